@@ -2,24 +2,45 @@
 
 from __future__ import annotations
 
-import time
-from typing import Optional, Dict, Any, List
+import asyncio
+import inspect
 import json
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable
 
-from openai import OpenAI, BadRequestError
-from openai.types.beta.assistant import Assistant
-# Do not import ThreadMessage directly to avoid version compatibility issues
-from typing import Any
-
-from config import get_settings
+from config import get_timeout_settings
 from agents.base import BaseAgent
+from services import llm_client
 from utils.logger import get_logger
 
 logger = get_logger()
 
+DEFAULT_INSTRUCTIONS = "You are Vida, an AI Life Coach with a supportive, real-talk personality. You speak like a wise friend, help users clarify goals, stay accountable, ask powerful reflection questions, give example choices, and close with next steps."
+
+
+def _search_knowledge_base(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Example tool implementation."""
+    return {"results": "This is a placeholder for search results"}
+
+
+def _get_user_goals(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Example tool implementation."""
+    return {"goals": ["Goal 1", "Goal 2", "Goal 3"]}
+
+
+# Notes: Tool name -> handler taking the decoded arguments; handlers may be async
+DEFAULT_TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "search_knowledge_base": _search_knowledge_base,
+    "get_user_goals": _get_user_goals,
+}
+
 
 class OpenAIAgent(BaseAgent):
-    """Agent implementation using OpenAI's Assistants API."""
+    """Agent implementation using OpenAI's Assistants API.
+
+    Every API call goes through the shared ``AsyncOpenAI`` client and runs are
+    consumed as streamed events, so a chat never blocks the event loop and
+    the reply is available as soon as the run completes.
+    """
 
     name: str = "openai_assistant"
 
@@ -30,117 +51,98 @@ class OpenAIAgent(BaseAgent):
         tools: Optional[List[Dict[str, Any]]] = None,
         assistant_id: Optional[str] = None,
         timeout: int = None,
+        tool_handlers: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+        assistant_resolver: Optional[Callable[[], Awaitable[str]]] = None,
     ):
         """
         Initialize an OpenAI Assistant agent.
-        
+
+        The assistant ID is resolved on the first run: ``assistant_id`` is used
+        as is, otherwise ``assistant_resolver`` supplies one (see
+        ``services.assistant_registry``), otherwise a new assistant is created.
+
         Args:
             model: The OpenAI model to use
             instructions: System instructions for the assistant
             tools: List of tools to enable for the assistant
             assistant_id: Optional existing assistant ID to use
             timeout: Maximum time to wait for the assistant response in seconds
+            tool_handlers: Optional overrides for tool name -> handler
+            assistant_resolver: Optional coroutine function returning the assistant ID
         """
-        self.client = OpenAI(api_key=get_settings().openai_api_key)
         self.model = model
-        self.instructions = instructions or "You are Vida, an AI Life Coach with a supportive, real-talk personality. You speak like a wise friend, help users clarify goals, stay accountable, ask powerful reflection questions, give example choices, and close with next steps."
+        self.instructions = instructions or DEFAULT_INSTRUCTIONS
         self.tools = tools or []
         self.assistant_id = assistant_id
-        self.timeout = timeout or get_settings().AGENT_TIMEOUT_SECONDS
-        self.assistant = None
-        
-        # If assistant_id is not provided, create a new assistant
-        if not self.assistant_id:
-            self._create_assistant()
-        else:
-            self._load_assistant()
+        self.timeout = timeout or get_timeout_settings().AGENT_TIMEOUT_SECONDS
+        self.tool_handlers = {**DEFAULT_TOOL_HANDLERS, **(tool_handlers or {})}
+        self.assistant_resolver = assistant_resolver
 
-    def _create_assistant(self) -> None:
-        """Create a new OpenAI Assistant."""
-        try:
-            self.assistant = self.client.beta.assistants.create(
-                name="Vida Coach",
-                description="An AI life coach that helps users with their goals and personal development",
-                instructions=self.instructions,
-                model=self.model,
-                tools=self.tools
-            )
-            self.assistant_id = self.assistant.id
-            logger.info(f"Created new OpenAI Assistant with ID: {self.assistant_id}")
-        except Exception as e:
-            logger.error(f"Failed to create OpenAI Assistant: {str(e)}")
-            raise
+    @property
+    def client(self):
+        """Blocking client kept for synchronous callers such as admin scripts."""
+        return llm_client.get_sync_api_client()
 
-    def _load_assistant(self) -> None:
-        """Load an existing OpenAI Assistant."""
+    async def _ensure_assistant(self) -> str:
+        """Resolve or create the assistant on first use and return its ID."""
+        if self.assistant_id:
+            return self.assistant_id
         try:
-            self.assistant = self.client.beta.assistants.retrieve(self.assistant_id)
-            logger.info(f"Loaded existing OpenAI Assistant with ID: {self.assistant_id}")
+            if self.assistant_resolver is not None:
+                self.assistant_id = await self.assistant_resolver()
+            else:
+                assistant = await llm_client.get_async_api_client().beta.assistants.create(
+                    name="Vida Coach",
+                    description="An AI life coach that helps users with their goals and personal development",
+                    instructions=self.instructions,
+                    model=self.model,
+                    tools=self.tools
+                )
+                self.assistant_id = assistant.id
+                logger.info(f"Created new OpenAI Assistant with ID: {self.assistant_id}")
         except Exception as e:
-            logger.error(f"Failed to load OpenAI Assistant: {str(e)}")
+            logger.error(f"Failed to initialize OpenAI Assistant: {str(e)}")
             raise
+        return self.assistant_id
 
     async def run(self, prompt: str, context: Optional[str] = None, thread_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Send a message to the OpenAI Assistant and wait for a response.
-        
+
+        The run is cancelled if it has not finished within ``timeout`` seconds.
+
         Args:
             prompt: The user message to send
             context: Optional additional context to include
             thread_id: Optional existing thread ID to continue a conversation
-            
+
         Returns:
             A dictionary containing the assistant's response and metadata
         """
+        state: Dict[str, Any] = {}
+
+        async def consume() -> str:
+            message = None
+            parts: List[str] = []
+            async for event in self._run_events(prompt, context, thread_id, state):
+                if "message" in event:
+                    # Notes: The last completed message is the final reply
+                    message = event["message"]
+                elif "delta" in event:
+                    parts.append(event["delta"])
+            return message if message is not None else "".join(parts)
+
         try:
-            # Create a new thread or use an existing one
-            if thread_id:
-                thread = self.client.beta.threads.retrieve(thread_id)
-            else:
-                thread = self.client.beta.threads.create()
-            
-            # Add the user message to the thread
-            full_message = prompt
-            if context:
-                full_message = f"{prompt}\n\nContext: {context}"
-                
-            self.client.beta.threads.messages.create(
-                thread_id=thread.id,
-                role="user",
-                content=full_message
-            )
-            
-            # Run the assistant
-            run = self.client.beta.threads.runs.create(
-                thread_id=thread.id,
-                assistant_id=self.assistant_id
-            )
-            
-            # Wait for the run to complete
-            run = self._wait_for_run(thread.id, run.id)
-            
-            # Handle any required actions (tool calls)
-            if run.status == "requires_action":
-                run = self._handle_tool_calls(thread.id, run)
-            
-            # Get the assistant's response
-            messages = self.client.beta.threads.messages.list(
-                thread_id=thread.id,
-                order="desc",
-                limit=1
-            )
-            
-            # Return the response and metadata
-            response_text = self._extract_message_content(messages.data[0])
-            
+            response_text = await asyncio.wait_for(consume(), self.timeout)
+        except asyncio.TimeoutError:
+            await self._cancel_run(state)
+            error = f"Assistant run timed out after {self.timeout} seconds"
+            logger.error(f"Error in OpenAI Assistant run: {error}")
             return {
-                "response": response_text,
-                "thread_id": thread.id,
-                "run_id": run.id,
-                "assistant_id": self.assistant_id,
-                "status": run.status
+                "response": f"I'm sorry, I encountered an error: {error}",
+                "status": "error",
+                "error": error
             }
-            
         except Exception as e:
             logger.error(f"Error in OpenAI Assistant run: {str(e)}")
             return {
@@ -148,84 +150,176 @@ class OpenAIAgent(BaseAgent):
                 "status": "error",
                 "error": str(e)
             }
-    
-    def _wait_for_run(self, thread_id: str, run_id: str):
-        """Wait for an assistant run to complete."""
-        start_time = time.time()
-        while True:
-            # Check if we've exceeded the timeout
-            if time.time() - start_time > self.timeout:
-                raise TimeoutError(f"Assistant run timed out after {self.timeout} seconds")
-                
-            # Check the run status
-            run = self.client.beta.threads.runs.retrieve(
-                thread_id=thread_id,
-                run_id=run_id
+
+        return {
+            "response": response_text,
+            "thread_id": state.get("thread_id"),
+            "run_id": state.get("run_id"),
+            "assistant_id": self.assistant_id,
+            "status": state.get("status")
+        }
+
+    async def stream(
+        self, prompt: str, context: Optional[str] = None, thread_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the assistant's reply as it is generated.
+
+        Yields ``{"delta": text}`` for each message delta, then a final
+        ``{"done": True, ...}`` event carrying the same metadata as :meth:`run`.
+        The run is cancelled and ``TimeoutError`` raised once ``timeout``
+        seconds have passed, even while the stream is waiting for an event.
+        """
+        state: Dict[str, Any] = {}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        events = self._run_events(prompt, context, thread_id, state)
+        try:
+            while True:
+                # Notes: Bound each wait so a stalled stream cannot outlive the deadline
+                try:
+                    event = await asyncio.wait_for(events.__anext__(), deadline - loop.time())
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    await self._cancel_run(state)
+                    raise TimeoutError(f"Assistant run timed out after {self.timeout} seconds") from None
+                if "delta" in event:
+                    yield event
+        finally:
+            await events.aclose()
+
+        yield {
+            "done": True,
+            "thread_id": state.get("thread_id"),
+            "run_id": state.get("run_id"),
+            "assistant_id": self.assistant_id,
+            "status": state.get("status")
+        }
+
+    async def _run_events(
+        self,
+        prompt: str,
+        context: Optional[str],
+        thread_id: Optional[str],
+        state: Dict[str, Any],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Post the user message, start a streamed run and yield its output.
+
+        Yields ``{"delta": text}`` and ``{"message": text}`` events. Tool calls
+        are answered and the run resumed on a new stream. ``state`` tracks the
+        thread ID, run ID and latest run status so callers can cancel the run.
+        """
+        client = llm_client.get_async_api_client()
+        assistant_id = await self._ensure_assistant()
+
+        # Create a new thread or use an existing one
+        if thread_id:
+            thread = await client.beta.threads.retrieve(thread_id)
+        else:
+            thread = await client.beta.threads.create()
+        state["thread_id"] = thread.id
+
+        # Add the user message to the thread
+        full_message = prompt
+        if context:
+            full_message = f"{prompt}\n\nContext: {context}"
+        await client.beta.threads.messages.create(
+            thread_id=thread.id,
+            role="user",
+            content=full_message
+        )
+
+        events = await client.beta.threads.runs.create(
+            thread_id=thread.id,
+            assistant_id=assistant_id,
+            stream=True
+        )
+        while events is not None:
+            pending_run = None
+            async for event in events:
+                if event.event == "thread.message.delta":
+                    for part in event.data.delta.content or []:
+                        text = getattr(part, "text", None)
+                        if text is not None and text.value:
+                            yield {"delta": text.value}
+                elif event.event == "thread.message.completed":
+                    yield {"message": self._extract_message_content(event.data)}
+                elif event.event.startswith("thread.run.") and ".step." not in event.event:
+                    # Notes: Run lifecycle events carry the run object itself
+                    state["run_id"] = event.data.id
+                    state["status"] = event.data.status
+                    if event.event == "thread.run.requires_action":
+                        pending_run = event.data
+
+            # Notes: A run waiting on tools ends its stream; resume it with the outputs
+            events = None
+            if pending_run is not None:
+                events = await client.beta.threads.runs.submit_tool_outputs(
+                    thread_id=thread.id,
+                    run_id=pending_run.id,
+                    tool_outputs=await self._handle_tool_calls(pending_run),
+                    stream=True
+                )
+
+    async def _cancel_run(self, state: Dict[str, Any]) -> None:
+        """Best-effort cancellation of the run recorded in ``state``."""
+        if not state.get("thread_id") or not state.get("run_id"):
+            return
+        try:
+            await llm_client.get_async_api_client().beta.threads.runs.cancel(
+                thread_id=state["thread_id"],
+                run_id=state["run_id"]
             )
-            
-            if run.status in ["completed", "failed", "cancelled", "expired"]:
-                return run
-            
-            # Wait before checking again
-            time.sleep(1)
-            
+        except Exception as e:
+            logger.warning(f"Failed to cancel OpenAI Assistant run {state['run_id']}: {str(e)}")
+
     def _extract_message_content(self, message: Any) -> str:
         """Extract text content from an assistant message."""
         content_parts = []
-        
+
         for content in message.content:
             if hasattr(content, "text"):
                 content_parts.append(content.text.value)
-                
+
         return "\n".join(content_parts)
-    
-    def _handle_tool_calls(self, thread_id: str, run):
+
+    async def _handle_tool_calls(self, run) -> List[Dict[str, str]]:
         """
-        Handle tool calls required by the assistant.
-        
-        This is a stub implementation that can be extended to support
-        various tools like searching databases, calling APIs, etc.
-        
+        Run every tool call the assistant requested concurrently.
+
         Args:
-            thread_id: The thread ID
             run: The run object requiring action
-            
+
         Returns:
-            The updated run object
+            Tool outputs ready for ``submit_tool_outputs``, in call order
         """
-        if not hasattr(run, "required_action") or not run.required_action:
-            return run
-            
-        tool_outputs = []
-        
-        for tool_call in run.required_action.submit_tool_outputs.tool_calls:
-            # Extract the function name and arguments
-            function_name = tool_call.function.name
-            arguments = json.loads(tool_call.function.arguments)
-            
-            # Handle different tool types
-            if function_name == "search_knowledge_base":
-                # Example tool implementation
-                result = {"results": "This is a placeholder for search results"}
-            elif function_name == "get_user_goals":
-                # Example tool implementation
-                result = {"goals": ["Goal 1", "Goal 2", "Goal 3"]}
-            else:
+        if not getattr(run, "required_action", None):
+            return []
+        tool_calls = run.required_action.submit_tool_outputs.tool_calls
+        return list(await asyncio.gather(*[self._call_tool(tool_call) for tool_call in tool_calls]))
+
+    async def _call_tool(self, tool_call) -> Dict[str, str]:
+        """Execute one tool call and return its output entry."""
+        # Extract the function name and arguments
+        function_name = tool_call.function.name
+        handler = self.tool_handlers.get(function_name)
+        try:
+            arguments = json.loads(tool_call.function.arguments or "{}")
+            if handler is None:
                 # Default response for unknown tools
                 result = {"error": f"Tool {function_name} not implemented"}
-                
-            # Add the tool output
-            tool_outputs.append({
-                "tool_call_id": tool_call.id,
-                "output": json.dumps(result)
-            })
-            
-        # Submit the tool outputs
-        run = self.client.beta.threads.runs.submit_tool_outputs(
-            thread_id=thread_id,
-            run_id=run.id,
-            tool_outputs=tool_outputs
-        )
-        
-        # Wait for the run to complete after tool submission
-        return self._wait_for_run(thread_id, run.id)
+            elif inspect.iscoroutinefunction(handler):
+                result = await handler(arguments)
+            else:
+                # Notes: Blocking handlers run in a worker thread
+                result = await asyncio.to_thread(handler, arguments)
+        except Exception as e:
+            logger.error(f"Tool {function_name} failed: {str(e)}")
+            result = {"error": str(e)}
+
+        return {
+            "tool_call_id": tool_call.id,
+            "output": json.dumps(result)
+        }
@@ -43,7 +43,8 @@ def generate_reflection_prompt(
     if db is not None and user_id is not None:
         messages = inject_wearable_context(db, user_id, messages)
 
-    # Notes: Delegate generation to the adapter with mild creativity
-    return adapter.generate(messages, temperature=0.6)
+    # Notes: Delegate generation to the adapter with mild creativity; fresh
+    # questions each time, so skip the response cache
+    return adapter.generate(messages, temperature=0.6, cache=False)
 
 # Footnote: This agent is invoked after a journal is summarized to prompt deeper thought.
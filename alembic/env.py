@@ -3,6 +3,10 @@ import os
 # Update sys.path to ensure the correct package is found (assuming 'vida_coach_backend' is the subfolder)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from database import Base
+from database.schema import load_all_models
+
+# Notes: Register every model so autogenerate sees the full schema
+load_all_models()
 target_metadata = Base.metadata
 from logging.config import fileConfig
 
@@ -0,0 +1,39 @@
+"""add assistant registry
+
+Revision ID: 3d6a9f0b7c12
+Revises: 8c1f4e7a2b93
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d6a9f0b7c12"
+down_revision: Union[str, Sequence[str], None] = "8c1f4e7a2b93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the shared assistant registry table."""
+    op.create_table(
+        "assistant_registry",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("domain", sa.String(length=50), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("instructions_hash", sa.String(length=64), nullable=False),
+        sa.Column("assistant_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint(
+            "domain", "model", "instructions_hash", name="uq_assistant_registry_config"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the shared assistant registry table."""
+    op.drop_table("assistant_registry")
@@ -0,0 +1,43 @@
+"""add user activity daily rollup
+
+Revision ID: 5b7e2c91d4a0
+Revises: 433b076ad922
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2c91d4a0"
+down_revision: Union[str, Sequence[str], None] = "433b076ad922"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-user daily activity rollup table."""
+    op.create_table(
+        "user_activity_daily",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("activity_date", sa.Date(), nullable=False),
+        sa.Column("journals", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sessions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("checkins", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("agent_runs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("interactions", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("user_id", "activity_date", name="uq_user_activity_day"),
+    )
+    op.create_index(
+        "ix_user_activity_daily_activity_date", "user_activity_daily", ["activity_date"]
+    )
+
+
+def downgrade() -> None:
+    """Drop the daily activity rollup table."""
+    op.drop_index("ix_user_activity_daily_activity_date", table_name="user_activity_daily")
+    op.drop_table("user_activity_daily")
@@ -0,0 +1,38 @@
+"""add usage columns to performance logs
+
+Revision ID: 6e2b8d4f1a57
+Revises: 3d6a9f0b7c12
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e2b8d4f1a57"
+down_revision: Union[str, Sequence[str], None] = "3d6a9f0b7c12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record provider-reported usage alongside each orchestration run."""
+    op.add_column(
+        "orchestration_performance_logs", sa.Column("cached_tokens", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "orchestration_performance_logs", sa.Column("model", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "orchestration_performance_logs", sa.Column("llm_latency_ms", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Drop the usage columns."""
+    op.drop_column("orchestration_performance_logs", "llm_latency_ms")
+    op.drop_column("orchestration_performance_logs", "model")
+    op.drop_column("orchestration_performance_logs", "cached_tokens")
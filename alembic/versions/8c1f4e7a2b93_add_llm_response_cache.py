@@ -0,0 +1,39 @@
+"""add llm response cache
+
+Revision ID: 8c1f4e7a2b93
+Revises: 5b7e2c91d4a0
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1f4e7a2b93"
+down_revision: Union[str, Sequence[str], None] = "5b7e2c91d4a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the persistent LLM response cache table."""
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.String(length=64), primary_key=True),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_llm_response_cache_created_at", "llm_response_cache", ["created_at"])
+    op.create_index("ix_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    """Drop the persistent LLM response cache table."""
+    op.drop_index("ix_llm_response_cache_expires_at", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_created_at", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
@@ -0,0 +1,39 @@
+"""add goal batch checkpoints
+
+Revision ID: a7c3e5f2d816
+Revises: 6e2b8d4f1a57
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e5f2d816"
+down_revision: Union[str, Sequence[str], None] = "6e2b8d4f1a57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the resumable segment goal run checkpoint table."""
+    op.create_table(
+        "goal_batch_checkpoints",
+        sa.Column("segment_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("last_user_id", sa.Integer(), nullable=True),
+        sa.Column("users_processed", sa.Integer(), nullable=False),
+        sa.Column("users_failed", sa.Integer(), nullable=False),
+        sa.Column("goals_created", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop the segment goal run checkpoint table."""
+    op.drop_table("goal_batch_checkpoints")
@@ -0,0 +1,30 @@
+"""add summary source fingerprints
+
+Revision ID: b3d9f6a1c4e2
+Revises: a7c3e5f2d816
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d9f6a1c4e2"
+down_revision: Union[str, Sequence[str], None] = "a7c3e5f2d816"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store the source entry fingerprint on both summary tables."""
+    op.add_column("summarized_journals", sa.Column("source_fingerprint", sa.String(length=64), nullable=True))
+    op.add_column("journal_summaries", sa.Column("source_fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the source entry fingerprint columns."""
+    op.drop_column("journal_summaries", "source_fingerprint")
+    op.drop_column("summarized_journals", "source_fingerprint")
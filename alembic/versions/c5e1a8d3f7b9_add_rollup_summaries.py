@@ -0,0 +1,42 @@
+"""add rollup summaries
+
+Revision ID: c5e1a8d3f7b9
+Revises: b3d9f6a1c4e2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a8d3f7b9"
+down_revision: Union[str, Sequence[str], None] = "b3d9f6a1c4e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the day/week/month summary tree table."""
+    op.create_table(
+        "rollup_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("level", sa.String(length=8), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("summary_text", sa.Text(), nullable=True),
+        sa.Column("source_fingerprint", sa.String(length=64), nullable=True),
+        sa.Column("item_count", sa.Integer(), nullable=False),
+        sa.Column("stale", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("user_id", "level", "period_start", name="uq_rollup_summary_period"),
+    )
+    op.create_index("ix_rollup_summaries_stale", "rollup_summaries", ["stale"])
+
+
+def downgrade() -> None:
+    """Drop the summary tree table."""
+    op.drop_index("ix_rollup_summaries_stale", table_name="rollup_summaries")
+    op.drop_table("rollup_summaries")
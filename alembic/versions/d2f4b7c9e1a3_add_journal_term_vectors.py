@@ -0,0 +1,46 @@
+"""add journal term vectors
+
+Revision ID: d2f4b7c9e1a3
+Revises: c5e1a8d3f7b9
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f4b7c9e1a3"
+down_revision: Union[str, Sequence[str], None] = "c5e1a8d3f7b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-entry term frequency table."""
+    op.create_table(
+        "journal_term_vectors",
+        sa.Column(
+            "entry_id",
+            sa.Integer(),
+            sa.ForeignKey("journal_entries.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("terms", sa.Text(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_journal_term_vectors_user_created",
+        "journal_term_vectors",
+        ["user_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-entry term frequency table."""
+    op.drop_index("ix_journal_term_vectors_user_created", table_name="journal_term_vectors")
+    op.drop_table("journal_term_vectors")
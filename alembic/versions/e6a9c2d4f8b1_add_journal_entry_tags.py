@@ -0,0 +1,51 @@
+"""add journal entry tags
+
+Revision ID: e6a9c2d4f8b1
+Revises: d2f4b7c9e1a3
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a9c2d4f8b1"
+down_revision: Union[str, Sequence[str], None] = "d2f4b7c9e1a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-entry tag table and flag every existing entry for backfill."""
+    op.add_column(
+        "journal_entries",
+        sa.Column("tags_indexed", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_index("ix_journal_entries_tags_indexed", "journal_entries", ["tags_indexed"])
+    op.create_table(
+        "journal_entry_tags",
+        sa.Column(
+            "entry_id",
+            sa.Integer(),
+            sa.ForeignKey("journal_entries.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("tag", sa.String(length=64), primary_key=True),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_journal_entry_tags_user_tag", "journal_entry_tags", ["user_id", "tag"])
+    op.create_index("ix_journal_entry_tags_tag_created", "journal_entry_tags", ["tag", "created_at"])
+
+
+def downgrade() -> None:
+    """Drop the per-entry tag table and the indexed flag."""
+    op.drop_index("ix_journal_entry_tags_tag_created", table_name="journal_entry_tags")
+    op.drop_index("ix_journal_entry_tags_user_tag", table_name="journal_entry_tags")
+    op.drop_table("journal_entry_tags")
+    op.drop_index("ix_journal_entries_tags_indexed", table_name="journal_entries")
+    op.drop_column("journal_entries", "tags_indexed")
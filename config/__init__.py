@@ -2,7 +2,7 @@
 
 # Notes: Standard utilities for caching
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 # Notes: Base class for environment driven settings
 from pydantic_settings import BaseSettings
@@ -76,6 +76,155 @@ class Settings(BaseSettings):
     DEBUG_MODE: bool = True
     """Global toggle for displaying debug banners in admin UI."""
 
+    # Notes: Connection pool tuning for the shared outbound LLM client
+    OPENAI_BASE_URL: str | None = None
+    """Override for the OpenAI API base URL (e.g. a local fake for load tests)."""
+    LLM_MAX_CONNECTIONS: int = 200
+    """Maximum concurrent HTTP connections held open to the LLM provider."""
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    """Idle connections kept alive in the pool between requests."""
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    """Per-request timeout applied to every outbound LLM call."""
+    LLM_PROVIDER_CONCURRENCY: Dict[str, int] = {"openai": 32}
+    """Maximum in-flight orchestration LLM calls per provider and event loop."""
+    LLM_DEFAULT_PROVIDER_CONCURRENCY: int = 16
+    """Concurrency ceiling for providers missing from LLM_PROVIDER_CONCURRENCY."""
+
+    # Notes: Per-model admission control for outbound chat completions
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    """Queue chat completions behind per-model request and token buckets."""
+    LLM_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "gpt-4o-mini": {"rpm": 30_000, "tpm": 150_000_000},
+        "gpt-4o": {"rpm": 10_000, "tpm": 30_000_000},
+    }
+    """Requests and tokens per minute by model name prefix (longest prefix wins)."""
+    LLM_DEFAULT_RATE_LIMIT: Dict[str, float] = {"rpm": 5000, "tpm": 2_000_000}
+    """Limits for models missing from LLM_RATE_LIMITS."""
+    LLM_RATE_BURST_SECONDS: float = 10.0
+    """Seconds of refill a bucket may bank for bursts."""
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    """Deadline for admission and retries before a call fails with LLMQueueTimeout."""
+    LLM_RATE_MAX_RETRIES: int = 4
+    """Retries of throttled or transient provider failures within the deadline."""
+    LLM_AIMD_INCREASE: float = 0.05
+    """Fraction of the configured limit restored after each successful call."""
+    LLM_AIMD_DECREASE: float = 0.5
+    """Multiplier applied to the effective limit after a 429."""
+    LLM_AIMD_MIN_FACTOR: float = 0.1
+    """Lowest fraction of the configured limit AIMD may fall to."""
+
+    # Notes: AIModelAdapter failover, hedging and circuit breakers
+    AI_PROVIDER_FALLBACKS: Dict[str, List[str]] = {}
+    """Alternate providers tried in order when a primary provider fails or is slow."""
+    AI_HEDGING_ENABLED: bool = False
+    """Send a second request to the next provider once the first exceeds its p95."""
+    AI_HEDGE_MIN_DELAY_SECONDS: float = 0.25
+    """Lower bound on the hedge delay so fast providers are not double-billed."""
+    AI_HEDGE_DEFAULT_DELAY_SECONDS: float = 5.0
+    """Hedge delay used until a provider has AI_HEDGE_MIN_SAMPLES latencies."""
+    AI_HEDGE_MIN_SAMPLES: int = 20
+    """Successful calls needed before the p95 latency drives the hedge delay."""
+    AI_BREAKER_FAILURE_THRESHOLD: int = 5
+    """Consecutive failures that open a provider's circuit breaker."""
+    AI_BREAKER_RESET_SECONDS: float = 30.0
+    """Seconds an open breaker rejects calls before a half-open trial."""
+
+    # Notes: Segment goal generation batch job
+    GOAL_BATCH_PAGE_SIZE: int = 500
+    """Segment members fetched per keyset page; each page commits with its checkpoint."""
+    GOAL_BATCH_CONCURRENCY: int = 16
+    """Concurrent LLM calls while generating goals for a page of members."""
+    GOAL_BATCH_INSERT_CHUNK: int = 1000
+    """Goal rows per bulk INSERT statement."""
+
+    # Notes: Stage graph pipelines (journal summarization post-processing)
+    STAGE_BACKGROUND_MODE: str = "background"
+    """``background`` runs background stages on a worker pool (inline on StaticPool engines); ``inline`` runs them before returning."""
+    STAGE_BACKGROUND_WORKERS: int = 4
+    """Worker threads shared by background pipeline stages."""
+
+    # Notes: Moderation verdict cache and batching
+    MODERATION_CACHE_MAX_ENTRIES: int = 10000
+    """Provider moderation verdicts remembered by content hash."""
+    MODERATION_BATCH_SIZE: int = 32
+    """Texts sent per moderation request by batch reruns and backfills."""
+
+    # Notes: Day/week/month summary tree feeding reviews, reports and trends
+    ROLLUP_SUMMARY_MODEL: str = "gpt-4o-mini"
+    """Model that condenses a node's input when it is too long to store verbatim."""
+    ROLLUP_VERBATIM_MAX_CHARS: int = 1200
+    """Node inputs up to this length are stored as-is without a model call."""
+    ROLLUP_INPUT_MAX_CHARS: int = 16000
+    """Input sent to the model for one node is truncated to this length."""
+    ROLLUP_SUMMARY_MAX_TOKENS: int = 300
+    """Output ceiling for one node summary, which bounds every prompt built from nodes."""
+    ROLLUP_REFRESH_BATCH: int = 500
+    """Stale nodes rebuilt per commit by the refresh job."""
+    ROLLUP_READ_REFRESH_LIMIT: int = 3
+    """Model calls a reader may spend condensing stale nodes in its window; the refresh job handles the rest."""
+
+    # Notes: Per-entry journal tag index behind /journals/analyze-tags
+    JOURNAL_TAGGING_MODE: str = "background"
+    """``background`` tags written entries on a worker pool after commit (deferred on StaticPool engines); ``deferred`` leaves them to the backfill job."""
+    JOURNAL_TAGGING_WORKERS: int = 2
+    """Worker threads tagging newly written or edited entries."""
+    JOURNAL_TAGS_PER_ENTRY: int = 5
+    """Maximum tags stored for one entry."""
+    JOURNAL_TAG_READ_BATCH: int = 20
+    """Untagged entries of the requesting user that analyze-tags queues on the tagging pool."""
+    JOURNAL_TAG_HALF_LIFE_DAYS: float = 30.0
+    """Age at which an entry's tags count half as much when ranking a user's tags."""
+    JOURNAL_TAG_BACKFILL_BATCH: int = 200
+    """Entries tagged per commit by the backfill job."""
+
+    # Notes: Per-user context snapshot cache used by memory assembly
+    CONTEXT_SNAPSHOT_TTL_SECONDS: float = 300.0
+    """Upper bound on snapshot age; covers writes made by other workers."""
+    CONTEXT_SNAPSHOT_MAX_USERS: int = 10000
+    """Maximum number of user snapshots kept in the in-process LRU."""
+
+    # Notes: Process-level cache for admin toggles, access policies and flags
+    POLICY_CACHE_TTL_SECONDS: float = 60.0
+    """How long another worker's admin edits may take to become visible."""
+
+    # Notes: Cached results of expensive AI read endpoints, keyed by context version
+    AI_RESULT_CACHE_TTL_SECONDS: float = 900.0
+    """Upper bound on result age; covers writes made by other workers."""
+    AI_RESULT_CACHE_MAX_ENTRIES: int = 10000
+    """Maximum number of (endpoint, user) results kept in the in-process LRU."""
+
+    # Notes: Buffered writer for orchestration and agent execution logs
+    TELEMETRY_MODE: str = "buffered"
+    """``buffered`` writes log rows from a background thread; ``sync`` commits inline and is used on StaticPool engines."""
+    TELEMETRY_QUEUE_MAX: int = 10000
+    """Rows held in memory before submissions start waiting and then dropping."""
+    TELEMETRY_BATCH_SIZE: int = 500
+    """Queued rows that trigger an early flush; also the rows per transaction."""
+    TELEMETRY_FLUSH_INTERVAL_MS: int = 250
+    """Maximum time a queued row waits before the flusher writes it."""
+    TELEMETRY_ENQUEUE_TIMEOUT_MS: int = 5
+    """How long a submission blocks on a full queue before the row is dropped."""
+
+    # Notes: Content-addressed cache for chat completion responses
+    LLM_CACHE_ENABLED: bool = True
+    """Master switch; when enabled, temperature-0 calls are cached unless ``cache=False``."""
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    """Responses kept in the in-process LRU tier."""
+    LLM_CACHE_TTL_SECONDS: float = 86400.0
+    """Lifetime of a cached response in both tiers."""
+    LLM_CACHE_PERSISTENT: bool = False
+    """Also store responses in the ``llm_response_cache`` table."""
+    LLM_CACHE_PERSISTENT_MAX_ROWS: int = 100000
+    """Row cap for the persistent tier; oldest rows are pruned first."""
+
+    # Notes: Assistants shared by every worker through the ``assistant_registry`` table
+    ASSISTANT_WARMUP_ON_STARTUP: bool = True
+    """Resolve the warm-up domains' assistants when a worker starts."""
+    ASSISTANT_WARMUP_DOMAINS: List[str] = ["general", "career", "health", "relationship"]
+    """Agent domains whose assistants are resolved during warm-up."""
+    ASSISTANT_WARMUP_TIMEOUT_SECONDS: float = 10.0
+    """Upper bound on how long warm-up may delay worker startup."""
+
     model_config = {
         "protected_namespaces": ('settings_',),
         "extra": "allow",
@@ -6,6 +6,7 @@ from pathlib import Path
 import json
 import yaml
 import os
+from typing import Any
 from utils.logger import get_logger
 
 # Notes: BaseSettings parses environment variables into attributes
@@ -19,6 +20,28 @@ class AppSettings(BaseSettings):
     database_url: str = "sqlite:///./vida.db"
     """Database connection URL."""
 
+    # Notes: Engine tuning applied by ``database/session.py``
+    DB_ECHO: bool = False
+    """Log every SQL statement; keep off outside local debugging."""
+
+    DB_POOL_SIZE: int = 10
+    """Persistent connections kept per process by the connection pool."""
+
+    DB_MAX_OVERFLOW: int = 20
+    """Extra connections opened under burst load beyond ``DB_POOL_SIZE``."""
+
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    """Seconds to wait for a pooled connection before raising."""
+
+    DB_POOL_PRE_PING: bool = True
+    """Test connections on checkout so dropped ones are replaced transparently."""
+
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    """Recycle connections older than this to dodge server-side idle timeouts."""
+
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    """Server-side statement timeout for PostgreSQL connections (0 disables)."""
+
     # Authentication configuration
     secret_key: str = "your-secret-key-change-in-production"
     """Secret key for JWT token signing."""
@@ -45,8 +68,8 @@ class AppSettings(BaseSettings):
     MODEL_PRICING_FILE: str = "config/model_pricing.yaml"
     """Filesystem path to the model pricing configuration file."""
 
-    model_pricing: dict[str, float] = {}
-    """Mapping of model name to cost per thousand tokens."""
+    model_pricing: dict[str, Any] = {}
+    """Mapping of model name to cost per thousand tokens (flat or per token kind)."""
 
     # Optional API keys
     openai_api_key: str = ""
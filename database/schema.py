@@ -0,0 +1,67 @@
+"""Explicit schema management used by deploy tooling and tests.
+
+The application no longer creates tables when ``main`` is imported. Run
+``python scripts/init_db.py upgrade`` before starting workers: it applies
+alembic migrations, or creates and stamps the schema when the database is
+empty. ``python scripts/init_db.py create`` always builds a fresh schema.
+"""
+
+from __future__ import annotations
+
+import importlib
+import pkgutil
+from pathlib import Path
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from database.base import Base
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+def load_all_models() -> None:
+    """Import every module under ``models`` so the metadata is complete."""
+    import models
+
+    for module in pkgutil.iter_modules(models.__path__):
+        importlib.import_module(f"models.{module.name}")
+
+
+def create_schema(bind: Engine | None = None) -> None:
+    """Create any missing tables on ``bind`` (the app engine by default)."""
+    if bind is None:
+        from database.session import engine as bind
+
+    load_all_models()
+    Base.metadata.create_all(bind=bind)
+
+
+def is_empty(bind: Engine | None = None) -> bool:
+    """Return whether ``bind`` has no tables at all, not even ``alembic_version``."""
+    if bind is None:
+        from database.session import engine as bind
+
+    return not inspect(bind).get_table_names()
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(str(ALEMBIC_INI))
+
+
+def stamp_head() -> None:
+    """Mark the database as current so later upgrades start from head."""
+    from alembic import command
+
+    command.stamp(_alembic_config(), "head")
+
+
+def upgrade_head() -> None:
+    """Apply pending alembic migrations."""
+    from alembic import command
+
+    command.upgrade(_alembic_config(), "head")
+
+# Footnote: Keep schema changes in alembic; create_schema is for fresh databases.
@@ -1,27 +1,152 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from config import get_settings
+from config import get_settings, get_timeout_settings
 
 # Notes: Load configuration once using the cached settings helper
 settings = get_settings()
+# Notes: Pool and logging knobs live on ``AppSettings``
+engine_settings = get_timeout_settings()
 
-# Create the SQLAlchemy engine with echo enabled for debugging
-engine_kwargs = {"echo": True}
-if settings.database_url.startswith("sqlite"):
-    engine_kwargs.update(
+# Notes: Async drivers substituted for the sync ones in ``DATABASE_URL``
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def build_engine_kwargs(database_url: str, config=engine_settings, is_async: bool = False) -> dict:
+    """Return ``create_engine`` keyword arguments for ``database_url``."""
+    kwargs = {"echo": config.DB_ECHO}
+    backend = make_url(database_url).get_backend_name()
+    if backend == "sqlite":
+        # Notes: SQLite shares one connection; pool sizing does not apply
+        kwargs.update(
+            {
+                "connect_args": {"check_same_thread": False},
+                "poolclass": StaticPool,
+            }
+        )
+        return kwargs
+
+    kwargs.update(
         {
-            "connect_args": {"check_same_thread": False},
-            "poolclass": StaticPool,
+            "pool_size": config.DB_POOL_SIZE,
+            "max_overflow": config.DB_MAX_OVERFLOW,
+            "pool_timeout": config.DB_POOL_TIMEOUT_SECONDS,
+            "pool_pre_ping": config.DB_POOL_PRE_PING,
+            "pool_recycle": config.DB_POOL_RECYCLE_SECONDS,
         }
     )
-engine = create_engine(settings.database_url, **engine_kwargs)
+    if backend == "postgresql" and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        timeout = str(config.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return kwargs
+
+
+def to_async_url(database_url: str) -> str:
+    """Return ``database_url`` rewritten to use its asyncio driver."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}")
+    return url.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+engine = create_engine(settings.database_url, **build_engine_kwargs(settings.database_url))
 
 # Configure session factory
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
+def shares_one_connection(bind) -> bool:
+    """Return whether every session on ``bind`` uses the same DBAPI connection.
+
+    ``StaticPool`` (the SQLite setup) works that way, so work done on another
+    thread would commit or roll back whatever transaction a request has open.
+    """
+    if bind is None:
+        return False
+    return isinstance(getattr(bind, "engine", bind).pool, StaticPool)
+
+
+def register_orm_hooks() -> None:
+    """Register the Session hooks that keep derived tables in step with writes.
+
+    They keep the daily activity rollup current, mark rollup summaries stale,
+    store journal term vectors and maintain the journal tag index. The app and
+    every job entry point call this before writing; repeated calls are no-ops.
+    """
+    # Notes: Imported here because the services import this module
+    from services.activity_rollup_service import _roll_up_flushed_events
+    from services.journal_tagging_service import (
+        _drop_stale_tags,
+        _flag_edited_entries,
+        _forget_pending,
+        _schedule_tagging,
+    )
+    from services.journal_trend_engine import _sync_term_vectors
+    from services.rollup_summary_service import _mark_flushed_records
+
+    hooks = (
+        ("after_flush", _roll_up_flushed_events),
+        ("after_flush", _mark_flushed_records),
+        ("after_flush", _sync_term_vectors),
+        ("before_flush", _flag_edited_entries),
+        ("after_flush", _drop_stale_tags),
+        ("after_commit", _schedule_tagging),
+        ("after_rollback", _forget_pending),
+    )
+    for identifier, hook in hooks:
+        if not event.contains(Session, identifier, hook):
+            event.listen(Session, identifier, hook)
+
+
+# Notes: The async engine is built on first use so sync-only deployments never
+# import the asyncio drivers
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """Return the shared ``AsyncEngine`` for ``DATABASE_URL``."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            to_async_url(settings.database_url),
+            **build_engine_kwargs(settings.database_url, is_async=True),
+        )
+    return _async_engine
+
+
+def get_async_session_factory():
+    """Return the ``async_sessionmaker`` bound to the shared async engine."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections, typically on application shutdown."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+
+
 def get_db():
     """Dependency that provides a database session."""
     db = SessionLocal()
@@ -31,5 +156,20 @@ def get_db():
         db.close()
 
 
-__all__ = ["engine", "SessionLocal", "get_db"]
+async def get_async_db():
+    """Dependency that provides an ``AsyncSession``."""
+    async with get_async_session_factory()() as db:
+        yield db
+
 
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "register_orm_hooks",
+    "shares_one_connection",
+    "get_db",
+    "get_async_db",
+    "get_async_engine",
+    "get_async_session_factory",
+    "dispose_async_engine",
+]
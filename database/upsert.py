@@ -0,0 +1,52 @@
+"""Dialect-aware insert-or-update used by the derived-table writers.
+
+PostgreSQL and SQLite get a single ``INSERT ... ON CONFLICT DO UPDATE``.
+Other dialects fall back to an ``UPDATE`` per row followed by an ``INSERT``
+when no row matched.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Table, and_, insert, update
+
+
+def upsert_rows(
+    connection,
+    table: Table,
+    rows: Sequence[dict],
+    index_elements: Sequence[str],
+    updates: Callable[[Any], dict],
+) -> None:
+    """Insert ``rows`` into ``table``, updating those whose key already exists.
+
+    ``updates(proposed)`` returns the values written to an existing row.
+    ``proposed[column]`` is the incoming value: the ``excluded`` row under
+    ``ON CONFLICT`` or the row dict in the fallback.
+    """
+
+    if not rows:
+        return
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        stmt = upsert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(index_elements), set_=updates(stmt.excluded)
+        )
+        connection.execute(stmt, list(rows))
+        return
+
+    # Notes: Portable fallback for dialects without ON CONFLICT support
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(and_(*(table.c[key] == row[key] for key in index_elements)))
+            .values(updates(row))
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table), row)
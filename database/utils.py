@@ -1,8 +1,9 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .session import SessionLocal
+from .session import SessionLocal, get_async_session_factory
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -12,3 +13,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a new ``AsyncSession`` for non-blocking routes."""
+    async with get_async_session_factory()() as db:
+        yield db
@@ -0,0 +1,27 @@
+"""Job entry point to rebuild the daily activity rollup from raw events."""
+
+import argparse
+from datetime import date
+
+from database.session import SessionLocal, register_orm_hooks
+from services.activity_rollup_service import rebuild_activity_rollup
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def run(since: date | None = None) -> None:
+    """Recompute rollup rows from ``since`` onward (all history by default)."""
+    register_orm_hooks()
+    db = SessionLocal()
+    try:
+        written = rebuild_activity_rollup(db, since=since)
+        logger.info("Rebuilt %s daily activity rollup rows", written)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild user_activity_daily")
+    parser.add_argument("--since", type=date.fromisoformat, default=None)
+    run(parser.parse_args().since)
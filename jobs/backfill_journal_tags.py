@@ -0,0 +1,36 @@
+"""Job entry point to tag journal entries missing from the tag index."""
+
+import argparse
+
+from config import get_settings
+from database.session import SessionLocal, register_orm_hooks
+from services.journal_tagging_service import index_pending_entries
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def run(batch_size: int | None = None, user_id: int | None = None) -> None:
+    """Tag every pending entry once, committing per batch."""
+    batch_size = batch_size or get_settings().JOURNAL_TAG_BACKFILL_BATCH
+    register_orm_hooks()
+    db = SessionLocal()
+    try:
+        # Notes: Keyset cursor so entries whose extraction fails are not retried forever
+        after_id, total = 0, 0
+        while True:
+            tagged, after_id = index_pending_entries(db, user_id, limit=batch_size, after_id=after_id)
+            if after_id is None:
+                break
+            total += tagged
+            logger.info("Tagged %s journal entries (%s so far, through id %s)", tagged, total, after_id)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill journal_entry_tags")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    run(args.batch_size, args.user_id)
@@ -0,0 +1,26 @@
+"""Job entry point to re-moderate stored summaries in batched provider calls."""
+
+import argparse
+
+from database.session import SessionLocal, register_orm_hooks
+from services.summary_moderation_service import RERUN_PAGE_SIZE, rerun_summary_moderation
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def run(batch_size: int = RERUN_PAGE_SIZE) -> None:
+    """Re-check every unflagged summary and flag the ones that now fail."""
+    register_orm_hooks()
+    db = SessionLocal()
+    try:
+        result = rerun_summary_moderation(db, batch_size=batch_size)
+        logger.info("Re-moderated %s summaries, flagged %s", result["checked"], result["flagged"])
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-moderate unflagged summaries")
+    parser.add_argument("--batch-size", type=int, default=RERUN_PAGE_SIZE)
+    run(parser.parse_args().batch_size)
@@ -8,7 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy.orm import Session
 
-from database.session import SessionLocal
+from database.session import SessionLocal, register_orm_hooks
 from services.openai_agent_service import OpenAIAgentService
 from utils.logger import get_logger
 
@@ -17,6 +17,7 @@ logger = get_logger()
 
 def cleanup_old_assistant_threads() -> None:
     """Clean up OpenAI assistant threads that are older than the TTL setting."""
+    register_orm_hooks()
     db = SessionLocal()
     try:
         count = OpenAIAgentService.cleanup_old_threads(db)
@@ -1,13 +1,28 @@
 # Notes: Script to run goal recommendation generation for a segment
-from database.session import SessionLocal
-from services.personalized_recommendation_service import generate_goals_for_segment
+from database.session import SessionLocal, register_orm_hooks
+from services.segment_goal_batch_service import run_segment_goal_batch
+from utils.logger import get_logger
 
+logger = get_logger()
 
-def run(segment_id: str) -> None:
-    """Execute the generation process within a DB session."""
+
+def run(segment_id: str, restart: bool = False) -> None:
+    """Execute the generation process within a DB session.
+
+    An interrupted run resumes after the last committed user unless
+    ``restart`` is set.
+    """
+    register_orm_hooks()
     db = SessionLocal()
     try:
-        generate_goals_for_segment(db, segment_id)
+        report = run_segment_goal_batch(db, segment_id, restart=restart)
+        logger.info(
+            "Generated %s goals for %s users in %.1fs (%.1f users/s)",
+            report.goals_created,
+            report.users_processed,
+            report.elapsed_seconds,
+            report.users_per_second,
+        )
     finally:
         db.close()
 
@@ -15,7 +30,8 @@ def run(segment_id: str) -> None:
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) < 2:
-        print("Usage: generate_goal_recommendations <segment_id>")
+    args = [arg for arg in sys.argv[1:] if arg != "--restart"]
+    if len(args) != 1:
+        print("Usage: generate_goal_recommendations <segment_id> [--restart]")
         raise SystemExit(1)
-    run(sys.argv[1])
+    run(args[0], restart="--restart" in sys.argv[1:])
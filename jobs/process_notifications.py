@@ -1,7 +1,7 @@
 # Notes: Entry point script to process pending notifications
 
 # Notes: Import database session factory and service function
-from database.session import SessionLocal
+from database.session import SessionLocal, register_orm_hooks
 from services.notification_service import process_pending_notifications
 
 
@@ -9,6 +9,7 @@ from services.notification_service import process_pending_notifications
 
 def run() -> None:
     """Execute the pending notification job."""
+    register_orm_hooks()
     db = SessionLocal()
     try:
         process_pending_notifications(db)
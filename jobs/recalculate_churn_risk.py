@@ -1,14 +1,19 @@
 """Job entry point to recompute churn risk for all users."""
 
-from database.session import SessionLocal
+from database.session import SessionLocal, register_orm_hooks
 from services.churn_risk_service import recalculate_all_churn_risk
+from utils.logger import get_logger
+
+logger = get_logger()
 
 
 def run() -> None:
     """Execute the batch churn risk recalculation."""
+    register_orm_hooks()
     db = SessionLocal()
     try:
-        recalculate_all_churn_risk(db)
+        written = recalculate_all_churn_risk(db)
+        logger.info("Recalculated churn risk for %s users", written)
     finally:
         db.close()
 
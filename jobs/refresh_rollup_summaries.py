@@ -0,0 +1,39 @@
+"""Job entry point to rebuild stale day/week/month rollup summaries."""
+
+import argparse
+from datetime import date
+
+from config import get_settings
+from database.session import SessionLocal, register_orm_hooks
+from services.rollup_summary_service import mark_history_stale, refresh_rollups
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def run(since: date | None = None, batch_size: int | None = None) -> None:
+    """Rebuild every stale node; with ``since``, first mark that history stale."""
+    batch_size = batch_size or get_settings().ROLLUP_REFRESH_BATCH
+    register_orm_hooks()
+    db = SessionLocal()
+    try:
+        if since is not None:
+            marked = mark_history_stale(db, since)
+            logger.info("Marked %s day summaries stale since %s", marked, since)
+        total = 0
+        while True:
+            rebuilt = refresh_rollups(db, limit=batch_size)
+            if not rebuilt:
+                break
+            total += rebuilt
+            logger.info("Rebuilt %s rollup summaries (%s so far)", rebuilt, total)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh rollup_summaries")
+    parser.add_argument("--since", type=date.fromisoformat, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    run(args.since, args.batch_size)
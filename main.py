@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI, APIRouter
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
@@ -129,16 +130,23 @@ from routes.personality import router as personality_router
 from routes.admin_health import router as admin_health_router
 
 
-from database.base import Base
-from database.session import engine
+from services import llm_client
+from database.session import dispose_async_engine, register_orm_hooks
+from services.telemetry_writer import shutdown_telemetry_writer
+from services.openai_agent_service import OpenAIAgentService
+from utils.logger import get_logger
 
-# Automatically create database tables on startup
-# This ensures the database schema is ready when the application starts
-Base.metadata.create_all(bind=engine)
+logger = get_logger()
+
+# Notes: Tables are not created at import; run ``scripts/init_db.py`` as a
+# deploy step so workers start without reflecting the schema
 
 # Notes: Load configuration for use when creating the FastAPI app
 settings = get_settings()
 
+# Notes: Keep rollups, summary staleness, term vectors and tags in step with writes
+register_orm_hooks()
+
 
 # Initialize the FastAPI application with project metadata and contact info
 app = FastAPI(
@@ -166,6 +174,39 @@ app.add_middleware(
 # Register middleware components on the app instance
 init_middlewares(app)
 
+
+@app.on_event("startup")
+async def warm_assistant_registry() -> None:
+    """Resolve shared assistants so the first chat after a deploy skips creation."""
+    if not settings.ASSISTANT_WARMUP_ON_STARTUP:
+        return
+    try:
+        await asyncio.wait_for(
+            OpenAIAgentService.warm_up(settings.ASSISTANT_WARMUP_DOMAINS),
+            settings.ASSISTANT_WARMUP_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Assistant warm-up timed out; remaining domains resolve on first use")
+
+
+@app.on_event("shutdown")
+async def close_llm_clients() -> None:
+    """Release pooled LLM provider connections when the worker exits."""
+    await llm_client.aclose()
+
+
+@app.on_event("shutdown")
+async def close_async_db_engine() -> None:
+    """Dispose the async database pool if any route opened it."""
+    await dispose_async_engine()
+
+
+@app.on_event("shutdown")
+def flush_telemetry() -> None:
+    """Write any buffered orchestration and execution logs before exiting."""
+    shutdown_telemetry_writer()
+
+
 # -- Custom OpenAPI -----------------------------------------------------------------
 # Provide JWT bearer authentication docs and reuse FastAPI's autogenerated schema
 def custom_openapi():
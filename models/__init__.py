@@ -38,6 +38,16 @@ from .analytics_event import AnalyticsEvent
 from .user_session import UserSession
 from .churn_risk import ChurnRisk, RiskCategory
 from .churn_score import ChurnScore
+# Notes: Import per-user daily activity rollup used by dashboards and churn
+from .user_activity_daily import UserActivityDaily
+from .llm_response_cache import LLMResponseCacheEntry
+# Notes: Import registry of shared OpenAI assistants
+from .assistant_registry import AssistantRegistryEntry
+# Notes: Import resumable progress of segment goal generation runs
+from .goal_batch_checkpoint import GoalBatchCheckpoint
+from .rollup_summary import RollupSummary
+from .journal_term_vector import JournalTermVector
+from .journal_entry_tag import JournalEntryTag
 # Notes: Import model tracking the latest state for each agent
 from .agent_state import AgentState
 # Notes: Import model for queued agent failures
@@ -113,6 +123,13 @@ __all__ = [
     "UserSession",
     "ChurnRisk",
     "ChurnScore",
+    "UserActivityDaily",
+    "LLMResponseCacheEntry",
+    "AssistantRegistryEntry",
+    "GoalBatchCheckpoint",
+    "RollupSummary",
+    "JournalTermVector",
+    "JournalEntryTag",
     "RiskCategory",
     "UserFeedback",
     "FeedbackType",
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+"""SQLAlchemy model mapping agent configurations to remote assistant IDs."""
+
+from datetime import datetime
+
+# Notes: SQLAlchemy helpers for columns and constraints
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+
+from database.base import Base
+
+
+class AssistantRegistryEntry(Base):
+    """OpenAI assistant created once for a (domain, model, instructions) triple."""
+
+    __tablename__ = "assistant_registry"
+    __table_args__ = (
+        UniqueConstraint(
+            "domain", "model", "instructions_hash", name="uq_assistant_registry_config"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    domain = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    # Notes: SHA-256 of the instructions so edited prompts get a new assistant
+    instructions_hash = Column(String(64), nullable=False)
+    assistant_id = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
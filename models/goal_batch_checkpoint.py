@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+"""SQLAlchemy model recording progress of segment goal generation runs."""
+
+from datetime import datetime
+
+# Notes: SQLAlchemy helpers for column definitions
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from database.base import Base
+
+
+class GoalBatchCheckpoint(Base):
+    """Keyset position and counters of the latest goal run for a segment."""
+
+    __tablename__ = "goal_batch_checkpoints"
+
+    # Notes: One checkpoint per segment; no FK so deleted segments keep their run history
+    segment_id = Column(UUID(as_uuid=True), primary_key=True)
+    # Notes: Highest user id whose goals are committed; a resumed run starts after it
+    last_user_id = Column(Integer, nullable=True)
+    users_processed = Column(Integer, default=0, nullable=False)
+    users_failed = Column(Integer, default=0, nullable=False)
+    goals_created = Column(Integer, default=0, nullable=False)
+    # Notes: running until the last page commits, then completed
+    status = Column(String(20), default="running", nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
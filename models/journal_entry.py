@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, false
 from sqlalchemy.orm import relationship
 
 from database.base import Base
@@ -23,6 +23,8 @@ class JournalEntry(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     # Indicates whether journal entry was AI-assisted or fully AI-generated
     ai_generated = Column(Boolean, default=False)
+    # False until journal_tagging_service has stored tags for the current content
+    tags_indexed = Column(Boolean, nullable=False, default=False, server_default=false(), index=True)
 
     user = relationship("User", back_populates="journal_entries")
     # Convenience relationship to access the linked goal object
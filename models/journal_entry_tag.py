@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+"""SQLAlchemy model holding the tags extracted from one journal entry."""
+
+from datetime import datetime
+
+# Notes: SQLAlchemy helpers for columns and indexes
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from database.base import Base
+
+
+class JournalEntryTag(Base):
+    """One normalized tag the model extracted from a journal entry."""
+
+    __tablename__ = "journal_entry_tags"
+    __table_args__ = (
+        Index("ix_journal_entry_tags_user_tag", "user_id", "tag"),
+        Index("ix_journal_entry_tags_tag_created", "tag", "created_at"),
+    )
+
+    # Notes: Replaced as a set whenever the entry is re-tagged
+    entry_id = Column(Integer, ForeignKey("journal_entries.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(64), primary_key=True)
+    # Notes: Order the model listed the tag in; breaks ties between equally weighted tags
+    position = Column(Integer, nullable=False, default=0)
+    # Notes: Copied from the entry so aggregation never joins back to journal text
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -9,7 +9,7 @@ from uuid import uuid4
 from datetime import datetime
 
 # Notes: SQLAlchemy column types and relationship helpers
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text, Boolean, String
 # Notes: PostgreSQL UUID type for id columns
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -32,6 +32,9 @@ class JournalSummary(Base):
     summary_text = Column(Text, nullable=False)
     # Notes: JSON string of journal entry ids used for the summary
     source_entry_ids = Column(Text, nullable=False)
+    # Notes: Digest of the source entry ids and update times used to skip
+    # regenerating an unchanged summary
+    source_fingerprint = Column(String(64), nullable=True)
     # Notes: Mark when this summary has been flagged
     flagged = Column(Boolean, default=False)
     # Notes: Reason provided for the flag
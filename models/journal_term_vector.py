@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+"""SQLAlchemy model holding the term counts of one journal entry."""
+
+from datetime import datetime
+
+# Notes: SQLAlchemy helpers for columns and indexes
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
+
+from database.base import Base
+
+
+class JournalTermVector(Base):
+    """Tokenized term frequencies kept in step with a journal entry's content."""
+
+    __tablename__ = "journal_term_vectors"
+    __table_args__ = (Index("ix_journal_term_vectors_user_created", "user_id", "created_at"),)
+
+    # Notes: One vector per entry; maintained by journal_trend_engine's flush hook
+    entry_id = Column(Integer, ForeignKey("journal_entries.id", ondelete="CASCADE"), primary_key=True)
+    # Notes: Copied from the entry so trend windows never join back to journal text
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Notes: JSON object mapping each term to its count in the entry
+    terms = Column(Text, nullable=False)
+    token_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+"""SQLAlchemy model for the persistent tier of the LLM response cache."""
+
+from datetime import datetime
+
+# Notes: SQLAlchemy helpers for columns
+from sqlalchemy import Column, DateTime, String, Text
+
+from database.base import Base
+
+
+class LLMResponseCacheEntry(Base):
+    """Completion text stored under a content hash of its request."""
+
+    __tablename__ = "llm_response_cache"
+
+    # Notes: SHA-256 of the canonical (model, messages, temperature, max_tokens)
+    key = Column(String(64), primary_key=True)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    # Notes: Oldest rows are evicted first once the table exceeds its size cap
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -69,6 +69,12 @@ class OrchestrationPerformanceLog(Base):
     input_tokens = Column(Integer)
     # Notes: Count of tokens received from the language model
     output_tokens = Column(Integer)
+    # Notes: Prompt tokens the provider billed at the cached-input rate
+    cached_tokens = Column(Integer, nullable=True)
+    # Notes: Model name reported by the provider, used to price the tokens
+    model = Column(String, nullable=True)
+    # Notes: Time spent waiting on the provider for the final attempt
+    llm_latency_ms = Column(Integer, nullable=True)
     # Notes: Result status such as 'success', 'failed', or 'timeout'
     status = Column(String)
     # Notes: True if fallback logic had to be executed
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+"""SQLAlchemy model for the per-user day/week/month summary tree."""
+
+from datetime import datetime
+
+# Notes: SQLAlchemy helpers for columns and constraints
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+
+from database.base import Base
+
+
+class RollupSummary(Base):
+    """Precomputed summary of a user's activity for one day, week or month."""
+
+    __tablename__ = "rollup_summaries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "level", "period_start", name="uq_rollup_summary_period"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Notes: day, week (starting Monday) or month (starting on the 1st)
+    level = Column(String(8), nullable=False)
+    period_start = Column(Date, nullable=False)
+    # Notes: Empty until the node is first built
+    summary_text = Column(Text, nullable=True)
+    # Notes: Digest of the node's input text; a stale node with unchanged input is not resummarized
+    source_fingerprint = Column(String(64), nullable=True)
+    # Notes: Raw records (day) or child nodes (week, month) behind the summary
+    item_count = Column(Integer, nullable=False, default=0)
+    # Notes: Set when the underlying records change; cleared by rollup_summary_service
+    stale = Column(Boolean, nullable=False, default=True, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -7,7 +7,7 @@ from uuid import uuid4
 from datetime import datetime
 
 # Notes: SQLAlchemy column helpers and types
-from sqlalchemy import Column, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Text, Boolean, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -29,6 +29,9 @@ class SummarizedJournal(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     # Notes: Optional list of journal entry ids used for the summary
     source_entry_ids = Column(Text, nullable=True)
+    # Notes: Digest of the source entry ids and update times used to skip
+    # regenerating an unchanged summary
+    source_fingerprint = Column(String(64), nullable=True)
     # Notes: Optional free-form notes left by administrators
     admin_notes = Column(Text, nullable=True)
     # Notes: Indicates a summary that has been flagged either automatically or
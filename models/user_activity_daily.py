@@ -0,0 +1,29 @@
+"""SQLAlchemy model holding per-user, per-day activity counters."""
+
+from __future__ import annotations
+
+# Notes: SQLAlchemy helpers for columns and constraints
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+
+from database.base import Base
+
+
+class UserActivityDaily(Base):
+    """Rollup of a user's activity events for one UTC calendar day."""
+
+    __tablename__ = "user_activity_daily"
+    __table_args__ = (
+        UniqueConstraint("user_id", "activity_date", name="uq_user_activity_day"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # Notes: Owner of the counters; indexed through the unique constraint
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Notes: UTC day the events occurred on
+    activity_date = Column(Date, nullable=False, index=True)
+    # Notes: Counters maintained incrementally by activity_rollup_service
+    journals = Column(Integer, nullable=False, default=0)
+    sessions = Column(Integer, nullable=False, default=0)
+    checkins = Column(Integer, nullable=False, default=0)
+    agent_runs = Column(Integer, nullable=False, default=0)
+    interactions = Column(Integer, nullable=False, default=0)
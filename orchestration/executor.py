@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from config import AGENT_MAX_RETRIES, AGENT_TIMEOUT_SECONDS
 from services.orchestration_log_service import log_agent_run
+from services.llm_usage import usage_metrics
 from services import agent_toggle_service, user_service, agent_access_service
 from utils.logger import get_logger
 from monitoring.logger import log_performance
@@ -126,8 +127,8 @@ async def execute_agent(
         user_id,
         {
             "execution_time_ms": elapsed_ms,
-            "input_tokens": 0,
-            "output_tokens": len(result),
+            # Notes: Usage is known when the agent call returns an LLMResult
+            **usage_metrics(result),
             "status": status,
             "fallback_triggered": False,
             "timeout_occurred": timeout_occurred,
@@ -0,0 +1,112 @@
+"""Concurrent fan-out of agent LLM calls under a shared request deadline."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Union
+
+from orchestration.runtime import get_runtime
+
+# Notes: Processors may be async (preferred) or blocking callables
+AgentProcessor = Callable[
+    [list[dict[str, str]]], Union[str, Awaitable[str]]
+]
+
+# Notes: Error text recorded for agents still running when the deadline hits
+DEADLINE_EXCEEDED = "Deadline exceeded"
+
+
+@dataclass
+class AgentResult:
+    """Outcome of one agent call inside a fan-out."""
+
+    # Notes: Domain name of the agent that produced this result
+    agent: str
+    # Notes: Response text, empty when the call failed or timed out
+    text: str
+    # Notes: Whether the processor returned without raising
+    success: bool
+    # Notes: Wall-clock time spent on this agent in milliseconds
+    elapsed_ms: int
+    # Notes: Error description for failed or timed-out calls
+    error_message: str | None = None
+    # Notes: True when the call was cancelled by the request deadline
+    timed_out: bool = False
+
+
+async def _invoke(processor: AgentProcessor, messages: list[dict[str, str]]) -> str:
+    """Await async processors; push blocking ones onto a worker thread."""
+
+    if inspect.iscoroutinefunction(processor):
+        return await processor(messages)
+    return await asyncio.to_thread(processor, messages)
+
+
+async def _run_one(
+    agent: str,
+    processor: AgentProcessor,
+    messages: list[dict[str, str]],
+    provider: str | None,
+) -> AgentResult:
+    """Execute a single processor and capture timing and failures."""
+
+    start = time.perf_counter()
+    try:
+        if provider is None:
+            text = await _invoke(processor, messages)
+        else:
+            # Notes: Respect the provider's concurrency ceiling on the runtime
+            async with get_runtime().limit(provider):
+                text = await _invoke(processor, messages)
+        success, error = True, None
+    except Exception as exc:  # pragma: no cover - generic failure capture
+        text, success, error = "", False, str(exc)
+    elapsed_ms = int((time.perf_counter() - start) * 1000)
+    return AgentResult(agent, text, success, elapsed_ms, error)
+
+
+async def fan_out(
+    jobs: dict[str, tuple[AgentProcessor, list[dict[str, str]]]],
+    deadline_seconds: float,
+    provider: str | None = None,
+) -> dict[str, AgentResult]:
+    """Run every job concurrently and return results keyed by agent name.
+
+    All calls share one deadline: total latency is bounded by the slowest
+    agent or ``deadline_seconds``, whichever comes first. Agents still running
+    at the deadline are cancelled and reported with ``timed_out=True``. When
+    ``provider`` is given each call also holds one of its concurrency slots.
+    """
+
+    if not jobs:
+        return {}
+
+    tasks = {
+        asyncio.create_task(_run_one(agent, processor, messages, provider)): agent
+        for agent, (processor, messages) in jobs.items()
+    }
+    done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+
+    results: dict[str, AgentResult] = {}
+    for task in done:
+        result = task.result()
+        results[result.agent] = result
+    for task in pending:
+        # Notes: Abandon the slow call; blocking processors finish in their thread
+        task.cancel()
+        agent = tasks[task]
+        results[agent] = AgentResult(
+            agent=agent,
+            text="",
+            success=False,
+            elapsed_ms=int(deadline_seconds * 1000),
+            error_message=DEADLINE_EXCEEDED,
+            timed_out=True,
+        )
+    return results
+
+# Footnote: Used by orchestration_processor_service so a multi-domain prompt
+# waits for the slowest agent instead of the sum of all agents.
@@ -21,6 +21,20 @@ def apply_persona_token(
     return messages
 
 
+def apply_persona_tokens(
+    db: Session, user_id: int, payloads: dict[str, list[dict]]
+) -> dict[str, list[dict]]:
+    """Insert persona snippets into several agent payloads with one token lookup."""
+
+    token = persona_token_service.get_token(db, user_id)
+    for agent_name, messages in payloads.items():
+        snippet = persona_token_service.enforce_token(agent_name, token)
+        if snippet:
+            # Notes: Same placement as apply_persona_token for each agent
+            messages.insert(1, {"role": "system", "content": snippet})
+    return payloads
+
+
 def inject_wearable_context(db: Session, user_id: int, messages: list[dict]) -> list[dict]:
     """Add recent wearable data to the conversation if available."""
 
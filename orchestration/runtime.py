@@ -0,0 +1,106 @@
+"""Long-lived asyncio runtime shared by all orchestration entry points.
+
+FastAPI handlers ``await`` the orchestration coroutines directly on their own
+event loop. Synchronous callers (jobs, sync routes, tests) submit the same
+coroutines to a single background loop owned by :class:`OrchestrationRuntime`
+instead of paying ``asyncio.run`` start-up on every call, which also fails
+when a loop is already running. Outbound LLM calls are bounded by one
+semaphore per provider so a burst of orchestrations cannot open unbounded
+connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from config import get_settings
+
+T = TypeVar("T")
+
+
+class OrchestrationRuntime:
+    """Background event loop plus per-provider concurrency limits."""
+
+    def __init__(self, provider_limits: dict[str, int] | None = None, default_limit: int = 32):
+        self._provider_limits = provider_limits or {}
+        self._default_limit = default_limit
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # Notes: Semaphores bind to a loop, so keep one set per running loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background loop thread on first use."""
+
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="orchestration-runtime", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coro: Awaitable[T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the background loop and block until it finishes."""
+
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("OrchestrationRuntime.run called from its own loop; await instead")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout)
+
+    def provider_limit(self, provider: str) -> int:
+        """Return the concurrency ceiling configured for ``provider``."""
+
+        return self._provider_limits.get(provider, self._default_limit)
+
+    @asynccontextmanager
+    async def limit(self, provider: str) -> AsyncIterator[None]:
+        """Hold one of ``provider``'s concurrency slots for the block."""
+
+        loop = asyncio.get_running_loop()
+        per_loop = self._semaphores.setdefault(loop, {})
+        semaphore = per_loop.get(provider)
+        if semaphore is None:
+            semaphore = per_loop[provider] = asyncio.Semaphore(self.provider_limit(provider))
+        async with semaphore:
+            yield
+
+    def shutdown(self) -> None:
+        """Stop the background loop; a later ``run`` starts a fresh one."""
+
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                if self._thread is not None:
+                    self._thread.join(timeout=5)
+                self._loop.close()
+            self._loop, self._thread = None, None
+
+
+# Notes: Process-wide runtime instance created lazily from settings
+_runtime: OrchestrationRuntime | None = None
+
+
+def get_runtime() -> OrchestrationRuntime:
+    """Return the shared orchestration runtime."""
+
+    global _runtime
+    if _runtime is None:
+        settings = get_settings()
+        _runtime = OrchestrationRuntime(
+            provider_limits=settings.LLM_PROVIDER_CONCURRENCY,
+            default_limit=settings.LLM_DEFAULT_PROVIDER_CONCURRENCY,
+        )
+    return _runtime
+
+# Footnote: Lets orchestration be awaited from FastAPI or driven from sync code.
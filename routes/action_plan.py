@@ -40,6 +40,6 @@ async def generate_action_plan_endpoint(
 ):
     """Generate a personalized action plan using the service layer."""
     # Notes: Delegate to the service to create an action plan based on the goal
-    action_plan = generate_action_plan(db, current_user.id, request.goal)
+    action_plan = await generate_action_plan(db, current_user.id, request.goal)
     # Notes: Return the generated action plan in JSON format
     return {"action_plan": action_plan}
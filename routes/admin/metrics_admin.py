@@ -8,6 +8,14 @@ from sqlalchemy.orm import Session
 
 from database.utils import get_db
 from services.system_metrics_service import get_recent_metrics
+from services.policy_cache import get_policy_cache_stats
+from services.telemetry_writer import get_telemetry_writer
+from services.llm_response_cache import get_llm_cache_stats
+from services.assistant_registry import get_assistant_registry
+from services.ai_result_cache import get_ai_result_cache_stats
+from services.llm_rate_limiter import get_rate_limiter_stats
+from services.provider_routing import get_provider_routing_stats
+from services.moderation_engine import get_moderation_stats
 
 # Notes: Prefix groups these endpoints under /admin/metrics
 router = APIRouter(prefix="/admin/metrics", tags=["admin"])
@@ -20,5 +28,19 @@ def read_metrics(
 ) -> dict:
     """Return current system metrics for the dashboard."""
     # Notes: Fetch the latest metrics computed from database tables
-    return get_recent_metrics(db)
+    metrics = get_recent_metrics(db)
+    # Notes: Include hit/miss counters for the in-process policy caches
+    metrics["policy_cache"] = get_policy_cache_stats()
+    # Notes: Queue depth and drop counters for buffered log writes
+    metrics["telemetry_writer"] = get_telemetry_writer().stats()
+    # Notes: Hit rate of the LLM response cache
+    metrics["llm_cache"] = get_llm_cache_stats()
+    # Notes: Assistants this worker created, loaded from the registry or deduplicated
+    metrics["assistant_registry"] = get_assistant_registry().stats()
+    # Notes: Hits and coalesced requests for the cached AI read endpoints
+    metrics["ai_result_cache"] = get_ai_result_cache_stats()
+    metrics["llm_rate_limits"] = get_rate_limiter_stats()
+    metrics["provider_routing"] = get_provider_routing_stats()
+    metrics["moderation"] = get_moderation_stats()
+    return metrics
 
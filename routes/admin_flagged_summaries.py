@@ -16,6 +16,7 @@ from services.summarized_journal_service import (
     unflag_summary,
 )
 from services import audit_log_service
+from services.summary_moderation_service import rerun_summary_moderation
 
 router = APIRouter(prefix="/admin/summaries", tags=["admin"])
 
@@ -48,6 +49,23 @@ def get_flagged_summaries(
     return rows
 
 
+@router.post("/moderation/rerun")
+def rerun_moderation_route(
+    body: dict,
+    _: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Re-moderate the given unflagged summaries in batched provider calls."""
+
+    summary_ids = body.get("summary_ids")
+    if not isinstance(summary_ids, list) or not summary_ids:
+        raise HTTPException(status_code=400, detail="summary_ids must be a non-empty list")
+    try:
+        return rerun_summary_moderation(db, summary_ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid summary id")
+
+
 @router.post("/{summary_id}/flag")
 def flag_summary_route(
     summary_id: str,
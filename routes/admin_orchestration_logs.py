@@ -57,6 +57,8 @@ def get_orchestration_logs(
             "execution_time_ms": log.execution_time_ms,
             "input_tokens": log.input_tokens,
             "output_tokens": log.output_tokens,
+            "cached_tokens": log.cached_tokens,
+            "model": log.model,
             "status": log.status,
             "fallback_triggered": log.fallback_triggered,
             # Notes: Expose timeout flag for admin dashboards
@@ -8,8 +8,10 @@ from database.utils import get_db
 from auth.dependencies import get_current_user
 from models.user import User
 from schemas.agent_schemas import AgentRequest, OpenAIAgentResponse, ThreadHistory
+from services import llm_client
 from services.openai_agent_service import OpenAIAgentService
 from models.assistant_thread import AssistantThread
+from utils.sse import sse_response
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
@@ -42,6 +44,30 @@ async def agent_chat(
         )
 
 
+@router.post("/chat/stream")
+async def agent_chat_stream(
+    request: AgentRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream the assigned agent's reply as server-sent events.
+
+    Emits ``token`` events while the assistant run produces text and a final
+    ``done`` event with the thread id; the thread and interaction log are
+    saved when the run ends.
+    """
+    return sse_response(
+        OpenAIAgentService.stream_agent_response(
+            db,
+            current_user,
+            request.prompt,
+            request.context,
+            request.thread_id
+        )
+    )
+
+
 @router.get("/threads/{thread_id}", response_model=dict)
 async def get_thread_history(
     thread_id: str,
@@ -55,11 +81,8 @@ async def get_thread_history(
     the conversation history in the frontend.
     """
     try:
-        # Get the agent (any domain will do since we just need the client)
-        agent = OpenAIAgentService.get_agent()
-        
-        # Get the messages
-        messages = agent.client.beta.threads.messages.list(
+        # Get the messages without blocking the event loop
+        messages = await llm_client.get_async_api_client().beta.threads.messages.list(
             thread_id=thread_id,
             order="asc"
         )
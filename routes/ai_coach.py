@@ -14,7 +14,13 @@ from services import ai_processor
 # Notes: Import function to suggest goals directly for convenience
 from services.ai_processor import suggest_goals
 # Notes: Import the orchestration service used to delegate requests
-from services.agent_orchestration_service import route_ai_request
+from services.agent_orchestration_service import route_ai_request, stream_ai_request
+# Notes: Persists streamed replies once the final text is known
+from services.agent_interaction_service import alog_interaction
+# Notes: Per-user result cache coalescing concurrent identical requests
+from services.ai_result_cache import aget_or_compute
+# Notes: Server-sent event framing shared by streaming endpoints
+from utils.sse import sse_response, stream_text_events
 
 # Notes: Dependency that retrieves the authenticated user
 from auth.dependencies import get_current_user
@@ -41,11 +47,33 @@ async def ai_coach(
     if prompt is None:
         raise HTTPException(status_code=400, detail="Prompt is required")
     # Notes: Generate response from the AI processor service using the user's context
-    ai_response = ai_processor.generate_ai_response(db, current_user.id, prompt)
+    ai_response = await ai_processor.generate_ai_response(db, current_user.id, prompt)
     # Notes: Return the generated response in a JSON structure
     return {"response": ai_response}
 
 
+@router.post("/coach/stream")
+# Notes: Streaming variant forwarding tokens as server-sent events
+async def ai_coach_stream(
+    payload: dict,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Stream the coaching reply as SSE and log it when generation ends."""
+    prompt = payload.get("prompt")
+    if prompt is None:
+        raise HTTPException(status_code=400, detail="Prompt is required")
+    user_id = current_user.id
+    deltas = ai_processor.stream_ai_response(db, user_id, prompt)
+    # Notes: The request session is closed before streaming ends, so only
+    # plain values reach the completion callback
+    return sse_response(
+        stream_text_events(
+            deltas, on_complete=lambda text: alog_interaction(user_id, prompt, text)
+        )
+    )
+
+
 @router.get("/suggest-goals")
 # Notes: Endpoint providing goal suggestions generated by AI
 async def suggest_goals_endpoint(
@@ -54,8 +82,11 @@ async def suggest_goals_endpoint(
     current_user: User = Depends(get_current_user),
 ):
     """Return AI-generated list of suggested goals for the user."""
-    # Notes: Call service function to obtain suggested goals
-    suggestions = suggest_goals(db, current_user.id)
+    # Notes: Reuse the last suggestions until the user's journals, goals or sessions change
+    user_id = current_user.id
+    suggestions = await aget_or_compute(
+        "suggest_goals", user_id, lambda: suggest_goals(db, user_id)
+    )
     # Notes: Wrap and return the suggestions in JSON format
     return {"suggestions": suggestions}
 
@@ -76,9 +107,34 @@ async def orchestrate_ai_request(
 
     # Notes: Delegate to the orchestration service to get the agent reply
     try:
-        result = route_ai_request(db, current_user.id, prompt)
+        result = await route_ai_request(db, current_user.id, prompt)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     # Notes: Return the agent type and generated response
     return result
+
+
+@router.post("/orchestrate/stream")
+# Notes: Streaming variant of the orchestration endpoint
+async def orchestrate_ai_request_stream(
+    payload: dict,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Stream the assigned agent's reply as SSE and log it when it ends."""
+    prompt = payload.get("prompt")
+    if prompt is None:
+        raise HTTPException(status_code=400, detail="Prompt is required")
+    user_id = current_user.id
+    try:
+        agent_type, deltas = stream_ai_request(db, user_id, prompt)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return sse_response(
+        stream_text_events(
+            deltas,
+            on_complete=lambda text: alog_interaction(user_id, prompt, text),
+            extra={"agent": agent_type},
+        )
+    )
@@ -1,11 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-# Notes: Import OpenAI client to generate responses after a check-in
-from openai import OpenAI
-
-# Notes: Helper to read configuration values such as the OpenAI API key
-from config import get_settings
+# Notes: Shared OpenAI client used to generate responses after a check-in
+from services import llm_client
 
 # Notes: Function used to gather recent user context for the AI prompt
 from services.ai_memory_service import get_user_context_memory
@@ -21,12 +18,6 @@ router = APIRouter(prefix="/daily-checkins", tags=["daily-checkins"])
 
 logger = get_logger()
 
-# Notes: Load configuration to obtain the OpenAI API key
-settings = get_settings()
-
-# Notes: Create a reusable OpenAI client for generating feedback
-client = OpenAI(api_key=settings.openai_api_key)
-
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 # Notes: Create a daily check-in and return AI feedback along with the record
@@ -59,21 +50,18 @@ def create_daily_checkin(
     )
 
     # Notes: Request a short supportive message from OpenAI
-    completion = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
+    feedback = llm_client.chat_completion(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"Today's Check-in: {checkin_text}\nUser Context: {memory}"},
         ],
+        model="gpt-4o",
         temperature=0.7,
         max_tokens=256,
     )
 
-    # Notes: Extract the AI's feedback text from the response
-    feedback = completion.choices[0].message.content
-
     # Notes: Return both the created check-in and the AI-generated feedback
-    return {"checkin": checkin_response, "feedback": feedback}
+    return {"checkin": checkin_response, "feedback": str(feedback)}
 
 
 @router.get("/{checkin_id}", response_model=DailyCheckInResponse)
@@ -15,6 +15,7 @@ from schemas.journal_tagging_schemas import JournalTagsResponse
 from auth.dependencies import get_current_user
 from models.user import User
 from middleware.feature_gate import feature_gate
+from services.ai_result_cache import get_or_compute
 
 router = APIRouter(
     prefix="/journals",
@@ -66,7 +67,7 @@ def export_journals(
     return journal_export_service.generate_journal_pdf(current_user.id, db)
 
 
-# Notes: Analyze all of the current user's journal entries and return key tags
+# Notes: Rank the tags indexed from the current user's journal entries
 @router.get("/analyze-tags", response_model=JournalTagsResponse)
 def analyze_journal_tags(
     current_user: User = Depends(get_current_user),
@@ -74,7 +75,13 @@ def analyze_journal_tags(
 ) -> JournalTagsResponse:
     """Return a list of keywords representing themes from the user's journals."""
 
-    tags = journal_tagging_service.extract_tags_from_journals(db, current_user.id)
+    # Notes: Tags only change when the user's journals do, so reuse the last result
+    user_id = current_user.id
+    tags = get_or_compute(
+        "journal_tags",
+        user_id,
+        lambda: journal_tagging_service.extract_tags_from_journals(db, user_id),
+    )
     return JournalTagsResponse(tags=tags)
 
 
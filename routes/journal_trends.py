@@ -13,6 +13,7 @@ from database.utils import get_db
 # Notes: Import the user model and AI processor function
 from models.user import User
 from services.ai_processor import analyze_journal_trends
+from services.ai_result_cache import get_or_compute
 from schemas.journal_trends import JournalTrendResponse
 
 # Notes: Initialize router under the /ai prefix
@@ -27,7 +28,11 @@ def get_journal_trends(
 ) -> JournalTrendResponse:
     """Return AI-generated journal trend insights for the user."""
 
-    # Notes: Delegate to service which also persists the analysis
-    result = analyze_journal_trends(db, current_user.id)
+    # Notes: Delegate to service which also persists the analysis; unchanged
+    # journals reuse the last analysis instead of storing a new trend row
+    user_id = current_user.id
+    result = get_or_compute(
+        "journal_trends", user_id, lambda: analyze_journal_trends(db, user_id)
+    )
     # Notes: Cast the dictionary into the response schema
     return JournalTrendResponse(**result)
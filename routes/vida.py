@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, status
 
-from services.openai_service import get_vida_response
+from services.openai_service import get_vida_response, stream_vida_response
 from schemas.vida_schemas import VidaRequest, VidaResponse
+from utils.sse import sse_response, stream_text_events
 
 router = APIRouter(prefix="/vida", tags=["vida"])
 
@@ -9,10 +10,16 @@ router = APIRouter(prefix="/vida", tags=["vida"])
 @router.post("/coach", response_model=VidaResponse)
 async def vida_coach(request: VidaRequest) -> VidaResponse:
     try:
-        vida_reply = get_vida_response(request.prompt)
+        vida_reply = await get_vida_response(request.prompt)
         return VidaResponse(response=vida_reply)
     except Exception as exc:  # pragma: no cover - simple wrapper
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process request",
         ) from exc
+
+
+@router.post("/coach/stream")
+async def vida_coach_stream(request: VidaRequest):
+    """Stream Vida's reply as server-sent events."""
+    return sse_response(stream_text_events(stream_vida_response(request.prompt)))
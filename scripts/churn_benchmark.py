@@ -0,0 +1,181 @@
+"""Benchmark churn recalculation on synthetic users.
+
+Usage:
+  python scripts/churn_benchmark.py --users 100000 --legacy-sample 2000
+
+Seeds an in-memory SQLite database with ``--users`` users and random
+sessions, journals, interactions, goals and subscriptions, then times:
+
+* ``legacy`` - the previous per-user loop (4-6 queries and a commit per user),
+  run on ``--legacy-sample`` users and extrapolated to the full population
+* ``batch``  - ``churn_batch_service.run_churn_risk_batch`` over every user
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.base import Base
+from database.schema import load_all_models
+from models import (
+    AgentInteractionLog,
+    ChurnRisk,
+    Goal,
+    JournalEntry,
+    RiskCategory,
+    Subscription,
+    User,
+    UserSession,
+)
+from services import activity_rollup_service, churn_batch_service
+
+
+def legacy_calculate_churn_risk(db, user_id):
+    """Previous per-user implementation kept for comparison."""
+    now = datetime.utcnow()
+    window_start = now - timedelta(days=30)
+    session_count = (
+        db.query(UserSession)
+        .filter(UserSession.user_id == user_id, UserSession.session_start >= window_start)
+        .count()
+    )
+    journal_count = (
+        db.query(JournalEntry)
+        .filter(JournalEntry.user_id == user_id, JournalEntry.created_at >= window_start)
+        .count()
+    )
+    interaction_count = (
+        db.query(AgentInteractionLog)
+        .filter(AgentInteractionLog.user_id == user_id, AgentInteractionLog.timestamp >= window_start)
+        .count()
+    )
+    sub = (
+        db.query(Subscription)
+        .filter(Subscription.user_id == user_id)
+        .order_by(Subscription.created_at.desc())
+        .first()
+    )
+    score = 0.25 * sum(
+        (
+            session_count == 0,
+            journal_count < 2,
+            interaction_count == 0,
+            not (sub is not None and sub.status in {"active", "trialing"}),
+        )
+    )
+    category = RiskCategory.LOW if score < 0.34 else RiskCategory.MEDIUM if score < 0.67 else RiskCategory.HIGH
+    db.add(ChurnRisk(user_id=user_id, risk_score=score, risk_category=category, calculated_at=now))
+    db.commit()
+
+
+def seed(db, users: int) -> None:
+    """Insert synthetic users and activity with bulk inserts."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    db.execute(
+        insert(User),
+        [
+            {
+                "email": f"u{i}@bench.test",
+                "phone_number": f"{i:010d}",
+                "hashed_password": "x",
+                "is_active": rng.random() > 0.1,
+            }
+            for i in range(users)
+        ],
+    )
+    ids = range(1, users + 1)
+
+    def recent():
+        return now - timedelta(days=rng.randint(0, 60))
+
+    db.execute(
+        insert(UserSession),
+        [{"id": uuid4(), "user_id": u, "session_start": recent()} for u in ids if rng.random() < 0.6],
+    )
+    db.execute(
+        insert(JournalEntry),
+        [{"user_id": u, "content": "entry", "created_at": recent()} for u in ids for _ in range(rng.randint(0, 3))],
+    )
+    db.execute(
+        insert(AgentInteractionLog),
+        [
+            {"user_id": u, "user_prompt": "p", "ai_response": "r", "timestamp": recent()}
+            for u in ids
+            if rng.random() < 0.5
+        ],
+    )
+    db.execute(
+        insert(Goal),
+        [
+            {"user_id": u, "title": "g", "is_completed": rng.random() < 0.5, "created_at": now, "updated_at": now}
+            for u in ids
+            if rng.random() < 0.7
+        ],
+    )
+    db.execute(
+        insert(Subscription),
+        [
+            {
+                "user_id": u,
+                "stripe_subscription_id": f"sub_{u}",
+                "status": rng.choice(["active", "trialing", "canceled"]),
+                "created_at": recent(),
+            }
+            for u in ids
+            if rng.random() < 0.4
+        ],
+    )
+    db.commit()
+    # Notes: Core inserts bypass the ORM rollup hook, so backfill it explicitly
+    activity_rollup_service.rebuild_activity_rollup(db)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Churn recalculation benchmark")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--legacy-sample", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=churn_batch_service.CHURN_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    load_all_models()
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    seed(db, args.users)
+    print(f"seeded {args.users} users in {time.perf_counter() - start:.1f}s")
+
+    sample = min(args.legacy_sample, args.users)
+    start = time.perf_counter()
+    for user_id in range(1, sample + 1):
+        legacy_calculate_churn_risk(db, user_id)
+    legacy = (time.perf_counter() - start) / sample * args.users
+    db.query(ChurnRisk).delete()
+    db.commit()
+
+    start = time.perf_counter()
+    written = churn_batch_service.run_churn_risk_batch(db, batch_size=args.batch_size)
+    batch = time.perf_counter() - start
+
+    print(f"legacy per-user loop : {legacy:8.1f}s (extrapolated from {sample} users)")
+    print(f"batch engine         : {batch:8.1f}s for {written} users")
+    print(f"speed-up             : {legacy / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 #!/bin/bash
 # Simple script to run backend and frontend together in development
 
+python scripts/init_db.py upgrade || exit 1
+
 uvicorn main:app --reload &
 BACK_PID=$!
 
@@ -0,0 +1,47 @@
+"""Create or migrate the database schema as an explicit deploy step.
+
+Usage:
+  python scripts/init_db.py create    # fresh database: create tables, stamp alembic head
+  python scripts/init_db.py upgrade   # alembic upgrade head; create and stamp if empty
+
+Both commands use ``DATABASE_URL``. Application workers never touch the
+schema on start-up; the Docker image, compose files, ``make run`` and
+``scripts/dev.sh`` run ``upgrade`` before starting them.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from database.schema import create_schema, is_empty, stamp_head, upgrade_head
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Database schema management")
+    parser.add_argument("command", choices=["create", "upgrade"])
+    parser.add_argument(
+        "--no-stamp",
+        action="store_true",
+        help="Skip stamping the alembic head after create",
+    )
+    args = parser.parse_args()
+
+    # Notes: The migration chain starts from existing tables, so an empty
+    # database gets the full schema and is stamped at head instead
+    if args.command == "create" or is_empty():
+        create_schema()
+        if not args.no_stamp:
+            stamp_head()
+        logger.info("Database schema created")
+    else:
+        upgrade_head()
+        logger.info("Database schema upgraded")
+
+
+if __name__ == "__main__":
+    main()
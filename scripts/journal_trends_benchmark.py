@@ -0,0 +1,122 @@
+"""Benchmark the local journal trend engine on prolific synthetic users.
+
+Usage:
+  python scripts/journal_trends_benchmark.py --entries 10000 --users 3
+
+Seeds an in-memory SQLite database with ``--users`` users, each holding
+``--entries`` journal entries over the 90-day span and a daily check-in, then
+reports:
+
+* ``legacy prompt`` - the size of the concatenated journal text the previous
+  implementation sent to gpt-4o on every analysis (~4 characters per token)
+* ``vectorize``     - tokenizing and storing every entry's term vector, the
+  one-off cost normally spread across journal writes
+* ``analyze``       - ``compute_user_trends`` per user: loading the vectors
+  and check-ins and computing keyword windows and mood correlations
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.base import Base
+from database.schema import load_all_models
+from models import DailyCheckIn, JournalEntry, User
+from models.daily_checkin import Mood
+from services import journal_trend_engine
+
+WORDS = (
+    "work meeting deadline project manager email focus gym run yoga sleep tired energy family "
+    "partner kids dinner friends weekend travel budget savings stress anxiety calm gratitude "
+    "reading writing guitar garden walk coffee morning evening doctor health diet water "
+    "promotion interview learning course habit journal therapy meditation commute rain sunshine"
+).split()
+
+
+def seed(db, users: int, entries: int) -> None:
+    """Insert synthetic journals and daily check-ins with bulk inserts."""
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    db.execute(
+        insert(User),
+        [{"email": f"t{i}@bench.test", "phone_number": f"{i:010d}", "hashed_password": "x"} for i in range(users)],
+    )
+    for user_id in range(1, users + 1):
+        db.execute(
+            insert(JournalEntry),
+            [
+                {
+                    "user_id": user_id,
+                    "content": " ".join(rng.choices(WORDS, k=rng.randint(40, 160))),
+                    "created_at": now - timedelta(minutes=rng.randint(0, 89 * 24 * 60)),
+                }
+                for _ in range(entries)
+            ],
+        )
+        db.execute(
+            insert(DailyCheckIn),
+            [
+                {
+                    "user_id": user_id,
+                    "mood": rng.choice(list(Mood)),
+                    "energy_level": rng.randint(1, 10),
+                    "stress_level": rng.randint(1, 10),
+                    "created_at": now - timedelta(days=day),
+                }
+                for day in range(90)
+            ],
+        )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Journal trend engine benchmark")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--entries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    load_all_models()
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    seed(db, args.users, args.entries)
+    print(f"seeded {args.users} users x {args.entries} entries in {time.perf_counter() - start:.1f}s")
+
+    chars = db.execute(select(func.sum(func.length(JournalEntry.content))).where(JournalEntry.user_id == 1)).scalar()
+    since = datetime.utcnow() - timedelta(days=journal_trend_engine.TREND_WINDOW_DAYS)
+
+    start = time.perf_counter()
+    for user_id in range(1, args.users + 1):
+        journal_trend_engine.ensure_vectors(db, user_id, since)
+    db.commit()
+    vectorize = (time.perf_counter() - start) / args.users
+
+    timings = []
+    for user_id in range(1, args.users + 1):
+        start = time.perf_counter()
+        report = journal_trend_engine.compute_user_trends(db, user_id)
+        timings.append(time.perf_counter() - start)
+
+    print(f"legacy prompt        : {chars:>10,} chars (~{chars // 4:,} tokens) per analysis")
+    print(f"vectorize (one-off)  : {vectorize * 1000:8.0f} ms per user")
+    print(f"analyze              : {median(timings) * 1000:8.0f} ms per user (median), 0 tokens")
+    print(f"top keywords         : {list(report.keyword_trends)[:5]}")
+
+
+if __name__ == "__main__":
+    main()
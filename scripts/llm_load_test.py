@@ -0,0 +1,122 @@
+"""Load test the shared LLM client against a local fake OpenAI server.
+
+Usage:
+  python scripts/llm_load_test.py --latency 0.5 --levels 1 10 100 300
+
+A tiny FastAPI app emulating ``/v1/chat/completions`` is started on a local
+port with a fixed response latency. For each concurrency level the script
+issues that many simultaneous requests from a single event loop through
+``services.llm_client.achat_completion`` and, for comparison, the same number
+through the blocking ``chat_completion`` shim called one after another (what
+an ``async def`` endpoint calling the sync SDK effectively did).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import uvicorn
+from fastapi import FastAPI
+
+
+def build_fake_openai(latency: float) -> FastAPI:
+    """Return an app that answers chat completions after ``latency`` seconds."""
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def completions(payload: dict):
+        await asyncio.sleep(latency)
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "ok"},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    return app
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run the fake provider in a background thread and wait until ready."""
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_async_levels(levels: list[int]) -> dict[int, float]:
+    """Return seconds taken to finish each level of simultaneous calls."""
+    from services import llm_client
+
+    results: dict[int, float] = {}
+    for concurrency in levels:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *[
+                llm_client.achat_completion([{"role": "user", "content": "ping"}])
+                for _ in range(concurrency)
+            ]
+        )
+        results[concurrency] = time.perf_counter() - start
+    await llm_client.aclose()
+    return results
+
+
+def run_blocking_level(concurrency: int) -> float:
+    """Return seconds taken when the same calls block one after another."""
+    from services import llm_client
+
+    start = time.perf_counter()
+    for _ in range(concurrency):
+        llm_client.chat_completion([{"role": "user", "content": "ping"}])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM client concurrency load test")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 100, 300])
+    parser.add_argument(
+        "--skip-blocking", action="store_true", help="Only measure the async path"
+    )
+    args = parser.parse_args()
+
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "load-test")
+    server = start_server(build_fake_openai(args.latency), args.port)
+
+    async_results = asyncio.run(run_async_levels(args.levels))
+
+    print(f"fake provider latency: {args.latency:.3f}s")
+    print("concurrency\tasync_s\tasync_req/s\tblocking_s\tblocking_req/s")
+    for level in args.levels:
+        elapsed = async_results[level]
+        blocking = "-"
+        blocking_rate = "-"
+        if not args.skip_blocking:
+            seconds = run_blocking_level(level)
+            blocking = f"{seconds:.2f}"
+            blocking_rate = f"{level / seconds:.1f}"
+        print(f"{level}\t{elapsed:.2f}\t{level / elapsed:.1f}\t{blocking}\t{blocking_rate}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark agents/sec for run_parallel_agents before and after the runtime.
+
+Usage:
+  python scripts/orchestration_benchmark.py --requests 50 --latency 0.05
+
+The LLM is replaced by a stub with fixed latency and the database is an
+in-memory SQLite instance, so the numbers isolate orchestration overhead:
+event loop start-up, per-agent memory queries, thread hops and per-row
+commits. "before" reproduces the previous implementation (``asyncio.run``
+per call, memory context and a commit per agent, blocking LLM call in a
+thread); "after" calls the current ``run_parallel_agents`` with log rows
+going through the buffered telemetry writer.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import main as _app  # noqa: F401  # Notes: importing the app registers every model
+from database.base import Base
+from services import llm_call_service, telemetry_writer
+from services import orchestration_processor_service as orchestrator
+from services.conversation_memory_service import build_memory_context
+from services.orchestration_log_service import log_agent_run
+from services.prompt_assembly_service import build_agent_prompt
+from services.user_service import create_user
+from orchestration.injector import apply_persona_token
+
+AGENTS = ["career", "health", "relationships", "finance", "mental_health"]
+
+
+def legacy_run_parallel_agents(user_id, user_prompt, agent_list, db, latency):
+    """Previous implementation kept here for comparison."""
+
+    def call_llm(prompt):
+        time.sleep(latency)
+        return "reply"
+
+    async def _execute(agent_name):
+        memory = build_memory_context(db, user_id, [agent_name], user_prompt)
+        prompt = build_agent_prompt(agent_name, memory, user_prompt)
+        prompt = apply_persona_token(db, user_id, agent_name, prompt)
+        start = time.perf_counter()
+        text = await asyncio.wait_for(asyncio.to_thread(call_llm, prompt), 10)
+        log_agent_run(
+            db,
+            agent_name,
+            user_id,
+            {
+                "execution_time_ms": int((time.perf_counter() - start) * 1000),
+                "input_tokens": len(str(prompt)),
+                "output_tokens": len(text),
+                "status": "success",
+            },
+        )
+        return agent_name, {"status": "success", "content": text}
+
+    async def _gather():
+        return await asyncio.gather(*[_execute(a) for a in agent_list])
+
+    return dict(asyncio.run(_gather()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel agent orchestration benchmark")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = create_user(
+        db,
+        {
+            "email": f"bench_{uuid.uuid4().hex}@example.com",
+            "phone_number": "5550000000",
+            "hashed_password": "password123",
+        },
+    )
+
+    async def fake_acall_llm(prompt):
+        await asyncio.sleep(args.latency)
+        return "reply"
+
+    llm_call_service.acall_llm = fake_acall_llm
+
+    total_agents = args.requests * len(AGENTS)
+
+    # Notes: The legacy path committed each log row inline
+    telemetry_writer._writer = telemetry_writer.TelemetryWriter(mode="sync")
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        legacy_run_parallel_agents(user.id, "help", AGENTS, db, args.latency)
+    before = time.perf_counter() - start
+    telemetry_writer._writer = telemetry_writer.TelemetryWriter(sessionmaker(bind=engine), mode="buffered")
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        orchestrator.run_parallel_agents(user.id, "help", AGENTS, db)
+    after_sync = time.perf_counter() - start
+
+    async def concurrent_requests():
+        await asyncio.gather(
+            *[
+                orchestrator.arun_parallel_agents(user.id, "help", AGENTS, db)
+                for _ in range(args.requests)
+            ]
+        )
+
+    start = time.perf_counter()
+    asyncio.run(concurrent_requests())
+    after_async = time.perf_counter() - start
+    telemetry_writer.shutdown_telemetry_writer()
+
+    print(f"{args.requests} requests x {len(AGENTS)} agents, LLM latency {args.latency}s")
+    print(f"before (asyncio.run per call): {total_agents / before:8.1f} agents/sec")
+    print(f"after  (runtime, sync entry) : {total_agents / after_sync:8.1f} agents/sec")
+    print(f"after  (awaited concurrently): {total_agents / after_async:8.1f} agents/sec")
+
+
+if __name__ == "__main__":
+    main()
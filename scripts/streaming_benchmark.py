@@ -0,0 +1,137 @@
+"""Compare time-to-first-byte of buffered and SSE coaching responses.
+
+Usage:
+  python scripts/streaming_benchmark.py --tokens 200 --token-delay 0.01 --requests 5
+
+Two local servers are started: a fake OpenAI provider that streams
+``--tokens`` chunks ``--token-delay`` seconds apart (and, for non-streaming
+calls, answers once the same total generation time has elapsed), and the
+``/vida`` router served by uvicorn. Each request to ``/vida/coach`` and
+``/vida/coach/stream`` is timed over real HTTP: TTFB is when the first body
+byte arrives, TTLB when the last one does.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+# Notes: Identical prompts would otherwise be served from the response cache
+os.environ["LLM_CACHE_ENABLED"] = "false"
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+
+def build_fake_openai(tokens: int, token_delay: float) -> FastAPI:
+    """Return an app emulating streamed and buffered chat completions."""
+    app = FastAPI()
+
+    def chunk(content: str) -> str:
+        body = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "gpt-4o",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def completions(payload: dict):
+        if payload.get("stream"):
+            async def events():
+                for i in range(tokens):
+                    await asyncio.sleep(token_delay)
+                    yield chunk(f"tok{i} ")
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(tokens * token_delay)
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(f"tok{i}" for i in range(tokens))},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    return app
+
+
+def build_coach_app() -> FastAPI:
+    """Return an app serving only the Vida coaching routes."""
+    from routes.vida import router
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run ``app`` in a background thread and wait until it accepts requests."""
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def time_request(client: httpx.Client, path: str) -> tuple[float, float]:
+    """Return (TTFB, TTLB) in seconds for one POST to ``path``."""
+    start = time.perf_counter()
+    first = None
+    with client.stream("POST", path, json={"prompt": "motivate me"}) as resp:
+        resp.raise_for_status()
+        for _ in resp.iter_raw():
+            if first is None:
+                first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE time-to-first-byte benchmark")
+    parser.add_argument("--provider-port", type=int, default=8766)
+    parser.add_argument("--app-port", type=int, default=8767)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.provider_port}/v1"
+    provider = start_server(build_fake_openai(args.tokens, args.token_delay), args.provider_port)
+    coach = start_server(build_coach_app(), args.app_port)
+
+    print(f"{args.tokens} tokens, {args.token_delay * 1000:.0f}ms apart, {args.requests} requests each")
+    print("endpoint\t\tTTFB_ms\tTTLB_ms")
+    with httpx.Client(base_url=f"http://127.0.0.1:{args.app_port}", timeout=120) as client:
+        for path in ("/vida/coach", "/vida/coach/stream"):
+            samples = [time_request(client, path) for _ in range(args.requests)]
+            ttfb = statistics.median(s[0] for s in samples) * 1000
+            ttlb = statistics.median(s[1] for s in samples) * 1000
+            print(f"{path:<20}\t{ttfb:.0f}\t{ttlb:.0f}")
+
+    coach.should_exit = True
+    provider.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Incrementally maintained per-user, per-day activity counters.
+
+Dashboards and churn scoring need rolling 7/30-day counts of journals,
+login sessions, check-ins, agent runs and agent interactions. Rather than
+rescanning those event tables, an ``after_flush`` hook folds every inserted
+or deleted event into ``user_activity_daily`` inside the same transaction,
+so readers aggregate at most one row per user per day.
+
+Windows are day-granular: ``days=7`` covers the UTC day seven days ago
+through today. Core bulk inserts and ``Query.delete`` bypass the ORM hook;
+run :func:`rebuild_activity_rollup` (``jobs/backfill_activity_rollup.py``)
+after loading data that way.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from database.upsert import upsert_rows
+from models import (
+    AgentExecutionLog,
+    AgentInteractionLog,
+    DailyCheckIn,
+    JournalEntry,
+    UserActivityDaily,
+    UserSession,
+)
+
+# Notes: Event model -> (rollup counter, timestamp attribute)
+TRACKED_EVENTS = {
+    JournalEntry: ("journals", "created_at"),
+    UserSession: ("sessions", "session_start"),
+    DailyCheckIn: ("checkins", "created_at"),
+    AgentExecutionLog: ("agent_runs", "created_at"),
+    AgentInteractionLog: ("interactions", "timestamp"),
+}
+ROLLUP_COUNTERS = tuple(counter for counter, _ in TRACKED_EVENTS.values())
+
+_table = UserActivityDaily.__table__
+
+
+def window_start(days: int, now: datetime | None = None) -> date:
+    """Return the first rollup day included in a ``days`` window."""
+
+    return ((now or datetime.utcnow()) - timedelta(days=days)).date()
+
+
+def _collect_deltas(objects: Iterable, sign: int, deltas: dict) -> None:
+    """Add ``sign`` to the counter of every tracked event in ``objects``."""
+
+    for obj in objects:
+        spec = TRACKED_EVENTS.get(type(obj))
+        if spec is None:
+            continue
+        counter, ts_attr = spec
+        user_id = obj.user_id
+        if user_id is None:
+            continue
+        day = (getattr(obj, ts_attr) or datetime.utcnow()).date()
+        deltas[(user_id, day)][counter] += sign
+
+
+def apply_activity_deltas(connection, deltas: dict[tuple[int, date], Counter]) -> None:
+    """Add counter deltas to the rollup, creating day rows as needed."""
+
+    rows = [
+        {
+            "user_id": user_id,
+            "activity_date": day,
+            **{counter: counts.get(counter, 0) for counter in ROLLUP_COUNTERS},
+        }
+        for (user_id, day), counts in deltas.items()
+    ]
+    upsert_rows(
+        connection,
+        _table,
+        rows,
+        ["user_id", "activity_date"],
+        lambda proposed: {c: _table.c[c] + proposed[c] for c in ROLLUP_COUNTERS},
+    )
+
+
+def _roll_up_flushed_events(session, flush_context) -> None:
+    """Fold events inserted or deleted by this flush into the rollup."""
+
+    deltas: dict[tuple[int, date], Counter] = defaultdict(Counter)
+    _collect_deltas(session.new, 1, deltas)
+    _collect_deltas(session.deleted, -1, deltas)
+    if deltas:
+        apply_activity_deltas(session.connection(), deltas)
+
+
+def activity_totals_query(days: int | None = None, now: datetime | None = None, *, counters: Sequence[str] = ROLLUP_COUNTERS):
+    """Return ``SELECT user_id, sum(counter)...`` over the window, grouped by user."""
+
+    stmt = select(
+        _table.c.user_id,
+        *[func.sum(_table.c[c]).label(c) for c in counters],
+    ).group_by(_table.c.user_id)
+    if days is not None:
+        stmt = stmt.where(_table.c.activity_date >= window_start(days, now))
+    return stmt
+
+
+def get_user_activity_totals(
+    db: Session, user_ids: Sequence[int], days: int, now: datetime | None = None
+) -> dict[int, dict[str, int]]:
+    """Return windowed counter totals for ``user_ids``; missing users are all zero."""
+
+    if not user_ids:
+        return {}
+    stmt = activity_totals_query(days, now).where(
+        _table.c.user_id.between(min(user_ids), max(user_ids))
+    )
+    found = {row.user_id: row._mapping for row in db.execute(stmt)}
+    return {
+        uid: {c: int(found[uid][c] or 0) if uid in found else 0 for c in ROLLUP_COUNTERS}
+        for uid in user_ids
+    }
+
+
+def rebuild_activity_rollup(db: Session, since: date | None = None) -> int:
+    """Recompute rollup rows from raw events (from ``since`` onward) and commit.
+
+    Returns the number of rollup rows written.
+    """
+
+    parts = []
+    for model, (counter, ts_attr) in TRACKED_EVENTS.items():
+        ts = getattr(model, ts_attr)
+        part = select(
+            model.user_id.label("user_id"),
+            func.date(ts).label("activity_date"),
+            *[literal(1 if c == counter else 0).label(c) for c in ROLLUP_COUNTERS],
+        ).where(model.user_id.is_not(None), ts.is_not(None))
+        if since is not None:
+            part = part.where(ts >= datetime.combine(since, datetime.min.time()))
+        parts.append(part)
+    events = union_all(*parts).subquery()
+    aggregated = select(
+        events.c.user_id,
+        events.c.activity_date,
+        *[func.sum(events.c[c]) for c in ROLLUP_COUNTERS],
+    ).group_by(events.c.user_id, events.c.activity_date)
+
+    clear = delete(_table)
+    if since is not None:
+        clear = clear.where(_table.c.activity_date >= since)
+    db.execute(clear)
+    result = db.execute(
+        insert(_table).from_select(["user_id", "activity_date", *ROLLUP_COUNTERS], aggregated)
+    )
+    db.commit()
+    return result.rowcount
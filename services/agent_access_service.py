@@ -7,34 +7,71 @@ from sqlalchemy.orm import Session
 from models.user import User
 from models.subscription import Subscription
 from models.agent_access_policy import AgentAccessPolicy, SubscriptionTier
+from services import policy_cache
 
 
 def _get_user_tier(db: Session, user: User) -> SubscriptionTier:
     """Return the current subscription tier for ``user``."""
-    sub = (
-        db.query(Subscription)
-        .filter(Subscription.user_id == user.id)
-        .order_by(Subscription.created_at.desc())
-        .first()
-    )
-    if sub and sub.status in {"active", "trialing"}:
-        return SubscriptionTier.premium
-    return SubscriptionTier.free
+
+    def _load() -> SubscriptionTier:
+        sub = (
+            db.query(Subscription)
+            .filter(Subscription.user_id == user.id)
+            .order_by(Subscription.created_at.desc())
+            .first()
+        )
+        if sub and sub.status in {"active", "trialing"}:
+            return SubscriptionTier.premium
+        return SubscriptionTier.free
+
+    # Notes: Memoized on the request's session so each agent reuses one lookup
+    return policy_cache.memoize_subscription_tier(db, user.id, _load)
 
 
 def is_agent_enabled_for_user(db: Session, agent_name: str, user: User) -> bool:
     """Return True if ``agent_name`` is enabled for ``user``'s tier."""
     tier = _get_user_tier(db, user)
+
+    def _load() -> bool | None:
+        policy = (
+            db.query(AgentAccessPolicy)
+            .filter(
+                AgentAccessPolicy.agent_name == agent_name,
+                AgentAccessPolicy.subscription_tier == tier,
+            )
+            .first()
+        )
+        return None if policy is None else bool(policy.is_enabled)
+
+    enabled = policy_cache.agent_access_policies.get_or_load((agent_name, tier.value), _load)
+    if enabled is None:
+        return True
+    return enabled
+
+
+def set_agent_access_policy(
+    db: Session, agent_name: str, tier: str | SubscriptionTier, is_enabled: bool
+) -> AgentAccessPolicy:
+    """Create or update the access policy for ``agent_name`` on ``tier``."""
+    tier_enum = SubscriptionTier(tier) if not isinstance(tier, SubscriptionTier) else tier
     policy = (
         db.query(AgentAccessPolicy)
         .filter(
             AgentAccessPolicy.agent_name == agent_name,
-            AgentAccessPolicy.subscription_tier == tier,
+            AgentAccessPolicy.subscription_tier == tier_enum,
         )
         .first()
     )
-    if policy is None:
-        return True
-    return bool(policy.is_enabled)
-
+    if policy:
+        policy.is_enabled = is_enabled
+    else:
+        policy = AgentAccessPolicy(
+            agent_name=agent_name, subscription_tier=tier_enum, is_enabled=is_enabled
+        )
+        db.add(policy)
+    db.commit()
+    db.refresh(policy)
+    policy_cache.agent_access_policies.invalidate((agent_name, tier_enum.value))
+    return policy
 
+# Footnote: Policy lookups are cached; writes go through set_agent_access_policy.
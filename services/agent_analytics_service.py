@@ -9,44 +9,55 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from models.orchestration_log import OrchestrationPerformanceLog
-
-# Notes: Estimated pricing per 1K tokens for the default model
-MODEL_TOKEN_PRICE_USD = 0.002
+from services.agent_cost_service import compute_cost
 
 
 def get_user_agent_usage_summary(db: Session, user_id: UUID) -> list[dict]:
     """Return aggregated usage metrics grouped by agent name."""
 
-    # Notes: Query aggregated token counts and run totals
+    # Notes: Query aggregated token counts per agent and model so each is priced correctly
     rows = (
         db.query(
             OrchestrationPerformanceLog.agent_name.label("agent"),
+            OrchestrationPerformanceLog.model,
             func.count(OrchestrationPerformanceLog.id).label("runs"),
             func.sum(OrchestrationPerformanceLog.input_tokens).label("in_tok"),
             func.sum(OrchestrationPerformanceLog.output_tokens).label("out_tok"),
+            func.sum(OrchestrationPerformanceLog.cached_tokens).label("cached"),
             func.max(OrchestrationPerformanceLog.timestamp).label("last"),
         )
         .filter(OrchestrationPerformanceLog.user_id == user_id)
-        .group_by(OrchestrationPerformanceLog.agent_name)
+        .group_by(OrchestrationPerformanceLog.agent_name, OrchestrationPerformanceLog.model)
         .all()
     )
 
-    summary: list[dict] = []
-    for agent, runs, in_tok, out_tok, last in rows:
+    agents: dict[str, dict] = {}
+    for agent, model, runs, in_tok, out_tok, cached, last in rows:
         input_tokens = int(in_tok or 0)
         output_tokens = int(out_tok or 0)
-        total_tokens = input_tokens + output_tokens
-        cost = round(total_tokens / 1000 * MODEL_TOKEN_PRICE_USD, 4)
-        summary.append(
+        entry = agents.setdefault(
+            agent,
             {
                 "agent_name": agent,
-                "runs": runs,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "cost_usd": cost,
-                "last_run": last.isoformat() if isinstance(last, datetime) else None,
-            }
+                "runs": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost_usd": 0.0,
+                "last_run": None,
+            },
         )
+        entry["runs"] += runs
+        entry["input_tokens"] += input_tokens
+        entry["output_tokens"] += output_tokens
+        entry["cost_usd"] += compute_cost(model, input_tokens, output_tokens, int(cached or 0))
+        if isinstance(last, datetime) and (entry["last_run"] is None or last > entry["last_run"]):
+            entry["last_run"] = last
+
+    summary: list[dict] = []
+    for entry in agents.values():
+        entry["cost_usd"] = round(entry["cost_usd"], 4)
+        entry["last_run"] = entry["last_run"].isoformat() if entry["last_run"] else None
+        summary.append(entry)
 
     # Notes: Order by agent name for stable output
     return sorted(summary, key=lambda x: x["agent_name"])
@@ -8,11 +8,49 @@ from config.settings import get_settings
 from models.orchestration_log import OrchestrationPerformanceLog
 
 
+def model_rates(model: str | None) -> dict[str, float]:
+    """Return ``input``, ``output`` and ``cached_input`` USD rates per 1K tokens."""
+    pricing = get_settings().model_pricing or {"default": 0.002}
+    entry = pricing.get(model) if model else None
+    if entry is None and model:
+        # Notes: Versioned names such as gpt-4o-2024-08-06 use the longest matching prefix
+        prefixes = [name for name in pricing if name != "default" and model.startswith(name)]
+        if prefixes:
+            entry = pricing[max(prefixes, key=len)]
+    if entry is None:
+        entry = pricing.get("default", 0.002)
+    if isinstance(entry, dict):
+        input_rate = float(entry.get("input", 0.0))
+        return {
+            "input": input_rate,
+            "output": float(entry.get("output", input_rate)),
+            "cached_input": float(entry.get("cached_input", input_rate)),
+        }
+    return {"input": float(entry), "output": float(entry), "cached_input": float(entry)}
+
+
+def compute_cost(
+    model: str | None,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cached_tokens: int = 0,
+) -> float:
+    """Return the USD cost of one usage record priced for ``model``."""
+    rates = model_rates(model)
+    input_tokens = input_tokens or 0
+    # Notes: Cached tokens are a subset of the prompt tokens
+    cached = min(cached_tokens or 0, input_tokens)
+    cost = (
+        (input_tokens - cached) * rates["input"]
+        + cached * rates["cached_input"]
+        + (output_tokens or 0) * rates["output"]
+    ) / 1000
+    return round(cost, 6)
+
+
 def get_cost_estimate(tokens: int, model: str = "default") -> float:
     """Return estimated cost for ``tokens`` using configured pricing."""
-    pricing = get_settings().model_pricing or {"default": 0.002}
-    rate = pricing.get(model, pricing.get("default", 0.002))
-    return round(tokens / 1000 * rate, 4)
+    return round(compute_cost(model, input_tokens=tokens), 4)
 
 
 def _date_functions(db: Session):
@@ -27,49 +65,73 @@ def _date_functions(db: Session):
     return day, week
 
 
-def aggregate_agent_costs(db: Session) -> dict:
-    """Return total token usage grouped by day and week."""
-    day_func, week_func = _date_functions(db)
-    token_sum = func.sum(
-        OrchestrationPerformanceLog.input_tokens + OrchestrationPerformanceLog.output_tokens
+def _usage_sums():
+    """Return summed input, output and cached token columns."""
+    log = OrchestrationPerformanceLog
+    return (
+        func.sum(func.coalesce(log.input_tokens, 0)),
+        func.sum(func.coalesce(log.output_tokens, 0)),
+        func.sum(func.coalesce(log.cached_tokens, 0)),
     )
 
-    daily_rows = (
-        db.query(day_func.label('period'), token_sum)
-        .group_by('period')
+
+def _priced_periods(db: Session, period_func) -> list[dict]:
+    """Return tokens and per-model priced cost for each period."""
+    rows = (
+        db.query(period_func.label('period'), OrchestrationPerformanceLog.model, *_usage_sums())
+        .group_by('period', OrchestrationPerformanceLog.model)
         .order_by('period')
         .all()
     )
-    weekly_rows = (
-        db.query(week_func.label('period'), token_sum)
-        .group_by('period')
-        .order_by('period')
+    periods: dict[str, dict] = {}
+    for period, model, in_tok, out_tok, cached in rows:
+        bucket = periods.setdefault(str(period), {"period": str(period), "tokens": 0, "cost": 0.0})
+        bucket["tokens"] += int(in_tok or 0) + int(out_tok or 0)
+        bucket["cost"] += compute_cost(model, int(in_tok or 0), int(out_tok or 0), int(cached or 0))
+    for bucket in periods.values():
+        bucket["cost"] = round(bucket["cost"], 4)
+    return list(periods.values())
+
+
+def aggregate_agent_costs(db: Session) -> dict:
+    """Return token usage and cost grouped by day, week and model.
+
+    Each row is priced with its own model's rates from
+    ``config/model_pricing.yaml``; rows without a model use ``default``.
+    """
+    day_func, week_func = _date_functions(db)
+    daily = _priced_periods(db, day_func)
+    weekly = _priced_periods(db, week_func)
+
+    model_rows = (
+        db.query(OrchestrationPerformanceLog.model, *_usage_sums())
+        .group_by(OrchestrationPerformanceLog.model)
         .all()
     )
+    by_model = []
+    total_cost = 0.0
+    for model, in_tok, out_tok, cached in model_rows:
+        in_tok, out_tok, cached = int(in_tok or 0), int(out_tok or 0), int(cached or 0)
+        cost = compute_cost(model, in_tok, out_tok, cached)
+        total_cost += cost
+        by_model.append(
+            {
+                "model": model,
+                "input_tokens": in_tok,
+                "output_tokens": out_tok,
+                "cached_tokens": cached,
+                "cost": round(cost, 4),
+            }
+        )
+    by_model.sort(key=lambda row: row["cost"], reverse=True)
 
-    daily = [
-        {
-            "period": str(p),
-            "tokens": t or 0,
-            "cost": get_cost_estimate(t or 0),
-        }
-        for p, t in daily_rows
-    ]
-    weekly = [
-        {
-            "period": str(p),
-            "tokens": t or 0,
-            "cost": get_cost_estimate(t or 0),
-        }
-        for p, t in weekly_rows
-    ]
     total_tokens = sum(d["tokens"] for d in daily)
-    total_cost = get_cost_estimate(total_tokens)
     return {
         "total_tokens": total_tokens,
-        "total_cost": total_cost,
+        "total_cost": round(total_cost, 4),
         "daily": daily,
         "weekly": weekly,
+        "by_model": by_model,
     }
 
 # Footnote: Simple aggregation used for admin cost dashboards.
@@ -1,10 +1,13 @@
 """Service functions for persisting agent execution logs."""
 
+from datetime import datetime
+
 # Notes: Type hints for database session
 from sqlalchemy.orm import Session
 
 # Notes: ORM model representing agent execution logs
 from models.agent_execution_log import AgentExecutionLog
+from services import telemetry_writer
 
 
 def log_agent_execution(
@@ -17,7 +20,7 @@ def log_agent_execution(
     execution_time_ms: int,
     error_message: str | None = None,
 ) -> AgentExecutionLog:
-    """Create a new execution log entry."""
+    """Record a new execution log entry through the telemetry writer."""
 
     # Notes: Instantiate the ORM object with provided fields
     log_entry = AgentExecutionLog(
@@ -28,11 +31,19 @@ def log_agent_execution(
         success=success,
         execution_time_ms=execution_time_ms,
         error_message=error_message,
+        # Notes: Stamp the run time now; buffered rows are inserted later
+        created_at=datetime.utcnow(),
     )
-    # Notes: Persist the record to the database
-    db.add(log_entry)
-    db.commit()
-    db.refresh(log_entry)
-    return log_entry
+    return telemetry_writer.submit(db, log_entry)
+
+def log_agent_executions(
+    db: Session, entries: list[dict]
+) -> list[AgentExecutionLog]:
+    """Record several execution log entries in one batch."""
+
+    # Notes: Each dict carries the same fields accepted by log_agent_execution
+    now = datetime.utcnow()
+    logs = [AgentExecutionLog(**{"created_at": now, **entry}) for entry in entries]
+    return telemetry_writer.submit_many(db, logs)
 
 # Footnote: Handles creation of execution log records for agents.
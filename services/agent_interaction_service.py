@@ -0,0 +1,42 @@
+"""Service functions for persisting agent conversation turns."""
+
+# Notes: Runs the blocking commit off the event loop for streaming callers
+from fastapi.concurrency import run_in_threadpool
+# Notes: Type hints for database session
+from sqlalchemy.orm import Session
+
+# Notes: Streams outlive the request session, so they log on one of their own
+from database.session import SessionLocal
+
+# Notes: ORM model capturing each prompt/response pair
+from models.agent_interaction_log import AgentInteractionLog
+
+
+def log_interaction(
+    db: Session, user_id: int, user_prompt: str, ai_response: str
+) -> AgentInteractionLog:
+    """Persist one prompt and the AI reply it received."""
+
+    entry = AgentInteractionLog(
+        user_id=user_id, user_prompt=user_prompt, ai_response=ai_response
+    )
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+def _log_on_own_session(user_id: int, user_prompt: str, ai_response: str) -> None:
+    db = SessionLocal()
+    try:
+        log_interaction(db, user_id, user_prompt, ai_response)
+    finally:
+        db.close()
+
+
+async def alog_interaction(user_id: int, user_prompt: str, ai_response: str) -> None:
+    """Persist a streamed reply on a dedicated session in the threadpool."""
+
+    await run_in_threadpool(_log_on_own_session, user_id, user_prompt, ai_response)
+
+# Footnote: Streaming routes call alog_interaction once the final text is known.
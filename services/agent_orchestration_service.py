@@ -1,5 +1,7 @@
 """Routing layer to delegate AI coaching requests to domain agents."""
 
+from typing import AsyncIterator
+
 # Notes: Import typing for SQLAlchemy session operations
 from sqlalchemy.orm import Session
 
@@ -10,13 +12,9 @@ from models.agent_interaction_log import AgentInteractionLog
 from models.user_personality import UserPersonality
 from models.personality import Personality
 
-# Notes: Import OpenAI client and settings helper
-from openai import OpenAI
-from config import get_settings
-
-# Notes: Initialize OpenAI client using API key from settings
-settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
+# Notes: Shared async LLM client layer
+from services import llm_client
+from services.orchestration_log_service import alog_stream_usage
 
 # Notes: Default system prompt used when no personality assignment exists
 DEFAULT_SYSTEM_PROMPT = (
@@ -39,11 +37,11 @@ def get_personality_assignment(db: Session, user_id: int, domain: str) -> UserPe
     )
 
 
-# Notes: Generate an AI response using the chosen personality or fallback
-def generate_ai_response(
+# Notes: Build the chat messages using the chosen personality or fallback
+def build_agent_messages(
     db: Session, user_id: int, domain: str, user_prompt: str
-) -> str:
-    """Return the OpenAI completion text using the user's personality."""
+) -> list[dict[str, str]]:
+    """Return system and user messages for the user's domain personality."""
 
     # Notes: Look up any personality assigned for this domain
     assignment = get_personality_assignment(db, user_id, domain)
@@ -52,40 +50,46 @@ def generate_ai_response(
     else:
         system_prompt = DEFAULT_SYSTEM_PROMPT
 
-    # Notes: Call the OpenAI chat completion endpoint with the prompt
-    response = client.chat.completions.create(
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+# Notes: Generate an AI response using the chosen personality or fallback
+async def generate_ai_response(
+    db: Session, user_id: int, domain: str, user_prompt: str
+) -> str:
+    """Return the OpenAI completion text using the user's personality."""
+
+    # Notes: Await the chat completion without blocking the event loop
+    return await llm_client.achat_completion(
+        build_agent_messages(db, user_id, domain, user_prompt),
         model="gpt-4o",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
         temperature=0.7,
         max_tokens=1024,
     )
 
-    # Notes: Return only the response text from the first choice
-    return response.choices[0].message.content
-
 
 # Notes: Stub implementation for the career coaching agent
-def call_career_agent(db: Session, user_id: int, prompt: str, context: str) -> str:
+async def call_career_agent(db: Session, user_id: int, prompt: str, context: str) -> str:
     """Return a career coaching response from OpenAI."""
     full_prompt = f"{prompt}\n\nPrevious context:\n{context}"
-    return generate_ai_response(db, user_id, "career", full_prompt)
+    return await generate_ai_response(db, user_id, "career", full_prompt)
 
 
 # Notes: Stub implementation for the health coaching agent
-def call_health_agent(db: Session, user_id: int, prompt: str, context: str) -> str:
+async def call_health_agent(db: Session, user_id: int, prompt: str, context: str) -> str:
     """Return a health coaching response from OpenAI."""
     full_prompt = f"{prompt}\n\nPrevious context:\n{context}"
-    return generate_ai_response(db, user_id, "health", full_prompt)
+    return await generate_ai_response(db, user_id, "health", full_prompt)
 
 
 # Notes: Stub implementation for the relationship coaching agent
-def call_relationship_agent(db: Session, user_id: int, prompt: str, context: str) -> str:
+async def call_relationship_agent(db: Session, user_id: int, prompt: str, context: str) -> str:
     """Return a relationship coaching response from OpenAI."""
     full_prompt = f"{prompt}\n\nPrevious context:\n{context}"
-    return generate_ai_response(db, user_id, "relationship", full_prompt)
+    return await generate_ai_response(db, user_id, "relationship", full_prompt)
 
 
 # Notes: Map agent types to their corresponding handler functions
@@ -96,10 +100,12 @@ AGENT_HANDLERS = {
 }
 
 
-# Notes: Select an agent for the user and return the generated response
+# Notes: Domains of the built-in handlers; unknown agent types fall back to career
+DEFAULT_AGENT_DOMAIN = "career"
 
-def route_ai_request(db: Session, user_id: int, user_prompt: str) -> dict:
-    """Route the user's prompt to the assigned agent and return its reply."""
+
+def _assigned_agent_type(db: Session, user_id: int) -> str:
+    """Return the user's first assigned agent type or raise ``ValueError``."""
 
     # Notes: Look up the user's first assigned agent record
     assignment = (
@@ -111,12 +117,11 @@ def route_ai_request(db: Session, user_id: int, user_prompt: str) -> dict:
     # Notes: If the user has no agent assigned, raise an error for the caller
     if assignment is None:
         raise ValueError("No agent assigned to user")
+    return assignment.agent_type
 
-    # Notes: Determine which handler should process the request
-    handler = AGENT_HANDLERS.get(assignment.agent_type)
-    if handler is None:
-        # Notes: Default to the career agent when type is unrecognized
-        handler = call_career_agent
+
+def _interaction_context(db: Session, user_id: int) -> str:
+    """Return the last five exchanges formatted oldest first."""
 
     # Notes: Gather prior interactions to provide context
     logs = (
@@ -131,10 +136,45 @@ def route_ai_request(db: Session, user_id: int, user_prompt: str) -> dict:
     history_snippets: list[str] = []
     for log in logs:
         history_snippets.append(f"User: {log.user_prompt}\nAI: {log.ai_response}")
-    context = "\n".join(reversed(history_snippets))
+    return "\n".join(reversed(history_snippets))
+
+
+# Notes: Select an agent for the user and return the generated response
+
+async def route_ai_request(db: Session, user_id: int, user_prompt: str) -> dict:
+    """Route the user's prompt to the assigned agent and return its reply."""
+
+    agent_type = _assigned_agent_type(db, user_id)
+
+    # Notes: Determine which handler should process the request
+    handler = AGENT_HANDLERS.get(agent_type)
+    if handler is None:
+        # Notes: Default to the career agent when type is unrecognized
+        handler = call_career_agent
 
     # Notes: Generate the agent's reply using the selected handler and context
-    response_text = handler(db, user_id, user_prompt, context)
+    context = _interaction_context(db, user_id)
+    response_text = await handler(db, user_id, user_prompt, context)
 
     # Notes: Return both the agent type and the generated text
-    return {"agent": assignment.agent_type, "response": response_text}
+    return {"agent": agent_type, "response": response_text}
+
+
+# Notes: Streamed variant of route_ai_request used by the SSE endpoint
+
+def stream_ai_request(
+    db: Session, user_id: int, user_prompt: str
+) -> tuple[str, AsyncIterator[str]]:
+    """Return the assigned agent type and an iterator of reply deltas."""
+
+    agent_type = _assigned_agent_type(db, user_id)
+    domain = agent_type if agent_type in AGENT_HANDLERS else DEFAULT_AGENT_DOMAIN
+    full_prompt = f"{user_prompt}\n\nPrevious context:\n{_interaction_context(db, user_id)}"
+    deltas = llm_client.astream_chat_completion(
+        build_agent_messages(db, user_id, domain, full_prompt),
+        model="gpt-4o",
+        temperature=0.7,
+        max_tokens=1024,
+        on_usage=lambda result: alog_stream_usage(agent_type, user_id, result),
+    )
+    return agent_type, deltas
@@ -62,6 +62,24 @@ def get_agent_personality(
     )
 
 
+def get_agent_personalities(
+    db: Session, user_id: int, agent_names: list[str]
+) -> list[AgentPersonalization]:
+    """Retrieve profiles for several agents of one user in a single query."""
+
+    # Notes: Used by orchestration to personalize every agent prompt at once
+    if not agent_names:
+        return []
+    return (
+        db.query(AgentPersonalization)
+        .filter(
+            AgentPersonalization.user_id == user_id,
+            AgentPersonalization.agent_name.in_(agent_names),
+        )
+        .all()
+    )
+
+
 def list_agent_personalities(db: Session, user_id: int) -> list[AgentPersonalization]:
     """Return all personalization records belonging to a user."""
 
@@ -31,10 +31,37 @@ def build_personalized_prompt(
     # Notes: When no profile exists, return the unmodified prompt
     if record is None:
         return base_prompt
+    return _merge_profile(record.personality_profile, base_prompt)
+
+
+def build_personalized_prompts(
+    db: Session, user_id: int, agent_names: list[str], base_prompt: str
+) -> dict[str, str]:
+    """Return personalized prompts for several agents using a single query."""
+
+    # Notes: Validate every agent name before touching the database
+    for agent_name in agent_names:
+        if agent_name not in VALID_AGENT_NAMES:
+            raise ValueError("Invalid agent name")
+
+    # Notes: Fetch all profiles for the requested agents in one round trip
+    records = agent_personalization_service.get_agent_personalities(
+        db, user_id, agent_names
+    )
+    profiles = {r.agent_name: r.personality_profile for r in records}
+
+    return {
+        name: _merge_profile(profiles[name], base_prompt) if name in profiles else base_prompt
+        for name in agent_names
+    }
+
+
+def _merge_profile(personality_profile: str, base_prompt: str) -> str:
+    """Combine a stored personalization profile with the base prompt."""
 
     # Notes: Attempt to decode the profile text as JSON for structured options
     try:
-        profile_data: Any = json.loads(record.personality_profile)
+        profile_data: Any = json.loads(personality_profile)
     except json.JSONDecodeError:
         profile_data = None
 
@@ -56,7 +83,7 @@ def build_personalized_prompt(
         return base_prompt
 
     # Notes: Fallback when personalization is plain text
-    return f"{record.personality_profile}\n\n{base_prompt}"
+    return f"{personality_profile}\n\n{base_prompt}"
 
 # Footnote: Prompt builder composes user-specific instructions with the base
 # prompt. It allows future expansion by reading JSON profiles that tune agent
@@ -14,6 +14,7 @@ from models.summarized_journal import SummarizedJournal
 
 # Notes: Summarization utility reused for generating fresh output
 from services.orchestration_summarizer import summarize_journal_entries
+from services.summary_fingerprint_service import fresh_summaries
 
 # Notes: Performance logging helper for audit trail
 from services.orchestration_log_service import log_agent_run
@@ -31,8 +32,10 @@ def rerun_summary(db: Session, summary_id: UUID) -> SummarizedJournal:
     # Notes: Clear any cached data related to the summarizer
     summarize_journal_entries.cache_clear() if hasattr(summarize_journal_entries, "cache_clear") else None  # type: ignore[attr-defined]
 
-    # Notes: Invoke the orchestration pipeline again using the same user context
-    new_text = summarize_journal_entries(summary.user_id, db)
+    # Notes: Invoke the orchestration pipeline again using the same user context;
+    # an explicit rerun must not be answered from the unchanged-entries shortcut
+    with fresh_summaries():
+        new_text = summarize_journal_entries(summary.user_id, db)
 
     # Notes: Update the existing summary record with the new text
     summary.summary_text = new_text
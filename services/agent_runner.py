@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from config.settings import get_settings
 from services.orchestration_log_service import log_agent_run
+from services.llm_usage import usage_metrics
 from services.agent_failure_log import log_final_failure
 from utils.logger import get_logger
 
@@ -40,8 +41,8 @@ async def run_with_retry(
                 user_id,
                 {
                     "execution_time_ms": elapsed_ms,
-                    "input_tokens": 0,
-                    "output_tokens": len(result),
+                    # Notes: Usage is known when the agent call returns an LLMResult
+                    **usage_metrics(result),
                     "status": "success",
                     "fallback_triggered": False,
                     "timeout_occurred": False,
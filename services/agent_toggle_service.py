@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 # Notes: ORM model storing toggle records
 from models.agent_settings import AgentToggle
+from services import policy_cache
 from utils.logger import get_logger
 
 logger = get_logger()
@@ -20,15 +21,20 @@ def get_enabled_agents(db: Session) -> list[str]:
 
 def is_agent_enabled(db: Session, agent_name: str) -> bool:
     """Check whether ``agent_name`` is enabled. Defaults to True."""
-    toggle = (
-        db.query(AgentToggle).filter(AgentToggle.agent_name == agent_name).first()
-    )
-    if toggle is None:
-        logger.info(
-            "agent_toggle_missing_default_enabled", extra={"agent": agent_name}
+
+    def _load() -> bool:
+        toggle = (
+            db.query(AgentToggle).filter(AgentToggle.agent_name == agent_name).first()
         )
-        return True
-    return bool(toggle.enabled)
+        if toggle is None:
+            logger.info(
+                "agent_toggle_missing_default_enabled", extra={"agent": agent_name}
+            )
+            return True
+        return bool(toggle.enabled)
+
+    # Notes: Served from the policy cache; set_agent_enabled invalidates it
+    return policy_cache.agent_toggles.get_or_load(agent_name, _load)
 
 
 def set_agent_enabled(db: Session, agent_name: str, enabled: bool) -> AgentToggle:
@@ -46,6 +52,7 @@ def set_agent_enabled(db: Session, agent_name: str, enabled: bool) -> AgentToggl
             db.add(toggle)
         db.commit()
         db.refresh(toggle)
+        policy_cache.agent_toggles.invalidate(agent_name)
         logger.info(
             "agent_toggle_set", extra={"agent": agent_name, "enabled": enabled}
         )
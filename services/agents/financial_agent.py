@@ -1,11 +1,10 @@
 """Agent processor providing financial coaching responses."""
 
-# Notes: Import OpenAI client for financial advice
-from openai import OpenAI
-from config import get_settings
+# Notes: Shared LLM client layer with async calls and sync shims
+from services import llm_client
 
-# Notes: Initialize OpenAI client with API key from configuration
-client = OpenAI(api_key=get_settings().openai_api_key)
+# Notes: Canned reply returned when the provider call fails
+FAILURE_MESSAGE = "Financial agent failed to generate a response."
 
 
 # Notes: Generate a response from the financial agent using pre-built messages
@@ -14,12 +13,21 @@ def process(messages: list[dict[str, str]]) -> str:
     """Return the financial agent's reply to the assembled prompt messages."""
 
     try:
-        completion = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=512,
+        return llm_client.chat_completion(
+            messages, model="gpt-4o", temperature=0.7, max_tokens=512
         )
-        return completion.choices[0].message.content
     except Exception:
-        return "Financial agent failed to generate a response."
+        return FAILURE_MESSAGE
+
+
+# Notes: Non-blocking variant used by the orchestration fan-out engine
+
+async def aprocess(messages: list[dict[str, str]]) -> str:
+    """Async counterpart of :func:`process` for concurrent orchestration."""
+
+    try:
+        return await llm_client.achat_completion(
+            messages, model="gpt-4o", temperature=0.7, max_tokens=512
+        )
+    except Exception:
+        return FAILURE_MESSAGE
@@ -1,64 +1,289 @@
-"""Abstraction layer for interacting with different AI model providers."""
+"""Abstraction layer for interacting with different AI model providers.
+
+An adapter sends each call to its primary provider and, when fallbacks are
+configured (``AI_PROVIDER_FALLBACKS`` or the ``fallbacks`` argument), routes
+around trouble:
+
+* providers whose circuit breaker is open are skipped;
+* a failed call fails over to the next healthy provider;
+* with hedging enabled, a call still running after the primary's p95
+  latency gets a second request to the next provider and the first success
+  wins. The loser is cancelled: async tasks are cancelled outright, while a
+  sync call that already started finishes in its worker thread and its
+  result is discarded.
+
+Outcomes are tracked per provider in :mod:`services.provider_routing`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
-# Notes: Import OpenAI SDK and application settings helper
-from openai import OpenAI
 from config import get_settings
 
+# Notes: Shared provider registry backed OpenAI client
+from services import llm_client
+from services.provider_routing import get_provider_health, hedge_delay
+
 
 # Notes: Simple stub representing an Anthropic Claude client
 class AnthropicClient:
     """Placeholder client for Claude API interactions."""
 
-    def generate(self, messages: list[dict[str, str]], temperature: float = 0.7) -> str:
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
         return "[Stubbed Claude response]"
 
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
+        return self.generate(messages, temperature, cache)
+
 
 # Notes: Simple stub representing a local language model client
 class LocalLLMClient:
     """Placeholder client for running a local language model."""
 
-    def generate(self, messages: list[dict[str, str]], temperature: float = 0.7) -> str:
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
         return "[Stubbed Local LLM response]"
 
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
+        return self.generate(messages, temperature, cache)
+
 
 # Notes: Wrapper client for OpenAI to keep a consistent generate() interface
 class OpenAIClient:
     """Thin wrapper around the OpenAI chat completion API."""
 
-    def __init__(self) -> None:
-        # Notes: Initialize the underlying OpenAI client using API key from settings
-        self._client = OpenAI(api_key=get_settings().openai_api_key)
-
-    def generate(self, messages: list[dict[str, str]], temperature: float = 0.7) -> str:
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
         """Return the text content from an OpenAI chat completion."""
-        completion = self._client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            temperature=temperature,
-            max_tokens=1024,
+        # Notes: Shared client and response cache live in llm_client
+        return llm_client.chat_completion(
+            messages, model="gpt-4o", temperature=temperature, max_tokens=1024, cache=cache
         )
-        return completion.choices[0].message.content
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
+        """Async :meth:`generate` on the shared ``AsyncOpenAI`` client."""
+        return await llm_client.achat_completion(
+            messages, model="gpt-4o", temperature=temperature, max_tokens=1024, cache=cache
+        )
+
+
+# Notes: Provider name -> client class; tests swap in stub providers here
+PROVIDER_CLIENTS = {
+    "OpenAI": OpenAIClient,
+    "Claude": AnthropicClient,
+    "LocalLLM": LocalLLMClient,
+}
+
+# Notes: Worker threads for sync hedged calls; losers keep running here until they return
+_hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ai-hedge")
 
 
 # Notes: Main adapter class that hides the underlying provider implementations
 class AIModelAdapter:
     """Adapter used by the application to interact with different AI providers."""
 
-    def __init__(self, provider: str) -> None:
+    def __init__(
+        self, provider: str, fallbacks: list[str] | None = None, hedge: bool | None = None
+    ) -> None:
+        settings = get_settings()
         self.provider = provider
         # Notes: Instantiate the appropriate client based on the provider name
         self.client = self._initialize_client()
+        if fallbacks is None:
+            fallbacks = settings.AI_PROVIDER_FALLBACKS.get(provider, [])
+        self.fallbacks = [name for name in fallbacks if name != provider]
+        self.hedge = settings.AI_HEDGING_ENABLED if hedge is None else hedge
+        self.clients = {provider: self.client}
+        for name in self.fallbacks:
+            self.clients[name] = self._initialize_client(name)
+
+    def _initialize_client(self, provider: str | None = None):
+        """Return the client object for ``provider`` (default: the primary)."""
+        client_cls = PROVIDER_CLIENTS.get(provider or self.provider)
+        if client_cls is None:
+            raise ValueError("Unsupported provider specified")
+        return client_cls()
+
+    @staticmethod
+    def _next_provider(queue: list[str]) -> str | None:
+        """Pop the next provider whose breaker admits a call."""
+        while queue:
+            name = queue.pop(0)
+            if get_provider_health(name).allow():
+                return name
+        return None
+
+    def _call(self, name: str, messages, temperature: float, cache: bool | None) -> str:
+        health = get_provider_health(name)
+        start = time.perf_counter()
+        try:
+            result = self.clients[name].generate(messages, temperature, cache)
+        except Exception:
+            health.record_failure()
+            raise
+        health.record_success(time.perf_counter() - start)
+        return result
+
+    async def _acall(self, name: str, messages, temperature: float, cache: bool | None) -> str:
+        health = get_provider_health(name)
+        start = time.perf_counter()
+        try:
+            result = await self.clients[name].agenerate(messages, temperature, cache)
+        except asyncio.CancelledError:
+            # Notes: A cancelled half-open trial must not hold the breaker's trial slot
+            health.record_cancelled()
+            raise
+        except Exception:
+            health.record_failure()
+            raise
+        health.record_success(time.perf_counter() - start)
+        return result
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
+        """Delegate the generation call to the underlying client.
+
+        Only temperature-0 calls reuse an earlier response to an identical
+        prompt unless ``cache`` says otherwise.
+        """
+        if not self.fallbacks:
+            return self.client.generate(messages, temperature, cache)
+
+        queue = list(self.fallbacks)
+        # Notes: With every breaker open the primary still gets the call
+        name = self._next_provider([self.provider, *queue]) or self.provider
+        if name != self.provider:
+            queue = queue[queue.index(name) + 1 :]
+        error: Exception | None = None
+        while name is not None:
+            if error is not None:
+                get_provider_health(name).count("failovers")
+            if not (self.hedge and queue):
+                try:
+                    return self._call(name, messages, temperature, cache)
+                except Exception as exc:
+                    error = exc
+                    name = self._next_provider(queue)
+                    continue
+
+            # Notes: Race the primary against a delayed hedge on the next provider
+            pending: dict[Future, str] = {
+                _hedge_executor.submit(self._call, name, messages, temperature, cache): name
+            }
+            done, _ = wait(pending, timeout=hedge_delay(name))
+            hedge_name = None if done else self._next_provider(queue)
+            if hedge_name is not None:
+                get_provider_health(hedge_name).count("hedges_launched")
+                pending[_hedge_executor.submit(self._call, hedge_name, messages, temperature, cache)] = hedge_name
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    winner = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        error = exc
+                        continue
+                    for loser, loser_name in pending.items():
+                        if loser.cancel():
+                            # Notes: Never started, so it will not record an outcome itself
+                            get_provider_health(loser_name).record_cancelled()
+                        else:
+                            get_provider_health(loser_name).count("cancelled")
+                    if winner != name:
+                        get_provider_health(winner).count("hedge_wins")
+                    return result
+            name = self._next_provider(queue)
+        raise error
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        cache: bool | None = None,
+    ) -> str:
+        """Async :meth:`generate`; a losing hedged request is cancelled in flight."""
+        if not self.fallbacks:
+            return await self.client.agenerate(messages, temperature, cache)
+
+        queue = list(self.fallbacks)
+        # Notes: With every breaker open the primary still gets the call
+        name = self._next_provider([self.provider, *queue]) or self.provider
+        if name != self.provider:
+            queue = queue[queue.index(name) + 1 :]
+        error: Exception | None = None
+        while name is not None:
+            if error is not None:
+                get_provider_health(name).count("failovers")
+            if not (self.hedge and queue):
+                try:
+                    return await self._acall(name, messages, temperature, cache)
+                except Exception as exc:
+                    error = exc
+                    name = self._next_provider(queue)
+                    continue
 
-    def _initialize_client(self):
-        """Return the client object for the configured provider."""
-        if self.provider == "OpenAI":
-            return OpenAIClient()
-        if self.provider == "Claude":
-            return AnthropicClient()
-        if self.provider == "LocalLLM":
-            return LocalLLMClient()
-        raise ValueError("Unsupported provider specified")
-
-    def generate(self, messages: list[dict[str, str]], temperature: float = 0.7) -> str:
-        """Delegate the generation call to the underlying client."""
-        return self.client.generate(messages, temperature)
+            pending: dict[asyncio.Task, str] = {
+                asyncio.create_task(self._acall(name, messages, temperature, cache)): name
+            }
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay(name))
+            hedge_name = None if done else self._next_provider(queue)
+            if hedge_name is not None:
+                get_provider_health(hedge_name).count("hedges_launched")
+                task = asyncio.create_task(self._acall(hedge_name, messages, temperature, cache))
+                pending[task] = hedge_name
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        winner = pending.pop(task)
+                        try:
+                            result = task.result()
+                        except Exception as exc:
+                            error = exc
+                            continue
+                        if winner != name:
+                            get_provider_health(winner).count("hedge_wins")
+                        return result
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+            name = self._next_provider(queue)
+        raise error
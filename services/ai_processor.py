@@ -1,6 +1,6 @@
-# Notes: Import required modules for OpenAI client and application settings
-from openai import OpenAI
-from config import get_settings
+# Notes: Shared LLM client layer providing async calls and sync shims
+from services import llm_client
+from services.orchestration_log_service import alog_stream_usage
 
 # Notes: Import function for retrieving user context memory
 from services.ai_memory_service import get_user_context_memory
@@ -9,18 +9,18 @@ from services.ai_memory_service import get_user_context_memory
 from models.journal_entry import JournalEntry
 from models.journal_summary import JournalSummary
 from services.summary_moderation_service import flag_summary_if_needed
+from services.summary_fingerprint_service import PLAN_REUSE, plan_summary
+from services.rollup_summary_service import LEVEL_MONTH, format_nodes, get_rollup_nodes
+from services import journal_trend_engine
 from models.journal_trends import JournalTrend
 
 # Notes: Standard library module for JSON serialization
 import json
+from typing import AsyncIterator
 
 # Notes: Import SQLAlchemy Session type for typing the database argument
 from sqlalchemy.orm import Session
 
-# Notes: Initialize settings and OpenAI client using the API key from settings
-settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
-
 # Notes: Define system prompt describing Vida's persona
 SYSTEM_PROMPT = (
     "You are Vida, an AI Life Coach with a supportive, real-talk personality. "
@@ -30,11 +30,11 @@ SYSTEM_PROMPT = (
 )
 
 
-# Notes: Generate Vida's response using optional user context memory
+# Notes: Build Vida's chat messages using optional user context memory
 
 
-def generate_ai_response(db: Session, user_id: int, user_prompt: str) -> str:
-    """Return the AI-generated response for the given user prompt."""
+def build_coach_messages(db: Session, user_id: int, user_prompt: str) -> list[dict[str, str]]:
+    """Return the system and user messages for a coaching reply."""
 
     # Notes: Retrieve recent coaching context for this user
     memory = get_user_context_memory(db, user_id)
@@ -51,25 +51,50 @@ Here is user context memory:
 {memory}
 """
 
-    # Notes: Send the prompt to OpenAI's chat completion endpoint
-    response = client.chat.completions.create(
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+# Notes: Generate Vida's response using optional user context memory
+
+
+async def generate_ai_response(db: Session, user_id: int, user_prompt: str) -> str:
+    """Return the AI-generated response for the given user prompt."""
+
+    # Notes: Await the completion so the event loop keeps serving other requests
+    return await llm_client.achat_completion(
+        build_coach_messages(db, user_id, user_prompt),
         model="gpt-4o",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
         temperature=0.8,
         max_tokens=1024,
+        # Notes: Open-ended coaching replies should not repeat verbatim
+        cache=False,
     )
 
-    # Notes: Return only the text portion of the first choice
-    return response.choices[0].message.content
+
+# Notes: Streamed variant forwarding tokens as the model produces them
+
+
+def stream_ai_response(db: Session, user_id: int, user_prompt: str) -> AsyncIterator[str]:
+    """Return an async iterator of text deltas for the coaching reply."""
+
+    # Notes: Memory is read before streaming starts so the session is free afterwards
+    return llm_client.astream_chat_completion(
+        build_coach_messages(db, user_id, user_prompt),
+        model="gpt-4o",
+        temperature=0.8,
+        max_tokens=1024,
+        cache=False,
+        on_usage=lambda result: alog_stream_usage("AICoach", user_id, result),
+    )
 
 
 # Notes: Suggest new goals for a user based on their context memory
 
 
-def suggest_goals(db: Session, user_id: int) -> str:
+async def suggest_goals(db: Session, user_id: int) -> str:
     """Return a numbered list of 3-5 suggested goals for the user."""
 
     # Notes: Gather recent session and journal information for context
@@ -81,20 +106,17 @@ def suggest_goals(db: Session, user_id: int) -> str:
         "suggest 3-5 actionable personal goals. Provide them as a simple numbered list."
     )
 
-    # Notes: Call the OpenAI chat completion API with the context memory
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
+    # Notes: Await the chat completion with the context memory
+    return await llm_client.achat_completion(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": memory},
         ],
+        model="gpt-4o",
         temperature=0.7,
         max_tokens=512,
     )
 
-    # Notes: Return the generated goals as a string
-    return response.choices[0].message.content
-
 
 # Notes: Summarize a set of journal entries using a simple count-based message
 def _summarize_entries(entries: list[JournalEntry]) -> str:
@@ -116,6 +138,11 @@ def generate_journal_summary(db: Session, user_id: int) -> str:
         .all()
     )
 
+    # Notes: Return the stored summary when none of its entries changed
+    plan = plan_summary(db, JournalSummary, user_id, journals)
+    if plan.mode == PLAN_REUSE:
+        return plan.previous.summary_text
+
     # Notes: Compose a summary using the helper or external AI model
     summary_text = _summarize_entries(journals)
 
@@ -124,6 +151,7 @@ def generate_journal_summary(db: Session, user_id: int) -> str:
         user_id=user_id,
         summary_text=summary_text,
         source_entry_ids=json.dumps([j.id for j in journals]),
+        source_fingerprint=plan.fingerprint,
     )
     db.add(summary_record)
     db.commit()
@@ -156,16 +184,10 @@ def analyze_journal_trends(db: Session, user_id: int) -> dict:
 
     from datetime import datetime, timedelta
 
-    # Notes: Retrieve journals from the last 90 days for analysis
-    cutoff = datetime.utcnow() - timedelta(days=90)
-    journals = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == user_id, JournalEntry.created_at >= cutoff)
-        .order_by(JournalEntry.created_at.desc())
-        .all()
-    )
+    # Notes: Keyword and mood trends are computed locally from stored term vectors
+    report = journal_trend_engine.compute_user_trends(db, user_id)
 
-    if not journals:
+    if not report.entries:
         # Notes: Return an empty structure when no journals exist
         return {
             "mood_summary": "",
@@ -173,30 +195,37 @@ def analyze_journal_trends(db: Session, user_id: int) -> dict:
             "goal_progress_notes": "",
         }
 
-    # Notes: Concatenate journal content for the AI prompt
-    combined_text = "\n".join(j.content for j in journals)
-
-    # Notes: Instruction asking the model to identify mood and goal progress trends
-    analysis_prompt = (
-        "Analyze the following journal entries and summarize mood trends, "
-        "common keywords, and progress on any linked goals. "
-        "Return JSON with keys 'mood_summary', 'keyword_trends', and "
-        "'goal_progress_notes'."
+    # Notes: Three or four bounded month summaries stand in for every raw journal
+    cutoff = datetime.utcnow() - timedelta(days=journal_trend_engine.TREND_WINDOW_DAYS)
+    months = get_rollup_nodes(db, user_id, LEVEL_MONTH, cutoff.date())
+    mood_summary = report.mood_summary()
+
+    # Notes: The model only writes the narrative; the computed trends are context
+    notes_prompt = (
+        "Write a short narrative about this user's progress on their goals over "
+        "the last three months. Reply with plain text only.\n\n"
+        f"Top keywords: {json.dumps(report.keyword_trends)}\n"
+        f"Rising keywords: {', '.join(report.rising_keywords) or 'none'}\n"
+        f"Average mood (1-5): {mood_summary['average_mood']}, trend: {mood_summary['mood_trend']}\n\n"
+        f"Monthly summaries:\n{format_nodes(months)}"
     )
 
-    # Notes: Call OpenAI to perform the trend analysis
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
+    # Notes: Sync shim is used here because the trends route runs in the threadpool
+    notes = llm_client.chat_completion(
+        [
             {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": f"{analysis_prompt}\n\n{combined_text}"},
+            {"role": "user", "content": notes_prompt},
         ],
+        model="gpt-4o",
         temperature=0.4,
         max_tokens=512,
     )
 
-    # Notes: Parse the response text into a dictionary
-    data = _parse_trend_response(response.choices[0].message.content)
+    data = {
+        "mood_summary": mood_summary,
+        "keyword_trends": report.keyword_trends,
+        "goal_progress_notes": str(notes).strip(),
+    }
 
     # Notes: Persist the trend analysis record in the database
     trend_record = JournalTrend(
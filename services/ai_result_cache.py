@@ -0,0 +1,129 @@
+"""Per-user result cache with single-flight coalescing for AI read endpoints.
+
+Goal suggestions and journal trends send a slice of the user's history to
+the model, and journal tags aggregate the user's tag index. Their results
+only change when that history does, so they are cached under the user's context version from
+:mod:`services.context_snapshot_service`, which journal, goal, session and
+task writes already bump. A TTL bounds staleness for writes made by other
+workers.
+
+Concurrent misses for the same ``(name, user_id, version)`` share one
+computation: the first caller runs it and the rest wait for its result (or
+its exception). Sync routes block on the shared future; async routes await
+it without blocking the loop. Cached values are shared between callers and
+must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, TypeVar
+
+from config import get_settings
+from services.context_snapshot_service import get_user_context_version
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+# Notes: (name, user_id) -> (version, stored_at, value)
+_results: "OrderedDict[tuple[str, int], tuple[int, float, Any]]" = OrderedDict()
+# Notes: (name, user_id, version) -> future shared by coalesced callers
+_inflight: dict[tuple[str, int, int], Future] = {}
+_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+
+def _claim(name: str, user_id: int) -> tuple[bool, Any, Future | None, int]:
+    """Return ``(hit, value, flight, version)``; ``flight`` is set for followers."""
+
+    settings = get_settings()
+    version = get_user_context_version(user_id)
+    with _lock:
+        entry = _results.get((name, user_id))
+        if (
+            entry is not None
+            and entry[0] == version
+            and time.monotonic() - entry[1] < settings.AI_RESULT_CACHE_TTL_SECONDS
+        ):
+            _results.move_to_end((name, user_id))
+            _stats["hits"] += 1
+            return True, entry[2], None, version
+        flight = _inflight.get((name, user_id, version))
+        if flight is not None:
+            _stats["coalesced"] += 1
+            return False, None, flight, version
+        _stats["misses"] += 1
+        _inflight[(name, user_id, version)] = Future()
+        return False, None, None, version
+
+
+def _settle(name: str, user_id: int, version: int, value: Any = None, error: BaseException | None = None) -> None:
+    """Publish the leader's outcome to waiting callers and cache successes."""
+
+    with _lock:
+        flight = _inflight.pop((name, user_id, version))
+        # Notes: Skip caching when a write bumped the version during the computation
+        if error is None and get_user_context_version(user_id) == version:
+            _results[(name, user_id)] = (version, time.monotonic(), value)
+            _results.move_to_end((name, user_id))
+            while len(_results) > get_settings().AI_RESULT_CACHE_MAX_ENTRIES:
+                _results.popitem(last=False)
+    if error is None:
+        flight.set_result(value)
+    else:
+        flight.set_exception(error)
+
+
+def get_or_compute(name: str, user_id: int, compute: Callable[[], T]) -> T:
+    """Return the cached ``name`` result for the user or compute it once."""
+
+    hit, value, flight, version = _claim(name, user_id)
+    if hit:
+        return value
+    if flight is not None:
+        return flight.result()
+    try:
+        value = compute()
+    except BaseException as exc:
+        _settle(name, user_id, version, error=exc)
+        raise
+    _settle(name, user_id, version, value)
+    return value
+
+
+async def aget_or_compute(name: str, user_id: int, compute: Callable[[], Awaitable[T]]) -> T:
+    """Async :func:`get_or_compute`; waiting callers do not block the loop."""
+
+    hit, value, flight, version = _claim(name, user_id)
+    if hit:
+        return value
+    if flight is not None:
+        return await asyncio.wrap_future(flight)
+    try:
+        value = await compute()
+    except BaseException as exc:
+        _settle(name, user_id, version, error=exc)
+        raise
+    _settle(name, user_id, version, value)
+    return value
+
+
+def get_ai_result_cache_stats() -> dict[str, int]:
+    """Return hit, miss and coalesced counters plus the cache size."""
+
+    with _lock:
+        return {**_stats, "size": len(_results), "in_flight": len(_inflight)}
+
+
+def clear_ai_result_cache() -> None:
+    """Drop cached results and reset counters (used by tests)."""
+
+    with _lock:
+        _results.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+# Footnote: Wraps the suggest-goals, journal-trends and analyze-tags routes.
@@ -0,0 +1,171 @@
+"""Registry of OpenAI assistants shared by every worker.
+
+Each agent configuration -- ``(domain, model, sha256(instructions))`` -- maps
+to one remote assistant recorded in the ``assistant_registry`` table. The
+first worker to need a configuration creates the assistant and inserts the
+row; every other worker reads the row instead of calling
+``beta.assistants.create``. Lookups are memoized per process and concurrent
+lookups for the same configuration share one in-flight resolution.
+
+Two workers that miss the table at the same moment may both create an
+assistant; the unique constraint picks one row and the loser deletes its
+duplicate, so the registry converges on a single assistant.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from models.assistant_registry import AssistantRegistryEntry
+from services import llm_client
+from utils.logger import get_logger
+
+logger = get_logger()
+
+_table = AssistantRegistryEntry.__table__
+
+ASSISTANT_NAME = "Vida Coach"
+ASSISTANT_DESCRIPTION = "An AI life coach that helps users with their goals and personal development"
+
+
+def instructions_hash(instructions: str) -> str:
+    """Return the hex digest identifying a set of instructions."""
+    return hashlib.sha256(instructions.encode("utf-8")).hexdigest()
+
+
+class AssistantRegistry:
+    """Resolve agent configurations to assistant IDs, creating each once."""
+
+    def __init__(self, bind=None):
+        self._bind = bind
+        self._ids: dict[tuple[str, str, str], str] = {}
+        self._pending: dict[tuple[str, str, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "loaded": 0, "duplicates_removed": 0}
+
+    @property
+    def bind(self):
+        """Return the engine, defaulting to the application's."""
+        if self._bind is None:
+            from database.session import engine
+
+            self._bind = engine
+        return self._bind
+
+    async def resolve(self, domain: str, model: str, instructions: str) -> str:
+        """Return the assistant ID for a configuration, creating it if needed."""
+        key = (domain, model, instructions_hash(instructions))
+        assistant_id = self._ids.get(key)
+        if assistant_id is not None:
+            return assistant_id
+
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(key)
+        # Notes: A future left behind by another event loop cannot be awaited here
+        if pending is None or pending.get_loop() is not loop:
+            pending = loop.create_task(self._resolve(key, model, instructions))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda done, key=key: self._forget_pending(key, done))
+        return await asyncio.shield(pending)
+
+    def _forget_pending(self, key: tuple[str, str, str], done: asyncio.Future) -> None:
+        if self._pending.get(key) is done:
+            del self._pending[key]
+
+    async def _resolve(self, key: tuple[str, str, str], model: str, instructions: str) -> str:
+        assistant_id = await asyncio.to_thread(self._lookup, key)
+        if assistant_id is not None:
+            self._count("loaded")
+        else:
+            created = await self._create(model, instructions)
+            assistant_id = await asyncio.to_thread(self._store, key, created)
+            if assistant_id != created:
+                # Notes: Another worker registered this configuration first
+                await self._delete(created)
+            else:
+                logger.info(f"Registered OpenAI Assistant {created} for domain {key[0]}")
+        self._ids[key] = assistant_id
+        return assistant_id
+
+    def _lookup(self, key: tuple[str, str, str]) -> str | None:
+        domain, model, digest = key
+        with self.bind.connect() as conn:
+            return conn.execute(
+                select(_table.c.assistant_id).where(
+                    _table.c.domain == domain,
+                    _table.c.model == model,
+                    _table.c.instructions_hash == digest,
+                )
+            ).scalar()
+
+    def _store(self, key: tuple[str, str, str], assistant_id: str) -> str:
+        """Insert the row and return the ID that ended up registered."""
+        domain, model, digest = key
+        try:
+            with self.bind.begin() as conn:
+                conn.execute(
+                    insert(_table),
+                    {
+                        "domain": domain,
+                        "model": model,
+                        "instructions_hash": digest,
+                        "assistant_id": assistant_id,
+                    },
+                )
+        except IntegrityError:
+            return self._lookup(key)
+        return assistant_id
+
+    async def _create(self, model: str, instructions: str) -> str:
+        assistant = await llm_client.get_async_api_client().beta.assistants.create(
+            name=ASSISTANT_NAME,
+            description=ASSISTANT_DESCRIPTION,
+            instructions=instructions,
+            model=model,
+        )
+        self._count("created")
+        return assistant.id
+
+    async def _delete(self, assistant_id: str) -> None:
+        try:
+            await llm_client.get_async_api_client().beta.assistants.delete(assistant_id)
+            self._count("duplicates_removed")
+        except Exception as e:
+            logger.warning(f"Failed to delete duplicate OpenAI Assistant {assistant_id}: {str(e)}")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def clear(self) -> None:
+        """Forget memoized IDs and reset counters; the table is untouched."""
+        self._ids.clear()
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> dict:
+        """Return creation counters and the number of memoized assistants."""
+        with self._lock:
+            return {**self._counters, "cached": len(self._ids)}
+
+
+_registry: AssistantRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_assistant_registry() -> AssistantRegistry:
+    """Return the process-wide registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AssistantRegistry()
+    return _registry
+
+# Footnote: OpenAIAgentService wires every domain agent to this registry.
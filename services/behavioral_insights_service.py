@@ -10,9 +10,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 # Notes: ORM models representing user activity tables
-from models.daily_checkin import DailyCheckIn
 from models.goal import Goal
-from models.journal_entry import JournalEntry
+from models.user_activity_daily import UserActivityDaily
+from services import activity_rollup_service
 
 
 # Notes: Aggregate recent activity and compute summary metrics
@@ -23,12 +23,16 @@ def generate_behavioral_insights(db: Session) -> dict:
     # Notes: Analyze data over the past 30 days
     window_start = datetime.utcnow() - timedelta(days=30)
 
-    # Notes: Count check-ins created within the window
-    total_checkins = (
-        db.query(func.count(DailyCheckIn.id))
-        .filter(DailyCheckIn.created_at >= window_start)
-        .scalar()
-        or 0
+    # Notes: Check-in and journal volume come from the daily activity rollup
+    rollup_start = activity_rollup_service.window_start(30)
+    in_window = UserActivityDaily.activity_date >= rollup_start
+    total_checkins, journal_entries = (
+        db.query(
+            func.coalesce(func.sum(UserActivityDaily.checkins), 0),
+            func.coalesce(func.sum(UserActivityDaily.journals), 0),
+        )
+        .filter(in_window)
+        .one()
     )
 
     # Notes: Count completed goals updated within the window
@@ -40,23 +44,17 @@ def generate_behavioral_insights(db: Session) -> dict:
         or 0
     )
 
-    # Notes: Count journal entries written within the window
-    journal_entries = (
-        db.query(func.count(JournalEntry.id))
-        .filter(JournalEntry.created_at >= window_start)
-        .scalar()
-        or 0
-    )
-
     # Notes: Calculate the average number of check-ins per week
     avg_checkins_per_week = total_checkins / 4.0
 
     # Notes: Determine the top five users by check-in count
+    checkins = func.sum(UserActivityDaily.checkins)
     rows = (
-        db.query(DailyCheckIn.user_id, func.count(DailyCheckIn.id).label("c"))
-        .filter(DailyCheckIn.created_at >= window_start)
-        .group_by(DailyCheckIn.user_id)
-        .order_by(func.count(DailyCheckIn.id).desc())
+        db.query(UserActivityDaily.user_id, checkins.label("c"))
+        .filter(in_window)
+        .group_by(UserActivityDaily.user_id)
+        .having(checkins > 0)
+        .order_by(checkins.desc())
         .limit(5)
         .all()
     )
@@ -1,73 +1,21 @@
 """Service for calculating and retrieving churn risk scores."""
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
 
-from models import (
-    ChurnRisk,
-    RiskCategory,
-    UserSession,
-    JournalEntry,
-    AgentInteractionLog,
-    Subscription,
-    User,
-)
+from models import ChurnRisk
+from services import churn_batch_service
 
 
 def calculate_churn_risk(db: Session, user_id: int) -> ChurnRisk:
     """Compute the churn risk for a single user and persist the record."""
 
     now = datetime.utcnow()
-    window_start = now - timedelta(days=30)
 
-    # Notes: Count recent login sessions
-    session_count = (
-        db.query(UserSession)
-        .filter(UserSession.user_id == user_id, UserSession.session_start >= window_start)
-        .count()
-    )
-
-    # Notes: Count recent journal entries
-    journal_count = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == user_id, JournalEntry.created_at >= window_start)
-        .count()
-    )
-
-    # Notes: Count recent AI interactions
-    interaction_count = (
-        db.query(AgentInteractionLog)
-        .filter(AgentInteractionLog.user_id == user_id, AgentInteractionLog.timestamp >= window_start)
-        .count()
-    )
-
-    # Notes: Determine if the latest subscription record is active
-    sub = (
-        db.query(Subscription)
-        .filter(Subscription.user_id == user_id)
-        .order_by(Subscription.created_at.desc())
-        .first()
-    )
-    subscription_active = sub is not None and sub.status in {"active", "trialing"}
-
-    # Notes: Start with zero risk and add penalties for missing activity
-    score = 0.0
-    if session_count == 0:
-        score += 0.25
-    if journal_count < 2:
-        score += 0.25
-    if interaction_count == 0:
-        score += 0.25
-    if not subscription_active:
-        score += 0.25
-
-    # Notes: Map score to human readable category
-    if score < 0.34:
-        category = RiskCategory.LOW
-    elif score < 0.67:
-        category = RiskCategory.MEDIUM
-    else:
-        category = RiskCategory.HIGH
+    # Notes: Same grouped feature queries and scoring as the batch engine
+    features = churn_batch_service.load_churn_features(db, [user_id], now)
+    scores, categories = churn_batch_service.score_churn_risk(features)
+    score, category = float(scores[0]), categories[0]
 
     # Notes: Persist the churn risk record
     risk = ChurnRisk(
@@ -94,9 +42,8 @@ def list_churn_risks(db: Session, limit: int = 100, offset: int = 0) -> list[Chu
     )
 
 
-def recalculate_all_churn_risk(db: Session) -> None:
-    """Recalculate churn risk for every user in the system."""
+def recalculate_all_churn_risk(db: Session) -> int:
+    """Recalculate churn risk for every user and return the rows written."""
 
-    users = db.query(User).all()
-    for user in users:
-        calculate_churn_risk(db, user.id)
+    # Notes: Set-based pages with bulk inserts instead of per-user queries
+    return churn_batch_service.run_churn_risk_batch(db)
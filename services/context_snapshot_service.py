@@ -0,0 +1,201 @@
+"""Cached, versioned per-user context snapshots for prompt memory.
+
+Both ``conversation_memory_service.build_memory_context`` and
+``ai_memory_service.get_user_context_memory`` read the same recent journals,
+sessions, open goals and open tasks. A snapshot holds those rows for one
+user; it is loaded with a single UNION ALL statement and kept in an
+in-process LRU. Each user has a version counter that write paths bump via
+:func:`invalidate_user_context`, so a warm snapshot is reused until the user's
+data changes. A TTL bounds staleness for writes made by other workers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Integer, Text, cast, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from models.goal import Goal
+from models.journal_entry import JournalEntry
+from models.session import Session as SessionModel
+from models.task import Task
+
+# Notes: Row limits cover the largest window any memory consumer reads
+SNAPSHOT_JOURNAL_LIMIT = 5
+SNAPSHOT_SESSION_LIMIT = 5
+
+
+@dataclass(frozen=True)
+class SessionNote:
+    """Summary fields of one coaching session."""
+
+    ai_summary: str | None
+    conversation_history: str | None
+
+
+@dataclass(frozen=True)
+class ContextSnapshot:
+    """Immutable view of a user's recent context, newest items first."""
+
+    user_id: int
+    version: int
+    journals: tuple[str, ...]
+    sessions: tuple[SessionNote, ...]
+    goals: tuple[str, ...]
+    tasks: tuple[str, ...]
+    loaded_at: float
+
+
+_lock = threading.Lock()
+_versions: dict[int, int] = {}
+_snapshots: "OrderedDict[int, ContextSnapshot]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+def invalidate_user_context(user_id: int | None) -> None:
+    """Bump the user's context version so the next read reloads from the DB."""
+
+    if user_id is None:
+        return
+    with _lock:
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+        _snapshots.pop(user_id, None)
+
+
+def get_user_context_version(user_id: int) -> int:
+    """Return the current context version for ``user_id``."""
+
+    with _lock:
+        return _versions.get(user_id, 0)
+
+
+def clear_context_snapshots() -> None:
+    """Drop every cached snapshot and reset counters."""
+
+    with _lock:
+        _snapshots.clear()
+        _versions.clear()
+        _stats.update(hits=0, misses=0)
+
+
+def get_cache_stats() -> dict[str, int]:
+    """Return hit/miss counters and the current number of cached users."""
+
+    with _lock:
+        return {**_stats, "size": len(_snapshots)}
+
+
+def get_context_snapshot(db: Session, user_id: int) -> ContextSnapshot:
+    """Return the user's snapshot, loading it only when missing or stale."""
+
+    settings = get_settings()
+    with _lock:
+        version = _versions.get(user_id, 0)
+        snapshot = _snapshots.get(user_id)
+        if (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() - snapshot.loaded_at < settings.CONTEXT_SNAPSHOT_TTL_SECONDS
+        ):
+            _snapshots.move_to_end(user_id)
+            _stats["hits"] += 1
+            return snapshot
+        _stats["misses"] += 1
+
+    snapshot = _load_snapshot(db, user_id, version)
+
+    with _lock:
+        # Notes: Skip caching when a write bumped the version during the load
+        if _versions.get(user_id, 0) == version:
+            _snapshots[user_id] = snapshot
+            _snapshots.move_to_end(user_id)
+            while len(_snapshots) > settings.CONTEXT_SNAPSHOT_MAX_USERS:
+                _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _load_snapshot(db: Session, user_id: int, version: int) -> ContextSnapshot:
+    """Fetch every context source for the user in one round trip."""
+
+    def _part(kind, row_id, text, extra, created_at, where, order_by=None, limit=None):
+        stmt = select(
+            literal(kind).label("kind"),
+            cast(row_id, Integer).label("row_id"),
+            cast(text, Text).label("text"),
+            cast(extra, Text).label("extra"),
+            created_at.label("created_at"),
+        ).where(*where)
+        if order_by is not None:
+            stmt = stmt.order_by(*order_by)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        # Notes: Wrap as a subquery so per-source ORDER BY/LIMIT survive the UNION
+        return select(stmt.subquery())
+
+    statement = union_all(
+        _part(
+            "journal",
+            JournalEntry.id,
+            JournalEntry.content,
+            null(),
+            JournalEntry.created_at,
+            [JournalEntry.user_id == user_id],
+            [JournalEntry.created_at.desc(), JournalEntry.id.desc()],
+            SNAPSHOT_JOURNAL_LIMIT,
+        ),
+        _part(
+            "session",
+            SessionModel.id,
+            SessionModel.ai_summary,
+            SessionModel.conversation_history,
+            SessionModel.created_at,
+            [SessionModel.user_id == user_id],
+            [SessionModel.created_at.desc(), SessionModel.id.desc()],
+            SNAPSHOT_SESSION_LIMIT,
+        ),
+        _part(
+            "goal",
+            Goal.id,
+            Goal.title,
+            null(),
+            Goal.created_at,
+            [Goal.user_id == user_id, Goal.is_completed.is_(False)],
+        ),
+        _part(
+            "task",
+            Task.id,
+            Task.description,
+            null(),
+            Task.created_at,
+            [Task.user_id == user_id, Task.is_completed.is_(False)],
+        ),
+    )
+    rows = db.execute(statement).all()
+
+    grouped: dict[str, list] = {"journal": [], "session": [], "goal": [], "task": []}
+    for row in rows:
+        grouped[row.kind].append(row)
+
+    def _newest_first(items):
+        return sorted(items, key=lambda r: (r.created_at or datetime.min, r.row_id), reverse=True)
+
+    return ContextSnapshot(
+        user_id=user_id,
+        version=version,
+        journals=tuple(r.text for r in _newest_first(grouped["journal"])),
+        sessions=tuple(
+            SessionNote(r.text, r.extra) for r in _newest_first(grouped["session"])
+        ),
+        # Notes: Goals and tasks keep insertion order like the original queries
+        goals=tuple(r.text for r in sorted(grouped["goal"], key=lambda r: r.row_id)),
+        tasks=tuple(r.text for r in sorted(grouped["task"], key=lambda r: r.row_id)),
+        loaded_at=time.monotonic(),
+    )
+
+# Footnote: Write services call invalidate_user_context after committing.
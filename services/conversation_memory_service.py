@@ -3,11 +3,10 @@
 # Notes: Import typing for DB interactions
 from sqlalchemy.orm import Session
 
-# Notes: Import ORM models that provide memory sources
-from models.journal_entry import JournalEntry
-from models.goal import Goal
-from models.session import Session as SessionModel
-from models.task import Task
+# Notes: Cached per-user snapshot of journals, sessions, goals and tasks
+from services.context_snapshot_service import get_context_snapshot
+# Notes: Model-aware token counting used for the memory budget
+from utils.token_budget import count_tokens, truncate_to_tokens
 
 # Notes: Limits for how much history to include
 RECENT_JOURNAL_LIMIT = 5
@@ -15,23 +14,6 @@ RECENT_SESSION_LIMIT = 3
 MAX_MEMORY_TOKENS = 300
 
 
-# Notes: Simple helper to count tokens approximately using whitespace
-
-def _approx_token_count(text: str) -> int:
-    """Return the number of whitespace separated tokens."""
-    return len(text.split())
-
-
-# Notes: Helper to truncate a text string to a token limit
-
-def _truncate_to_tokens(text: str, max_tokens: int) -> str:
-    """Return text trimmed to the last max_tokens tokens when it is too long."""
-    words = text.split()
-    if len(words) <= max_tokens:
-        return text
-    return " ".join(words[-max_tokens:])
-
-
 # Notes: Build a combined memory block for prompt injection
 
 def build_memory_context(
@@ -42,46 +24,20 @@ def build_memory_context(
 ) -> str:
     """Return summarized memory context for the user."""
 
-    # Notes: Fetch the most recent journal entries for context
-    journals = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == user_id)
-        .order_by(JournalEntry.created_at.desc())
-        .limit(RECENT_JOURNAL_LIMIT)
-        .all()
-    )
-    journal_snippets = [j.content for j in journals]
-
-    # Notes: Gather all goals that are not yet completed
-    goals = (
-        db.query(Goal)
-        .filter(Goal.user_id == user_id, Goal.is_completed.is_(False))
-        .all()
-    )
-    goal_summaries = [g.title for g in goals]
+    # Notes: Read every source from the cached snapshot (no queries when warm)
+    snapshot = get_context_snapshot(db, user_id)
+    journal_snippets = list(snapshot.journals[:RECENT_JOURNAL_LIMIT])
+    goal_summaries = list(snapshot.goals)
 
-    # Notes: Retrieve the latest session summaries for continuity
-    sessions = (
-        db.query(SessionModel)
-        .filter(SessionModel.user_id == user_id)
-        .order_by(SessionModel.created_at.desc())
-        .limit(RECENT_SESSION_LIMIT)
-        .all()
-    )
+    # Notes: Prefer session summaries and fall back to raw history
     session_notes: list[str] = []
-    for s in sessions:
+    for s in snapshot.sessions[:RECENT_SESSION_LIMIT]:
         if s.ai_summary:
             session_notes.append(s.ai_summary)
         elif s.conversation_history:
             session_notes.append(s.conversation_history)
 
-    # Notes: Include any active tasks that are not completed
-    tasks = (
-        db.query(Task)
-        .filter(Task.user_id == user_id, Task.is_completed.is_(False))
-        .all()
-    )
-    task_lines = [t.description for t in tasks]
+    task_lines = list(snapshot.tasks)
 
     # Notes: Compose the memory block referencing each source
     parts: list[str] = []
@@ -106,9 +62,9 @@ def build_memory_context(
 
     memory_context = "\n".join(parts)
 
-    # Notes: Enforce a token limit to keep prompts manageable
-    if _approx_token_count(memory_context) > MAX_MEMORY_TOKENS:
-        memory_context = _truncate_to_tokens(memory_context, MAX_MEMORY_TOKENS)
+    # Notes: Enforce the model token budget to keep prompts manageable
+    if count_tokens(memory_context) > MAX_MEMORY_TOKENS:
+        memory_context = truncate_to_tokens(memory_context, MAX_MEMORY_TOKENS)
 
     return memory_context
 
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 
 # Notes: Import the SQLAlchemy model representing check-ins
 from models.daily_checkin import DailyCheckIn
+from services.context_snapshot_service import invalidate_user_context
 
 
 def create_daily_checkin(db: Session, checkin_data: dict) -> DailyCheckIn:
@@ -10,6 +11,8 @@ def create_daily_checkin(db: Session, checkin_data: dict) -> DailyCheckIn:
     db.add(new_checkin)
     db.commit()
     db.refresh(new_checkin)
+    # Notes: Moods feed the journal trend report cached under the context version
+    invalidate_user_context(new_checkin.user_id)
     return new_checkin
 
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy.orm import Session
 
 from models.feature_flag import FeatureFlag, AccessTier
+from services import policy_cache
 
 
 _ROLE_ORDER = {
@@ -16,15 +17,23 @@ _ROLE_ORDER = {
 def get_feature_flag(db: Session, feature_key: str, user_role: str) -> bool:
     """Return True if ``feature_key`` is enabled for ``user_role``."""
 
-    flag = db.query(FeatureFlag).filter(FeatureFlag.feature_key == feature_key).first()
-    if flag is None:
+    def _load() -> tuple[str, bool] | None:
+        flag = db.query(FeatureFlag).filter(FeatureFlag.feature_key == feature_key).first()
+        if flag is None:
+            return None
+        return flag.access_tier.value, bool(flag.enabled)
+
+    # Notes: Cache the decoded flag per key; the role check stays per call
+    cached = policy_cache.feature_flags.get_or_load(feature_key, _load)
+    if cached is None:
         # Missing flag defaults to enabled
         return True
-    required = _ROLE_ORDER.get(flag.access_tier.value, 0)
+    access_tier, enabled = cached
+    required = _ROLE_ORDER.get(access_tier, 0)
     actual = _ROLE_ORDER.get(user_role, 0)
     if actual < required:
         return False
-    return bool(flag.enabled)
+    return enabled
 
 
 def set_feature_flag(
@@ -42,6 +51,7 @@ def set_feature_flag(
         db.add(flag)
     db.commit()
     db.refresh(flag)
+    policy_cache.feature_flags.invalidate(feature_key)
     return flag
 
 
@@ -6,12 +6,13 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 
-from models.journal_entry import JournalEntry
+from models.user_activity_daily import UserActivityDaily
 from models.agent_execution_log import AgentExecutionLog
 from models.user_feedback import UserFeedback, FeedbackType
 from models.daily_checkin import DailyCheckIn, Mood
+from services import activity_rollup_service
 
 
 # Notes: Map mood enum values to numeric scores for averaging
@@ -28,30 +29,28 @@ def get_global_insights(db: Session) -> Dict[str, int | float | str | None]:
     """Return high level usage metrics for admin dashboard."""
 
     now = datetime.utcnow()
-    week_start = now - timedelta(days=7)
     month_start = now - timedelta(days=30)
 
-    # Notes: Count journals created in the last 7 and 30 days
-    journals_last_7d = (
-        db.query(func.count(JournalEntry.id))
-        .filter(JournalEntry.created_at >= week_start)
-        .scalar()
-        or 0
-    )
-    journals_last_30d = (
-        db.query(func.count(JournalEntry.id))
-        .filter(JournalEntry.created_at >= month_start)
-        .scalar()
-        or 0
-    )
-
-    # Notes: Number of distinct users writing journals in the last week
-    active_users = (
-        db.query(func.count(func.distinct(JournalEntry.user_id)))
-        .filter(JournalEntry.created_at >= week_start)
-        .scalar()
-        or 0
+    # Notes: Journal volume and weekly active writers come from the daily
+    # rollup in one pass over at most users x 30 rows
+    week_day = activity_rollup_service.window_start(7, now)
+    in_week = UserActivityDaily.activity_date >= week_day
+    row = (
+        db.query(
+            func.sum(case((in_week, UserActivityDaily.journals), else_=0)),
+            func.sum(UserActivityDaily.journals),
+            func.count(
+                func.distinct(
+                    case((in_week & (UserActivityDaily.journals > 0), UserActivityDaily.user_id))
+                )
+            ),
+        )
+        .filter(UserActivityDaily.activity_date >= activity_rollup_service.window_start(30, now))
+        .one()
     )
+    journals_last_7d = int(row[0] or 0)
+    journals_last_30d = int(row[1] or 0)
+    active_users = int(row[2] or 0)
 
     # Notes: Determine the most frequently executed agent by volume
     agent_row = (
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from models.goal import Goal
+from services.context_snapshot_service import invalidate_user_context
 
 
 def create_goal(db: Session, goal_data: dict) -> Goal:
@@ -10,6 +11,8 @@ def create_goal(db: Session, goal_data: dict) -> Goal:
     db.add(new_goal)
     db.commit()
     db.refresh(new_goal)
+    # Notes: Open goals are part of the cached prompt context
+    invalidate_user_context(new_goal.user_id)
     return new_goal
 
 
@@ -41,6 +44,7 @@ def update_goal_progress(db: Session, goal_id: int, user_id: int, progress: int,
     
     db.commit()
     db.refresh(goal)
+    invalidate_user_context(user_id)
     return goal
 
 
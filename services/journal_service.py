@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from models.journal_entry import JournalEntry
+from services.context_snapshot_service import invalidate_user_context
 
 
 def create_journal_entry(db: Session, entry_data: dict) -> JournalEntry:
@@ -12,6 +13,8 @@ def create_journal_entry(db: Session, entry_data: dict) -> JournalEntry:
     db.add(new_entry)
     db.commit()
     db.refresh(new_entry)
+    # Notes: New journals change the user's cached prompt context
+    invalidate_user_context(new_entry.user_id)
     return new_entry
 
 
@@ -1,6 +1,5 @@
-# Notes: Import OpenAI client and application settings helper
-from openai import OpenAI
-from config import get_settings
+# Notes: Shared lazily constructed OpenAI client
+from services import llm_client
 
 # Notes: Import SQLAlchemy Session for database interaction
 from sqlalchemy.orm import Session
@@ -8,10 +7,6 @@ from sqlalchemy.orm import Session
 # Notes: Import the ORM model for journal entries
 from models.journal_entry import JournalEntry
 
-# Notes: Initialize settings and OpenAI client using the API key
-settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
-
 
 # Notes: Summarize the latest journal entries for a given user
 
@@ -33,16 +28,16 @@ def summarize_user_journals(user_id: int, db: Session) -> str:
     journal_entries_block = "\n".join(context_lines)
 
     # Notes: Send the collected entries to the OpenAI chat completion API
-    response = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
+    summary = llm_client.chat_completion(
+        [
             {
                 "role": "system",
                 "content": "You are a coaching assistant summarizing journal entries.",
             },
             {"role": "user", "content": "Summarize the following:\n" + journal_entries_block},
         ],
+        model="gpt-4.1-mini",
     )
 
-    # Notes: Return the summary text from the first choice in the response
-    return response.choices[0].message.content
+    # Notes: Return the summary as a plain string
+    return str(summary)
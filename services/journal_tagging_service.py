@@ -1,51 +1,70 @@
-# Notes: Service for extracting goal-related tags from user journal entries
+"""Per-entry journal tag index behind ``/journals/analyze-tags``.
+
+Tags used to be extracted by sending every journal the user had ever
+written to the model on each request. Now each entry is tagged once, when it
+is written or its content is edited, and the tags are stored in
+``journal_entry_tags``. The endpoint ranks a user's tags with one SQL
+aggregate, and :func:`top_tags` without a user gives the same ranking across
+all users.
+
+Entries carry a ``tags_indexed`` flag. New entries start unflagged, and an
+edit to ``content`` clears the flag and drops the entry's old tags in the same
+flush. In ``background`` mode (``JOURNAL_TAGGING_MODE``) the entries a commit
+wrote are tagged on a small worker pool. Entries that are still unflagged,
+because they predate the index, were written in ``deferred`` mode or through
+Core bulk inserts, or failed extraction, are picked up by
+``jobs/backfill_journal_tags.py``. Reads never call the model: they answer
+from the stored tags and, in ``background`` mode, queue a bounded batch of
+the user's pending entries on the pool. An entry already queued in this
+process is not queued again. When the pool's sessions would share the
+request's connection (SQLite's ``StaticPool``), ``background`` behaves like
+``deferred`` so a worker never commits inside a request's transaction.
+"""
+
 from __future__ import annotations
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import case, delete, func, insert, inspect, select, update
 from sqlalchemy.orm import Session
 
-# Notes: Import the AI abstraction layer and journal ORM model
+from config import get_settings
+from database.session import SessionLocal, shares_one_connection
+
+# Notes: Import the AI abstraction layer and journal ORM models
 from services.ai_model_adapter import AIModelAdapter
+from services.context_snapshot_service import invalidate_user_context
 from models.journal_entry import JournalEntry
+from models.journal_entry_tag import JournalEntryTag
+from utils.logger import get_logger
 
+logger = get_logger()
 
-# Notes: Analyze all journals for the given user and return a list of tags
-
-def extract_tags_from_journals(db: Session, user_id: int) -> list[str]:
-    """Return goal or theme tags extracted from the user's journals."""
-    # Notes: Retrieve every journal entry belonging to the user
-    entries = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == user_id)
-        .order_by(JournalEntry.created_at)
-        .all()
-    )
+MODE_BACKGROUND = "background"
+MODE_DEFERRED = "deferred"
 
-    # Notes: Return an empty list when the user has no journal history
-    if not entries:
-        return []
+TOP_TAGS = 10
+MAX_TAG_LENGTH = 64
+# Notes: Half-life steps before the recency weight bottoms out
+RECENCY_STEPS = 6
 
-    # Notes: Combine all journal content into a single text block
-    combined_content = "\n".join(entry.content for entry in entries)
+_entries = JournalEntry.__table__
+_tags = JournalEntryTag.__table__
+_PENDING_KEY = "journal_tags_pending"
 
-    # Notes: Create the AI adapter instance using the default provider
-    adapter = AIModelAdapter("OpenAI")
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+# Notes: Entry ids queued or being tagged by this process's pool
+_scheduled: set[int] = set()
+_scheduled_lock = threading.Lock()
 
-    # Notes: Instruction for the AI to generate JSON list of tags
-    system_prompt = (
-        "Extract 3-10 short keywords that summarize the user's goals or focus "
-        "areas from the provided journal text. Return them as JSON in the form "
-        "{\"tags\": [\"tag1\", \"tag2\"]}."
-    )
 
-    # Notes: Submit the journal text to the AI model
-    response = adapter.generate(
-        [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": combined_content},
-        ],
-        temperature=0.3,
-    )
+def _parse_tags(response: str) -> list[str]:
+    """Return the tag list from a JSON reply, or from a comma separated one."""
 
     # Notes: Attempt to parse the AI response as JSON to get the tag list
     try:
@@ -58,3 +77,263 @@ def extract_tags_from_journals(db: Session, user_id: int) -> list[str]:
 
     # Notes: Fallback: split a simple comma or newline separated string
     return [t.strip() for t in response.replace("\n", ",").split(",") if t.strip()]
+
+
+def _normalize_tags(tags: Iterable[str]) -> list[str]:
+    """Lowercase, trim and de-duplicate tags, keeping the model's order."""
+
+    normalized: list[str] = []
+    for tag in tags:
+        tag = " ".join(str(tag).lower().strip().lstrip("#").split())[:MAX_TAG_LENGTH]
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized[: get_settings().JOURNAL_TAGS_PER_ENTRY]
+
+
+def extract_entry_tags(content: str | None, adapter: AIModelAdapter | None = None) -> list[str]:
+    """Ask the model for the tags of one journal entry."""
+
+    if not content or not content.strip():
+        return []
+    adapter = adapter or AIModelAdapter("OpenAI")
+
+    # Notes: Instruction for the AI to generate JSON list of tags
+    system_prompt = (
+        f"Extract 1-{get_settings().JOURNAL_TAGS_PER_ENTRY} short keywords that summarize the "
+        "user's goals or focus areas from the provided journal entry. Return them as JSON in "
+        "the form {\"tags\": [\"tag1\", \"tag2\"]}."
+    )
+    response = adapter.generate(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content},
+        ],
+        temperature=0.3,
+    )
+    return _normalize_tags(_parse_tags(response))
+
+
+def _store_tags(connection, row: Any, tags: Sequence[str]) -> bool:
+    """Replace an entry's tags; return False if the entry changed since it was read."""
+
+    # Notes: Keep updated_at as-is so summary fingerprints do not see a change
+    marked = connection.execute(
+        update(_entries)
+        .where(_entries.c.id == row.id, _entries.c.updated_at == row.updated_at)
+        .values(tags_indexed=True, updated_at=_entries.c.updated_at)
+    )
+    if marked.rowcount == 0:
+        return False
+    connection.execute(delete(_tags).where(_tags.c.entry_id == row.id))
+    if tags:
+        connection.execute(
+            insert(_tags),
+            [
+                {
+                    "entry_id": row.id,
+                    "tag": tag,
+                    "position": position,
+                    "user_id": row.user_id,
+                    "created_at": row.created_at or datetime.utcnow(),
+                }
+                for position, tag in enumerate(tags)
+            ],
+        )
+    return True
+
+
+def index_entries(db: Session, rows: Sequence[Any]) -> list[int]:
+    """Tag each ``_pending_select`` row; return the user ids of the entries stored.
+
+    An entry whose extraction fails stays pending for a later pass. The
+    caller commits.
+    """
+
+    adapter = AIModelAdapter("OpenAI")
+    stored: list[int] = []
+    for row in rows:
+        try:
+            tags = extract_entry_tags(row.content, adapter)
+        except Exception as exc:
+            logger.warning("Tag extraction failed for journal entry %s: %s", row.id, exc)
+            continue
+        if _store_tags(db.connection(), row, tags):
+            stored.append(row.user_id)
+    return stored
+
+
+def _pending_select():
+    return select(
+        _entries.c.id,
+        _entries.c.user_id,
+        _entries.c.created_at,
+        _entries.c.updated_at,
+        _entries.c.content,
+    ).where(_entries.c.tags_indexed.is_(False), _entries.c.user_id.is_not(None))
+
+
+def index_pending_entries(
+    db: Session, user_id: int | None = None, *, limit: int, after_id: int = 0
+) -> tuple[int, int | None]:
+    """Tag up to ``limit`` untagged entries with ids above ``after_id`` and commit.
+
+    Returns ``(tagged, last_id)``; ``last_id`` is None once nothing is left,
+    and is the cursor for the next call otherwise.
+    """
+
+    stmt = _pending_select().where(_entries.c.id > after_id)
+    if user_id is not None:
+        stmt = stmt.where(_entries.c.user_id == user_id)
+    rows = db.execute(stmt.order_by(_entries.c.id).limit(limit)).all()
+    if not rows:
+        return 0, None
+    stored = index_entries(db, rows)
+    db.commit()
+    return len(stored), rows[-1].id
+
+
+def _recency_weight(now: datetime):
+    """SQL weight halving for every ``JOURNAL_TAG_HALF_LIFE_DAYS`` of entry age."""
+
+    half_life = timedelta(days=get_settings().JOURNAL_TAG_HALF_LIFE_DAYS)
+    return case(
+        *[(_tags.c.created_at >= now - half_life * (step + 1), 0.5**step) for step in range(RECENCY_STEPS)],
+        else_=0.5**RECENCY_STEPS,
+    )
+
+
+def top_tags(
+    db: Session,
+    user_id: int | None = None,
+    *,
+    limit: int = TOP_TAGS,
+    since: datetime | None = None,
+    now: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Rank stored tags by recency-weighted frequency, for one user or everyone.
+
+    Each row holds the ``tag``, its ``score``, and how many ``entries`` and
+    distinct ``users`` it appears for.
+    """
+
+    score = func.sum(_recency_weight(now or datetime.utcnow())).label("score")
+    stmt = select(
+        _tags.c.tag,
+        score,
+        func.count().label("entries"),
+        func.count(_tags.c.user_id.distinct()).label("users"),
+    )
+    if user_id is not None:
+        stmt = stmt.where(_tags.c.user_id == user_id)
+    if since is not None:
+        stmt = stmt.where(_tags.c.created_at >= since)
+    stmt = (
+        stmt.group_by(_tags.c.tag)
+        .order_by(score.desc(), func.min(_tags.c.position), _tags.c.tag)
+        .limit(limit)
+    )
+    return [
+        {"tag": tag, "score": round(float(weight), 4), "entries": entries, "users": users}
+        for tag, weight, entries, users in db.execute(stmt)
+    ]
+
+
+# Notes: Rank the user's indexed tags; pending entries are only queued, never tagged inline
+
+def extract_tags_from_journals(db: Session, user_id: int) -> list[str]:
+    """Return goal or theme tags extracted from the user's journals."""
+    settings = get_settings()
+    if _tags_in_background():
+        pending = db.execute(
+            select(_entries.c.id)
+            .where(_entries.c.tags_indexed.is_(False), _entries.c.user_id == user_id)
+            .order_by(_entries.c.id.desc())
+            .limit(settings.JOURNAL_TAG_READ_BATCH)
+        ).scalars().all()
+        schedule_tagging(pending)
+    return [row["tag"] for row in top_tags(db, user_id)]
+
+
+def _content_changed(entry: JournalEntry) -> bool:
+    return inspect(entry).attrs.content.history.has_changes()
+
+
+def _flag_edited_entries(session, flush_context, instances) -> None:
+    """Mark entries whose content is being edited as needing new tags."""
+
+    for obj in session.dirty:
+        if isinstance(obj, JournalEntry) and _content_changed(obj):
+            obj.tags_indexed = False
+
+
+def _drop_stale_tags(session, flush_context) -> None:
+    """Drop the tags of edited or deleted entries and remember what to re-tag."""
+
+    written = [obj.id for obj in session.new if isinstance(obj, JournalEntry)]
+    edited = [obj.id for obj in session.dirty if isinstance(obj, JournalEntry) and _content_changed(obj)]
+    removed = [obj.id for obj in session.deleted if isinstance(obj, JournalEntry)]
+    if edited or removed:
+        session.connection().execute(delete(_tags).where(_tags.c.entry_id.in_(edited + removed)))
+    if written or edited:
+        session.info.setdefault(_PENDING_KEY, set()).update(written + edited)
+
+
+def _schedule_tagging(session) -> None:
+    """Hand the entries a commit wrote to the tagging pool."""
+
+    entry_ids = session.info.pop(_PENDING_KEY, None)
+    if entry_ids and _tags_in_background():
+        schedule_tagging(entry_ids)
+
+
+def _forget_pending(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _tags_in_background() -> bool:
+    """Return whether written entries go to the pool, whose sessions need a connection of their own."""
+
+    if get_settings().JOURNAL_TAGGING_MODE != MODE_BACKGROUND:
+        return False
+    return not shares_one_connection(SessionLocal.kw.get("bind"))
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=get_settings().JOURNAL_TAGGING_WORKERS,
+                thread_name_prefix="journal-tags",
+            )
+        return _pool
+
+
+def schedule_tagging(entry_ids: Iterable[int]) -> None:
+    """Queue entries on the tagging pool unless this process already has them queued."""
+
+    with _scheduled_lock:
+        queued = sorted(set(entry_ids) - _scheduled)
+        _scheduled.update(queued)
+    if queued:
+        _get_pool().submit(_tag_in_background, queued)
+
+
+def _tag_in_background(entry_ids: list[int]) -> None:
+    """Tag freshly written entries on a session of their own."""
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(_pending_select().where(_entries.c.id.in_(entry_ids))).all()
+        users = set(index_entries(db, rows))
+        db.commit()
+    except Exception:
+        logger.exception("Background tagging failed for journal entries %s", entry_ids)
+        return
+    finally:
+        db.close()
+        with _scheduled_lock:
+            _scheduled.difference_update(entry_ids)
+    # Notes: Cached analyze-tags results are keyed by the user's context version
+    for user_id in users:
+        invalidate_user_context(user_id)
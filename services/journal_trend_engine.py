@@ -0,0 +1,349 @@
+"""Deterministic keyword and mood trends from per-entry term vectors.
+
+Each journal entry's content is tokenized once, when it is written. An
+``after_flush`` hook stores the term counts in ``journal_term_vectors``, so
+trend analysis never re-reads or re-tokenizes journal text. Entries written
+before the table existed, or through Core bulk inserts, are vectorized
+lazily the first time their user's trends are read.
+
+:func:`compute_trends` works on NumPy arrays over a ``TREND_WINDOW_DAYS`` span:
+
+* a day x term count matrix restricted to the ``MAX_VOCABULARY`` terms found
+  in the most entries, with IDF weights over the entries in the span
+* TF-IDF per sliding window of ``SLIDING_WINDOW_DAYS``, stepping back from
+  today by ``WINDOW_STEP_DAYS``; rising and fading keywords compare the
+  latest window with the average of the earlier ones
+* ``DailyCheckIn`` moods mapped to 1-5 and correlated (Pearson) with each
+  term's daily frequency, plus a least-squares mood slope
+
+The results are the same for the same data, and computing them costs no tokens.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import delete, inspect, select
+from sqlalchemy.orm import Session
+
+from database.upsert import upsert_rows
+from models.daily_checkin import DailyCheckIn, Mood
+from models.journal_entry import JournalEntry
+from models.journal_term_vector import JournalTermVector
+
+# Notes: Analysis span and sliding window shape, in days
+TREND_WINDOW_DAYS = 90
+SLIDING_WINDOW_DAYS = 14
+WINDOW_STEP_DAYS = 7
+# Notes: Terms kept in the matrices; bounds memory for prolific writers
+MAX_VOCABULARY = 2000
+TOP_KEYWORDS = 10
+TOP_WINDOW_TERMS = 5
+# Notes: Days with both a check-in and a journal needed before reporting correlations
+MIN_MOOD_DAYS = 5
+MIN_CORRELATION = 0.3
+# Notes: Mood slope (points per 30 days) treated as a real change
+MOOD_TREND_THRESHOLD = 0.25
+
+MOOD_SCORES = {
+    Mood.EXCELLENT: 5.0,
+    Mood.GOOD: 4.0,
+    Mood.OKAY: 3.0,
+    Mood.STRUGGLING: 2.0,
+    Mood.BAD: 1.0,
+}
+
+STOPWORDS = frozenset(
+    """
+    about above after again against all also and any are aren't because been before being
+    below between both but can can't cannot could couldn't did didn't does doesn't doing don't
+    down during each few for from further get got had hadn't has hasn't have haven't having
+    her here hers herself him himself his how i'm i've into isn't it's its itself just let's
+    like more most much must myself nor not now off once only other ought our ours ourselves
+    out over own really same she she's should shouldn't some still such than that that's the
+    their theirs them themselves then there there's these they they're this those through
+    today too under until very was wasn't we're we've were weren't what what's when where
+    which while who whom why will with won't would wouldn't you you're you've your yours
+    yourself yourselves
+    """.split()
+)
+
+_TOKEN = re.compile(r"[a-z][a-z']+")
+_table = JournalTermVector.__table__
+
+
+def tokenize(text: str) -> Counter:
+    """Return lowercased term counts without stopwords or very short words."""
+
+    counts: Counter = Counter()
+    for raw in _TOKEN.findall(text.lower()):
+        if raw in STOPWORDS:
+            continue
+        term = raw.strip("'")
+        if term.endswith("'s"):
+            term = term[:-2]
+        if len(term) >= 3 and term not in STOPWORDS:
+            counts[term] += 1
+    return counts
+
+
+def _vector_row(entry_id: int, user_id: int, created_at: datetime | None, content: str | None) -> dict:
+    counts = tokenize(content or "")
+    return {
+        "entry_id": entry_id,
+        "user_id": user_id,
+        "created_at": created_at or datetime.utcnow(),
+        "terms": json.dumps(counts, separators=(",", ":")),
+        "token_count": sum(counts.values()),
+    }
+
+
+def upsert_vectors(connection, rows: Sequence[dict]) -> None:
+    """Insert or replace term vectors keyed by entry id."""
+
+    upsert_rows(
+        connection,
+        _table,
+        rows,
+        ["entry_id"],
+        lambda proposed: {c: proposed[c] for c in ("user_id", "created_at", "terms", "token_count")},
+    )
+
+
+def _vector_inputs_changed(entry: JournalEntry) -> bool:
+    state = inspect(entry)
+    return any(state.attrs[name].history.has_changes() for name in ("content", "user_id", "created_at"))
+
+
+def _sync_term_vectors(session, flush_context) -> None:
+    """Keep each flushed journal entry's term vector in step with its content."""
+
+    written = [obj for obj in session.new if isinstance(obj, JournalEntry)]
+    written += [
+        obj for obj in session.dirty if isinstance(obj, JournalEntry) and _vector_inputs_changed(obj)
+    ]
+    removed = [obj.id for obj in session.deleted if isinstance(obj, JournalEntry)]
+    if not (written or removed):
+        return
+    connection = session.connection()
+    if removed:
+        connection.execute(delete(_table).where(_table.c.entry_id.in_(removed)))
+    upsert_vectors(
+        connection,
+        [_vector_row(e.id, e.user_id, e.created_at, e.content) for e in written if e.user_id is not None],
+    )
+
+
+def ensure_vectors(db: Session, user_id: int, since: datetime) -> int:
+    """Vectorize the user's entries since ``since`` that have no stored vector."""
+
+    missing = db.execute(
+        select(JournalEntry.id, JournalEntry.user_id, JournalEntry.created_at, JournalEntry.content)
+        .outerjoin(_table, _table.c.entry_id == JournalEntry.id)
+        .where(
+            JournalEntry.user_id == user_id,
+            JournalEntry.created_at >= since,
+            _table.c.entry_id.is_(None),
+        )
+    ).all()
+    upsert_vectors(db.connection(), [_vector_row(*row) for row in missing])
+    return len(missing)
+
+
+@dataclass
+class TrendReport:
+    """Keyword and mood trends for one user over the analysis span."""
+
+    entries: int = 0
+    keyword_trends: dict[str, int] = field(default_factory=dict)
+    rising_keywords: list[str] = field(default_factory=list)
+    fading_keywords: list[str] = field(default_factory=list)
+    windows: list[dict[str, Any]] = field(default_factory=list)
+    checkins: int = 0
+    average_mood: float | None = None
+    mood_trend: str = "insufficient data"
+    mood_keywords: dict[str, dict[str, float]] = field(
+        default_factory=lambda: {"positive": {}, "negative": {}}
+    )
+
+    def mood_summary(self) -> dict[str, Any]:
+        """Return the mood and sliding-window details stored as ``mood_summary``."""
+
+        return {
+            "average_mood": self.average_mood,
+            "mood_trend": self.mood_trend,
+            "checkins": self.checkins,
+            "rising_keywords": self.rising_keywords,
+            "fading_keywords": self.fading_keywords,
+            "mood_keywords": self.mood_keywords,
+            "windows": self.windows,
+        }
+
+
+def _top(scores: np.ndarray, limit: int, minimum: float = 0.0) -> list[int]:
+    """Return the indices of the ``limit`` highest scores above ``minimum``."""
+    order = np.argsort(-scores, kind="stable")[:limit]
+    return [int(i) for i in order if scores[i] > minimum]
+
+
+def _mood_trend(days: np.ndarray, moods: np.ndarray) -> str:
+    if len(days) < MIN_MOOD_DAYS or np.ptp(days) == 0:
+        return "insufficient data"
+    slope = np.polyfit(days, moods, 1)[0] * 30
+    if slope > MOOD_TREND_THRESHOLD:
+        return "improving"
+    if slope < -MOOD_TREND_THRESHOLD:
+        return "declining"
+    return "steady"
+
+
+def compute_trends(
+    vectors: Iterable[tuple[datetime, dict[str, int]]],
+    checkins: Iterable[tuple[datetime, Mood]],
+    today: date | None = None,
+) -> TrendReport:
+    """Compute keyword and mood trends from ``(created_at, term counts)`` pairs."""
+
+    today = today or datetime.utcnow().date()
+    start = today - timedelta(days=TREND_WINDOW_DAYS)
+    n_days = TREND_WINDOW_DAYS + 1
+
+    # Notes: Flatten entries into (entry, day, term, count) coordinates
+    term_index: dict[str, int] = {}
+    entry_days: list[int] = []
+    doc_idx: list[int] = []
+    term_idx: list[int] = []
+    counts: list[int] = []
+    for created_at, terms in vectors:
+        day = (created_at.date() - start).days
+        if not 0 <= day < n_days:
+            continue
+        entry = len(entry_days)
+        entry_days.append(day)
+        for term, count in terms.items():
+            doc_idx.append(entry)
+            term_idx.append(term_index.setdefault(term, len(term_index)))
+            counts.append(count)
+
+    report = TrendReport(entries=len(entry_days))
+    mood_days, mood_values = [], []
+    for created_at, mood in checkins:
+        day = (created_at.date() - start).days
+        if 0 <= day < n_days and mood in MOOD_SCORES:
+            mood_days.append(day)
+            mood_values.append(MOOD_SCORES[mood])
+    report.checkins = len(mood_days)
+    mood_day_arr = np.asarray(mood_days, dtype=np.int64)
+    mood_arr = np.asarray(mood_values, dtype=np.float64)
+    if report.checkins:
+        report.average_mood = round(float(mood_arr.mean()), 2)
+        report.mood_trend = _mood_trend(mood_day_arr, mood_arr)
+    if not report.entries or not term_index:
+        return report
+
+    entry_day_arr = np.asarray(entry_days, dtype=np.int64)
+    doc_arr = np.asarray(doc_idx, dtype=np.int64)
+    term_arr = np.asarray(term_idx, dtype=np.int64)
+    count_arr = np.asarray(counts, dtype=np.float64)
+
+    # Notes: Keep the terms that appear in the most entries
+    df_all = np.bincount(term_arr, minlength=len(term_index))
+    keep = np.argsort(-df_all, kind="stable")[:MAX_VOCABULARY]
+    remap = np.full(len(term_index), -1, dtype=np.int64)
+    remap[keep] = np.arange(len(keep))
+    mask = remap[term_arr] >= 0
+    cols = remap[term_arr[mask]]
+    rows = entry_day_arr[doc_arr[mask]]
+    names = list(term_index)
+    vocabulary = [names[i] for i in keep]
+    n_terms = len(keep)
+
+    day_counts = np.bincount(
+        rows * n_terms + cols, weights=count_arr[mask], minlength=n_days * n_terms
+    ).reshape(n_days, n_terms)
+    df = df_all[keep].astype(np.float64)
+    idf = np.log((1.0 + report.entries) / (1.0 + df)) + 1.0
+
+    # Notes: Span-wide TF-IDF picks the headline keywords; counts keep the response shape
+    totals = day_counts.sum(axis=0)
+    overall = totals / max(totals.sum(), 1.0) * idf
+    report.keyword_trends = {vocabulary[i]: int(totals[i]) for i in _top(overall, TOP_KEYWORDS)}
+
+    # Notes: Sliding windows as differences of the cumulative day matrix
+    cumulative = np.vstack([np.zeros((1, n_terms)), np.cumsum(day_counts, axis=0)])
+    entry_cumulative = np.concatenate([[0], np.cumsum(np.bincount(entry_day_arr, minlength=n_days))])
+    mood_sum = np.bincount(mood_day_arr, weights=mood_arr, minlength=n_days)
+    mood_n = np.bincount(mood_day_arr, minlength=n_days)
+    mood_sum_cum = np.concatenate([[0.0], np.cumsum(mood_sum)])
+    mood_n_cum = np.concatenate([[0], np.cumsum(mood_n)])
+    ends = np.arange(n_days, SLIDING_WINDOW_DAYS - 1, -WINDOW_STEP_DAYS)[::-1]
+    starts = ends - SLIDING_WINDOW_DAYS
+    window_counts = cumulative[ends] - cumulative[starts]
+    window_totals = window_counts.sum(axis=1, keepdims=True)
+    window_tfidf = np.divide(window_counts, window_totals, out=np.zeros_like(window_counts), where=window_totals > 0) * idf
+
+    for w, (lo, hi) in enumerate(zip(starts, ends)):
+        checkin_count = mood_n_cum[hi] - mood_n_cum[lo]
+        report.windows.append(
+            {
+                "start": (start + timedelta(days=int(lo))).isoformat(),
+                "end": (start + timedelta(days=int(hi) - 1)).isoformat(),
+                "entries": int(entry_cumulative[hi] - entry_cumulative[lo]),
+                "top_terms": [vocabulary[i] for i in _top(window_tfidf[w], TOP_WINDOW_TERMS)],
+                "average_mood": round(float((mood_sum_cum[hi] - mood_sum_cum[lo]) / checkin_count), 2)
+                if checkin_count
+                else None,
+            }
+        )
+
+    if len(ends) > 1:
+        change = window_tfidf[-1] - window_tfidf[:-1].mean(axis=0)
+        report.rising_keywords = [vocabulary[i] for i in _top(change, TOP_WINDOW_TERMS)]
+        report.fading_keywords = [vocabulary[i] for i in _top(-change, TOP_WINDOW_TERMS)]
+
+    # Notes: Correlate daily term frequency with the day's average mood
+    both = np.flatnonzero((mood_n > 0) & (day_counts.sum(axis=1) > 0))
+    if len(both) >= MIN_MOOD_DAYS:
+        freq = day_counts[both] / day_counts[both].sum(axis=1, keepdims=True)
+        mood = mood_sum[both] / mood_n[both]
+        freq_c = freq - freq.mean(axis=0)
+        mood_c = mood - mood.mean()
+        denom = np.sqrt((freq_c**2).sum(axis=0)) * np.sqrt((mood_c**2).sum())
+        corr = np.divide(freq_c.T @ mood_c, denom, out=np.zeros(n_terms), where=denom > 0)
+        # Notes: A term seen on a single day correlates perfectly by accident
+        corr[(day_counts[both] > 0).sum(axis=0) < 2] = 0.0
+        for label, sign in (("positive", 1.0), ("negative", -1.0)):
+            report.mood_keywords[label] = {
+                vocabulary[i]: round(float(corr[i]), 2)
+                for i in _top(sign * corr, TOP_WINDOW_TERMS, MIN_CORRELATION)
+            }
+    return report
+
+
+def compute_user_trends(db: Session, user_id: int, today: date | None = None) -> TrendReport:
+    """Load the user's term vectors and check-ins for the span and compute trends."""
+
+    today = today or datetime.utcnow().date()
+    since = datetime.combine(today - timedelta(days=TREND_WINDOW_DAYS), datetime.min.time())
+    ensure_vectors(db, user_id, since)
+    vectors = db.execute(
+        select(_table.c.created_at, _table.c.terms).where(
+            _table.c.user_id == user_id, _table.c.created_at >= since
+        )
+    ).all()
+    checkins = db.execute(
+        select(DailyCheckIn.created_at, DailyCheckIn.mood).where(
+            DailyCheckIn.user_id == user_id, DailyCheckIn.created_at >= since
+        )
+    ).all()
+    return compute_trends(
+        ((created_at, json.loads(terms)) for created_at, terms in vectors),
+        checkins,
+        today,
+    )
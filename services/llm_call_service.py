@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-# Notes: Import OpenAI SDK and application settings loader
-from openai import OpenAI, AuthenticationError
-from config import get_settings
+# Notes: Import OpenAI SDK errors and the shared lazily built clients
+from openai import AuthenticationError
+from services import llm_client
+from services.llm_rate_limiter import LLMQueueTimeout
 
-
-# Notes: Initialize the OpenAI client with API key from settings
-_client = OpenAI(api_key=get_settings().openai_api_key)
+# Notes: Returned when the provider stays saturated past the queue deadline
+BUSY_MESSAGE = "The AI service is busy right now. Please try again shortly."
 
 
 def call_llm(prompt_payload: list[dict[str, str]]) -> str:
@@ -16,16 +16,27 @@ def call_llm(prompt_payload: list[dict[str, str]]) -> str:
 
     # Notes: Send the payload to the chat completion endpoint
     try:
-        completion = _client.chat.completions.create(
-            model="gpt-4o",
-            messages=prompt_payload,
-            temperature=0.7,
-            max_tokens=1024,
+        return llm_client.chat_completion(
+            prompt_payload, model="gpt-4o", temperature=0.7, max_tokens=1024
+        )
+    except AuthenticationError:
+        return "Authentication failed when communicating with OpenAI."
+    except LLMQueueTimeout:
+        return BUSY_MESSAGE
+    except Exception:
+        return "An unexpected error occurred while generating the response."
+
+async def acall_llm(prompt_payload: list[dict[str, str]]) -> str:
+    """Async variant of :func:`call_llm` that does not block the event loop."""
+
+    try:
+        return await llm_client.achat_completion(
+            prompt_payload, model="gpt-4o", temperature=0.7, max_tokens=1024
         )
-        # Notes: Extract and return the first choice text
-        return completion.choices[0].message.content
     except AuthenticationError:
         return "Authentication failed when communicating with OpenAI."
+    except LLMQueueTimeout:
+        return BUSY_MESSAGE
     except Exception:
         return "An unexpected error occurred while generating the response."
 
@@ -0,0 +1,311 @@
+"""Shared asyncio LLM client layer used by every AI service.
+
+Request handlers ``await`` :func:`achat_completion`, which runs on a single
+``AsyncOpenAI`` client backed by a pooled ``httpx.AsyncClient``. The event
+loop is never blocked while the model is generating, so one worker can keep
+hundreds of coaching requests in flight. Batch jobs and synchronous code paths
+use :func:`chat_completion`, a blocking shim over a pooled sync client.
+Both consult :mod:`services.llm_response_cache` for temperature-0 calls
+(``cache`` overrides that either way), and both return an :class:`~services.llm_usage.LLMResult`:
+the response text carrying the provider's token usage, model and latency.
+:func:`astream_chat_completion` asks for usage in the stream's last chunk and
+hands the same result to its ``on_usage`` callback.
+Completions are admitted by :mod:`services.llm_rate_limiter`, which
+queues them under per-model limits and owns retries of 429s, so the clients
+they use are built without SDK retries. Other OpenAI endpoints (moderations,
+assistants, threads and runs) are not covered by the rate controller. They
+use :func:`get_sync_api_client` / :func:`get_async_api_client`, which share the
+same connection pools but keep the SDK's default retries.
+"""
+
+from __future__ import annotations
+
+import inspect
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import httpx
+
+# Notes: Import both OpenAI SDK clients; they share configuration below
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI, OpenAI
+
+from config import get_settings
+from services import llm_rate_limiter, llm_response_cache
+from services.llm_usage import LLMResult
+from services.provider_registry import registry
+
+DEFAULT_MODEL = "gpt-4o"
+
+# Notes: Provider names under which the shared clients are registered
+OPENAI_ASYNC_PROVIDER = "openai_async"
+OPENAI_SYNC_PROVIDER = "openai"
+OPENAI_ASYNC_API_PROVIDER = "openai_async_api"
+OPENAI_SYNC_API_PROVIDER = "openai_api"
+
+
+def _pool_limits() -> httpx.Limits:
+    """Return connection pool limits derived from settings."""
+
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+def _build_async_client() -> AsyncOpenAI:
+    """Construct the pooled ``AsyncOpenAI`` client from settings."""
+
+    settings = get_settings()
+    timeout = settings.LLM_REQUEST_TIMEOUT_SECONDS
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout=timeout,
+        # Notes: Retries go through the rate limiter so 429s adjust the send rate
+        max_retries=0,
+        http_client=httpx.AsyncClient(limits=_pool_limits(), timeout=timeout),
+    )
+
+
+def _build_sync_client() -> OpenAI:
+    """Construct the pooled blocking ``OpenAI`` client from settings."""
+
+    settings = get_settings()
+    timeout = settings.LLM_REQUEST_TIMEOUT_SECONDS
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout=timeout,
+        # Notes: Retries go through the rate limiter so 429s adjust the send rate
+        max_retries=0,
+        http_client=httpx.Client(limits=_pool_limits(), timeout=timeout),
+    )
+
+
+registry.register(OPENAI_ASYNC_PROVIDER, _build_async_client)
+registry.register(OPENAI_SYNC_PROVIDER, _build_sync_client)
+# Notes: Copies of the completion clients that keep SDK retries; they share the connection pools
+registry.register(
+    OPENAI_ASYNC_API_PROVIDER,
+    lambda: get_async_client().with_options(max_retries=DEFAULT_MAX_RETRIES),
+)
+registry.register(
+    OPENAI_SYNC_API_PROVIDER,
+    lambda: get_sync_client().with_options(max_retries=DEFAULT_MAX_RETRIES),
+)
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Return the shared ``AsyncOpenAI`` completion client, creating it on first use."""
+
+    return registry.get(OPENAI_ASYNC_PROVIDER)
+
+
+def get_sync_client() -> OpenAI:
+    """Return the shared blocking ``OpenAI`` completion client for batch jobs."""
+
+    return registry.get(OPENAI_SYNC_PROVIDER)
+
+
+def get_async_api_client() -> AsyncOpenAI:
+    """Return the async client for endpoints outside the rate controller."""
+
+    return registry.get(OPENAI_ASYNC_API_PROVIDER)
+
+
+def get_sync_api_client() -> OpenAI:
+    """Return the blocking client for endpoints outside the rate controller."""
+
+    return registry.get(OPENAI_SYNC_API_PROVIDER)
+
+
+def _elapsed_ms(start: float) -> int:
+    """Return milliseconds since ``start`` (a ``perf_counter`` reading)."""
+
+    return int((time.perf_counter() - start) * 1000)
+
+
+async def _maybe_await(value: Any) -> None:
+    """Await ``value`` when a callback returned an awaitable."""
+
+    if inspect.isawaitable(value):
+        await value
+
+
+def _cached_result(text: str, model: str) -> LLMResult:
+    """Wrap a response cache hit; no provider tokens were spent on it."""
+
+    return LLMResult(text, model=model, from_cache=True)
+
+
+async def achat_completion(
+    messages: list[dict[str, str]],
+    *,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.7,
+    max_tokens: int = 1024,
+    cache: bool | None = None,
+) -> LLMResult:
+    """Return the first choice text of a chat completion without blocking."""
+
+    response_cache = llm_response_cache.resolve_cache(cache, temperature)
+    if response_cache is not None:
+        key = llm_response_cache.cache_key(model, messages, temperature, max_tokens)
+        cached = await response_cache.aget(key)
+        if cached is not None:
+            return _cached_result(cached, model)
+
+    start = time.perf_counter()
+    completion = await llm_rate_limiter.arun(
+        model,
+        messages,
+        max_tokens,
+        lambda: get_async_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        ),
+    )
+    result = LLMResult.from_completion(completion, model, _elapsed_ms(start))
+    if response_cache is not None:
+        await response_cache.aset(key, model, result.text)
+    return result
+
+
+async def astream_chat_completion(
+    messages: list[dict[str, str]],
+    *,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.7,
+    max_tokens: int = 1024,
+    cache: bool | None = None,
+    on_usage: Callable[[LLMResult], Any | Awaitable[Any]] | None = None,
+) -> AsyncIterator[str]:
+    """Yield text deltas of a streamed chat completion as they arrive.
+
+    A response cache hit is yielded as a single delta. Once the stream ends,
+    ``on_usage`` receives the full text as an :class:`LLMResult` carrying the
+    usage reported in the final chunk.
+    """
+
+    response_cache = llm_response_cache.resolve_cache(cache, temperature)
+    if response_cache is not None:
+        key = llm_response_cache.cache_key(model, messages, temperature, max_tokens)
+        cached = await response_cache.aget(key)
+        if cached is not None:
+            yield cached
+            if on_usage is not None:
+                await _maybe_await(on_usage(_cached_result(cached, model)))
+            return
+
+    start = time.perf_counter()
+    stream = await llm_rate_limiter.arun(
+        model,
+        messages,
+        max_tokens,
+        lambda: get_async_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            # Notes: The provider appends a choice-less chunk carrying the usage block
+            stream_options={"include_usage": True},
+        ),
+    )
+    parts: list[str] = []
+    usage = None
+    streamed_model = model
+    async for chunk in stream:
+        streamed_model = getattr(chunk, "model", None) or streamed_model
+        if getattr(chunk, "usage", None) is not None:
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    result = LLMResult.from_usage("".join(parts), usage, streamed_model, _elapsed_ms(start))
+    llm_rate_limiter.reconcile(
+        model, messages, max_tokens, result.total_tokens if usage is not None else None
+    )
+    if response_cache is not None:
+        await response_cache.aset(key, model, result.text)
+    if on_usage is not None:
+        await _maybe_await(on_usage(result))
+
+
+def chat_completion(
+    messages: list[dict[str, str]],
+    *,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.7,
+    max_tokens: int = 1024,
+    cache: bool | None = None,
+) -> LLMResult:
+    """Blocking variant of :func:`achat_completion` for jobs and sync routes."""
+
+    response_cache = llm_response_cache.resolve_cache(cache, temperature)
+    if response_cache is not None:
+        key = llm_response_cache.cache_key(model, messages, temperature, max_tokens)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return _cached_result(cached, model)
+
+    start = time.perf_counter()
+    completion = llm_rate_limiter.run(
+        model,
+        messages,
+        max_tokens,
+        lambda: get_sync_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        ),
+    )
+    result = LLMResult.from_completion(completion, model, _elapsed_ms(start))
+    if response_cache is not None:
+        response_cache.set(key, model, result.text)
+    return result
+
+
+async def aclose() -> None:
+    """Close pooled connections; called from the application shutdown hook."""
+
+    await registry.aclose()
+
+
+def set_clients(
+    async_client: AsyncOpenAI | None = None, sync_client: OpenAI | None = None
+) -> None:
+    """Install explicit clients, e.g. ones pointed at a local stub in tests.
+
+    Each client serves both completions and the other endpoints.
+    """
+
+    registry.override(OPENAI_ASYNC_PROVIDER, async_client)
+    registry.override(OPENAI_SYNC_PROVIDER, sync_client)
+    registry.override(OPENAI_ASYNC_API_PROVIDER, async_client)
+    registry.override(OPENAI_SYNC_API_PROVIDER, sync_client)
+
+
+__all__ = [
+    "DEFAULT_MODEL",
+    "OPENAI_ASYNC_PROVIDER",
+    "OPENAI_SYNC_PROVIDER",
+    "OPENAI_ASYNC_API_PROVIDER",
+    "OPENAI_SYNC_API_PROVIDER",
+    "get_async_client",
+    "get_sync_client",
+    "get_async_api_client",
+    "get_sync_api_client",
+    "achat_completion",
+    "astream_chat_completion",
+    "chat_completion",
+    "aclose",
+    "set_clients",
+]
@@ -0,0 +1,389 @@
+"""Per-model admission control for outbound LLM traffic.
+
+Every chat completion sent by :mod:`services.llm_client` first reserves one
+request and an estimated number of tokens from two token buckets kept for its
+model: requests per minute and tokens per minute. Reservations are handed out
+in arrival order, so a caller that cannot be admitted right away waits its
+turn instead of firing at the provider. If the wait would overrun the
+caller's deadline the reservation is refused and :class:`LLMQueueTimeout` is
+raised without spending any budget.
+
+The buckets refill at ``limit * factor`` where ``factor`` follows AIMD: a 429
+halves it (down to a floor) and pauses the model until ``Retry-After`` has
+elapsed, while every success adds a small step back up to the configured
+ceiling. Throttled and transient failures are retried here while the deadline
+allows, which is why the completion clients are built with ``max_retries=0``.
+
+Once the response arrives, the token estimate is reconciled with the usage
+the provider reported so the tokens-per-minute bucket tracks real spend.
+Streams report usage only in their last chunk; :func:`reconcile` settles them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+from config import get_settings
+from utils.logger import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+# Notes: Errors retried by the controller; only RateLimitError shrinks the rate
+_TRANSIENT_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class LLMQueueTimeout(TimeoutError):
+    """Raised when a call cannot be admitted before its deadline."""
+
+
+class _Bucket:
+    """Token bucket whose level may go negative to queue reservations."""
+
+    def __init__(self, per_minute: float, burst_seconds: float, now: float):
+        self.per_minute = per_minute
+        self.burst_seconds = burst_seconds
+        self.level = self.capacity(1.0)
+        self.updated = now
+
+    def rate(self, factor: float) -> float:
+        """Units refilled per second at the current AIMD factor."""
+        return self.per_minute * factor / 60.0
+
+    def capacity(self, factor: float) -> float:
+        """Largest burst the bucket can hold."""
+        return max(self.rate(factor) * self.burst_seconds, 1.0)
+
+    def refill(self, now: float, factor: float) -> None:
+        self.level = min(self.capacity(factor), self.level + (now - self.updated) * self.rate(factor))
+        self.updated = now
+
+    def wait_for(self, cost: float, factor: float) -> float:
+        """Seconds until ``cost`` units are available."""
+        if self.level >= cost:
+            return 0.0
+        return (cost - self.level) / self.rate(factor)
+
+
+class ModelRateController:
+    """Request and token buckets plus the AIMD factor for one model."""
+
+    def __init__(
+        self,
+        model: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        *,
+        burst_seconds: float = 10.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        min_factor: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self._clock = clock
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, burst_seconds, now)
+        self._tokens = _Bucket(tokens_per_minute, burst_seconds, now)
+        self._increase = increase
+        self._decrease = decrease
+        self._min_factor = min_factor
+        self._lock = threading.Lock()
+        self.factor = 1.0
+        self.paused_until = 0.0
+        self._waiting = 0
+        self._stats = {
+            "admitted": 0,
+            "rejected": 0,
+            "throttled": 0,
+            "retried": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    def reserve(self, tokens: int, max_wait: float) -> float:
+        """Reserve a request slot and ``tokens``; return the seconds to wait.
+
+        Raises :class:`LLMQueueTimeout` when the wait would exceed
+        ``max_wait``; nothing is reserved in that case.
+        """
+
+        with self._lock:
+            now = self._clock()
+            self._requests.refill(now, self.factor)
+            self._tokens.refill(now, self.factor)
+            wait = max(
+                self._requests.wait_for(1, self.factor),
+                self._tokens.wait_for(tokens, self.factor),
+                self.paused_until - now,
+                0.0,
+            )
+            if wait > max_wait:
+                self._stats["rejected"] += 1
+                raise LLMQueueTimeout(
+                    f"{self.model} queue wait {wait:.1f}s exceeds the {max(max_wait, 0):.1f}s deadline"
+                )
+            self._requests.level -= 1
+            self._tokens.level -= tokens
+            self._stats["admitted"] += 1
+            self._stats["wait_ms_total"] += wait * 1000
+            self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait * 1000)
+            return wait
+
+    def settle(self, reserved: int, actual: int | None) -> None:
+        """Return unused estimated tokens, or charge the overrun."""
+
+        if actual is None:
+            return
+        with self._lock:
+            self._tokens.level += reserved - actual
+
+    def on_success(self) -> None:
+        """Additive increase back toward the configured limits."""
+
+        with self._lock:
+            self.factor = min(1.0, self.factor + self._increase)
+
+    def on_throttle(self, retry_after: float | None) -> None:
+        """Multiplicative decrease and pause after a 429."""
+
+        with self._lock:
+            now = self._clock()
+            self.factor = max(self._min_factor, self.factor * self._decrease)
+            # Notes: Drop any banked burst so queued callers spread out at the new rate
+            self._requests.level = min(self._requests.level, 0.0)
+            self._tokens.level = min(self._tokens.level, 0.0)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            self._stats["throttled"] += 1
+
+    def on_retry(self) -> None:
+        with self._lock:
+            self._stats["retried"] += 1
+
+    def track_waiting(self, delta: int) -> None:
+        """Adjust the number of callers sleeping in the queue."""
+
+        with self._lock:
+            self._waiting += delta
+
+    def stats(self) -> dict[str, Any]:
+        """Return admission counters, queue depth and current limits."""
+
+        with self._lock:
+            admitted = self._stats["admitted"]
+            return {
+                **self._stats,
+                "wait_ms_avg": round(self._stats["wait_ms_total"] / admitted, 2) if admitted else 0.0,
+                "queue_depth": self._waiting,
+                "factor": round(self.factor, 3),
+                "requests_per_minute": round(self._requests.per_minute * self.factor, 1),
+                "tokens_per_minute": round(self._tokens.per_minute * self.factor, 1),
+                "paused_for_ms": max(0, int((self.paused_until - self._clock()) * 1000)),
+            }
+
+
+_controllers: dict[str, ModelRateController] = {}
+_controllers_lock = threading.Lock()
+
+
+def _limits_for(model: str) -> dict[str, float]:
+    """Return the configured limits for ``model``; the longest prefix wins."""
+
+    settings = get_settings()
+    matches = [name for name in settings.LLM_RATE_LIMITS if model.startswith(name)]
+    if matches:
+        return settings.LLM_RATE_LIMITS[max(matches, key=len)]
+    return settings.LLM_DEFAULT_RATE_LIMIT
+
+
+def get_controller(model: str) -> ModelRateController:
+    """Return the shared controller for ``model``, creating it on first use."""
+
+    with _controllers_lock:
+        controller = _controllers.get(model)
+        if controller is None:
+            settings = get_settings()
+            limits = _limits_for(model)
+            controller = ModelRateController(
+                model,
+                limits["rpm"],
+                limits["tpm"],
+                burst_seconds=settings.LLM_RATE_BURST_SECONDS,
+                increase=settings.LLM_AIMD_INCREASE,
+                decrease=settings.LLM_AIMD_DECREASE,
+                min_factor=settings.LLM_AIMD_MIN_FACTOR,
+            )
+            _controllers[model] = controller
+        return controller
+
+
+def estimate_tokens(messages: list[dict[str, str]], max_tokens: int) -> int:
+    """Rough prompt size (four characters per token) plus the output ceiling."""
+
+    chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return chars // 4 + len(messages) * 4 + max_tokens
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Read the provider's ``Retry-After`` hint in seconds, if any."""
+
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+def _actual_tokens(response: Any) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage is not None else None
+
+
+def _backoff(controller: ModelRateController, exc: Exception, attempt: int) -> float:
+    """Record a failed attempt and return the delay before the next one."""
+
+    controller.on_retry()
+    if isinstance(exc, RateLimitError):
+        retry_after = _retry_after(exc)
+        controller.on_throttle(retry_after)
+        # Notes: The pause is enforced by the next reservation
+        return 0.0
+    return min(0.5 * 2**attempt, 8.0)
+
+
+def _can_retry(exc: Exception, attempt: int, deadline: float) -> bool:
+    settings = get_settings()
+    return (
+        isinstance(exc, _TRANSIENT_ERRORS)
+        and attempt < settings.LLM_RATE_MAX_RETRIES
+        and time.monotonic() < deadline
+    )
+
+
+async def arun(
+    model: str,
+    messages: list[dict[str, str]],
+    max_tokens: int,
+    call: Callable[[], Awaitable[T]],
+    *,
+    timeout: float | None = None,
+) -> T:
+    """Admit and run ``call`` for ``model``, retrying throttled attempts."""
+
+    settings = get_settings()
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return await call()
+    controller = get_controller(model)
+    tokens = estimate_tokens(messages, max_tokens)
+    deadline = time.monotonic() + (timeout if timeout is not None else settings.LLM_QUEUE_TIMEOUT_SECONDS)
+    attempt = 0
+    while True:
+        wait = controller.reserve(tokens, deadline - time.monotonic())
+        if wait > 0:
+            controller.track_waiting(1)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                controller.track_waiting(-1)
+        try:
+            response = await call()
+        except Exception as exc:
+            controller.settle(tokens, 0)
+            if not _can_retry(exc, attempt, deadline):
+                raise
+            delay = _backoff(controller, exc, attempt)
+            logger.warning("Retrying %s call after %s", model, type(exc).__name__)
+            attempt += 1
+            if delay:
+                await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            continue
+        controller.settle(tokens, _actual_tokens(response))
+        controller.on_success()
+        return response
+
+
+def run(
+    model: str,
+    messages: list[dict[str, str]],
+    max_tokens: int,
+    call: Callable[[], T],
+    *,
+    timeout: float | None = None,
+) -> T:
+    """Blocking variant of :func:`arun` for jobs and sync routes."""
+
+    settings = get_settings()
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return call()
+    controller = get_controller(model)
+    tokens = estimate_tokens(messages, max_tokens)
+    deadline = time.monotonic() + (timeout if timeout is not None else settings.LLM_QUEUE_TIMEOUT_SECONDS)
+    attempt = 0
+    while True:
+        wait = controller.reserve(tokens, deadline - time.monotonic())
+        if wait > 0:
+            controller.track_waiting(1)
+            try:
+                time.sleep(wait)
+            finally:
+                controller.track_waiting(-1)
+        try:
+            response = call()
+        except Exception as exc:
+            controller.settle(tokens, 0)
+            if not _can_retry(exc, attempt, deadline):
+                raise
+            delay = _backoff(controller, exc, attempt)
+            logger.warning("Retrying %s call after %s", model, type(exc).__name__)
+            attempt += 1
+            if delay:
+                time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            continue
+        controller.settle(tokens, _actual_tokens(response))
+        controller.on_success()
+        return response
+
+
+def reconcile(
+    model: str, messages: list[dict[str, str]], max_tokens: int, actual: int | None
+) -> None:
+    """Settle a streamed call's estimate once its final chunk reports usage.
+
+    A stream object carries no usage when :func:`arun` returns it, so that
+    reservation is left at the estimate until the stream has been read.
+    """
+
+    if not get_settings().LLM_RATE_LIMIT_ENABLED:
+        return
+    get_controller(model).settle(estimate_tokens(messages, max_tokens), actual)
+
+
+def get_rate_limiter_stats() -> dict[str, dict[str, Any]]:
+    """Return per-model admission metrics for the admin dashboard."""
+
+    with _controllers_lock:
+        controllers = list(_controllers.values())
+    return {controller.model: controller.stats() for controller in controllers}
+
+
+def reset_rate_limiters() -> None:
+    """Drop every controller so limits are rebuilt from settings (used by tests)."""
+
+    with _controllers_lock:
+        _controllers.clear()
+
+# Footnote: Orchestration concurrency semaphores in orchestration.runtime still cap in-flight calls per loop.
@@ -0,0 +1,284 @@
+"""Content-addressed cache for LLM chat completions.
+
+Many prompts are sent verbatim more than once: temperature-0 self-scores,
+re-run summaries and identical persona/system payloads. Responses are keyed
+by a SHA-256 of the canonical JSON of ``(model, messages, temperature,
+max_tokens)`` and kept in an in-process LRU with a TTL. An optional
+persistent tier (the ``llm_response_cache`` table) shares entries across
+workers and restarts; it is pruned to ``LLM_CACHE_PERSISTENT_MAX_ROWS`` by
+age.
+
+Only temperature-0 calls are cached by default: sampled output such as
+open-ended coaching replies or reflection questions must not be replayed to
+every user who sends the same prompt. ``llm_client.chat_completion`` /
+``achat_completion`` and ``AIModelAdapter.generate`` take ``cache=True`` to
+opt a sampled call in, or ``cache=False`` to bypass the cache entirely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from config import get_settings
+from models.llm_response_cache import LLMResponseCacheEntry
+from utils.logger import get_logger
+
+logger = get_logger()
+
+_table = LLMResponseCacheEntry.__table__
+
+
+def cache_key(model: str, messages: list[dict], temperature: float, max_tokens: int) -> str:
+    """Return the hex digest identifying one completion request."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": float(temperature),
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DatabaseResponseStore:
+    """Persistent cache tier stored in the ``llm_response_cache`` table."""
+
+    def __init__(self, bind=None, max_rows: int | None = None, prune_every: int = 100):
+        self._bind = bind
+        self.max_rows = max_rows or get_settings().LLM_CACHE_PERSISTENT_MAX_ROWS
+        self.prune_every = prune_every
+        self._writes = 0
+
+    @property
+    def bind(self):
+        """Return the engine, defaulting to the application's."""
+        if self._bind is None:
+            from database.session import engine
+
+            self._bind = engine
+        return self._bind
+
+    def get(self, key: str) -> str | None:
+        """Return the unexpired response stored under ``key``."""
+        with self.bind.connect() as conn:
+            return conn.execute(
+                select(_table.c.response).where(
+                    _table.c.key == key, _table.c.expires_at > datetime.utcnow()
+                )
+            ).scalar()
+
+    def set(self, key: str, model: str, response: str, ttl_seconds: float) -> None:
+        """Store ``response`` under ``key``, replacing any previous value."""
+        now = datetime.utcnow()
+        with self.bind.begin() as conn:
+            conn.execute(delete(_table).where(_table.c.key == key))
+            conn.execute(
+                insert(_table),
+                {
+                    "key": key,
+                    "model": model,
+                    "response": response,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=ttl_seconds),
+                },
+            )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete expired rows and the oldest rows beyond ``max_rows``."""
+        with self.bind.begin() as conn:
+            removed = conn.execute(
+                delete(_table).where(_table.c.expires_at <= datetime.utcnow())
+            ).rowcount
+            cutoff = conn.execute(
+                select(_table.c.created_at)
+                .order_by(_table.c.created_at.desc())
+                .offset(self.max_rows)
+                .limit(1)
+            ).scalar()
+            if cutoff is not None:
+                removed += conn.execute(
+                    delete(_table).where(_table.c.created_at <= cutoff)
+                ).rowcount
+        return removed
+
+
+class LLMResponseCache:
+    """Two-tier response cache: in-process LRU backed by an optional store."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        store: DatabaseResponseStore | None = None,
+    ):
+        settings = get_settings()
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.LLM_CACHE_TTL_SECONDS
+        self.store = store
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "store_errors": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, key: str, response: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def _lookup_memory(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def get(self, key: str) -> str | None:
+        """Return a cached response, consulting the store on a memory miss."""
+        response = self._lookup_memory(key)
+        if response is not None:
+            return response
+        if self.store is not None:
+            try:
+                response = self.store.get(key)
+            except Exception:  # pragma: no cover - depends on database failures
+                self._count("store_errors")
+                logger.exception("LLM cache store lookup failed")
+                response = None
+            if response is not None:
+                self._count("persistent_hits")
+                self._remember(key, response)
+                return response
+        self._count("misses")
+        return None
+
+    def set(self, key: str, model: str, response: str) -> None:
+        """Cache ``response`` in every tier."""
+        if not response:
+            return
+        self._remember(key, response)
+        if self.store is not None:
+            try:
+                self.store.set(key, model, response, self.ttl_seconds)
+            except Exception:  # pragma: no cover - depends on database failures
+                self._count("store_errors")
+                logger.exception("LLM cache store write failed")
+
+    async def aget(self, key: str) -> str | None:
+        """Async :meth:`get`; the store round trip runs in a worker thread."""
+        if self.store is None:
+            return self.get(key)
+        response = self._lookup_memory(key)
+        if response is not None:
+            return response
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, model: str, response: str) -> None:
+        """Async :meth:`set`; the store write runs in a worker thread."""
+        if self.store is None:
+            self.set(key, model, response)
+        else:
+            await asyncio.to_thread(self.set, key, model, response)
+
+    def record_bypass(self) -> None:
+        """Count a call that opted out of caching."""
+        self._count("bypassed")
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters, hit rate and current size."""
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+        lookups = counters["hits"] + counters["persistent_hits"] + counters["misses"]
+        hit_total = counters["hits"] + counters["persistent_hits"]
+        return {
+            **counters,
+            "size": size,
+            "max_entries": self.max_entries,
+            "persistent": self.store is not None,
+            "hit_rate": round(hit_total / lookups, 4) if lookups else 0.0,
+        }
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """Return the process-wide cache, built from settings on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                store = DatabaseResponseStore() if get_settings().LLM_CACHE_PERSISTENT else None
+                _cache = LLMResponseCache(store=store)
+    return _cache
+
+
+def resolve_cache(cache: bool | None = None, temperature: float = 0) -> LLMResponseCache | None:
+    """Return the cache to use for one call, or ``None`` when bypassed.
+
+    With ``cache`` unset only deterministic (temperature 0) calls are cached.
+    """
+    if not get_settings().LLM_CACHE_ENABLED:
+        return None
+    response_cache = get_response_cache()
+    if cache is None:
+        cache = float(temperature) == 0
+    if not cache:
+        response_cache.record_bypass()
+        return None
+    return response_cache
+
+
+def get_llm_cache_stats() -> dict:
+    """Return counters for the admin metrics endpoint."""
+    return get_response_cache().stats()
+
+
+def clear_response_cache() -> None:
+    """Forget cached responses in this process (used by tests)."""
+    if _cache is not None:
+        _cache.clear()
+
+# Footnote: Consulted by llm_client so every chat completion path shares one cache.
@@ -0,0 +1,111 @@
+"""Provider-reported token usage carried alongside LLM responses.
+
+``llm_client`` returns :class:`LLMResult`, a ``str`` subclass, so every
+caller that treats a completion as text keeps working while logging code
+reads the exact ``usage`` block, model name and latency from the same
+object. String methods (``strip``, slicing, formatting) return plain
+``str`` and drop the usage, so read it before transforming the text.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read ``name`` from an SDK object or from a plain dict."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class LLMResult(str):
+    """Completion text plus the usage the provider reported for it."""
+
+    model: str | None
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    latency_ms: int
+    from_cache: bool
+
+    def __new__(
+        cls,
+        text: str,
+        *,
+        model: str | None = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency_ms: int = 0,
+        from_cache: bool = False,
+    ) -> "LLMResult":
+        result = super().__new__(cls, text or "")
+        result.model = model
+        result.prompt_tokens = prompt_tokens
+        result.completion_tokens = completion_tokens
+        # Notes: Cached tokens are the part of prompt_tokens billed at the cached rate
+        result.cached_tokens = cached_tokens
+        result.latency_ms = latency_ms
+        result.from_cache = from_cache
+        return result
+
+    @classmethod
+    def from_completion(cls, completion: Any, model: str, latency_ms: int) -> "LLMResult":
+        """Build a result from a chat completion response."""
+        return cls.from_usage(
+            completion.choices[0].message.content,
+            _field(completion, "usage"),
+            _field(completion, "model") or model,
+            latency_ms,
+        )
+
+    @classmethod
+    def from_usage(cls, text: str, usage: Any, model: str, latency_ms: int) -> "LLMResult":
+        """Build a result from ``text`` and a usage block, e.g. a stream's last chunk."""
+        details = _field(usage, "prompt_tokens_details")
+        return cls(
+            text,
+            model=model,
+            prompt_tokens=_field(usage, "prompt_tokens") or 0,
+            completion_tokens=_field(usage, "completion_tokens") or 0,
+            cached_tokens=_field(details, "cached_tokens") or 0,
+            latency_ms=latency_ms,
+        )
+
+    @property
+    def text(self) -> str:
+        """Return the response as a plain string."""
+        return str.__str__(self)
+
+    @property
+    def total_tokens(self) -> int:
+        """Prompt plus completion tokens."""
+        return self.prompt_tokens + self.completion_tokens
+
+
+def usage_metrics(result: Any) -> dict:
+    """Return performance-log fields for ``result``.
+
+    Plain strings (stub providers, fallback messages) carry no usage, so
+    their token fields are ``None`` rather than a guess.
+    """
+    if not isinstance(result, LLMResult):
+        return {
+            "model": None,
+            "input_tokens": None,
+            "output_tokens": None,
+            "cached_tokens": None,
+            "llm_latency_ms": None,
+        }
+    return {
+        "model": result.model,
+        "input_tokens": result.prompt_tokens,
+        "output_tokens": result.completion_tokens,
+        "cached_tokens": result.cached_tokens,
+        "llm_latency_ms": result.latency_ms,
+    }
+
+# Footnote: Consumed by the orchestration executors when writing performance logs.
@@ -0,0 +1,177 @@
+"""Memoized content moderation with a compiled local keyword matcher.
+
+Provider verdicts are cached by the SHA-256 of the text, so moderating a
+summary for both flagging paths, or re-moderating it during an admin rerun,
+costs a single round trip. Uncached texts are sent in batches; the
+moderation endpoint accepts a list of inputs and returns one result per
+input.
+
+The local keyword rules are compiled once into an Aho-Corasick automaton.
+One pass over the lowered text reports every rule category that matches, in
+place of one substring scan per word. When the provider call fails, the
+``fallback`` category supplies the verdict. Those verdicts are not cached,
+so the next call asks the provider again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from typing import Iterable, Sequence
+
+from config import get_settings
+from services import llm_client
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Notes: Rule categories; fallback words stand in for the provider when it is unreachable
+FALLBACK = "fallback"
+AUTO_FLAG = "auto_flag"
+
+KEYWORD_RULES = {
+    "forbidden": FALLBACK,
+    "banned": FALLBACK,
+    "violence": FALLBACK,
+    "suicide": AUTO_FLAG,
+    "kill": AUTO_FLAG,
+    "hate": AUTO_FLAG,
+}
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping substrings to rule categories."""
+
+    def __init__(self, rules: dict[str, str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[frozenset[str]] = [frozenset()]
+        outputs: list[set[str]] = [set()]
+        for term, category in rules.items():
+            state = 0
+            for char in term.lower():
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(category)
+
+        # Notes: Breadth-first failure links; each state inherits its suffix's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+        self._out = [frozenset(out) for out in outputs]
+
+    def scan(self, text: str) -> set[str]:
+        """Return the categories of every rule occurring in ``text``."""
+        found: set[str] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._out[state]:
+                found |= self._out[state]
+        return found
+
+
+_matcher = KeywordMatcher(KEYWORD_RULES)
+
+_lock = threading.Lock()
+_verdicts: "OrderedDict[str, bool]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "api_calls": 0, "fallbacks": 0}
+
+
+def content_hash(text: str) -> str:
+    """Return the cache key for ``text``."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def keyword_categories(text: str) -> set[str]:
+    """Return the local rule categories matched by ``text``."""
+    return _matcher.scan(text)
+
+
+def _remember(key: str, flagged: bool) -> None:
+    with _lock:
+        _verdicts[key] = flagged
+        _verdicts.move_to_end(key)
+        while len(_verdicts) > get_settings().MODERATION_CACHE_MAX_ENTRIES:
+            _verdicts.popitem(last=False)
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def moderate_batch(texts: Sequence[str]) -> list[bool]:
+    """Return a flagged verdict per text, sending only uncached texts upstream."""
+
+    keys = [content_hash(text) for text in texts]
+    verdicts: dict[str, bool] = {}
+    missing: dict[str, str] = {}
+    with _lock:
+        for key, text in zip(keys, texts):
+            if key in verdicts or key in missing:
+                continue
+            if key in _verdicts:
+                _verdicts.move_to_end(key)
+                verdicts[key] = _verdicts[key]
+                _stats["hits"] += 1
+            else:
+                missing[key] = text
+                _stats["misses"] += 1
+
+    pending = list(missing.items())
+    for chunk in _chunks(pending, get_settings().MODERATION_BATCH_SIZE):
+        try:
+            resp = llm_client.get_sync_api_client().moderations.create(input=[text for _, text in chunk])
+            results = [bool(result.flagged) for result in resp.results]
+        except Exception as exc:  # pragma: no cover - network may be disabled
+            logger.warning("moderation check failed: %s", exc)
+            with _lock:
+                _stats["fallbacks"] += len(chunk)
+            for key, text in chunk:
+                verdicts[key] = FALLBACK in keyword_categories(text)
+            continue
+        with _lock:
+            _stats["api_calls"] += 1
+        for (key, _), flagged in zip(chunk, results):
+            verdicts[key] = flagged
+            _remember(key, flagged)
+    return [verdicts[key] for key in keys]
+
+
+def is_flagged(text: str) -> bool:
+    """Return the moderation verdict for a single text."""
+    return moderate_batch([text])[0]
+
+
+def get_moderation_stats() -> dict[str, int]:
+    """Return cache and provider call counters."""
+    with _lock:
+        return {**_stats, "size": len(_verdicts)}
+
+
+def clear_moderation_cache() -> None:
+    """Forget cached verdicts and reset counters (used by tests)."""
+    with _lock:
+        _verdicts.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+# Footnote: summary_moderation_service is the only caller; routes go through it.
@@ -1,17 +1,23 @@
 """Service for managing OpenAI agents and conversations."""
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import functools
+from typing import Optional, Dict, Any, List, AsyncIterator, Iterable
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 import datetime
+from fastapi.concurrency import run_in_threadpool
 
 from agents.openai_agent import OpenAIAgent
+from database.session import SessionLocal
 from models.user import User
 from models.agent_interaction_log import AgentInteractionLog
 from models.agent_assignment import AgentAssignment
 from models.assistant_thread import AssistantThread
 from config import get_settings
+from services.assistant_registry import get_assistant_registry
 from utils.logger import get_logger
+from utils.sse import stream_text_events
 
 logger = get_logger()
 
@@ -19,8 +25,10 @@ logger = get_logger()
 class OpenAIAgentService:
     """Service for managing OpenAI Assistant agents."""
     
-    # Cache of OpenAI agents by domain
+    # Cache of OpenAI agents by domain; the remote assistants themselves are
+    # shared across workers through the assistant registry
     _agent_cache: Dict[str, OpenAIAgent] = {}
+    model: str = "gpt-4o"
     
     @classmethod
     def get_agent(cls, domain: str = "general") -> OpenAIAgent:
@@ -37,10 +45,13 @@ class OpenAIAgentService:
             # Create domain-specific instructions
             instructions = cls._get_domain_instructions(domain)
             
-            # Create a new agent
+            # Create a new agent; its assistant is looked up in the registry on first run
             agent = OpenAIAgent(
-                model="gpt-4o",
-                instructions=instructions
+                model=cls.model,
+                instructions=instructions,
+                assistant_resolver=functools.partial(
+                    get_assistant_registry().resolve, domain, cls.model, instructions
+                )
             )
             
             # Cache the agent
@@ -48,6 +59,30 @@ class OpenAIAgentService:
             
         return cls._agent_cache[domain]
     
+    @classmethod
+    async def warm_up(cls, domains: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve the assistants for ``domains`` ahead of the first chat.
+
+        Domains that fail to resolve are logged and left out of the result;
+        they are retried on their first run.
+
+        Returns:
+            Mapping of domain to assistant ID
+        """
+        domains = list(domains)
+        agents = [cls.get_agent(domain) for domain in domains]
+        results = await asyncio.gather(
+            *[agent._ensure_assistant() for agent in agents], return_exceptions=True
+        )
+        resolved = {}
+        for domain, result in zip(domains, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Assistant warm-up failed for domain {domain}: {str(result)}")
+            else:
+                resolved[domain] = result
+        return resolved
+
     @staticmethod
     def _get_domain_instructions(domain: str) -> str:
         """Get domain-specific instructions for the agent."""
@@ -101,38 +136,98 @@ class OpenAIAgentService:
         Returns:
             The agent's response
         """
+        domain, agent, db_thread, thread_id = OpenAIAgentService._prepare_run(db, user, thread_id)
+
+        # Get the agent response
+        response_data = await agent.run(prompt, context, thread_id)
+        OpenAIAgentService._record_interaction(db, user.id, domain, agent, prompt, db_thread, response_data)
+        return response_data
+
+    @staticmethod
+    async def stream_agent_response(
+        db: Session,
+        user: User,
+        prompt: str,
+        context: Optional[str] = None,
+        thread_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the agent's reply as server-sent events.
+
+        The thread and interaction log are written once the run finishes, on a
+        session of their own since the request session is closed by then, and
+        the final ``done`` event carries the thread and run identifiers.
+        """
+        domain, agent, db_thread, thread_id = OpenAIAgentService._prepare_run(db, user, thread_id)
+        user_id, thread_pk = user.id, db_thread.id if db_thread else None
+        metadata: Dict[str, Any] = {}
+
+        async def deltas():
+            async for event in agent.stream(prompt, context, thread_id):
+                if "delta" in event:
+                    yield event["delta"]
+                else:
+                    metadata.update({k: v for k, v in event.items() if k != "done"})
+
+        def persist(text: str) -> None:
+            session = SessionLocal()
+            try:
+                stored = session.get(AssistantThread, thread_pk) if thread_pk else None
+                OpenAIAgentService._record_interaction(
+                    session, user_id, domain, agent, prompt, stored, {**metadata, "response": text}
+                )
+            finally:
+                session.close()
+
+        async for frame in stream_text_events(
+            deltas(), on_complete=lambda text: run_in_threadpool(persist, text), extra=metadata
+        ):
+            yield frame
+
+    @staticmethod
+    def _prepare_run(db: Session, user: User, thread_id: Optional[str]):
+        """Return the domain, agent, stored thread and usable thread id for a user."""
         # Get the user's agent assignment
         assignment = db.query(AgentAssignment).filter_by(user_id=user.id).first()
-        
+
         # Default to general domain if no assignment exists
         domain = assignment.agent_type if assignment else "general"
-        
+
         # Get or create the agent
         agent = OpenAIAgentService.get_agent(domain)
-        
+
         # Try to find the existing thread in the database if thread_id is provided
         db_thread = None
         if thread_id:
             db_thread = db.query(AssistantThread).filter_by(
-                thread_id=thread_id, 
+                thread_id=thread_id,
                 user_id=user.id
             ).first()
-            
+
             # If the thread doesn't exist in our database, don't use it
             if not db_thread:
                 thread_id = None
-                
-        # Get the agent response
-        response_data = await agent.run(prompt, context, thread_id)
-        
+        return domain, agent, db_thread, thread_id
+
+    @staticmethod
+    def _record_interaction(
+        db: Session,
+        user_id: int,
+        domain: str,
+        agent: OpenAIAgent,
+        prompt: str,
+        db_thread: Optional[AssistantThread],
+        response_data: Dict[str, Any]
+    ) -> None:
+        """Persist the thread bookkeeping and the interaction log for one run."""
         # If this is a new thread, save it to the database
         if not db_thread and response_data.get("thread_id"):
             db_thread = AssistantThread(
-                user_id=user.id,
+                user_id=user_id,
                 thread_id=response_data["thread_id"],
                 assistant_id=response_data["assistant_id"],
                 domain=domain,
-                metadata={
+                thread_metadata={
                     "initial_prompt": prompt,
                     "model": agent.model
                 }
@@ -141,25 +236,16 @@ class OpenAIAgentService:
         # If we have an existing thread, update the last_message_at timestamp
         elif db_thread:
             db_thread.last_message_at = datetime.datetime.now()
-            
+
         # Log the interaction
         interaction_log = AgentInteractionLog(
-            user_id=user.id,
-            agent_type=domain,
+            user_id=user_id,
             user_prompt=prompt,
             ai_response=response_data["response"],
-            metadata={
-                "thread_id": response_data.get("thread_id"),
-                "run_id": response_data.get("run_id"),
-                "assistant_id": response_data.get("assistant_id"),
-                "status": response_data.get("status")
-            }
         )
         db.add(interaction_log)
         db.commit()
-        
-        return response_data
-        
+
     @staticmethod
     def get_user_threads(db: Session, user: User, limit: int = 10) -> List[AssistantThread]:
         """
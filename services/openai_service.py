@@ -1,30 +1,39 @@
-from openai import OpenAI, AuthenticationError
+from typing import AsyncIterator
 
-from config import get_settings
+from openai import AuthenticationError
 
-
-# Notes: OpenAI client configured with API key from settings
-client = OpenAI(api_key=get_settings().openai_api_key)
+# Notes: Shared async LLM client layer
+from services import llm_client
 
 SYSTEM_MESSAGE = (
     "You are Vida, an AI Life Coach. Speak casually like a trusted coach. Help clarify goals, break tasks into micro-steps, stay accountable. Keep responses short, supportive, and give clear next steps."
 )
 
 
-def get_vida_response(user_prompt: str) -> str:
+def _vida_messages(user_prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_MESSAGE},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+async def get_vida_response(user_prompt: str) -> str:
     """Return Vida's response to the given user prompt."""
     try:
-        completion = client.chat.completions.create(
+        return await llm_client.achat_completion(
+            _vida_messages(user_prompt),
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": SYSTEM_MESSAGE},
-                {"role": "user", "content": user_prompt},
-            ],
             temperature=0.7,
             max_tokens=1024,
         )
-        return completion.choices[0].message.content
     except AuthenticationError:
         return "Authentication failed when communicating with OpenAI."
     except Exception:
         return "An unexpected error occurred while generating the response."
+
+
+def stream_vida_response(user_prompt: str) -> AsyncIterator[str]:
+    """Return an async iterator of Vida's reply deltas."""
+    return llm_client.astream_chat_completion(
+        _vida_messages(user_prompt), model="gpt-4o", temperature=0.7, max_tokens=1024
+    )
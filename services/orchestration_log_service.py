@@ -1,10 +1,19 @@
 """Service layer for orchestrator performance log entries."""
 
+from datetime import datetime
+
+# Notes: Runs the blocking commit off the event loop for streaming callers
+from fastapi.concurrency import run_in_threadpool
 # Notes: Type hints for database sessions
 from sqlalchemy.orm import Session
 
+# Notes: Streams outlive the request session, so they log on one of their own
+from database.session import SessionLocal
+
 # Notes: Import the ORM model defined for performance metrics
 from models.orchestration_log import OrchestrationPerformanceLog
+from services import telemetry_writer
+from services.llm_usage import LLMResult, usage_metrics
 
 
 def log_agent_run(
@@ -13,15 +22,70 @@ def log_agent_run(
     user_id: int,
     metrics: dict,
 ) -> OrchestrationPerformanceLog:
-    """Persist a performance log entry from an orchestration run."""
+    """Record a performance log entry from an orchestration run.
+
+    The row is written by the telemetry writer, so in buffered mode it is
+    not yet persisted when this returns.
+    """
+
+    return telemetry_writer.submit(db, _build_log_entry(agent_name, user_id, metrics))
+
+
+def log_agent_runs(
+    db: Session, runs: list[tuple[str, int, dict]]
+) -> list[OrchestrationPerformanceLog]:
+    """Record several ``(agent_name, user_id, metrics)`` entries in one batch."""
+
+    entries = [_build_log_entry(agent, user_id, metrics) for agent, user_id, metrics in runs]
+    return telemetry_writer.submit_many(db, entries)
+
+
+def _log_on_own_session(agent_name: str, user_id: int, metrics: dict) -> None:
+    db = SessionLocal()
+    try:
+        log_agent_run(db, agent_name, user_id, metrics)
+    finally:
+        db.close()
+
+
+async def alog_agent_run(agent_name: str, user_id: int, metrics: dict) -> None:
+    """Record a streamed run on a dedicated session in the threadpool."""
+
+    await run_in_threadpool(_log_on_own_session, agent_name, user_id, metrics)
+
+
+async def alog_stream_usage(agent_name: str, user_id: int, result: LLMResult) -> None:
+    """Record the usage a streamed completion reported once it has ended."""
+
+    await alog_agent_run(
+        agent_name,
+        user_id,
+        {
+            "execution_time_ms": result.latency_ms,
+            **usage_metrics(result),
+            "status": "success",
+        },
+    )
+
+
+def _build_log_entry(
+    agent_name: str, user_id: int, metrics: dict
+) -> OrchestrationPerformanceLog:
+    """Return an unsaved performance log row populated from ``metrics``."""
 
     # Notes: Instantiate and populate the ORM model
-    log_entry = OrchestrationPerformanceLog(
+    return OrchestrationPerformanceLog(
         agent_name=agent_name,
         user_id=user_id,
+        # Notes: Stamp the run time now; buffered rows are inserted later
+        timestamp=datetime.utcnow(),
         execution_time_ms=metrics.get("execution_time_ms"),
         input_tokens=metrics.get("input_tokens"),
         output_tokens=metrics.get("output_tokens"),
+        cached_tokens=metrics.get("cached_tokens"),
+        # Notes: Model and provider latency come from the LLM usage block
+        model=metrics.get("model"),
+        llm_latency_ms=metrics.get("llm_latency_ms"),
         status=metrics.get("status"),
         fallback_triggered=metrics.get("fallback_triggered", False),
         # Notes: Persist whether the run exceeded the timeout threshold
@@ -41,11 +105,6 @@ def log_agent_run(
         # Notes: Type of trigger that caused the moderation event
         trigger_type=metrics.get("trigger_type"),
     )
-    # Notes: Commit the new record to the database
-    db.add(log_entry)
-    db.commit()
-    db.refresh(log_entry)
-    return log_entry
 
 
 def fetch_logs(
@@ -153,6 +212,8 @@ def export_logs_to_csv(db: Session, filters: dict) -> str:
             "execution_time_ms",
             "input_tokens",
             "output_tokens",
+            "cached_tokens",
+            "model",
             "status",
             "fallback_triggered",
             "timestamp",
@@ -168,6 +229,8 @@ def export_logs_to_csv(db: Session, filters: dict) -> str:
                 log.execution_time_ms,
                 log.input_tokens,
                 log.output_tokens,
+                log.cached_tokens,
+                log.model,
                 log.status,
                 log.fallback_triggered,
                 log.timestamp.isoformat(),
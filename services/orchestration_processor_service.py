@@ -17,18 +17,22 @@ from services.agents import (
     mindset_agent,
 )
 
-# Notes: Service used to record execution details
-from services.agent_execution_log_service import log_agent_execution
+# Notes: Service used to record execution details in one batch
+from services.agent_execution_log_service import log_agent_executions
 # Notes: Performance logging service capturing timeout information
-from services.orchestration_log_service import log_agent_run
-# Notes: Import prompt builder to inject personalization
-# Notes: Import prompt builder to inject personalization
-from services.agent_prompt_builder import build_personalized_prompt
+from services.orchestration_log_service import log_agent_runs
+# Notes: Import prompt builder to inject personalization for all agents at once
+from services.agent_prompt_builder import build_personalized_prompts
 # Notes: Import memory context builder to provide conversation history
 from services.conversation_memory_service import build_memory_context
 # Notes: Import prompt assembly helper for building agent requests
 from services.prompt_assembly_service import build_agent_prompt
-from orchestration.injector import apply_persona_token
+from orchestration.injector import apply_persona_tokens
+# Notes: Concurrent fan-out engine bounded by a per-request deadline
+from orchestration.fanout import fan_out
+# Notes: Shared long-lived loop and per-provider concurrency limits
+from orchestration.runtime import get_runtime
+from config import AGENT_TIMEOUT_SECONDS
 # Notes: Utility to check if an agent is currently active
 # Notes: Import utilities for loading and checking agent state context
 from services.agent_context_loader import load_agent_context, is_agent_active
@@ -51,20 +55,33 @@ from models.agent_score import AgentScore
 # Notes: Timing utility for measuring execution latency
 import time
 
-# Notes: Map domain names to their processor functions
+# Notes: Provider whose concurrency slots parallel agent calls consume
+LLM_PROVIDER = "openai"
+
+# Notes: Map domain names to their (async) processor functions
 AGENT_PROCESSORS = {
-    "career": career_agent.process,
-    "health": wellness_agent.process,
-    "relationships": relationship_agent.process,
-    "finance": financial_agent.process,
-    "mental_health": mindset_agent.process,
+    "career": career_agent.aprocess,
+    "health": wellness_agent.aprocess,
+    "relationships": relationship_agent.aprocess,
+    "finance": financial_agent.aprocess,
+    "mental_health": mindset_agent.aprocess,
 }
 
 
-# Notes: Process the user prompt with all assigned agents
+# Notes: Process the user prompt with all assigned agents concurrently
 
-def process_user_prompt(db: Session, user_id: int, user_prompt: str) -> list[dict]:
-    """Return responses from each agent assigned to the user."""
+async def aprocess_user_prompt(
+    db: Session,
+    user_id: int,
+    user_prompt: str,
+    deadline_seconds: float = AGENT_TIMEOUT_SECONDS,
+) -> list[dict]:
+    """Return responses from each agent assigned to the user.
+
+    Prompts for every runnable agent are assembled up front, the LLM calls are
+    fanned out concurrently under ``deadline_seconds`` and execution logs are
+    written in one transaction, so latency tracks the slowest agent.
+    """
 
     # Notes: Fetch the user object to evaluate role-based permissions
     user = get_user(db, user_id)
@@ -89,9 +106,9 @@ def process_user_prompt(db: Session, user_id: int, user_prompt: str) -> list[dic
     # Notes: Determine which agents are active for the user one time up front
     active_agents = load_agent_context(db, user_id)
 
-    responses: list[dict] = []
+    # Notes: Ordered (domain, blocked) pairs so output follows assignment order
+    plan: list[tuple[str, bool]] = []
 
-    # Notes: Execute each agent processor and log execution details
     for assignment in assignments:
         # Notes: When a list of active agents was returned, skip agents not in it
         if active_agents and assignment.domain not in active_agents:
@@ -112,66 +129,72 @@ def process_user_prompt(db: Session, user_id: int, user_prompt: str) -> list[dic
                 user.role,
                 assignment.domain,
             )
-            # Add explicit blocked response
-            responses.append({
-                "agent": assignment.domain,
-                "blocked": True,
-                "reason": "Upgrade required"
-            })
+            plan.append((assignment.domain, True))
             continue
 
-        processor = AGENT_PROCESSORS.get(assignment.domain)
-        if processor is None:
-            # Notes: Skip domains without a matching processor
-            continue
-        start = time.perf_counter()
-        try:
-            # Notes: Apply user personalization before assembling the final messages
-            personalized_prompt = build_personalized_prompt(
-                db, user_id, assignment.domain, user_prompt
-            )
-            # Notes: Build the message list using the new prompt assembly helper
-            messages = build_agent_prompt(
-                assignment.domain,
-                memory_context,
-                personalized_prompt,
-            )
-            # Notes: Inject persona token context when available
-            messages = apply_persona_token(
-                db, user_id, assignment.domain, messages
+        # Notes: Skip domains without a matching processor
+        if assignment.domain in AGENT_PROCESSORS:
+            plan.append((assignment.domain, False))
+
+    domains = [domain for domain, blocked in plan if not blocked]
+
+    # Notes: Assemble every agent payload in a single DB pass before any LLM call
+    personalized = build_personalized_prompts(db, user_id, domains, user_prompt)
+    payloads = {
+        domain: build_agent_prompt(domain, memory_context, personalized[domain])
+        for domain in domains
+    }
+    payloads = apply_persona_tokens(db, user_id, payloads)
+
+    # Notes: Issue all LLM calls at once under the shared request deadline
+    results = await fan_out(
+        {domain: (AGENT_PROCESSORS[domain], payloads[domain]) for domain in domains},
+        deadline_seconds,
+        provider=LLM_PROVIDER,
+    )
+
+    # Notes: Persist execution metrics for every agent in one transaction
+    log_agent_executions(
+        db,
+        [
+            {
+                "user_id": user_id,
+                "agent_name": domain,
+                "input_prompt": user_prompt,
+                "response_output": results[domain].text,
+                "success": results[domain].success,
+                "execution_time_ms": results[domain].elapsed_ms,
+                "error_message": results[domain].error_message,
+            }
+            for domain in domains
+        ],
+    )
+
+    responses: list[dict] = []
+    for domain, blocked in plan:
+        if blocked:
+            # Add explicit blocked response
+            responses.append(
+                {"agent": domain, "blocked": True, "reason": "Upgrade required"}
             )
-            # Notes: Execute the agent using the assembled message payload
-            result_text = processor(messages)
-            success = True
-            error_message = None
-        except Exception as exc:  # pragma: no cover - generic failure capture
-            result_text = ""
-            success = False
-            error_message = str(exc)
-        elapsed_ms = int((time.perf_counter() - start) * 1000)
-        # Notes: Persist execution metrics regardless of success
-        log_agent_execution(
-            db,
-            user_id,
-            assignment.domain,
-            user_prompt,
-            result_text,
-            success,
-            elapsed_ms,
-            error_message,
-        )
-        if success:
-            responses.append({"agent": assignment.domain, "response": result_text})
+        elif results[domain].success:
+            responses.append({"agent": domain, "response": results[domain].text})
 
     # Notes: Aggregated list of agent responses is returned to the caller
     return responses
+
+
+def process_user_prompt(db: Session, user_id: int, user_prompt: str) -> list[dict]:
+    """Synchronous entry point running :func:`aprocess_user_prompt` on the runtime."""
+
+    return get_runtime().run(aprocess_user_prompt(db, user_id, user_prompt))
 # Footnote: Coordinates calling each domain agent and filters them using
 # Notes: `load_agent_context` so only active agents generate responses.
 
 
-# Notes: Execute multiple agents concurrently using asyncio
+# Notes: Execute multiple agents concurrently on the caller's event loop
 
-def run_parallel_agents(
+async def arun_parallel_agents(
     user_id: int,
     user_prompt: str,
     agent_list: list[str],
@@ -182,10 +205,18 @@ def run_parallel_agents(
 
     The timeout_seconds parameter limits how long each agent may run before
     marking the result as a timeout. This prevents the orchestration layer from
-    hanging indefinitely when an agent is slow to respond."""
+    hanging indefinitely when an agent is slow to respond.
+
+    All database work happens on the calling task: memory context is loaded
+    once and shared read-only by every agent, and performance rows are written
+    in a single transaction after the LLM calls finish. Only the LLM calls run
+    concurrently, each holding a slot of the provider's concurrency limit."""
 
     import asyncio
-    from services.llm_call_service import call_llm
+    from services import llm_call_service
+    from services.llm_usage import usage_metrics
+
+    runtime = get_runtime()
 
     # Notes: Retrieve the user once to evaluate permissions for each agent
     user = get_user(db, user_id)
@@ -205,19 +236,24 @@ def run_parallel_agents(
                 name,
             )
 
-    # Notes: Inner coroutine used for each agent execution
-    async def _execute(agent_name: str) -> tuple[str, dict]:
-        # Notes: Build personalized memory context for the user and agent
-        memory = build_memory_context(db, user_id, [agent_name], user_prompt)
-        prompt = build_agent_prompt(agent_name, memory, user_prompt)
-        # Notes: Attach persona token details to the prompt
-        prompt = apply_persona_token(db, user_id, agent_name, prompt)
+    # Notes: Memory context does not depend on the agent, so load it once
+    memory = build_memory_context(db, user_id, allowed_agents, user_prompt)
+    prompts = {
+        name: build_agent_prompt(name, memory, user_prompt) for name in allowed_agents
+    }
+    # Notes: Attach persona token details with a single token lookup
+    prompts = apply_persona_tokens(db, user_id, prompts)
+
+    # Notes: Inner coroutine touching only the LLM, never the shared Session
+    async def _execute(agent_name: str) -> tuple[str, dict, dict]:
+        prompt = prompts[agent_name]
         start = time.perf_counter()
         try:
-            # Notes: Enforce timeout on the blocking LLM call
-            text = await asyncio.wait_for(
-                asyncio.to_thread(call_llm, prompt), timeout_seconds
-            )
+            async with runtime.limit(LLM_PROVIDER):
+                # Notes: Enforce timeout on the LLM call
+                text = await asyncio.wait_for(
+                    llm_call_service.acall_llm(prompt), timeout_seconds
+                )
             status = "success"
             timed_out = False
         except asyncio.TimeoutError:
@@ -226,30 +262,35 @@ def run_parallel_agents(
             status = "timeout"
             timed_out = True
         elapsed_ms = int((time.perf_counter() - start) * 1000)
-        # Notes: Record metrics to the orchestration performance log
-        log_agent_run(
-            db,
-            agent_name,
-            user_id,
-            {
-                "execution_time_ms": elapsed_ms,
-                "input_tokens": len(str(prompt)),
-                "output_tokens": len(str(text)),
-                "status": status,
-                "fallback_triggered": False,
-                "timeout_occurred": timed_out,
-            },
-        )
-        return agent_name, {"status": status, "content": text}
+        metrics = {
+            "execution_time_ms": elapsed_ms,
+            # Notes: Provider-reported usage; the timeout fallback has none
+            **usage_metrics(text),
+            "status": status,
+            "fallback_triggered": False,
+            "timeout_occurred": timed_out,
+        }
+        return agent_name, {"status": status, "content": text}, metrics
 
-    # Notes: Gather results for all agents concurrently
-    async def _gather() -> list[tuple[str, str]]:
-        tasks = [_execute(name) for name in allowed_agents]
-        return await asyncio.gather(*tasks)
+    results = await asyncio.gather(*[_execute(name) for name in allowed_agents])
 
-    # Notes: Run the event loop and format the output as a dictionary
-    pairs = asyncio.run(_gather())
-    return {name: resp for name, resp in pairs}
+    # Notes: Flush all performance rows to the log in one transaction
+    log_agent_runs(db, [(name, user_id, metrics) for name, _, metrics in results])
+    return {name: resp for name, resp, _ in results}
+
+
+def run_parallel_agents(
+    user_id: int,
+    user_prompt: str,
+    agent_list: list[str],
+    db: Session,
+    timeout_seconds: int = 10,
+) -> dict[str, dict]:
+    """Synchronous entry point running :func:`arun_parallel_agents` on the runtime."""
+
+    return get_runtime().run(
+        arun_parallel_agents(user_id, user_prompt, agent_list, db, timeout_seconds)
+    )
 
 # Footnote: Provides parallel execution path for orchestrating multiple agents.
 
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from models.orchestration_log import OrchestrationPerformanceLog
 from services.orchestration_summarizer import summarize_journal_entries
+from services.summary_fingerprint_service import fresh_summaries
 from agents.reflection_booster_agent import generate_reflection_prompt
 
 
@@ -28,7 +29,9 @@ def replay_orchestration(db: Session, log_id: UUID) -> dict:
     last_error: Exception | None = None
     for attempt in range(2):
         try:
-            summary_text = summarize_journal_entries(user_id, db)
+            # Notes: A replay must produce fresh output even for unchanged entries
+            with fresh_summaries():
+                summary_text = summarize_journal_entries(user_id, db)
             break
         except Exception as exc:  # pragma: no cover - best effort retry
             last_error = exc
@@ -8,11 +8,13 @@ from models.summarized_journal import SummarizedJournal
 from services import summary_moderation_service, orchestration_log_service
 
 
-def handle_summary_moderation(db: Session, summary: SummarizedJournal) -> None:
+def handle_summary_moderation(
+    db: Session, summary: SummarizedJournal, moderation_flagged: bool | None = None
+) -> None:
     """Run auto-flagging on the summary and log the result."""
 
     flagged, trigger = summary_moderation_service.auto_flag_summary(
-        db, summary.id, summary.summary_text
+        db, summary.id, summary.summary_text, moderation_flagged
     )
     orchestration_log_service.log_agent_run(
         db,
@@ -20,8 +22,9 @@ def handle_summary_moderation(db: Session, summary: SummarizedJournal) -> None:
         summary.user_id,
         {
             "execution_time_ms": 0,
-            "input_tokens": len(summary.summary_text),
-            "output_tokens": len(summary.summary_text),
+            # Notes: Moderation makes no completion call, so no tokens are billed
+            "input_tokens": 0,
+            "output_tokens": 0,
             "status": "auto_flagged" if flagged else "completed",
             "fallback_triggered": False,
             "timeout_occurred": False,
@@ -1,17 +1,35 @@
-"""Service for summarizing recent journal entries via the orchestration agent."""
+"""Service for summarizing recent journal entries via the orchestration agent.
+
+The work runs as a :class:`~services.stage_graph.StageGraph`. The caller
+waits only for the critical path: the summary LLM call, then the record and
+one moderation check running side by side, then applying flags.
+Self-scoring, reflection prompts and conflict detection run as background
+stages on their own database sessions. On an engine whose sessions share one
+connection (SQLite's ``StaticPool``) they run inline instead, since a worker
+thread's commit would land in the request's transaction.
+
+Before the graph runs, the entry window is fingerprinted. An unchanged window
+returns the latest summary without any model call, and a window that only
+gained entries is summarized incrementally from the previous text.
+"""
 
 from __future__ import annotations
 
 # Notes: Standard library imports
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Any, Iterator
+from uuid import uuid4
 
 # Notes: SQLAlchemy session type
 from sqlalchemy.orm import Session
 
+from database.session import shares_one_connection
+
 # Notes: ORM models used for retrieval and persistence
 from models.journal_entry import JournalEntry
 from models.summarized_journal import SummarizedJournal
-from services.summary_moderation_service import flag_summary_if_needed
+from services.summary_moderation_service import check_summary_text, flag_summary_if_needed
 
 # Notes: Import the reflection booster agent and services
 from agents.reflection_booster_agent import generate_reflection_prompt
@@ -26,118 +44,153 @@ from services import (
 # Notes: Adapter used to call the LLM summarization agent
 from services.ai_model_adapter import AIModelAdapter
 from services.agent_self_score_service import log_self_score
-from utils.logger import get_logger
+from services.stage_graph import MODE_INLINE, Stage, StageGraph
+from services.summary_fingerprint_service import PLAN_INCREMENTAL, PLAN_REUSE, SummaryPlan, plan_summary
+
+
+# Notes: Prompt asking the model to rate the summary it just produced
+SELF_SCORE_PROMPT = [
+    {"role": "system", "content": "You just generated the above summary."},
+    {
+        "role": "user",
+        "content": (
+            "On a scale from 1-10, how confident are you this summary was "
+            "accurate? Reply with only the number and optionally a short explanation."
+        ),
+    },
+]
+
+
+# Notes: Prompts for a full summary and for folding new entries into the previous one
+SUMMARY_PROMPT = "Summarize the following journal entries in a short paragraph."
+INCREMENTAL_SUMMARY_PROMPT = (
+    "Update the previous summary of this user's journal with the new entries. "
+    "Reply with a single short paragraph covering both."
+)
 
-logger = get_logger()
 
+def _summary_messages(plan: SummaryPlan, entries_text: str) -> list[dict[str, str]]:
+    """Return the full or incremental summarization prompt."""
 
-# Notes: Summarize the latest set of journal entries for a user
+    if plan.mode == PLAN_INCREMENTAL:
+        new_text = "\n".join(entry.content for entry in plan.new_entries)
+        return [
+            {"role": "system", "content": INCREMENTAL_SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"Previous summary:\n{plan.previous.summary_text}\n\nNew entries:\n{new_text}",
+            },
+        ]
+    return [
+        {"role": "system", "content": SUMMARY_PROMPT},
+        {"role": "user", "content": entries_text},
+    ]
 
-def summarize_journal_entries(user_id: int, db: Session) -> str:
-    """Return summarized text for the user's recent journal history."""
 
-    # Notes: Query the most recent 10 journal entries for the user
-    entries = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == user_id)
-        .order_by(JournalEntry.created_at.desc())
-        .limit(10)
-        .all()
-    )
+@contextmanager
+def _stage_session(db: Session) -> Iterator[Session]:
+    """Open a session on the request's engine for a background stage."""
 
-    # Notes: Build a single text block containing the journal contents
-    combined_text = "\n".join(entry.content for entry in entries)
+    session = Session(bind=db.get_bind())
+    try:
+        yield session
+    finally:
+        session.close()
 
-    # Notes: Use the AI model adapter to generate the summary
-    adapter = AIModelAdapter("OpenAI")
-    summary = adapter.generate(
-        [
-            {
-                "role": "system",
-                "content": "Summarize the following journal entries in a short paragraph.",
-            },
-            {"role": "user", "content": combined_text},
-        ],
-        temperature=0.5,
-    )
 
-    # Notes: Persist the summary record for historical tracking
-    record = SummarizedJournal(
-        user_id=user_id,
-        summary_text=summary,
-        created_at=datetime.utcnow(),
-        source_entry_ids=str([e.id for e in entries]),
-    )
-    db.add(record)
-    db.commit()
-    db.refresh(record)
+def _build_graph(user_id: int, db: Session) -> StageGraph:
+    """Return the summarization pipeline for one request."""
 
-    # Notes: Flag the summary when it fails moderation
-    flag_summary_if_needed(db, record, user_id)
-    # Notes: Run automated moderation heuristics and log the attempt
-    orchestration_service.handle_summary_moderation(db, record)
+    adapter = AIModelAdapter("OpenAI")
 
-    # Notes: Ask the language model to self-assess confidence in the summary
-    try:
-        score_prompt = [
-            {"role": "system", "content": "You just generated the above summary."},
-            {
-                "role": "user",
-                "content": (
-                    "On a scale from 1-10, how confident are you this summary was "
-                    "accurate? Reply with only the number and optionally a short explanation."
-                ),
-            },
-        ]
-        score_text = adapter.generate(score_prompt, temperature=0)
-        parsed = float(score_text.strip().split()[0])
-        normalized = max(0.0, min(parsed / 10.0, 1.0))
-        log_self_score(
-            db,
-            "JournalSummarizationAgent",
-            record.id,
-            user_id,
-            normalized,
-            reasoning=score_text,
-        )
-    except Exception as exc:  # pragma: no cover - best effort logging
-        logger.warning("Self score generation failed: %s", exc)
+    def summarize(results: dict[str, Any]) -> str:
+        # Notes: Reruns and replays want new text, not a cached reply to the same prompt
+        cache = False if results["fresh"] else None
+        return adapter.generate(results["messages"], temperature=0.5, cache=cache)
 
-    # Notes: Generate a follow-up reflection prompt using the booster agent
-    try:
-        prompt_text = generate_reflection_prompt(
-            combined_text,
-            mood=None,
-            goals=[],
-            db=db,
+    def persist(results: dict[str, Any]) -> SummarizedJournal:
+        # Notes: Persist the summary record for historical tracking
+        record = SummarizedJournal(
+            id=results["record_id"],
             user_id=user_id,
+            summary_text=results["summary"],
+            created_at=datetime.utcnow(),
+            source_entry_ids=str(results["entries"]["ids"]),
+            source_fingerprint=results["fingerprint"],
         )
-        # Notes: Persist the generated prompt linked to the newest journal entry
-        if entries:
-            reflection_prompt_service.create_prompt(
-                db, user_id, entries[0].id, prompt_text
-            )
-        # Notes: Log the generation within the orchestration audit trail
-        orchestration_audit_service.log_orchestration_request(
-            db,
-            user_id,
-            "reflection_prompt_generation",
-            ["ReflectionBoosterAgent"],
-            [{"prompt_text": prompt_text}],
+        db.add(record)
+        db.commit()
+        db.refresh(record)
+        return record
+
+    def moderate(results: dict[str, Any]) -> bool:
+        # Notes: One moderation call feeds both flagging paths
+        return check_summary_text(results["summary"])
+
+    def apply_flags(results: dict[str, Any]) -> None:
+        record, flagged = results["record"], results["moderation"]
+        # Notes: Flag the summary when it fails moderation
+        flag_summary_if_needed(db, record, user_id, moderation_flagged=flagged)
+        # Notes: Run automated moderation heuristics and log the attempt
+        orchestration_service.handle_summary_moderation(db, record, moderation_flagged=flagged)
+
+    def self_score(results: dict[str, Any]) -> None:
+        # Notes: Ask the language model to self-assess confidence in the summary
+        # Notes: The summary itself is in the prompt, so each summary gets its own score
+        score_text = adapter.generate(
+            [{"role": "assistant", "content": results["summary"]}, *SELF_SCORE_PROMPT],
+            temperature=0,
         )
-    except Exception:  # pragma: no cover - best effort logging
-        pass
+        parsed = float(score_text.strip().split()[0])
+        normalized = max(0.0, min(parsed / 10.0, 1.0))
+        with _stage_session(db) as session:
+            log_self_score(
+                session,
+                "JournalSummarizationAgent",
+                results["record_id"],
+                user_id,
+                normalized,
+                reasoning=score_text,
+            )
 
-    # Notes: Run the conflict detection agent and persist any flags
-    try:
-        flags = detect_conflict_issues(combined_text)
-        if flags and entries:
+    def reflection(results: dict[str, Any]) -> None:
+        entries = results["entries"]
+        with _stage_session(db) as session:
+            # Notes: Generate a follow-up reflection prompt using the booster agent
+            prompt_text = generate_reflection_prompt(
+                entries["text"],
+                mood=None,
+                goals=[],
+                db=session,
+                user_id=user_id,
+            )
+            # Notes: Persist the generated prompt linked to the newest journal entry
+            if entries["ids"]:
+                reflection_prompt_service.create_prompt(
+                    session, user_id, entries["ids"][0], prompt_text
+                )
+            # Notes: Log the generation within the orchestration audit trail
+            orchestration_audit_service.log_orchestration_request(
+                session,
+                user_id,
+                "reflection_prompt_generation",
+                ["ReflectionBoosterAgent"],
+                [{"prompt_text": prompt_text}],
+            )
+
+    def conflicts(results: dict[str, Any]) -> None:
+        entries = results["entries"]
+        # Notes: Run the conflict detection agent and persist any flags
+        flags = detect_conflict_issues(entries["text"])
+        if not (flags and entries["ids"]):
+            return
+        with _stage_session(db) as session:
             conflict_resolution_service.save_conflict_flags(
-                db, user_id, entries[0].id, flags
+                session, user_id, entries["ids"][0], flags
             )
             # Notes: Log the conflict results for auditing
             orchestration_audit_service.log_orchestration_request(
-                db,
+                session,
                 user_id,
                 "conflict_detection",
                 ["ConflictResolutionAgent"],
@@ -148,10 +201,52 @@ def summarize_journal_entries(user_id: int, db: Session) -> str:
                     }
                 ],
             )
-    except Exception:  # pragma: no cover - best effort logging
-        pass
 
+    return StageGraph(
+        "journal_summary",
+        [
+            Stage("summary", summarize),
+            Stage("record", persist, after=("summary",)),
+            Stage("moderation", moderate, after=("summary",)),
+            Stage("flags", apply_flags, after=("record", "moderation")),
+            Stage("self_score", self_score, after=("record",), background=True),
+            Stage("reflection", reflection, background=True),
+            Stage("conflicts", conflicts, background=True),
+        ],
+    )
+
+
+# Notes: Summarize the latest set of journal entries for a user
+
+def summarize_journal_entries(user_id: int, db: Session) -> str:
+    """Return summarized text for the user's recent journal history."""
+
+    # Notes: Query the most recent 10 journal entries for the user
+    entries = (
+        db.query(JournalEntry)
+        .filter(JournalEntry.user_id == user_id)
+        .order_by(JournalEntry.created_at.desc())
+        .limit(10)
+        .all()
+    )
+    plan = plan_summary(db, SummarizedJournal, user_id, entries)
+    if plan.mode == PLAN_REUSE:
+        # Notes: Nothing changed since the last summary, so no tokens are spent
+        return plan.previous.summary_text
+
+    # Notes: Stages get plain values, not request-session objects; the record
+    # id is assigned up front so background stages never touch the request's record
+    text = "\n".join(entry.content for entry in entries)
+    context = {
+        "record_id": uuid4(),
+        "fingerprint": plan.fingerprint,
+        "fresh": plan.fresh,
+        "messages": _summary_messages(plan, text),
+        "entries": {"ids": [e.id for e in entries], "text": text},
+    }
+    mode = MODE_INLINE if shares_one_connection(db.get_bind()) else None
+    run = _build_graph(user_id, db).run(context, mode=mode)
     # Notes: Return the summarized text back to the caller
-    return summary
+    return run.results["summary"]
 
 # Footnote: This service is used by the orchestration journal summary endpoint.
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 # Notes: Service helpers used by the orchestrator
 from services import prompt_version_service
 from services.ai_model_adapter import AIModelAdapter
+from services.llm_usage import usage_metrics
 from services.orchestration_log_service import log_agent_run
 
 
@@ -41,8 +42,8 @@ async def run_agent(db: Session, user_id: int, agent_name: str, user_prompt: str
         user_id,
         {
             "execution_time_ms": elapsed_ms,
-            "input_tokens": len(str(messages)),
-            "output_tokens": len(response_text),
+            # Notes: Exact token counts and model from the provider's usage block
+            **usage_metrics(response_text),
             "status": "success",
             "fallback_triggered": False,
             "timeout_occurred": False,
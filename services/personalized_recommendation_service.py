@@ -11,12 +11,52 @@ from models.goal import Goal
 from models.user import User
 from services.segmentation_service import evaluate_segment
 from services.ai_model_adapter import AIModelAdapter
+from services.context_snapshot_service import invalidate_user_context
+
+
+# Notes: System prompt shared by the interactive and batch goal generators
+GOAL_SYSTEM_PROMPT = "You are Vida, an AI Life Coach providing concise goal suggestions."
+
+# Notes: Most suggestions stored per user
+MAX_GOALS_PER_USER = 5
+
+
+def build_goal_messages(email: str) -> list[dict[str, str]]:
+    """Return the chat messages asking for goal suggestions for one user."""
+
+    prompt = (
+        "Generate 3-5 short personal goals for the following user. "
+        "Return JSON like {\"goals\": [\"goal1\", \"goal2\"]}. "
+        f"User email: {email}"
+    )
+    return [
+        {"role": "system", "content": GOAL_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def parse_goal_suggestions(response_text: str) -> list[str]:
+    """Return up to five goal titles from a model response."""
+
+    # Notes: Attempt to parse the JSON response from the AI model
+    try:
+        data = json.loads(response_text)
+        goals = data.get("goals", [])
+        if not isinstance(goals, list):
+            goals = []
+    except Exception:
+        goals = [g.strip("- ").strip() for g in response_text.splitlines() if g.strip()]
+    return [str(goal) for goal in goals[:MAX_GOALS_PER_USER]]
 
 
 # Notes: Generate 3-5 AI goal suggestions for each user in a segment
 
 def generate_goals_for_segment(db: Session, segment_id: str | UUID) -> List[Goal]:
-    """Return the list of created Goal objects."""
+    """Return the list of created Goal objects.
+
+    Suited to small segments; the scheduled job uses
+    :mod:`services.segment_goal_batch_service` for large ones.
+    """
 
     # Notes: Retrieve all users matching the segment criteria
     users: List[User] = evaluate_segment(db, segment_id)
@@ -28,36 +68,11 @@ def generate_goals_for_segment(db: Session, segment_id: str | UUID) -> List[Goal
 
     # Notes: Iterate over each user and request goal suggestions
     for user in users:
-        prompt = (
-            "Generate 3-5 short personal goals for the following user. "
-            "Return JSON like {\"goals\": [\"goal1\", \"goal2\"]}. "
-            f"User email: {user.email}"
-        )
-        response_text = adapter.generate(
-            [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are Vida, an AI Life Coach providing concise goal suggestions."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-        )
-
-        # Notes: Attempt to parse the JSON response from the AI model
-        try:
-            data = json.loads(response_text)
-            goals = data.get("goals", [])
-            if not isinstance(goals, list):
-                goals = []
-        except Exception:
-            goals = [g.strip("- ").strip() for g in response_text.splitlines() if g.strip()]
+        response_text = adapter.generate(build_goal_messages(user.email), temperature=0.7)
 
         # Notes: Create Goal objects for each suggestion
-        for goal_text in goals[:5]:
-            goal = Goal(user_id=user.id, title=str(goal_text))
+        for goal_text in parse_goal_suggestions(response_text):
+            goal = Goal(user_id=user.id, title=goal_text)
             db.add(goal)
             created.append(goal)
 
@@ -65,4 +80,7 @@ def generate_goals_for_segment(db: Session, segment_id: str | UUID) -> List[Goal
     db.commit()
     for g in created:
         db.refresh(g)
+    # Notes: New goals change each affected user's cached prompt context
+    for user_id in {g.user_id for g in created}:
+        invalidate_user_context(user_id)
     return created
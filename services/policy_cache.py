@@ -0,0 +1,139 @@
+"""Process-level TTL caches for admin toggles, access policies and feature flags.
+
+Agent execution and feature-gated routes consult these settings on every
+call even though they change only when an administrator edits them. Each
+cache keeps decoded values (never ORM instances) for a bounded TTL and is
+invalidated by the admin setters, so edits made through this process apply
+immediately while edits from other workers apply within the TTL.
+
+The user's subscription tier is memoized per request on ``Session.info``;
+``get_db`` yields one session per request so the memo never outlives it, and
+it is dropped whenever a ``Subscription`` row is flushed on that session.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from models.subscription import Subscription
+
+_MISSING = object()
+_TIER_MEMO_KEY = "subscription_tier_memo"
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire after ``ttl_seconds``."""
+
+    def __init__(self, name: str, ttl_seconds: float | None = None, max_entries: int = 1024):
+        self.name = name
+        self._ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl_seconds(self) -> float:
+        """Return the configured TTL, read from settings unless overridden."""
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return get_settings().POLICY_CACHE_TTL_SECONDS
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or store ``loader()``'s result."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop ``key`` or, when omitted, every entry."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the number of live entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def reset(self) -> None:
+        """Clear entries and counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Notes: One cache per admin-controlled setting family
+agent_toggles = TTLCache("agent_toggles")
+agent_access_policies = TTLCache("agent_access_policies")
+feature_flags = TTLCache("feature_flags")
+
+_CACHES = (agent_toggles, agent_access_policies, feature_flags)
+_tier_stats = {"hits": 0, "misses": 0}
+_tier_lock = threading.Lock()
+
+
+def memoize_subscription_tier(db: Session, user_id: int, loader: Callable[[], Any]) -> Any:
+    """Return the user's tier from the request memo, loading it once per session."""
+    memo = db.info.setdefault(_TIER_MEMO_KEY, {})
+    if user_id in memo:
+        with _tier_lock:
+            _tier_stats["hits"] += 1
+        return memo[user_id]
+    with _tier_lock:
+        _tier_stats["misses"] += 1
+    memo[user_id] = loader()
+    return memo[user_id]
+
+
+@event.listens_for(Session, "after_flush")
+def _drop_tier_memo_on_subscription_change(session, flush_context) -> None:
+    """Forget memoized tiers when subscriptions change on this session."""
+    if _TIER_MEMO_KEY not in session.info:
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Subscription):
+            session.info.pop(_TIER_MEMO_KEY, None)
+            return
+
+
+def get_policy_cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit/miss counters for every policy cache."""
+    stats = {cache.name: cache.stats() for cache in _CACHES}
+    with _tier_lock:
+        stats["subscription_tiers"] = dict(_tier_stats)
+    return stats
+
+
+def clear_policy_caches() -> None:
+    """Reset every policy cache and counter."""
+    for cache in _CACHES:
+        cache.reset()
+    with _tier_lock:
+        _tier_stats.update(hits=0, misses=0)
+
+# Footnote: Admin setters call invalidate on the matching cache after commit.
@@ -0,0 +1,93 @@
+"""Process-wide registry of lazily constructed LLM provider clients.
+
+Services used to build SDK clients at import time, so every worker start
+paid for a dozen HTTP connection pools before serving its first request.
+Providers now register a zero-argument factory here and callers resolve the
+client on first use via :func:`get_provider`. Registration is cheap and
+import-safe; construction happens once per process under a lock.
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+from typing import Any, Callable
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ProviderRegistry:
+    """Map provider names to factories and cache the constructed clients."""
+
+    def __init__(self) -> None:
+        self._factories: dict[str, Callable[[], Any]] = {}
+        self._clients: dict[str, Any] = {}
+        # Notes: Reentrant so a factory may derive its client from another provider
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register ``factory`` for ``name`` without constructing anything."""
+        with self._lock:
+            self._factories[name] = factory
+            self._clients.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the client for ``name``, constructing it on first use."""
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                try:
+                    factory = self._factories[name]
+                except KeyError:
+                    raise KeyError(f"Unknown provider: {name}") from None
+                client = factory()
+                self._clients[name] = client
+                logger.info("provider_client_created", extra={"provider": name})
+            return client
+
+    def override(self, name: str, client: Any | None) -> None:
+        """Install ``client`` for ``name``; ``None`` restores lazy construction."""
+        with self._lock:
+            if client is None:
+                self._clients.pop(name, None)
+            else:
+                self._clients[name] = client
+
+    def initialized(self) -> list[str]:
+        """Return the names of providers whose clients have been built."""
+        with self._lock:
+            return sorted(self._clients)
+
+    async def aclose(self) -> None:
+        """Close every constructed client and forget it."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            close = getattr(client, "close", None)
+            if close is None:
+                continue
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+
+
+# Notes: Shared instance used by llm_client and every provider-backed service
+registry = ProviderRegistry()
+
+
+def register_provider(name: str, factory: Callable[[], Any]) -> None:
+    """Register a provider factory on the shared registry."""
+    registry.register(name, factory)
+
+
+def get_provider(name: str) -> Any:
+    """Return the shared client for ``name``."""
+    return registry.get(name)
+
+# Footnote: Default OpenAI providers are registered by services.llm_client.
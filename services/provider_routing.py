@@ -0,0 +1,195 @@
+"""Per-provider health tracking used by :class:`AIModelAdapter` routing.
+
+Each provider name gets one process-wide :class:`ProviderHealth` holding a
+circuit breaker, a window of recent successful latencies (for the p95 that
+sets the hedge delay) and outcome counters for the admin dashboard.
+
+The breaker opens after ``AI_BREAKER_FAILURE_THRESHOLD`` consecutive
+failures and rejects calls for ``AI_BREAKER_RESET_SECONDS``. After that a
+single trial call is let through (half-open); its outcome closes the breaker
+or re-opens it for another period.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from config import get_settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Notes: Number of recent latencies kept per provider for the p95 estimate
+LATENCY_WINDOW = 200
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a timed half-open trial.
+
+    A trial that reports no outcome within ``reset_seconds`` is treated as
+    lost, so a cancelled or hung trial cannot keep the breaker half-open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+
+    def allow(self) -> bool:
+        """Return whether a call may be sent now."""
+        if self.state == CLOSED:
+            return True
+        now = self._clock()
+        if self.state == OPEN and now - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self._trial_in_flight and now - self._trial_started_at >= self.reset_seconds:
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            self._trial_started_at = now
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot of a call that ended without an outcome."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class ProviderHealth:
+    """Breaker, latency window and outcome counters for one provider."""
+
+    def __init__(self, name: str, breaker: CircuitBreaker):
+        self.name = name
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "short_circuited": 0,
+            "hedges_launched": 0,
+            "hedge_wins": 0,
+            "failovers": 0,
+            "cancelled": 0,
+        }
+
+    def allow(self) -> bool:
+        with self._lock:
+            allowed = self.breaker.allow()
+            if not allowed:
+                self.counters["short_circuited"] += 1
+            return allowed
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.breaker.record_success()
+            self._latencies.append(latency)
+            self.counters["calls"] += 1
+            self.counters["successes"] += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.breaker.record_failure()
+            self.counters["calls"] += 1
+            self.counters["failures"] += 1
+
+    def record_cancelled(self) -> None:
+        """Count a call cancelled before its outcome was known."""
+        with self._lock:
+            self.breaker.release_trial()
+            self.counters["cancelled"] += 1
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def p95(self) -> float | None:
+        """Return the 95th percentile latency in seconds, or ``None`` if too few samples."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < get_settings().AI_HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def stats(self) -> dict[str, Any]:
+        p95 = self.p95()
+        with self._lock:
+            return {
+                **self.counters,
+                "breaker": self.breaker.state,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+
+
+_health: dict[str, ProviderHealth] = {}
+_health_lock = threading.Lock()
+
+
+def get_provider_health(name: str) -> ProviderHealth:
+    """Return the shared health record for provider ``name``."""
+
+    with _health_lock:
+        health = _health.get(name)
+        if health is None:
+            settings = get_settings()
+            health = ProviderHealth(
+                name,
+                CircuitBreaker(settings.AI_BREAKER_FAILURE_THRESHOLD, settings.AI_BREAKER_RESET_SECONDS),
+            )
+            _health[name] = health
+        return health
+
+
+def hedge_delay(name: str) -> float:
+    """Seconds to wait on ``name`` before sending a hedged request elsewhere."""
+
+    settings = get_settings()
+    p95 = get_provider_health(name).p95()
+    if p95 is None:
+        return settings.AI_HEDGE_DEFAULT_DELAY_SECONDS
+    return max(settings.AI_HEDGE_MIN_DELAY_SECONDS, p95)
+
+
+def get_provider_routing_stats() -> dict[str, dict[str, Any]]:
+    """Return outcome counters, breaker state and p95 latency per provider."""
+
+    with _health_lock:
+        records = list(_health.values())
+    return {health.name: health.stats() for health in records}
+
+
+def reset_provider_health() -> None:
+    """Forget breakers, latencies and counters (used by tests)."""
+
+    with _health_lock:
+        _health.clear()
+
+# Footnote: Health is per process; each worker learns provider latency on its own.
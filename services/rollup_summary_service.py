@@ -0,0 +1,338 @@
+"""Per-user tree of day, week and month summaries.
+
+Weekly reviews, monthly reports and trend analysis used to paste every raw
+session, journal, task and habit in their window into one prompt. They now
+read precomputed nodes from ``rollup_summaries`` instead. Day nodes condense
+one UTC day of records. Week nodes (starting Monday) condense their day
+nodes, and month nodes condense the weeks that start in that month. A node's
+text is stored verbatim when its input is short. Otherwise a small model
+condenses it under a fixed token ceiling, so a prompt built from a handful
+of nodes stays the same size however much the user writes.
+
+An ``after_flush`` hook marks the day node of every inserted, edited or
+deleted record stale. :func:`refresh_rollups` rebuilds stale nodes bottom-up
+and marks a parent stale only when a child's input actually changed. The
+refresh job keeps the tree current. Readers refresh the stale nodes of the
+window they read and the child nodes under it, newest first. They spend at
+most ``ROLLUP_READ_REFRESH_LIMIT`` model calls; a node past that budget
+keeps its previous text, or holds the opening of its input if it has none,
+until the job condenses it. As with the activity rollup, Core bulk writes
+bypass the hook; run ``jobs/refresh_rollup_summaries.py --since`` after
+loading data that way.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from database.upsert import upsert_rows
+from models.habit import Habit
+from models.journal_entry import JournalEntry
+from models.rollup_summary import RollupSummary
+from models.session import Session as SessionModel
+from models.task import Task
+from services import llm_client
+from utils.logger import get_logger
+
+logger = get_logger()
+
+LEVEL_DAY = "day"
+LEVEL_WEEK = "week"
+LEVEL_MONTH = "month"
+# Notes: Rebuild order; each level is condensed from the one before it
+LEVELS = (LEVEL_DAY, LEVEL_WEEK, LEVEL_MONTH)
+_PARENT = {LEVEL_DAY: LEVEL_WEEK, LEVEL_WEEK: LEVEL_MONTH}
+_CHILD = {LEVEL_WEEK: LEVEL_DAY, LEVEL_MONTH: LEVEL_WEEK}
+
+# Notes: Record model -> (label, line renderer); every model is bucketed by created_at
+TRACKED_RECORDS = {
+    SessionModel: ("Session", lambda s: s.ai_summary or s.title or "(no summary)"),
+    JournalEntry: ("Journal", lambda j: j.content),
+    Task: ("Task", lambda t: f"{'[x]' if t.is_completed else '[ ]'} {t.description}"),
+    Habit: ("Habit", lambda h: f"{h.habit_name} streak: {h.streak_count}"),
+}
+
+ROLLUP_PROMPTS = {
+    LEVEL_DAY: (
+        "Condense this user's coaching activity for one day into a few sentences. "
+        "Keep concrete events, moods, completed tasks and habit streaks."
+    ),
+    LEVEL_WEEK: (
+        "Condense these daily summaries of one user's week into a short paragraph. "
+        "Keep accomplishments, recurring themes, mood shifts and open tasks."
+    ),
+    LEVEL_MONTH: (
+        "Condense these weekly summaries of one user's month into a short paragraph. "
+        "Keep major themes, progress on goals and habits, and notable challenges."
+    ),
+}
+
+_table = RollupSummary.__table__
+
+
+def period_start(level: str, day: date) -> date:
+    """Return the first day of the ``level`` period containing ``day``."""
+
+    if level == LEVEL_WEEK:
+        return day - timedelta(days=day.weekday())
+    if level == LEVEL_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _period_end(level: str, start: date) -> date:
+    """Return the first day after the period beginning at ``start``."""
+
+    if level == LEVEL_WEEK:
+        return start + timedelta(days=7)
+    if level == LEVEL_MONTH:
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    # Notes: SQLite returns DATE() results as text
+    return date.fromisoformat(str(value)[:10])
+
+
+def mark_stale(connection, keys: Iterable[tuple[int, str, date]]) -> None:
+    """Flag ``(user_id, level, period_start)`` nodes stale, creating them as needed."""
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "level": level,
+            "period_start": start,
+            "item_count": 0,
+            "stale": True,
+            "updated_at": now,
+        }
+        for user_id, level, start in set(keys)
+    ]
+    upsert_rows(
+        connection,
+        _table,
+        rows,
+        ["user_id", "level", "period_start"],
+        lambda proposed: {"stale": True, "updated_at": proposed["updated_at"]},
+    )
+
+
+def _day_keys(objects: Iterable) -> set[tuple[int, str, date]]:
+    keys = set()
+    for obj in objects:
+        if type(obj) not in TRACKED_RECORDS or obj.user_id is None:
+            continue
+        day = (obj.created_at or datetime.utcnow()).date()
+        keys.add((obj.user_id, LEVEL_DAY, day))
+    return keys
+
+
+def _mark_flushed_records(session, flush_context) -> None:
+    """Mark the day nodes of records written by this flush stale."""
+
+    edited = (obj for obj in session.dirty if session.is_modified(obj))
+    keys = _day_keys(session.new) | _day_keys(session.deleted) | _day_keys(edited)
+    if keys:
+        mark_stale(session.connection(), keys)
+
+
+def _day_input(db: Session, node: RollupSummary) -> tuple[str, int]:
+    """Return the raw record lines for a day node and how many records they cover."""
+
+    start = datetime.combine(node.period_start, datetime.min.time())
+    end = start + timedelta(days=1)
+    lines: list[str] = []
+    for model, (label, render) in TRACKED_RECORDS.items():
+        records = (
+            db.query(model)
+            .filter(model.user_id == node.user_id, model.created_at >= start, model.created_at < end)
+            .order_by(model.created_at)
+            .all()
+        )
+        lines.extend(f"{label}: {render(record)}" for record in records)
+    return "\n".join(lines), len(lines)
+
+
+def _children_input(db: Session, node: RollupSummary) -> tuple[str, int]:
+    """Return the dated child summaries of a week or month node."""
+
+    children = (
+        db.query(RollupSummary)
+        .filter(
+            RollupSummary.user_id == node.user_id,
+            RollupSummary.level == _CHILD[node.level],
+            RollupSummary.period_start >= node.period_start,
+            RollupSummary.period_start < _period_end(node.level, node.period_start),
+            RollupSummary.summary_text.is_not(None),
+        )
+        .order_by(RollupSummary.period_start)
+        .all()
+    )
+    return "\n".join(f"{c.period_start.isoformat()}: {c.summary_text}" for c in children), len(children)
+
+
+def _condense(level: str, text: str) -> str:
+    """Store short input verbatim; otherwise summarize it under the token ceiling."""
+
+    settings = get_settings()
+    if len(text) <= settings.ROLLUP_VERBATIM_MAX_CHARS:
+        return text
+    return str(
+        llm_client.chat_completion(
+            [
+                {"role": "system", "content": ROLLUP_PROMPTS[level]},
+                {"role": "user", "content": text[: settings.ROLLUP_INPUT_MAX_CHARS]},
+            ],
+            model=settings.ROLLUP_SUMMARY_MODEL,
+            temperature=0.3,
+            max_tokens=settings.ROLLUP_SUMMARY_MAX_TOKENS,
+        )
+    )
+
+
+def _rebuild(db: Session, node: RollupSummary, *, condense: bool = True) -> bool:
+    """Recompute one stale node and mark its parent stale if its input changed.
+
+    Returns whether the model was called. With ``condense`` false, input too
+    long to store verbatim is not summarized: a node without text gets the
+    opening of its input and stays stale, and a node with text keeps it.
+    """
+
+    if node.level == LEVEL_DAY:
+        text, count = _day_input(db, node)
+    else:
+        text, count = _children_input(db, node)
+    fingerprint = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    changed = fingerprint != node.source_fingerprint
+    parent = _PARENT.get(node.level)
+    if changed and parent:
+        mark_stale(db.connection(), [(node.user_id, parent, period_start(parent, node.period_start))])
+
+    if count == 0:
+        # Notes: Every record behind the node is gone
+        db.delete(node)
+        return False
+    if not changed:
+        node.stale = False
+        return False
+    verbatim_max = get_settings().ROLLUP_VERBATIM_MAX_CHARS
+    if not condense and len(text) > verbatim_max:
+        if node.summary_text is None:
+            node.summary_text = text[:verbatim_max]
+            node.item_count = count
+        return False
+    node.summary_text = _condense(node.level, text)
+    node.source_fingerprint = fingerprint
+    node.item_count = count
+    node.stale = False
+    return len(text) > verbatim_max
+
+
+def refresh_rollups(db: Session, user_id: int | None = None, *, limit: int | None = None) -> int:
+    """Rebuild stale nodes bottom-up, committing per level; return how many were rebuilt.
+
+    ``limit`` caps the nodes handled in one call so a job can work in batches.
+    """
+
+    rebuilt = 0
+    for level in LEVELS:
+        if limit is not None and rebuilt >= limit:
+            break
+        stmt = select(RollupSummary).where(RollupSummary.stale.is_(True), RollupSummary.level == level)
+        if user_id is not None:
+            stmt = stmt.where(RollupSummary.user_id == user_id)
+        stmt = stmt.order_by(RollupSummary.user_id, RollupSummary.period_start)
+        if limit is not None:
+            stmt = stmt.limit(limit - rebuilt)
+        nodes = db.execute(stmt).scalars().all()
+        for node in nodes:
+            _rebuild(db, node)
+        db.commit()
+        rebuilt += len(nodes)
+    return rebuilt
+
+
+def refresh_window(db: Session, user_id: int, level: str, start: date, *, model_calls: int) -> None:
+    """Rebuild the user's stale ``level`` nodes from ``start`` and the child nodes under them.
+
+    Levels go bottom-up and each level newest first. At most ``model_calls``
+    nodes are condensed by the model; every other stale node is rebuilt
+    when its input is short enough to store verbatim, or otherwise keeps
+    its text (or the opening of its input) until the refresh job runs.
+    """
+
+    for child_level in LEVELS[: LEVELS.index(level) + 1]:
+        nodes = db.execute(
+            select(RollupSummary)
+            .where(
+                RollupSummary.user_id == user_id,
+                RollupSummary.level == child_level,
+                RollupSummary.stale.is_(True),
+                RollupSummary.period_start >= start,
+            )
+            .order_by(RollupSummary.period_start.desc())
+        ).scalars().all()
+        for node in nodes:
+            if _rebuild(db, node, condense=model_calls > 0):
+                model_calls -= 1
+        db.commit()
+
+
+def get_rollup_nodes(db: Session, user_id: int, level: str, since: date) -> list[RollupSummary]:
+    """Return the user's ``level`` nodes covering ``since`` onward.
+
+    Stale nodes in that window are refreshed first, spending at most
+    ``ROLLUP_READ_REFRESH_LIMIT`` model calls on the newest of them.
+    """
+
+    start = period_start(level, since)
+    refresh_window(db, user_id, level, start, model_calls=get_settings().ROLLUP_READ_REFRESH_LIMIT)
+    return (
+        db.query(RollupSummary)
+        .filter(
+            RollupSummary.user_id == user_id,
+            RollupSummary.level == level,
+            RollupSummary.period_start >= start,
+            RollupSummary.summary_text.is_not(None),
+        )
+        .order_by(RollupSummary.period_start)
+        .all()
+    )
+
+
+def format_nodes(nodes: Iterable[RollupSummary]) -> str:
+    """Render nodes as dated lines for a prompt."""
+
+    return "\n".join(f"{node.period_start.isoformat()}: {node.summary_text}" for node in nodes)
+
+
+def mark_history_stale(db: Session, since: date | None = None) -> int:
+    """Mark the day node of every record since ``since`` stale and commit.
+
+    Returns the number of day nodes marked. Used to backfill the tree and to
+    recover from bulk loads that bypass the flush hook.
+    """
+
+    keys = set()
+    for model in TRACKED_RECORDS:
+        stmt = select(model.user_id, func.date(model.created_at)).where(
+            model.user_id.is_not(None), model.created_at.is_not(None)
+        )
+        if since is not None:
+            stmt = stmt.where(model.created_at >= datetime.combine(since, datetime.min.time()))
+        keys.update((uid, LEVEL_DAY, _as_date(day)) for uid, day in db.execute(stmt.distinct()))
+    mark_stale(db.connection(), keys)
+    db.commit()
+    return len(keys)
@@ -0,0 +1,200 @@
+"""Resumable, concurrent goal generation for large user segments.
+
+Segment members are read in keyset pages ordered by user id. Every member of
+a page gets its goal suggestions from the async adapter with at most
+``GOAL_BATCH_CONCURRENCY`` calls in flight. The page's goals are then
+written with chunked executemany inserts, and the page commits together with
+its :class:`~models.goal_batch_checkpoint.GoalBatchCheckpoint`. An
+interrupted run therefore resumes after the last committed user, without
+repeating calls or inserting duplicate goals.
+
+Members whose LLM call fails are counted in ``users_failed`` and skipped;
+the checkpoint still moves past them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from models import Goal, GoalBatchCheckpoint
+from services import llm_client
+from services.ai_model_adapter import AIModelAdapter
+from services.context_snapshot_service import invalidate_user_context
+from services.personalized_recommendation_service import build_goal_messages, parse_goal_suggestions
+from services.segmentation_service import iter_segment_member_pages
+from utils.logger import get_logger
+
+logger = get_logger()
+
+RUNNING = "running"
+COMPLETED = "completed"
+
+
+@dataclass
+class GoalBatchReport:
+    """Progress of a segment goal run, cumulative across resumes."""
+
+    segment_id: str
+    status: str
+    resumed_after: int | None
+    users_processed: int
+    users_failed: int
+    goals_created: int
+    pages: int
+    elapsed_seconds: float
+    users_per_second: float
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _load_checkpoint(db: Session, segment_id: UUID, restart: bool) -> GoalBatchCheckpoint:
+    """Return the checkpoint to continue from, resetting finished or discarded runs."""
+
+    checkpoint = db.get(GoalBatchCheckpoint, segment_id)
+    if checkpoint is None:
+        checkpoint = GoalBatchCheckpoint(segment_id=segment_id)
+        db.add(checkpoint)
+    elif restart or checkpoint.status == COMPLETED:
+        checkpoint.last_user_id = None
+        checkpoint.started_at = datetime.utcnow()
+    else:
+        return checkpoint
+    checkpoint.users_processed = 0
+    checkpoint.users_failed = 0
+    checkpoint.goals_created = 0
+    checkpoint.status = RUNNING
+    db.commit()
+    return checkpoint
+
+
+async def _generate_page(
+    adapter: AIModelAdapter, members: list[tuple[int, str]], limit: asyncio.Semaphore
+) -> list[tuple[int, list[str] | None]]:
+    """Return ``(user_id, goals)`` per member; ``goals`` is ``None`` on failure."""
+
+    async def one(user_id: int, email: str) -> tuple[int, list[str] | None]:
+        async with limit:
+            try:
+                text = await adapter.agenerate(build_goal_messages(email), temperature=0.7)
+            except Exception:
+                logger.exception("Goal generation failed for user %s", user_id)
+                return user_id, None
+        return user_id, parse_goal_suggestions(text)
+
+    return await asyncio.gather(*[one(user_id, email) for user_id, email in members])
+
+
+def _insert_goals(db: Session, rows: list[dict], chunk_size: int) -> None:
+    """Bulk insert goal rows in chunks of ``chunk_size``."""
+
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(Goal), rows[start : start + chunk_size])
+
+
+async def arun_segment_goal_batch(
+    db: Session,
+    segment_id: str | UUID,
+    *,
+    page_size: int | None = None,
+    concurrency: int | None = None,
+    restart: bool = False,
+    adapter: AIModelAdapter | None = None,
+    on_progress: Callable[[GoalBatchReport], None] | None = None,
+) -> GoalBatchReport:
+    """Generate goals for every segment member, resuming a previous run."""
+
+    settings = get_settings()
+    page_size = page_size or settings.GOAL_BATCH_PAGE_SIZE
+    limit = asyncio.Semaphore(concurrency or settings.GOAL_BATCH_CONCURRENCY)
+    adapter = adapter or AIModelAdapter("OpenAI")
+    seg_id = UUID(segment_id) if isinstance(segment_id, str) else segment_id
+
+    checkpoint = _load_checkpoint(db, seg_id, restart)
+    resumed_after = checkpoint.last_user_id
+    start = time.perf_counter()
+    processed_this_run = 0
+    pages = 0
+
+    def report() -> GoalBatchReport:
+        elapsed = time.perf_counter() - start
+        return GoalBatchReport(
+            segment_id=str(seg_id),
+            status=checkpoint.status,
+            resumed_after=resumed_after,
+            users_processed=checkpoint.users_processed,
+            users_failed=checkpoint.users_failed,
+            goals_created=checkpoint.goals_created,
+            pages=pages,
+            elapsed_seconds=round(elapsed, 2),
+            users_per_second=round(processed_this_run / elapsed, 2) if elapsed else 0.0,
+        )
+
+    for members in iter_segment_member_pages(db, seg_id, page_size, after_id=resumed_after):
+        results = await _generate_page(adapter, members, limit)
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "title": title,
+                "progress": 0,
+                "is_completed": False,
+                "progress_updated_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user_id, goals in results
+            for title in goals or ()
+        ]
+        _insert_goals(db, rows, settings.GOAL_BATCH_INSERT_CHUNK)
+        failed = sum(1 for _, goals in results if goals is None)
+        # Notes: Goals and the checkpoint advance in one transaction
+        checkpoint.last_user_id = members[-1][0]
+        checkpoint.users_processed += len(members)
+        checkpoint.users_failed += failed
+        checkpoint.goals_created += len(rows)
+        db.commit()
+
+        for user_id in {row["user_id"] for row in rows}:
+            invalidate_user_context(user_id)
+        pages += 1
+        processed_this_run += len(members)
+        progress = report()
+        logger.info(
+            "Segment %s goals: %s users (%s failed), %s goals, %.1f users/s",
+            seg_id,
+            progress.users_processed,
+            progress.users_failed,
+            progress.goals_created,
+            progress.users_per_second,
+        )
+        if on_progress is not None:
+            on_progress(progress)
+
+    checkpoint.status = COMPLETED
+    db.commit()
+    return report()
+
+
+def run_segment_goal_batch(db: Session, segment_id: str | UUID, **kwargs) -> GoalBatchReport:
+    """Blocking entry point for jobs; owns the event loop for the run."""
+
+    async def main() -> GoalBatchReport:
+        try:
+            return await arun_segment_goal_batch(db, segment_id, **kwargs)
+        finally:
+            # Notes: Pooled async connections belong to this loop
+            await llm_client.aclose()
+
+    return asyncio.run(main())
+
+# Footnote: generate_goals_for_segment remains the in-request path for small segments.
@@ -2,19 +2,21 @@
 
 # Notes: Standard imports for JSON handling
 import json
-from typing import Any, List
+from typing import Any, Iterator, List
 
 # Notes: SQLAlchemy session and aggregate helpers
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from uuid import UUID
 
+from services import activity_rollup_service
+
 # Notes: Import the models required for filtering
 from models import (
     User,
     Subscription,
     ChurnRisk,
-    UserSession,
+    UserActivityDaily,
     UserPersonality,
     Personality,
     UserSegment,
@@ -130,16 +132,30 @@ def _apply_session_filter(query, db: Session, criteria: dict[str, Any]):
     """Apply active session count rules to the query."""
     if not any(k in criteria for k in ("min_sessions", "max_sessions")):
         return query
+    # Notes: All-time session totals from the daily rollup; users without any
+    # sessions stay excluded as with the previous raw-event join
     subq = (
-        db.query(UserSession.user_id, func.count(UserSession.id).label("session_count"))
-        .group_by(UserSession.user_id)
+        activity_rollup_service.activity_totals_query(counters=("sessions",))
+        .having(func.sum(UserActivityDaily.sessions) > 0)
         .subquery()
     )
     query = query.join(subq, subq.c.user_id == User.id)
     if "min_sessions" in criteria:
-        query = query.filter(subq.c.session_count >= criteria["min_sessions"])
+        query = query.filter(subq.c.sessions >= criteria["min_sessions"])
     if "max_sessions" in criteria:
-        query = query.filter(subq.c.session_count <= criteria["max_sessions"])
+        query = query.filter(subq.c.sessions <= criteria["max_sessions"])
+    return query
+
+
+def _segment_query(db: Session, segment: UserSegment):
+    """Return a ``User`` query filtered by the segment's criteria."""
+    criteria: dict[str, Any] = json.loads(segment.criteria_json or "{}")
+
+    query = db.query(User)
+    query = _apply_subscription_filter(query, db, criteria)
+    query = _apply_churn_filter(query, db, criteria)
+    query = _apply_personality_filter(query, criteria)
+    query = _apply_session_filter(query, db, criteria)
     return query
 
 
@@ -151,12 +167,33 @@ def evaluate_segment(db: Session, segment_id: str | UUID) -> List[User]:
     if segment is None:
         return []
 
-    criteria: dict[str, Any] = json.loads(segment.criteria_json or "{}")
+    return _segment_query(db, segment).all()
 
-    query = db.query(User)
-    query = _apply_subscription_filter(query, db, criteria)
-    query = _apply_churn_filter(query, db, criteria)
-    query = _apply_personality_filter(query, criteria)
-    query = _apply_session_filter(query, db, criteria)
 
-    return query.all()
+def iter_segment_member_pages(
+    db: Session,
+    segment_id: str | UUID,
+    batch_size: int = 500,
+    after_id: int | None = None,
+) -> Iterator[list[tuple[int, str]]]:
+    """Yield ascending ``(user_id, email)`` pages of segment members.
+
+    Keyset pagination on ``User.id`` keeps every page an index range scan and
+    lets a resumed job continue after ``after_id`` without re-reading earlier
+    members.
+    """
+    seg_id = UUID(segment_id) if isinstance(segment_id, str) else segment_id
+    segment = db.get(UserSegment, seg_id)
+    if segment is None:
+        return
+    members = _segment_query(db, segment).with_entities(User.id, User.email).distinct()
+    last_id = after_id
+    while True:
+        query = members
+        if last_id is not None:
+            query = query.filter(User.id > last_id)
+        page = [tuple(row) for row in query.order_by(User.id).limit(batch_size)]
+        if not page:
+            return
+        yield page
+        last_id = page[-1][0]
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from models.session import Session as SessionModel
+from services.context_snapshot_service import invalidate_user_context
 
 
 def create_session(db: Session, session_data: dict) -> SessionModel:
@@ -10,6 +11,8 @@ def create_session(db: Session, session_data: dict) -> SessionModel:
     db.add(new_session)
     db.commit()
     db.refresh(new_session)
+    # Notes: Session summaries feed the cached prompt context
+    invalidate_user_context(new_session.user_id)
     return new_session
 
 
@@ -0,0 +1,239 @@
+"""Small dependency-graph executor for multi-step request pipelines.
+
+A pipeline is a list of :class:`Stage` objects naming the stages they run
+``after``. Each stage receives the results of every finished stage by name.
+It starts as soon as its dependencies succeed, so independent stages
+overlap. :meth:`StageGraph.run` returns once every *foreground* stage has
+finished.
+
+*Background* stages never hold up the caller. In ``background`` mode they run
+on a shared worker pool whenever their dependencies complete, and may
+outlive the request. In ``inline`` mode, used by the test suite, they run on
+the caller's thread after the foreground stages. A failed stage skips its
+dependants. The first foreground failure is re-raised to the caller, while
+background failures are only logged.
+
+Each stage's start offset and duration are recorded in a :class:`StageRun`
+so the critical path is visible in logs.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from config import get_settings
+from utils.logger import get_logger
+
+logger = get_logger()
+
+MODE_BACKGROUND = "background"
+MODE_INLINE = "inline"
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a pipeline and the stages it depends on."""
+
+    name: str
+    run: Callable[[dict[str, Any]], Any]
+    after: tuple[str, ...] = ()
+    background: bool = False
+
+
+@dataclass
+class StageTiming:
+    """Start offset from the beginning of the run and duration of a stage."""
+
+    status: str
+    started_ms: float = 0.0
+    duration_ms: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class StageRun:
+    """Results and timings of one execution of a :class:`StageGraph`."""
+
+    graph: str
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    background_done: threading.Event = field(default_factory=threading.Event)
+
+    def timing_summary(self) -> dict[str, dict[str, Any]]:
+        """Return timings as plain dicts for logging."""
+        return {
+            name: {
+                "status": t.status,
+                "started_ms": round(t.started_ms, 1),
+                "duration_ms": round(t.duration_ms, 1),
+            }
+            for name, t in self.timings.items()
+        }
+
+
+# Notes: Shared pools; foreground stages overlap within a request, background
+# stages drain independently of it
+_foreground_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="stage")
+_background_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_background_pool() -> ThreadPoolExecutor:
+    global _background_pool
+    with _pool_lock:
+        if _background_pool is None:
+            _background_pool = ThreadPoolExecutor(
+                max_workers=get_settings().STAGE_BACKGROUND_WORKERS,
+                thread_name_prefix="stage-bg",
+            )
+        return _background_pool
+
+
+class StageGraph:
+    """Validated set of stages that can be executed repeatedly."""
+
+    def __init__(self, name: str, stages: Iterable[Stage]):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self._dependants: dict[str, list[str]] = {name: [] for name in self.stages}
+        for stage in self.stages.values():
+            for dep in stage.after:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name!r} depends on unknown stage {dep!r}")
+                if self.stages[dep].background and not stage.background:
+                    raise ValueError(f"Foreground stage {stage.name!r} cannot wait on background {dep!r}")
+                self._dependants[dep].append(stage.name)
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        pending = {name: len(stage.after) for name, stage in self.stages.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        seen = 0
+        while ready:
+            name = ready.pop()
+            seen += 1
+            for dependant in self._dependants[name]:
+                pending[dependant] -= 1
+                if pending[dependant] == 0:
+                    ready.append(dependant)
+        if seen != len(self.stages):
+            raise ValueError(f"Stage graph {self.name!r} has a cycle")
+
+    def run(self, context: dict[str, Any] | None = None, *, mode: str | None = None) -> StageRun:
+        """Execute the graph and return once the foreground stages finish.
+
+        ``context`` seeds the results mapping passed to every stage.
+        """
+        mode = mode or get_settings().STAGE_BACKGROUND_MODE
+        if mode not in (MODE_BACKGROUND, MODE_INLINE):
+            raise ValueError(f"Unknown stage background mode {mode!r}")
+        return _Execution(self, dict(context or {}), mode).start()
+
+
+class _Execution:
+    """Scheduling state for a single :meth:`StageGraph.run`."""
+
+    def __init__(self, graph: StageGraph, context: dict[str, Any], mode: str):
+        self.graph = graph
+        self.mode = mode
+        self.run = StageRun(graph.name, results=context)
+        self.start_time = time.perf_counter()
+        self._lock = threading.Lock()
+        self._waiting = {name: len(stage.after) for name, stage in graph.stages.items()}
+        self._foreground_left = sum(not s.background for s in graph.stages.values())
+        self._background_left = len(graph.stages) - self._foreground_left
+        self._foreground_done = threading.Event()
+        self._deferred: list[Stage] = []
+        self._error: BaseException | None = None
+
+    def start(self) -> StageRun:
+        roots = [s for s in self.graph.stages.values() if not s.after]
+        if not self._foreground_left:
+            self._foreground_done.set()
+        if not self._background_left:
+            self.run.background_done.set()
+        for stage in roots:
+            self._schedule(stage)
+        self._foreground_done.wait()
+        if self.mode == MODE_INLINE:
+            # Notes: Deferred background stages (and any they unlock) run here
+            while self._deferred:
+                self._execute(self._deferred.pop(0))
+        logger.info("Stage graph %s foreground timings: %s", self.graph.name, self.run.timing_summary())
+        if self._error is not None:
+            raise self._error
+        return self.run
+
+    def _schedule(self, stage: Stage) -> None:
+        if not stage.background:
+            _foreground_pool.submit(self._execute, stage)
+        elif self.mode == MODE_INLINE:
+            with self._lock:
+                self._deferred.append(stage)
+        else:
+            _get_background_pool().submit(self._execute, stage)
+
+    def _execute(self, stage: Stage) -> None:
+        started = time.perf_counter()
+        try:
+            result = stage.run(self.run.results)
+        except BaseException as exc:
+            timing = StageTiming(FAILED, error=repr(exc))
+            if stage.background:
+                logger.exception("Background stage %s.%s failed", self.graph.name, stage.name)
+            elif self._error is None:
+                self._error = exc
+            ok = False
+        else:
+            timing = StageTiming(OK)
+            ok = True
+        timing.started_ms = (started - self.start_time) * 1000
+        timing.duration_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            if ok:
+                self.run.results[stage.name] = result
+            self.run.timings[stage.name] = timing
+        self._finish(stage, ok)
+
+    def _finish(self, stage: Stage, ok: bool) -> None:
+        ready: list[Stage] = []
+        skipped: list[Stage] = []
+        with self._lock:
+            for name in self.graph._dependants[stage.name]:
+                if not ok:
+                    if name not in self.run.timings:
+                        self.run.timings[name] = StageTiming(SKIPPED)
+                        skipped.append(self.graph.stages[name])
+                    continue
+                self._waiting[name] -= 1
+                if self._waiting[name] == 0 and name not in self.run.timings:
+                    ready.append(self.graph.stages[name])
+            if stage.background:
+                self._background_left -= 1
+            else:
+                self._foreground_left -= 1
+        for dependant in skipped:
+            self._finish(dependant, False)
+        for dependant in ready:
+            self._schedule(dependant)
+        with self._lock:
+            if self._foreground_left == 0:
+                self._foreground_done.set()
+            if self._background_left == 0 and not self.run.background_done.is_set():
+                self.run.background_done.set()
+                if self.mode == MODE_BACKGROUND:
+                    logger.info(
+                        "Stage graph %s background timings: %s",
+                        self.graph.name,
+                        self.run.timing_summary(),
+                    )
+
+# Footnote: Stages share the caller's results dict; each stage owns the keys it writes.
@@ -0,0 +1,118 @@
+"""Decide whether a journal summary can be reused instead of regenerated.
+
+A summary records a fingerprint of the entries it was built from: a SHA-256
+over each entry's id and ``updated_at``. Before summarizing, the caller asks
+:func:`plan_summary` how to proceed:
+
+* ``reuse`` - the current entry window has the same fingerprint as the latest
+  summary, so its text is returned without a model call or a new row.
+* ``incremental`` - the entries behind the latest summary are unchanged and
+  newer entries have arrived, so only those are sent alongside the previous
+  summary text.
+* ``full`` - anything else: no prior summary, a flagged one, or edited or
+  deleted source entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from sqlalchemy.orm import Session
+
+from models.journal_entry import JournalEntry
+from models.journal_summary import JournalSummary
+from models.summarized_journal import SummarizedJournal
+
+PLAN_REUSE = "reuse"
+PLAN_INCREMENTAL = "incremental"
+PLAN_FULL = "full"
+
+# Notes: Set while an admin rerun or replay needs fresh model output
+_bypass_reuse: ContextVar[bool] = ContextVar("summary_bypass_reuse", default=False)
+
+
+@dataclass
+class SummaryPlan:
+    """How to produce the next summary and what it builds on."""
+
+    mode: str
+    fingerprint: str
+    previous: SummarizedJournal | JournalSummary | None = None
+    new_entries: list[JournalEntry] = field(default_factory=list)
+    # Notes: Set under fresh_summaries(); the model call must skip the response cache too
+    fresh: bool = False
+
+
+def entry_fingerprint(entries: Iterable[JournalEntry]) -> str:
+    """Return a stable digest of entry ids and their last update times."""
+
+    parts = sorted(
+        f"{entry.id}:{entry.updated_at.isoformat() if entry.updated_at else ''}"
+        for entry in entries
+    )
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _created_column(model: type[SummarizedJournal] | type[JournalSummary]):
+    return model.created_at if model is SummarizedJournal else model.timestamp
+
+
+def _source_ids(summary: SummarizedJournal | JournalSummary) -> list[int]:
+    try:
+        return [int(i) for i in json.loads(summary.source_entry_ids or "[]")]
+    except (TypeError, ValueError):
+        return []
+
+
+@contextmanager
+def fresh_summaries() -> Iterator[None]:
+    """Always regenerate summaries inside this block."""
+
+    token = _bypass_reuse.set(True)
+    try:
+        yield
+    finally:
+        _bypass_reuse.reset(token)
+
+
+def plan_summary(
+    db: Session,
+    model: type[SummarizedJournal] | type[JournalSummary],
+    user_id: int,
+    entries: list[JournalEntry],
+) -> SummaryPlan:
+    """Compare ``entries`` with the user's latest ``model`` summary."""
+
+    fingerprint = entry_fingerprint(entries)
+    if _bypass_reuse.get():
+        return SummaryPlan(PLAN_FULL, fingerprint, fresh=True)
+
+    previous = (
+        db.query(model)
+        .filter(model.user_id == user_id)
+        .order_by(_created_column(model).desc())
+        .first()
+    )
+    # Notes: Flagged text is never served again or built upon
+    if previous is None or previous.flagged or not previous.source_fingerprint:
+        return SummaryPlan(PLAN_FULL, fingerprint)
+    if previous.source_fingerprint == fingerprint:
+        return SummaryPlan(PLAN_REUSE, fingerprint, previous)
+
+    previous_ids = _source_ids(previous)
+    known = set(previous_ids)
+    new_entries = [entry for entry in entries if entry.id not in known]
+    if not new_entries:
+        return SummaryPlan(PLAN_FULL, fingerprint)
+    # Notes: The entry set only grew if every earlier source entry is untouched
+    sources = db.query(JournalEntry).filter(JournalEntry.id.in_(previous_ids)).all()
+    if len(sources) != len(previous_ids) or entry_fingerprint(sources) != previous.source_fingerprint:
+        return SummaryPlan(PLAN_FULL, fingerprint)
+    return SummaryPlan(PLAN_INCREMENTAL, fingerprint, previous, new_entries)
+
+# Footnote: Used by orchestration_summarizer and ai_processor.generate_journal_summary.
@@ -1,40 +1,48 @@
 from __future__ import annotations
 """Helpers for moderation checks on generated summaries."""
 
-from openai import OpenAI, OpenAIError
-from config import get_settings
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Iterator, Sequence
 from uuid import UUID
 
-from services import audit_log_service
+from services import audit_log_service, moderation_engine
 from utils.logger import get_logger
 from models.summarized_journal import SummarizedJournal
 from models.journal_summary import JournalSummary
 from . import agent_flag_service
 
-settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
 logger = get_logger()
 
+# Notes: Summaries loaded per page when re-moderating history
+RERUN_PAGE_SIZE = 200
+
 
 def _moderation_flagged(text: str) -> bool:
-    """Return True when text fails the moderation check."""
-    try:
-        resp = client.moderations.create(input=text)
-        return bool(resp.results[0].flagged)
-    except OpenAIError as exc:  # pragma: no cover - network may be disabled
-        logger.warning("moderation check failed: %s", exc)
-    except Exception as exc:  # pragma: no cover - network may be disabled
-        logger.warning("moderation error: %s", exc)
-    # Simple keyword heuristic fallback
-    lowered = text.lower()
-    return any(word in lowered for word in ["forbidden", "banned", "violence"])
-
-
-def flag_summary_if_needed(db: Session, summary: SummarizedJournal | JournalSummary, user_id: int) -> None:
-    """Create an AgentOutputFlag when the summary text is unsafe."""
-    if _moderation_flagged(summary.summary_text):
+    """Return True when text fails the (memoized) moderation check."""
+    return moderation_engine.is_flagged(text)
+
+
+def check_summary_text(text: str) -> bool:
+    """Return the moderation verdict for ``text`` so one check can feed both flag paths."""
+    return _moderation_flagged(text)
+
+
+def flag_summary_if_needed(
+    db: Session,
+    summary: SummarizedJournal | JournalSummary,
+    user_id: int,
+    moderation_flagged: bool | None = None,
+) -> None:
+    """Create an AgentOutputFlag when the summary text is unsafe.
+
+    Pass ``moderation_flagged`` when the verdict is already known to skip
+    the moderation call.
+    """
+    if moderation_flagged is None:
+        moderation_flagged = _moderation_flagged(summary.summary_text)
+    if moderation_flagged:
         reason = "moderation_violation"
         agent_flag_service.flag_agent_output(
             db,
@@ -50,15 +58,19 @@ def flag_summary_if_needed(db: Session, summary: SummarizedJournal | JournalSumm
         db.commit()
 
 
-def auto_flag_summary(db: Session, summary_id: UUID, content: str) -> tuple[bool, str]:
+def auto_flag_summary(
+    db: Session, summary_id: UUID, content: str, moderation_flagged: bool | None = None
+) -> tuple[bool, str]:
     """Run heuristic checks and flag the summary when issues are detected."""
 
-    lowered = content.lower()
     trigger_type = None
-    if any(word in lowered for word in ["suicide", "kill", "hate"]):
+    if moderation_engine.AUTO_FLAG in moderation_engine.keyword_categories(content):
         trigger_type = "keyword"
-    elif _moderation_flagged(content):
-        trigger_type = "ai_moderation"
+    else:
+        if moderation_flagged is None:
+            moderation_flagged = _moderation_flagged(content)
+        if moderation_flagged:
+            trigger_type = "ai_moderation"
 
     flagged = trigger_type is not None
 
@@ -89,3 +101,65 @@ def auto_flag_summary(db: Session, summary_id: UUID, content: str) -> tuple[bool
     return flagged, trigger_type or "manual_review"
 
 
+def auto_flag_summaries(db: Session, summaries: Sequence[SummarizedJournal]) -> list[tuple[bool, str]]:
+    """Auto-flag several summaries with one moderation request per batch.
+
+    Summaries already caught by the keyword rules are not sent upstream.
+    """
+
+    needs_api = [
+        s for s in summaries
+        if moderation_engine.AUTO_FLAG not in moderation_engine.keyword_categories(s.summary_text)
+    ]
+    verdicts = dict(
+        zip(
+            (s.id for s in needs_api),
+            moderation_engine.moderate_batch([s.summary_text for s in needs_api]),
+        )
+    )
+    return [
+        auto_flag_summary(db, s.id, s.summary_text, verdicts.get(s.id, False))
+        for s in summaries
+    ]
+
+
+def _iter_unflagged_pages(
+    db: Session, batch_size: int, summary_ids: Sequence[UUID] | None
+) -> Iterator[list[SummarizedJournal]]:
+    """Yield pages of unflagged summaries in id order (keyset pagination)."""
+
+    last_id = None
+    while True:
+        stmt = (
+            select(SummarizedJournal)
+            .where(SummarizedJournal.flagged.is_not(True))
+            .order_by(SummarizedJournal.id)
+            .limit(batch_size)
+        )
+        if summary_ids is not None:
+            stmt = stmt.where(SummarizedJournal.id.in_(summary_ids))
+        if last_id is not None:
+            stmt = stmt.where(SummarizedJournal.id > last_id)
+        page = list(db.scalars(stmt))
+        if not page:
+            return
+        yield page
+        last_id = page[-1].id
+
+
+def rerun_summary_moderation(
+    db: Session,
+    summary_ids: Sequence[str | UUID] | None = None,
+    batch_size: int = RERUN_PAGE_SIZE,
+) -> dict[str, int]:
+    """Re-moderate unflagged summaries (all, or ``summary_ids``) in batches."""
+
+    ids = None
+    if summary_ids is not None:
+        ids = [UUID(str(sid)) for sid in summary_ids]
+    checked = flagged = 0
+    for page in _iter_unflagged_pages(db, batch_size, ids):
+        outcomes = auto_flag_summaries(db, page)
+        checked += len(page)
+        flagged += sum(1 for was_flagged, _ in outcomes if was_flagged)
+    return {"checked": checked, "flagged": flagged}
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from models.task import Task
+from services.context_snapshot_service import invalidate_user_context
 
 
 def create_task(db: Session, task_data: dict) -> Task:
@@ -11,6 +12,8 @@ def create_task(db: Session, task_data: dict) -> Task:
     db.add(new_task)
     db.commit()
     db.refresh(new_task)
+    # Notes: Open tasks are part of the cached prompt context
+    invalidate_user_context(new_task.user_id)
     # Return the freshly created task
     return new_task
 
@@ -35,6 +38,7 @@ def mark_task_complete(db: Session, task_id: int) -> None:
         # Update the completion flag and persist the change
         task.is_completed = True
         db.commit()
+        invalidate_user_context(task.user_id)
 
 
 def delete_task(db: Session, task_id: int) -> None:
@@ -43,5 +47,7 @@ def delete_task(db: Session, task_id: int) -> None:
     task = db.query(Task).filter(Task.id == task_id).first()
     if task:
         # Delete and commit the removal
+        user_id = task.user_id
         db.delete(task)
         db.commit()
+        invalidate_user_context(user_id)
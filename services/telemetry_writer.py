@@ -0,0 +1,240 @@
+"""Buffered writer for orchestration performance and agent execution logs.
+
+Every agent run used to ``add`` + ``commit`` + ``refresh`` its log row on the
+request's session, putting an fsync-bound transaction on the hot path of each
+LLM call. In ``buffered`` mode log rows are instead placed on a bounded
+in-process queue and a daemon thread writes them in batches on its own
+session, every ``TELEMETRY_FLUSH_INTERVAL_MS`` or as soon as
+``TELEMETRY_BATCH_SIZE`` rows are waiting.
+
+When the queue is full, ``submit`` waits up to ``TELEMETRY_ENQUEUE_TIMEOUT_MS``
+for the flusher to catch up and then drops the row, counting it in
+:meth:`TelemetryWriter.stats`. ``sync`` mode keeps the previous behaviour of
+committing on the caller's session and is what the test suite uses.
+
+``buffered`` falls back to ``sync`` when the writer's engine hands every
+session the same connection (SQLite's ``StaticPool``): the flusher's commit
+would otherwise land in whatever transaction a request has open.
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+from typing import Callable, Iterable
+
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from database.session import shares_one_connection
+from utils.logger import get_logger
+
+logger = get_logger()
+
+MODE_BUFFERED = "buffered"
+MODE_SYNC = "sync"
+
+
+class TelemetryWriter:
+    """Queue ORM log rows and persist them in batches off the request path."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        *,
+        mode: str | None = None,
+        max_queue: int | None = None,
+        batch_size: int | None = None,
+        flush_interval_ms: int | None = None,
+        enqueue_timeout_ms: int | None = None,
+    ):
+        settings = get_settings()
+        self.mode = mode or settings.TELEMETRY_MODE
+        if self.mode not in (MODE_BUFFERED, MODE_SYNC):
+            raise ValueError(f"Unknown telemetry mode {self.mode!r}")
+        self.batch_size = batch_size or settings.TELEMETRY_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or settings.TELEMETRY_FLUSH_INTERVAL_MS) / 1000
+        timeout_ms = (
+            settings.TELEMETRY_ENQUEUE_TIMEOUT_MS if enqueue_timeout_ms is None else enqueue_timeout_ms
+        )
+        self.enqueue_timeout = timeout_ms / 1000
+        self._session_factory = session_factory
+        bind = getattr(self._factory(), "kw", {}).get("bind")
+        if self.mode == MODE_BUFFERED and shares_one_connection(bind):
+            self.mode = MODE_SYNC
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue or settings.TELEMETRY_QUEUE_MAX)
+        # Notes: Held while draining so flush() never races the background thread
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Notes: Guards every counter; stats() and flush() run on request threads
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def submit(self, db: Session, entry):
+        """Persist ``entry`` now (sync mode) or queue it for the flusher."""
+        if self.mode == MODE_SYNC:
+            db.add(entry)
+            db.commit()
+            db.refresh(entry)
+            return entry
+        self._enqueue(entry)
+        return entry
+
+    def submit_many(self, db: Session, entries: list) -> list:
+        """Persist several rows in one transaction or queue each of them."""
+        if not entries:
+            return entries
+        if self.mode == MODE_SYNC:
+            db.add_all(entries)
+            db.commit()
+            return entries
+        for entry in entries:
+            self._enqueue(entry)
+        return entries
+
+    def _enqueue(self, entry) -> None:
+        self._ensure_started()
+        try:
+            if self.enqueue_timeout > 0:
+                self._queue.put(entry, timeout=self.enqueue_timeout)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            # Notes: Telemetry is best effort; never stall a request on it
+            with self._stats_lock:
+                self.dropped += 1
+            self._wakeup.set()
+            return
+        with self._stats_lock:
+            self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="telemetry-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush(max_rows=self.batch_size)
+
+    def _drain(self, limit: int | None) -> list:
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self, max_rows: int | None = None) -> int:
+        """Write queued rows now and return how many were persisted."""
+        written = 0
+        with self._write_lock:
+            while True:
+                batch = self._drain(max_rows or self.batch_size)
+                if not batch:
+                    break
+                written += self._write(batch)
+                if max_rows is not None:
+                    break
+        return written
+
+    def _factory(self) -> Callable[[], Session]:
+        if self._session_factory is None:
+            from database.session import SessionLocal
+
+            return SessionLocal
+        return self._session_factory
+
+    def _write(self, batch: list) -> int:
+        db = self._factory()()
+        try:
+            # Notes: Same-class rows flush as one executemany INSERT per model
+            db.add_all(batch)
+            db.commit()
+        except Exception:  # pragma: no cover - depends on database failures
+            db.rollback()
+            with self._stats_lock:
+                self.failed += len(batch)
+            logger.exception("Dropped %s telemetry rows after a failed flush", len(batch))
+            return 0
+        finally:
+            db.close()
+        with self._stats_lock:
+            self.written += len(batch)
+            self.flushes += 1
+        return len(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the flusher thread and write everything still queued."""
+        thread = self._thread
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        """Return queue depth and write/drop counters."""
+        with self._stats_lock:
+            return {
+                "mode": self.mode,
+                "queued": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "flushes": self.flushes,
+            }
+
+
+_writer: TelemetryWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_telemetry_writer() -> TelemetryWriter:
+    """Return the process-wide writer, creating it on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = TelemetryWriter()
+    return _writer
+
+
+def submit(db: Session, entry):
+    """Hand one log row to the process-wide writer."""
+    return get_telemetry_writer().submit(db, entry)
+
+
+def submit_many(db: Session, entries: Iterable) -> list:
+    """Hand several log rows to the process-wide writer."""
+    return get_telemetry_writer().submit_many(db, list(entries))
+
+
+def shutdown_telemetry_writer() -> None:
+    """Flush and stop the process-wide writer if it was ever used."""
+    if _writer is not None:
+        _writer.shutdown()
+
+# Footnote: orchestration_log_service and agent_execution_log_service route their writes here.
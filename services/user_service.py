@@ -34,8 +34,9 @@ def get_user_by_email(db: Session, email: str) -> User | None:
 
 def get_user(db: Session, user_id: int) -> User | None:
     """Return a user by their ID or None if not found."""
-    # Retrieve a single user by primary key
-    return db.query(User).filter(User.id == user_id).first()
+    # Retrieve a single user by primary key; ``Session.get`` reuses the
+    # identity map so a user already loaded by auth costs no extra query
+    return db.get(User, user_id)
 
 
 def get_all_users(db: Session) -> list[User]:
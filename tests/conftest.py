@@ -12,6 +12,14 @@ from sqlalchemy.pool import StaticPool
 from database.base import Base
 # Notes: Ensure rate limiter uses a very high threshold during tests
 os.environ.setdefault("RATE_LIMIT", "100000/minute")
+# Notes: Write telemetry rows inline so tests can read them on their own session
+os.environ.setdefault("TELEMETRY_MODE", "sync")
+# Notes: Run background pipeline stages before the request returns
+os.environ.setdefault("STAGE_BACKGROUND_MODE", "inline")
+# Notes: Leave journal tagging to reads so writes never reach the model
+os.environ.setdefault("JOURNAL_TAGGING_MODE", "deferred")
+# Notes: Startup must not try to create remote assistants
+os.environ.setdefault("ASSISTANT_WARMUP_ON_STARTUP", "false")
 os.environ.setdefault(
     "ENABLED_FEATURES",
     '["journal","goals","pdf_export","agent_feedback","checkins"]',
@@ -19,6 +27,7 @@ os.environ.setdefault(
 os.environ.setdefault("TESTING", "true")
 from main import app
 from database.utils import get_db
+from database.schema import create_schema
 from fastapi.testclient import TestClient
 import uuid
 
@@ -32,6 +41,8 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 
 # Notes: Initial schema created once. Each test will reset tables.
 Base.metadata.create_all(bind=engine)
+# Notes: The app engine no longer builds tables on import; mirror the deploy step
+create_schema()
 
 
 def override_get_db(session: Session):
@@ -61,6 +72,25 @@ def db_session():
         db.close()
 
 
+@pytest.fixture
+def file_db(tmp_path):
+    """Session on a file-backed SQLite database whose pool gives each thread its own connection.
+
+    Background writers fall back to inline work on the shared ``StaticPool``
+    connection, so tests of the threaded paths run here instead.
+    """
+    file_engine = create_engine(
+        f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=file_engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=file_engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        file_engine.dispose()
+
+
 @pytest.fixture
 def client(db_session):
     """FastAPI test client using the isolated session."""
@@ -121,3 +151,24 @@ def seed_roles(db_session):
             db_session.add(Role(name=name))
     db_session.commit()
     yield
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Drop cached user context, policies, LLM responses, AI results, verdicts and provider state between tests."""
+    from services.ai_result_cache import clear_ai_result_cache
+    from services.context_snapshot_service import clear_context_snapshots
+    from services.llm_rate_limiter import reset_rate_limiters
+    from services.llm_response_cache import clear_response_cache
+    from services.moderation_engine import clear_moderation_cache
+    from services.policy_cache import clear_policy_caches
+    from services.provider_routing import reset_provider_health
+
+    clear_context_snapshots()
+    clear_policy_caches()
+    clear_response_cache()
+    clear_ai_result_cache()
+    reset_rate_limiters()
+    reset_provider_health()
+    clear_moderation_cache()
+    yield
@@ -35,7 +35,7 @@ def test_generate_action_plan(client, db_session, monkeypatch):
     # Notes: Patch the service layer to avoid calling OpenAI during the test
     import routes.action_plan as action_routes
 
-    def fake_generate(db, uid: int, goal: str) -> str:
+    async def fake_generate(db, uid: int, goal: str) -> str:
         return "Mock Plan"
 
     monkeypatch.setattr(action_routes, "generate_action_plan", fake_generate)
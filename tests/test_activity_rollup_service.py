@@ -0,0 +1,81 @@
+"""Tests for the incrementally maintained daily activity rollup."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from models import DailyCheckIn, JournalEntry, UserActivityDaily
+from models.daily_checkin import Mood
+from services import activity_rollup_service, user_service, user_session_service
+from services.global_insights_service import get_global_insights
+
+
+def _snapshot(db):
+    rows = db.query(UserActivityDaily).order_by(
+        UserActivityDaily.user_id, UserActivityDaily.activity_date
+    )
+    return [
+        (r.user_id, r.activity_date, *(getattr(r, c) for c in activity_rollup_service.ROLLUP_COUNTERS))
+        for r in rows
+    ]
+
+
+def test_orm_inserts_and_deletes_update_rollup(db_session, test_user):
+    user = test_user
+    entries = [JournalEntry(user_id=user.id, content=str(i)) for i in range(3)]
+    db_session.add_all(entries)
+    db_session.add(DailyCheckIn(user_id=user.id, mood=Mood.GOOD, energy_level=3, stress_level=2))
+    user_session_service.start_session(db_session, user.id, None, None)
+    db_session.commit()
+
+    totals = activity_rollup_service.get_user_activity_totals(db_session, [user.id], 7)[user.id]
+    assert totals["journals"] == 3
+    assert totals["checkins"] == 1
+    assert totals["sessions"] == 1
+
+    db_session.delete(entries[0])
+    db_session.commit()
+    totals = activity_rollup_service.get_user_activity_totals(db_session, [user.id], 7)[user.id]
+    assert totals["journals"] == 2
+
+
+def test_windows_and_rebuild_match_incremental(db_session, test_user, unique_user_data):
+    user = test_user
+    other = user_service.create_user(db_session, unique_user_data())
+    now = datetime.utcnow()
+    db_session.add_all(
+        [
+            JournalEntry(user_id=user.id, content="new", created_at=now),
+            JournalEntry(user_id=user.id, content="mid", created_at=now - timedelta(days=20)),
+            JournalEntry(user_id=user.id, content="old", created_at=now - timedelta(days=60)),
+            JournalEntry(user_id=other.id, content="x", created_at=now - timedelta(days=3)),
+        ]
+    )
+    db_session.commit()
+
+    totals = activity_rollup_service.get_user_activity_totals(db_session, [user.id, other.id], 30, now)
+    assert totals[user.id]["journals"] == 2
+    assert totals[other.id]["journals"] == 1
+
+    insights = get_global_insights(db_session)
+    assert insights["journals_last_7d"] == 2
+    assert insights["journals_last_30d"] == 3
+    assert insights["weekly_active_users"] == 2
+
+    incremental = _snapshot(db_session)
+    assert activity_rollup_service.rebuild_activity_rollup(db_session) == len(incremental)
+    assert _snapshot(db_session) == incremental
+
+
+def test_register_orm_hooks_attaches_each_hook_once(db_session):
+    from database.session import register_orm_hooks
+
+    register_orm_hooks()
+    register_orm_hooks()
+
+    listeners = list(db_session.dispatch.after_flush)
+    assert listeners.count(activity_rollup_service._roll_up_flushed_events) == 1
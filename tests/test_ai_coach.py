@@ -44,7 +44,7 @@ def test_ai_coach_response(monkeypatch):
     # Notes: Patch the AI processor to avoid external API calls
     from services import ai_processor
 
-    def fake_generate(db, user_id: int, prompt: str) -> str:
+    async def fake_generate(db, user_id: int, prompt: str) -> str:
         return "Mocked AI reply"
 
     monkeypatch.setattr(ai_processor, "generate_ai_response", fake_generate)
@@ -67,7 +67,10 @@ def test_ai_coach_missing_prompt(monkeypatch):
     # Notes: Patch AI generation to avoid external call even though it won't run
     from services import ai_processor
 
-    monkeypatch.setattr(ai_processor, "generate_ai_response", lambda *_: "")
+    async def fake_empty(*_):
+        return ""
+
+    monkeypatch.setattr(ai_processor, "generate_ai_response", fake_empty)
 
     headers = {"Authorization": f"Bearer {token}"}
     response = client.post("/ai/coach", json={}, headers=headers)
@@ -90,7 +93,7 @@ def test_ai_coach_response_with_memory(monkeypatch):
     # Notes: Patch AI processor to avoid calling external API
     from services import ai_processor
 
-    def fake_generate(db, uid: int, prompt: str) -> str:
+    async def fake_generate(db, uid: int, prompt: str) -> str:
         return "Mocked memory based reply"
 
     monkeypatch.setattr(ai_processor, "generate_ai_response", fake_generate)
@@ -112,7 +115,7 @@ def test_suggest_goals_endpoint(monkeypatch):
     # Notes: Patch the suggest_goals function used by the route
     import routes.ai_coach as ai_routes
 
-    def fake_suggest(db, uid: int) -> str:
+    async def fake_suggest(db, uid: int) -> str:
         return "1. Stay active\n2. Eat healthy"
 
     monkeypatch.setattr(ai_routes, "suggest_goals", fake_suggest)
@@ -58,15 +58,11 @@ def test_analyze_journal_trends_creates_record(monkeypatch):
         '"goal_progress_notes": "progress"}'
     )
 
-    class FakeResp:
-        def __init__(self, content: str):
-            self.choices = [type("obj", (), {"message": type("obj", (), {"content": content})})]
-
-    def fake_create(**_kwargs):
-        return FakeResp(response_text)
+    def fake_completion(messages, **_kwargs):
+        return response_text
 
     monkeypatch.setattr(
-        "services.ai_processor.client.chat.completions.create", fake_create
+        "services.llm_client.chat_completion", fake_completion
     )
 
     result = analyze_journal_trends(db, user.id)
@@ -87,18 +83,12 @@ def test_analyze_journal_trends_calls_openai(monkeypatch):
 
     called: dict = {}
 
-    class FakeResp:
-        def __init__(self, content: str):
-            self.choices = [type("obj", (), {"message": type("obj", (), {"content": content})})]
-
-    def fake_create(**kwargs):
+    def fake_completion(messages, **kwargs):
         called["model"] = kwargs.get("model")
-        return FakeResp(
-            '{"mood_summary": "ok", "keyword_trends": {}, "goal_progress_notes": ""}'
-        )
+        return '{"mood_summary": "ok", "keyword_trends": {}, "goal_progress_notes": ""}'
 
     monkeypatch.setattr(
-        "services.ai_processor.client.chat.completions.create", fake_create
+        "services.llm_client.chat_completion", fake_completion
     )
 
     analyze_journal_trends(db, user.id)
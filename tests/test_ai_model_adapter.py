@@ -0,0 +1,213 @@
+"""Tests for AIModelAdapter failover, hedging and circuit breakers."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+
+from config import get_settings
+from services import ai_model_adapter
+from services.ai_model_adapter import AIModelAdapter
+from services.provider_routing import (
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    get_provider_health,
+    get_provider_routing_stats,
+    hedge_delay,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def stub_provider(text, latency, fail=False):
+    """Return a client class whose calls take ``latency()`` seconds."""
+
+    class StubClient:
+        calls = 0
+        cancelled = 0
+
+        def generate(self, messages, temperature=0.7, cache=True):
+            type(self).calls += 1
+            time.sleep(latency())
+            if fail:
+                raise RuntimeError(f"{text} down")
+            return text
+
+        async def agenerate(self, messages, temperature=0.7, cache=True):
+            type(self).calls += 1
+            try:
+                await asyncio.sleep(latency())
+            except asyncio.CancelledError:
+                type(self).cancelled += 1
+                raise
+            if fail:
+                raise RuntimeError(f"{text} down")
+            return text
+
+    return StubClient
+
+
+@pytest.fixture
+def routing_settings(monkeypatch):
+    monkeypatch.setenv("AI_HEDGE_MIN_DELAY_SECONDS", "0.02")
+    monkeypatch.setenv("AI_HEDGE_DEFAULT_DELAY_SECONDS", "0.05")
+    monkeypatch.setenv("AI_HEDGE_MIN_SAMPLES", "10")
+    monkeypatch.setenv("AI_BREAKER_FAILURE_THRESHOLD", "2")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def _install(monkeypatch, **providers):
+    for name, client_cls in providers.items():
+        monkeypatch.setitem(ai_model_adapter.PROVIDER_CLIENTS, name, client_cls)
+
+
+def test_failed_call_fails_over_and_breaker_skips_provider(monkeypatch, routing_settings):
+    broken = stub_provider("primary", lambda: 0, fail=True)
+    backup = stub_provider("backup", lambda: 0)
+    _install(monkeypatch, Primary=broken, Backup=backup)
+    adapter = AIModelAdapter("Primary", fallbacks=["Backup"], hedge=False)
+
+    assert [adapter.generate([]) for _ in range(4)] == ["backup"] * 4
+
+    # Notes: Two failures open the breaker, so later calls go straight to the backup
+    assert broken.calls == 2
+    stats = get_provider_routing_stats()
+    assert stats["Primary"]["breaker"] == OPEN
+    assert stats["Primary"]["short_circuited"] == 2
+    assert stats["Backup"]["failovers"] == 2
+
+
+def test_breaker_half_open_trial_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()
+    # Notes: Only one trial call is admitted while half-open
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_lost_half_open_trial_does_not_block_the_provider_forever():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    # Notes: The trial never reports back; it counts as lost after another reset period
+    clock.now = 15
+    assert not breaker.allow()
+    clock.now = 20
+    assert breaker.allow()
+
+    breaker.release_trial()
+    assert breaker.state == HALF_OPEN and breaker.allow()
+
+
+def test_hedge_delay_tracks_primary_p95(monkeypatch, routing_settings):
+    rng = random.Random(7)
+    # Notes: Mostly ~10ms with a slow tail, like a provider under load
+    primary = stub_provider("primary", lambda: rng.choice([0.01] * 9 + [0.08]))
+    _install(monkeypatch, Primary=primary, Backup=stub_provider("backup", lambda: 0))
+    adapter = AIModelAdapter("Primary", fallbacks=["Backup"], hedge=False)
+
+    assert hedge_delay("Primary") == 0.05
+    for _ in range(40):
+        adapter.generate([])
+
+    p95 = get_provider_health("Primary").p95()
+    assert 0.01 <= p95 <= 0.12
+    assert hedge_delay("Primary") == max(0.02, p95)
+
+
+def test_sync_hedge_returns_faster_provider(monkeypatch, routing_settings):
+    slow = stub_provider("slow", lambda: 0.5)
+    fast = stub_provider("fast", lambda: 0.01)
+    _install(monkeypatch, Primary=slow, Backup=fast)
+    adapter = AIModelAdapter("Primary", fallbacks=["Backup"], hedge=True)
+
+    start = time.perf_counter()
+    assert adapter.generate([]) == "fast"
+    assert time.perf_counter() - start < 0.3
+
+    stats = get_provider_routing_stats()
+    assert stats["Backup"]["hedges_launched"] == 1
+    assert stats["Backup"]["hedge_wins"] == 1
+    assert stats["Primary"]["cancelled"] == 1
+
+
+def test_fast_primary_is_not_hedged(monkeypatch, routing_settings):
+    primary = stub_provider("primary", lambda: 0)
+    backup = stub_provider("backup", lambda: 0)
+    _install(monkeypatch, Primary=primary, Backup=backup)
+    adapter = AIModelAdapter("Primary", fallbacks=["Backup"], hedge=True)
+
+    async def run():
+        return await asyncio.gather(*[adapter.agenerate([]) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["primary"] * 5
+    assert backup.calls == 0
+
+
+def test_async_hedge_cancels_losing_request(monkeypatch, routing_settings):
+    slow = stub_provider("slow", lambda: 1.0)
+    fast = stub_provider("fast", lambda: 0.01)
+    _install(monkeypatch, Primary=slow, Backup=fast)
+    adapter = AIModelAdapter("Primary", fallbacks=["Backup"], hedge=True)
+
+    start = time.perf_counter()
+    assert asyncio.run(adapter.agenerate([])) == "fast"
+    assert time.perf_counter() - start < 0.5
+
+    assert slow.cancelled == 1
+    stats = get_provider_routing_stats()
+    assert stats["Primary"]["cancelled"] == 1
+    # Notes: A cancelled loser is not a provider failure
+    assert stats["Primary"]["failures"] == 0
+    assert stats["Backup"]["hedge_wins"] == 1
+
+
+def test_cancelled_hedge_loser_releases_half_open_trial(monkeypatch, routing_settings):
+    slow = stub_provider("slow", lambda: 1.0)
+    fast = stub_provider("fast", lambda: 0.01)
+    _install(monkeypatch, Primary=slow, Backup=fast)
+    adapter = AIModelAdapter("Primary", fallbacks=["Backup"], hedge=True)
+    breaker = get_provider_health("Primary").breaker
+    breaker._clock = clock = FakeClock()
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 1000
+
+    # Notes: Primary gets the half-open trial and loses the hedge race
+    assert asyncio.run(adapter.agenerate([])) == "fast"
+    assert slow.cancelled == 1
+
+    assert breaker.state == HALF_OPEN and breaker.allow()
+
+# Footnote: Stub providers sleep for sampled latencies; no network calls are made.
@@ -1,6 +1,7 @@
 """Tests for the AI orchestration service and route."""
 
 # Notes: Ensure the project root is importable and environment variables exist
+import asyncio
 import os
 import sys
 import uuid
@@ -55,13 +56,13 @@ def test_route_ai_request_selects_agent(monkeypatch):
     )
     assign_agent(db, user.id, "career")
 
-    def fake_career(db, uid: int, prompt: str, context: str) -> str:
+    async def fake_career(db, uid: int, prompt: str, context: str) -> str:
         return "career reply"
 
     monkeypatch.setattr(orchestration, "call_career_agent", fake_career)
     monkeypatch.setitem(orchestration.AGENT_HANDLERS, "career", fake_career)
 
-    result = orchestration.route_ai_request(db, user.id, "help me")
+    result = asyncio.run(orchestration.route_ai_request(db, user.id, "help me"))
     assert result["agent"] == "career"
     assert result["response"] == "career reply"
     db.close()
@@ -72,7 +73,7 @@ def test_route_ai_request_selects_agent(monkeypatch):
 def test_orchestrate_route(monkeypatch):
     user_id, token = register_and_login("health")
 
-    def fake_health(db, uid: int, prompt: str, context: str) -> str:
+    async def fake_health(db, uid: int, prompt: str, context: str) -> str:
         return "stay hydrated"
 
     monkeypatch.setattr(orchestration, "call_health_agent", fake_health)
@@ -0,0 +1,143 @@
+"""Tests for the per-user AI result cache and request coalescing."""
+
+# Notes: Configure environment and import app before running tests
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from main import app
+from auth.auth_utils import create_access_token
+from services import ai_result_cache
+from services.context_snapshot_service import invalidate_user_context
+
+client = TestClient(app)
+
+
+def test_result_reused_until_user_data_changes():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert ai_result_cache.get_or_compute("trends", 901, compute) == {"n": 1}
+    assert ai_result_cache.get_or_compute("trends", 901, compute) == {"n": 1}
+    # Notes: Other users and other endpoints are cached separately
+    assert ai_result_cache.get_or_compute("trends", 902, compute) == {"n": 2}
+    assert ai_result_cache.get_or_compute("tags", 901, compute) == {"n": 3}
+
+    invalidate_user_context(901)
+    assert ai_result_cache.get_or_compute("trends", 901, compute) == {"n": 4}
+    assert ai_result_cache.get_ai_result_cache_stats()["hits"] == 1
+
+
+def test_concurrent_sync_callers_share_one_computation():
+    calls = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return ["career", "health"]
+
+    def request():
+        barrier.wait()
+        results.append(ai_result_cache.get_or_compute("tags", 903, compute))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [["career", "health"]] * 8
+    assert ai_result_cache.get_ai_result_cache_stats()["coalesced"] == 7
+
+
+def test_concurrent_async_callers_share_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "1. Walk daily"
+
+    async def run():
+        return await asyncio.gather(
+            *[ai_result_cache.aget_or_compute("suggest_goals", 904, compute) for _ in range(10)]
+        )
+
+    assert asyncio.run(run()) == ["1. Walk daily"] * 10
+    assert len(calls) == 1
+
+
+def test_failures_reach_waiters_and_are_not_cached():
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    async def run():
+        return await asyncio.gather(
+            *[ai_result_cache.aget_or_compute("suggest_goals", 905, failing) for _ in range(3)],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(calls) == 1
+
+    def failing_sync():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        ai_result_cache.get_or_compute("suggest_goals", 905, failing_sync)
+    assert ai_result_cache.get_ai_result_cache_stats()["size"] == 0
+
+
+def test_journal_trends_route_reuses_analysis(monkeypatch, unique_user_data):
+    resp = client.post("/users/", json=unique_user_data())
+    user_id = resp.json()["id"]
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+    calls = []
+
+    def fake_analyze(db, uid):
+        calls.append(uid)
+        return {
+            "id": str(len(calls)),
+            "user_id": uid,
+            "timestamp": "2020-01-01T00:00:00",
+            "mood_summary": "good",
+            "keyword_trends": {},
+            "goal_progress_notes": "on track",
+        }
+
+    import routes.journal_trends as jt_route
+
+    monkeypatch.setattr(jt_route, "analyze_journal_trends", fake_analyze)
+
+    first = client.get("/ai/journal-trends", headers=headers).json()
+    second = client.get("/ai/journal-trends", headers=headers).json()
+    assert first == second
+    assert len(calls) == 1
+
+    # Notes: A new journal entry bumps the user's data version
+    client.post("/journals/", json={"user_id": user_id, "content": "new day"}, headers=headers)
+    third = client.get("/ai/journal-trends", headers=headers).json()
+    assert third["id"] == "2"
+    assert len(calls) == 2
+
+# Footnote: Coalescing is per process; the context version TTL covers other workers.
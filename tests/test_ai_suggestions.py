@@ -49,7 +49,7 @@ def test_suggest_goals(monkeypatch):
     # Notes: calling OpenAI during tests
     import routes.ai_coach as ai_routes
 
-    def fake_suggest(db, uid: int) -> str:
+    async def fake_suggest(db, uid: int) -> str:
         return "1. Exercise daily\n2. Eat more vegetables"
 
     monkeypatch.setattr(ai_routes, "suggest_goals", fake_suggest)
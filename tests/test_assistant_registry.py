@@ -0,0 +1,162 @@
+"""Tests for the shared OpenAI assistant registry."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from models.assistant_registry import AssistantRegistryEntry
+from services import llm_client
+from services.assistant_registry import AssistantRegistry
+from services.openai_agent_service import OpenAIAgentService
+
+_table = AssistantRegistryEntry.__table__
+
+
+# Notes: Fake assistants endpoint numbering each created assistant
+class FakeAssistantsEndpoint:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.created = []
+        self.deleted = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            assistant_id = request.url.path.rsplit("/", 1)[-1]
+            self.deleted.append(assistant_id)
+            return httpx.Response(
+                200, json={"id": assistant_id, "object": "assistant.deleted", "deleted": True}
+            )
+        await asyncio.sleep(self.latency)
+        payload = json.loads(request.content)
+        self.created.append(payload)
+        return httpx.Response(
+            200,
+            json={
+                "id": f"asst_{len(self.created)}",
+                "object": "assistant",
+                "created_at": 0,
+                "model": payload["model"],
+                "instructions": payload["instructions"],
+                "tools": [],
+                "metadata": {},
+            },
+        )
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    _table.create(bind=engine)
+    return engine
+
+
+def _run(api: FakeAssistantsEndpoint, coro_factory):
+    async def wrapper():
+        llm_client.set_clients(
+            async_client=AsyncOpenAI(
+                api_key="test",
+                base_url="http://fake-openai.local/v1",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handle)),
+            )
+        )
+        try:
+            return await coro_factory()
+        finally:
+            await llm_client.aclose()
+            llm_client.set_clients()
+
+    return asyncio.run(wrapper())
+
+
+def test_second_worker_reuses_registered_assistant(engine):
+    api = FakeAssistantsEndpoint()
+    first, second = AssistantRegistry(bind=engine), AssistantRegistry(bind=engine)
+
+    async def scenario():
+        a = await first.resolve("career", "gpt-4o", "coach careers")
+        b = await second.resolve("career", "gpt-4o", "coach careers")
+        return a, b
+
+    assert _run(api, scenario) == ("asst_1", "asst_1")
+    assert len(api.created) == 1
+    assert second.stats()["loaded"] == 1
+
+
+def test_concurrent_lookups_share_one_creation(engine):
+    api = FakeAssistantsEndpoint(latency=0.05)
+    registry = AssistantRegistry(bind=engine)
+
+    async def scenario():
+        return await asyncio.gather(
+            *[registry.resolve("general", "gpt-4o", "coach") for _ in range(10)]
+        )
+
+    assert set(_run(api, scenario)) == {"asst_1"}
+    assert len(api.created) == 1
+    assert registry.stats() == {"created": 1, "loaded": 0, "duplicates_removed": 0, "cached": 1}
+
+
+def test_racing_workers_converge_and_delete_duplicate(engine):
+    api = FakeAssistantsEndpoint(latency=0.05)
+    first, second = AssistantRegistry(bind=engine), AssistantRegistry(bind=engine)
+
+    async def scenario():
+        return await asyncio.gather(
+            first.resolve("health", "gpt-4o", "coach health"),
+            second.resolve("health", "gpt-4o", "coach health"),
+        )
+
+    a, b = _run(api, scenario)
+
+    assert a == b
+    assert len(api.created) == 2
+    assert len(api.deleted) == 1 and api.deleted[0] != a
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(_table)).scalar() == 1
+
+
+def test_changed_instructions_create_new_assistant(engine):
+    api = FakeAssistantsEndpoint()
+    registry = AssistantRegistry(bind=engine)
+
+    async def scenario():
+        return (
+            await registry.resolve("general", "gpt-4o", "v1"),
+            await registry.resolve("general", "gpt-4o", "v2"),
+        )
+
+    assert _run(api, scenario) == ("asst_1", "asst_2")
+
+
+def test_warm_up_resolves_domain_agents(engine, monkeypatch):
+    api = FakeAssistantsEndpoint()
+    registry = AssistantRegistry(bind=engine)
+    monkeypatch.setattr("services.openai_agent_service.get_assistant_registry", lambda: registry)
+    monkeypatch.setattr(OpenAIAgentService, "_agent_cache", {})
+
+    resolved = _run(api, lambda: OpenAIAgentService.warm_up(["general", "career"]))
+
+    assert resolved == {
+        "general": OpenAIAgentService.get_agent("general").assistant_id,
+        "career": OpenAIAgentService.get_agent("career").assistant_id,
+    }
+    assert len(set(resolved.values())) == 2
+    assert {c["instructions"] for c in api.created} == {
+        OpenAIAgentService._get_domain_instructions(domain) for domain in ("general", "career")
+    }
+
+# Footnote: Separate registries on one engine stand in for separate worker processes.
@@ -12,6 +12,7 @@ os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 from main import app
 from services import user_service, churn_risk_service
 from services import user_session_service
+from models import RiskCategory
 from models.subscription import Subscription
 from models.journal_entry import JournalEntry
 from models.agent_interaction_log import AgentInteractionLog
@@ -36,7 +37,7 @@ def test_high_risk_score():
     db = TestingSessionLocal()
     user = create_user(db)
     risk = churn_risk_service.calculate_churn_risk(db, user.id)
-    assert risk.risk_category == churn_risk_service.RiskCategory.HIGH
+    assert risk.risk_category == RiskCategory.HIGH
     assert risk.risk_score == 1.0
     db.close()
 
@@ -61,7 +62,7 @@ def test_medium_risk_score():
     db.commit()
 
     risk = churn_risk_service.calculate_churn_risk(db, user.id)
-    assert risk.risk_category == churn_risk_service.RiskCategory.MEDIUM
+    assert risk.risk_category == RiskCategory.MEDIUM
     assert 0.34 <= risk.risk_score < 0.67
     db.close()
 
@@ -85,6 +86,6 @@ def test_low_risk_score():
     db.commit()
 
     risk = churn_risk_service.calculate_churn_risk(db, user.id)
-    assert risk.risk_category == churn_risk_service.RiskCategory.LOW
+    assert risk.risk_category == RiskCategory.LOW
     assert risk.risk_score < 0.34
     db.close()
@@ -0,0 +1,83 @@
+"""Tests for the cached per-user context snapshot."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import event
+
+from services import (
+    context_snapshot_service,
+    goal_service,
+    journal_service,
+    session_service,
+    task_service,
+)
+from services.ai_memory_service import get_user_context_memory
+from services.conversation_memory_service import build_memory_context
+from utils.token_budget import count_tokens, truncate_to_tokens
+
+
+class QueryCounter:
+    """Count SELECT statements issued on the session's connection."""
+
+    def __init__(self, db):
+        self.engine = db.get_bind()
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.count += 1
+
+
+def test_snapshot_loads_in_one_query_and_is_reused(db_session, test_user):
+    user_id = test_user.id
+    journal_service.create_journal_entry(db_session, {"user_id": user_id, "content": "j1"})
+    goal_service.create_goal(db_session, {"user_id": user_id, "title": "g1"})
+    task_service.create_task(db_session, {"user_id": user_id, "description": "t1"})
+    session_service.create_session(db_session, {"user_id": user_id, "ai_summary": "s1"})
+
+    with QueryCounter(db_session) as cold:
+        context = build_memory_context(db_session, user_id, ["career"], "hi")
+    assert cold.count == 1
+    assert "j1" in context and "g1" in context and "t1" in context and "s1" in context
+
+    with QueryCounter(db_session) as warm:
+        build_memory_context(db_session, user_id, ["career"], "hi")
+        get_user_context_memory(db_session, user_id)
+    assert warm.count == 0
+    assert context_snapshot_service.get_cache_stats()["hits"] == 2
+
+
+def test_writes_invalidate_snapshot(db_session, test_user):
+    user_id = test_user.id
+    journal_service.create_journal_entry(db_session, {"user_id": user_id, "content": "old"})
+    assert "old" in get_user_context_memory(db_session, user_id)
+
+    version = context_snapshot_service.get_user_context_version(user_id)
+    journal_service.create_journal_entry(db_session, {"user_id": user_id, "content": "new"})
+    assert context_snapshot_service.get_user_context_version(user_id) == version + 1
+    assert "new" in get_user_context_memory(db_session, user_id)
+
+    task = task_service.create_task(db_session, {"user_id": user_id, "description": "todo"})
+    assert "todo" in build_memory_context(db_session, user_id, None, "hi")
+    task_service.mark_task_complete(db_session, task.id)
+    assert "todo" not in build_memory_context(db_session, user_id, None, "hi")
+
+
+def test_token_budget_keeps_tail_and_line_breaks():
+    text = "first line\n" + "filler " * 100 + "\nlast line"
+    trimmed = truncate_to_tokens(text, 10)
+    assert trimmed.endswith("last line")
+    assert count_tokens(trimmed) <= 10
+    assert truncate_to_tokens("short", 10) == "short"
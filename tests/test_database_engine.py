@@ -0,0 +1,70 @@
+"""Tests for database engine configuration and the async session path."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from config.settings import AppSettings
+from database import session as db_session_module
+
+
+def test_postgres_engine_uses_pool_settings():
+    config = AppSettings(
+        DB_POOL_SIZE=7,
+        DB_MAX_OVERFLOW=3,
+        DB_POOL_RECYCLE_SECONDS=60,
+        DB_STATEMENT_TIMEOUT_MS=5000,
+    )
+    url = "postgresql://vida:secret@db:5432/vida"
+
+    kwargs = db_session_module.build_engine_kwargs(url, config)
+    assert kwargs["echo"] is False
+    assert kwargs["pool_size"] == 7
+    assert kwargs["max_overflow"] == 3
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["pool_recycle"] == 60
+    assert kwargs["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    async_kwargs = db_session_module.build_engine_kwargs(url, config, is_async=True)
+    assert async_kwargs["connect_args"] == {
+        "server_settings": {"statement_timeout": "5000"}
+    }
+
+
+def test_sqlite_engine_skips_pool_sizing():
+    kwargs = db_session_module.build_engine_kwargs("sqlite:///:memory:", AppSettings())
+    assert "pool_size" not in kwargs
+    assert kwargs["connect_args"] == {"check_same_thread": False}
+
+
+def test_async_url_swaps_driver():
+    assert (
+        db_session_module.to_async_url("postgresql://u:p@h:5432/d")
+        == "postgresql+asyncpg://u:p@h:5432/d"
+    )
+    assert db_session_module.to_async_url("sqlite:///./vida.db") == "sqlite+aiosqlite:///./vida.db"
+    with pytest.raises(ValueError):
+        db_session_module.to_async_url("mysql://u:p@h/d")
+
+
+def test_async_db_dependency_yields_working_session():
+    pytest.importorskip("aiosqlite")
+    from database.utils import get_async_db
+
+    async def run():
+        try:
+            agen = get_async_db()
+            db = await agen.__anext__()
+            value = (await db.execute(text("SELECT 1"))).scalar_one()
+            await agen.aclose()
+            return value
+        finally:
+            await db_session_module.dispose_async_engine()
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,215 @@
+"""Tests for the per-entry journal tag index and its SQL ranking."""
+
+# Notes: Ensure project modules are importable and env vars set
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from config import get_settings
+from jobs import backfill_journal_tags
+from models.journal_entry import JournalEntry
+from models.journal_entry_tag import JournalEntryTag
+from services import journal_service, journal_tagging_service, user_service
+from services.journal_tagging_service import extract_tags_from_journals, index_pending_entries, top_tags
+
+
+@pytest.fixture
+def tag_calls(monkeypatch):
+    """Answer each entry with the JSON tags named after ``tags:`` in its content."""
+
+    calls = []
+
+    def fake_generate(self, messages, temperature=0.3):
+        content = messages[1]["content"]
+        calls.append(content)
+        if "explode" in content:
+            raise RuntimeError("provider down")
+        return json.dumps({"tags": content.split("tags:", 1)[1].split(",")})
+
+    monkeypatch.setattr(journal_tagging_service.AIModelAdapter, "generate", fake_generate)
+    return calls
+
+
+def _index(db):
+    """Do the pool's or backfill job's work on the test session."""
+
+    index_pending_entries(db, limit=100)
+
+
+def _stored(db, entry_id):
+    rows = db.query(JournalEntryTag).filter_by(entry_id=entry_id).order_by(JournalEntryTag.position)
+    return [row.tag for row in rows]
+
+
+def test_each_entry_is_tagged_once_and_normalized(tag_calls, db_session, test_user):
+    user = test_user
+    entry = journal_service.create_journal_entry(
+        db_session, {"user_id": user.id, "content": "tags: Career ,#leadership,career"}
+    )
+    stamp = entry.updated_at
+
+    _index(db_session)
+    _index(db_session)
+
+    assert extract_tags_from_journals(db_session, user.id) == ["career", "leadership"]
+    assert len(tag_calls) == 1
+    db_session.refresh(entry)
+    assert entry.tags_indexed and entry.updated_at == stamp
+    assert _stored(db_session, entry.id) == ["career", "leadership"]
+
+
+def test_edits_and_deletes_replace_tags(tag_calls, db_session, test_user):
+    user = test_user
+    entry = journal_service.create_journal_entry(db_session, {"user_id": user.id, "content": "tags:gym"})
+    _index(db_session)
+
+    entry.content = "tags:sleep"
+    db_session.commit()
+    assert not entry.tags_indexed and _stored(db_session, entry.id) == []
+    _index(db_session)
+    assert extract_tags_from_journals(db_session, user.id) == ["sleep"]
+
+    # Notes: Edits to other columns keep the stored tags
+    entry.title = "Night"
+    db_session.commit()
+    assert entry.tags_indexed and len(tag_calls) == 2
+
+    db_session.delete(entry)
+    db_session.commit()
+    assert db_session.query(JournalEntryTag).count() == 0
+
+
+def test_ranking_weights_recent_entries_and_spans_users(tag_calls, db_session, unique_user_data):
+    now = datetime.utcnow()
+    first, second = (user_service.create_user(db_session, unique_user_data()) for _ in range(2))
+    rows = [{"user_id": first.id, "content": "tags:work", "created_at": now - timedelta(days=200 + i)} for i in range(3)]
+    rows += [
+        {"user_id": first.id, "content": "tags:marathon", "created_at": now - timedelta(days=2)},
+        {"user_id": second.id, "content": "tags:marathon", "created_at": now - timedelta(days=40)},
+    ]
+    db_session.execute(insert(JournalEntry), rows)
+    db_session.commit()
+    _index(db_session)
+
+    # Notes: Three 200-day-old mentions weigh less than one from this week
+    assert extract_tags_from_journals(db_session, first.id) == ["marathon", "work"]
+    assert extract_tags_from_journals(db_session, second.id) == ["marathon"]
+
+    overall = top_tags(db_session, now=now)
+    assert [row["tag"] for row in overall] == ["marathon", "work"]
+    assert overall[0] == {"tag": "marathon", "score": 1.5, "entries": 2, "users": 2}
+    assert overall[1]["entries"] == 3 and overall[1]["users"] == 1
+
+
+def test_reads_answer_from_stored_tags_without_the_model(tag_calls, db_session, test_user):
+    user = test_user
+    journal_service.create_journal_entry(db_session, {"user_id": user.id, "content": "tags:pending"})
+
+    # Notes: Deferred mode leaves the entry to the backfill job
+    assert extract_tags_from_journals(db_session, user.id) == []
+    assert tag_calls == []
+
+
+class _RecordingPool:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+
+
+@pytest.fixture
+def background_tagging(monkeypatch, file_db):
+    """Tag after commit on one worker thread, against a database with a connection per thread."""
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setenv("JOURNAL_TAGGING_MODE", "background")
+    monkeypatch.setattr(journal_tagging_service, "_get_pool", lambda: pool)
+    monkeypatch.setattr(journal_tagging_service, "SessionLocal", sessionmaker(bind=file_db.get_bind()))
+    get_settings.cache_clear()
+    yield pool
+    pool.shutdown(wait=True)
+    get_settings.cache_clear()
+
+
+def _drain(pool):
+    """Wait for everything queued so far on a single-worker pool."""
+
+    pool.submit(lambda: None).result(timeout=5)
+
+
+def test_background_mode_tags_entries_after_commit(tag_calls, background_tagging, file_db, unique_user_data):
+    user = user_service.create_user(file_db, unique_user_data())
+    entry = journal_service.create_journal_entry(file_db, {"user_id": user.id, "content": "tags:focus"})
+    _drain(background_tagging)
+
+    file_db.expire_all()
+    assert file_db.get(JournalEntry, entry.id).tags_indexed
+    assert top_tags(file_db, user.id)[0]["tag"] == "focus"
+    assert len(tag_calls) == 1
+
+    # Notes: Bulk inserts skip the hook; a read queues them on the pool
+    file_db.execute(insert(JournalEntry), [{"user_id": user.id, "content": "tags:focus,rest"}])
+    file_db.commit()
+    extract_tags_from_journals(file_db, user.id)
+    _drain(background_tagging)
+    assert extract_tags_from_journals(file_db, user.id) == ["focus", "rest"]
+    assert len(tag_calls) == 2
+
+
+def test_queued_entries_are_not_queued_twice(monkeypatch, background_tagging, file_db, unique_user_data):
+    pool = _RecordingPool()
+    monkeypatch.setattr(journal_tagging_service, "_get_pool", lambda: pool)
+    user = user_service.create_user(file_db, unique_user_data())
+    file_db.execute(insert(JournalEntry), [{"user_id": user.id, "content": f"tags:t{i}"} for i in range(3)])
+    file_db.commit()
+    try:
+        extract_tags_from_journals(file_db, user.id)
+        extract_tags_from_journals(file_db, user.id)
+    finally:
+        journal_tagging_service._scheduled.clear()
+
+    assert len(pool.submitted) == 1 and len(pool.submitted[0][0]) == 3
+
+
+def test_background_mode_defers_on_a_shared_connection(tag_calls, monkeypatch, db_session, test_user):
+    pool = _RecordingPool()
+    monkeypatch.setenv("JOURNAL_TAGGING_MODE", "background")
+    monkeypatch.setattr(journal_tagging_service, "_get_pool", lambda: pool)
+    monkeypatch.setattr(journal_tagging_service, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    get_settings.cache_clear()
+    try:
+        journal_service.create_journal_entry(db_session, {"user_id": test_user.id, "content": "tags:later"})
+        assert extract_tags_from_journals(db_session, test_user.id) == []
+    finally:
+        get_settings.cache_clear()
+
+    # Notes: A worker on the StaticPool connection would commit inside this session's transaction
+    assert pool.submitted == [] and tag_calls == []
+
+
+def test_backfill_job_skips_failures_and_finishes(tag_calls, monkeypatch, db_session, test_user):
+    user = test_user
+    contents = ["tags:a", "explode", "tags:b", "tags:c", "tags:d"]
+    db_session.execute(insert(JournalEntry), [{"user_id": user.id, "content": c} for c in contents])
+    db_session.commit()
+    monkeypatch.setattr(backfill_journal_tags, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+
+    backfill_journal_tags.run(batch_size=2)
+
+    assert len(tag_calls) == 5
+    pending = db_session.query(JournalEntry).filter_by(tags_indexed=False).all()
+    assert [entry.content for entry in pending] == ["explode"]
+    assert sorted(row["tag"] for row in top_tags(db_session, user.id)) == ["a", "b", "c", "d"]
+
+# Footnote: The model is stubbed; every entry states the tags it should get.
@@ -12,6 +12,7 @@ os.environ.setdefault("OPENAI_API_KEY", "test")
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 from main import app
+from database.utils import get_db
 from auth.auth_utils import create_access_token
 
 client = TestClient(app)
@@ -52,6 +53,11 @@ def test_analyze_journal_tags(monkeypatch):
 
     monkeypatch.setattr(tagging_service.AIModelAdapter, "generate", fake_generate)
 
+    # Notes: Entries are tagged off the request path; run the backfill job's step
+    sessions = app.dependency_overrides.get(get_db, get_db)()
+    tagging_service.index_pending_entries(next(sessions), user_id, limit=10)
+    sessions.close()
+
     response = client.get("/journals/analyze-tags", headers=headers)
     assert response.status_code == 200
     data = response.json()
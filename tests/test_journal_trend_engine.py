@@ -0,0 +1,146 @@
+"""Tests for term vectors and the local keyword and mood trend engine."""
+
+# Notes: Ensure project modules are importable and env vars set
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from sqlalchemy import insert
+
+from models.daily_checkin import DailyCheckIn, Mood
+from models.journal_entry import JournalEntry
+from models.journal_term_vector import JournalTermVector
+from services import daily_checkin_service, journal_service, journal_trend_engine
+from services.ai_processor import analyze_journal_trends
+from services.journal_trend_engine import compute_trends, tokenize
+
+TODAY = date(2026, 10, 17)
+
+
+def _at(days_ago):
+    return datetime.combine(TODAY - timedelta(days=days_ago), datetime.min.time()) + timedelta(hours=9)
+
+
+def test_tokenize_drops_stopwords_and_short_words():
+    assert tokenize("I don't LOVE my work, but the work's fine at 5pm") == {"love": 1, "work": 2, "fine": 1}
+
+
+def test_vectors_follow_entry_writes(db_session, test_user):
+    user = test_user
+    entry = journal_service.create_journal_entry(db_session, {"user_id": user.id, "content": "gym gym sleep"})
+    vector = db_session.get(JournalTermVector, entry.id)
+    assert json.loads(vector.terms) == {"gym": 2, "sleep": 1} and vector.token_count == 3
+
+    entry.content = "deadline stress"
+    db_session.commit()
+    db_session.refresh(vector)
+    assert json.loads(vector.terms) == {"deadline": 1, "stress": 1}
+
+    db_session.delete(entry)
+    db_session.commit()
+    assert db_session.get(JournalTermVector, entry.id) is None
+
+
+@pytest.mark.parametrize("dialect", ["sqlite", "mssql"])
+def test_upsert_vectors_replaces_existing_rows(monkeypatch, db_session, dialect, test_user):
+    user = test_user
+    entry = journal_service.create_journal_entry(db_session, {"user_id": user.id, "content": "gym"})
+    connection = db_session.connection()
+    # Notes: A dialect without ON CONFLICT takes the update-then-insert fallback
+    monkeypatch.setattr(connection.dialect, "name", dialect)
+    rows = [
+        journal_trend_engine._vector_row(entry.id, user.id, entry.created_at, "sleep sleep"),
+        journal_trend_engine._vector_row(entry.id + 1000, user.id, entry.created_at, "deadline"),
+    ]
+    journal_trend_engine.upsert_vectors(connection, rows)
+    monkeypatch.undo()
+    db_session.commit()
+
+    assert json.loads(db_session.get(JournalTermVector, entry.id).terms) == {"sleep": 2}
+    assert db_session.get(JournalTermVector, entry.id + 1000).token_count == 1
+
+
+def test_sliding_windows_surface_rising_keywords():
+    vectors = [(_at(day), {"work": 2, "family": 1}) for day in range(20, 90)]
+    vectors += [(_at(day), {"marathon": 3, "work": 1}) for day in range(0, 10)]
+
+    report = compute_trends(vectors, [], TODAY)
+
+    assert report.entries == 80
+    assert report.keyword_trends["marathon"] == 30
+    assert report.rising_keywords[0] == "marathon"
+    assert "family" in report.fading_keywords
+    latest = report.windows[-1]
+    assert latest["end"] == TODAY.isoformat() and latest["entries"] == 10
+    assert latest["top_terms"][0] == "marathon"
+    assert compute_trends(vectors, [], TODAY) == report
+
+
+def test_mood_correlates_with_keywords_and_trend():
+    vectors, checkins = [], []
+    for day in range(30):
+        good = day % 2 == 0
+        vectors.append((_at(day), {"gym": 2, "friends": 1} if good else {"deadline": 2, "commute": 1}))
+        # Notes: Newer days (smaller offsets) get better moods on top of the gym effect
+        checkins.append((_at(day), Mood.EXCELLENT if good else (Mood.OKAY if day < 15 else Mood.BAD)))
+
+    report = compute_trends(vectors, checkins, TODAY)
+
+    assert report.checkins == 30
+    assert set(report.mood_keywords["positive"]) == {"gym", "friends"}
+    assert set(report.mood_keywords["negative"]) == {"deadline", "commute"}
+    assert report.mood_trend == "improving"
+
+
+def test_analyze_journal_trends_only_asks_the_model_for_notes(monkeypatch, db_session, test_user):
+    user = test_user
+    now = datetime.utcnow()
+    # Notes: Core insert bypasses the flush hook; vectors are filled in lazily
+    db_session.execute(
+        insert(JournalEntry),
+        [{"user_id": user.id, "content": f"training plan day {i}", "created_at": now - timedelta(days=i)} for i in range(6)],
+    )
+    for i in range(6):
+        db_session.add(
+            DailyCheckIn(user_id=user.id, mood=Mood.GOOD, energy_level=7, stress_level=3, created_at=now - timedelta(days=i))
+        )
+    db_session.commit()
+
+    prompts = []
+
+    def fake_completion(messages, **kwargs):
+        prompts.append(messages[1]["content"])
+        return "  Steady progress on the training plan.  "
+
+    monkeypatch.setattr("services.llm_client.chat_completion", fake_completion)
+    monkeypatch.setattr(journal_trend_engine, "TOP_KEYWORDS", 2)
+
+    result = analyze_journal_trends(db_session, user.id)
+
+    assert result["keyword_trends"] == {"training": 6, "plan": 6}
+    assert result["mood_summary"]["average_mood"] == 4.0
+    assert result["goal_progress_notes"] == "Steady progress on the training plan."
+    assert len(prompts) == 1 and "Top keywords" in prompts[0]
+    assert db_session.query(JournalTermVector).filter_by(user_id=user.id).count() == 6
+
+
+def test_checkins_refresh_the_cached_trend_report(monkeypatch, authorized_client, db_session, test_user):
+    journal_service.create_journal_entry(db_session, {"user_id": test_user.id, "content": "training plan"})
+    calls = []
+    monkeypatch.setattr("services.llm_client.chat_completion", lambda messages, **kwargs: calls.append(1) or "notes")
+
+    first = authorized_client.get("/ai/journal-trends").json()
+    daily_checkin_service.create_checkin(db_session, test_user.id, Mood.EXCELLENT, 8, 2)
+    second = authorized_client.get("/ai/journal-trends").json()
+
+    assert first["mood_summary"]["average_mood"] is None
+    assert second["mood_summary"]["average_mood"] == 5.0
+    assert len(calls) == 2
+
+# Footnote: compute_trends is pure, so most cases run without a database.
@@ -28,8 +28,7 @@ def test_call_llm(monkeypatch):
                     called['messages'] = messages
                     return type('Obj', (), {'choices': [type('C', (), {'message': type('M', (), {'content': "ok"})()})]})()
 
-    monkeypatch.setattr(llm_call_service, 'OpenAI', FakeOpenAI)
-    monkeypatch.setattr(llm_call_service, '_client', FakeOpenAI())
+    monkeypatch.setattr(llm_call_service.llm_client, 'get_sync_client', lambda: FakeOpenAI())
 
     response = llm_call_service.call_llm([{"role": "user", "content": "hi"}])
     assert called['messages'][0]["content"] == "hi"
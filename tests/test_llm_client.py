@@ -0,0 +1,141 @@
+"""Tests for the shared asyncio LLM client layer."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from services import llm_client
+
+
+# Notes: Minimal chat completion body understood by the OpenAI SDK
+def _completion_body(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+# Notes: Fake OpenAI endpoint that sleeps to emulate model latency
+class FakeOpenAIStub:
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.calls.append(payload)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return httpx.Response(200, json=_completion_body("stub reply"))
+
+
+def _install_async_stub(stub: FakeOpenAIStub) -> None:
+    client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://fake-openai.local/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(stub.handle)),
+    )
+    llm_client.set_clients(async_client=client)
+
+
+def test_achat_completion_forwards_payload():
+    stub = FakeOpenAIStub(latency=0)
+
+    async def run():
+        _install_async_stub(stub)
+        try:
+            return await llm_client.achat_completion(
+                [{"role": "user", "content": "hi"}], temperature=0.2, max_tokens=10
+            )
+        finally:
+            await llm_client.aclose()
+
+    assert asyncio.run(run()) == "stub reply"
+    assert stub.calls[0]["messages"][0]["content"] == "hi"
+    assert stub.calls[0]["max_tokens"] == 10
+
+
+# Notes: Load test showing one event loop keeps hundreds of calls in flight
+def test_concurrent_calls_share_one_event_loop():
+    stub = FakeOpenAIStub(latency=0.05)
+    total = 200
+
+    async def run():
+        _install_async_stub(stub)
+        try:
+            start = time.perf_counter()
+            replies = await asyncio.gather(
+                *[
+                    llm_client.achat_completion([{"role": "user", "content": str(i)}])
+                    for i in range(total)
+                ]
+            )
+            return replies, time.perf_counter() - start
+        finally:
+            await llm_client.aclose()
+
+    replies, elapsed = asyncio.run(run())
+    assert len(replies) == total
+    # Notes: Serial execution would take total * latency = 10 seconds
+    assert elapsed < total * stub.latency / 4
+    assert stub.peak >= 100
+
+
+def test_chat_completion_sync_shim():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json=_completion_body("sync reply"))
+
+    client = OpenAI(
+        api_key="test",
+        base_url="http://fake-openai.local/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    llm_client.set_clients(sync_client=client)
+    try:
+        reply = llm_client.chat_completion(
+            [{"role": "user", "content": "batch"}], model="gpt-4o-mini"
+        )
+    finally:
+        llm_client.set_clients()
+
+    assert reply == "sync reply"
+    assert seen["body"]["model"] == "gpt-4o-mini"
+
+
+def test_non_completion_endpoints_keep_sdk_retries_on_the_shared_pool():
+    llm_client.set_clients()
+    completions, api = llm_client.get_sync_client(), llm_client.get_sync_api_client()
+
+    # Notes: Only completions have the rate limiter retrying 429s for them
+    assert completions.max_retries == 0
+    assert api.max_retries > 0
+    assert api._client is completions._client
+    assert llm_client.get_async_api_client().max_retries > 0
+
+# Footnote: Guards the non-blocking LLM path used by coaching endpoints.
@@ -0,0 +1,195 @@
+"""Tests for per-model admission control of outbound LLM calls."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+from services import llm_call_service, llm_client, llm_rate_limiter
+from services.llm_rate_limiter import LLMQueueTimeout, ModelRateController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _controller(clock, rpm=60, tpm=6000, **kwargs):
+    return ModelRateController("gpt-4o", rpm, tpm, burst_seconds=2, clock=clock, **kwargs)
+
+
+def _completion(text="ok", total_tokens=30):
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": total_tokens - 5, "completion_tokens": 5, "total_tokens": total_tokens},
+    }
+
+
+def test_requests_queue_in_arrival_order():
+    clock = FakeClock()
+    controller = _controller(clock)
+
+    # Notes: 60 rpm refills one request per second with a two-request burst
+    waits = [controller.reserve(10, max_wait=10) for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 1.0, 2.0]
+    clock.now += 2
+    assert controller.reserve(10, max_wait=10) == 1.0
+
+
+def test_reservation_past_deadline_is_refused_without_spending_budget():
+    clock = FakeClock()
+    controller = _controller(clock, tpm=600)
+
+    assert controller.reserve(20, max_wait=0) == 0.0
+    with pytest.raises(LLMQueueTimeout):
+        controller.reserve(100, max_wait=1)
+    # Notes: The refused call left the bucket untouched for smaller requests
+    assert controller.reserve(1, max_wait=1) == pytest.approx(0.1)
+    assert controller.stats()["rejected"] == 1
+
+
+def test_settle_reconciles_estimate_with_reported_usage():
+    clock = FakeClock()
+    controller = _controller(clock, tpm=600)
+
+    controller.reserve(20, max_wait=0)
+    controller.settle(20, 5)
+    assert controller.reserve(15, max_wait=0) == 0.0
+
+
+def test_stream_settles_its_estimate_with_the_final_usage_chunk(monkeypatch):
+    settled = []
+    monkeypatch.setattr(
+        ModelRateController, "settle", lambda self, reserved, actual: settled.append(actual)
+    )
+
+    async def handler(request):
+        chunks = [
+            {"choices": [{"index": 0, "delta": {"content": "hi"}, "finish_reason": None}]},
+            {"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": 1, "total_tokens": 13}},
+        ]
+        body = "".join(
+            f"data: {json.dumps({'id': 'c', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'gpt-4o', **chunk})}\n\n"
+            for chunk in chunks
+        )
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=body + "data: [DONE]\n\n"
+        )
+
+    results = []
+
+    async def scenario():
+        llm_client.set_clients(
+            async_client=AsyncOpenAI(
+                api_key="test",
+                base_url="http://fake-openai.local/v1",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+        )
+        try:
+            deltas = llm_client.astream_chat_completion(
+                [{"role": "user", "content": "hi"}], cache=False, on_usage=results.append
+            )
+            return [delta async for delta in deltas]
+        finally:
+            llm_client.set_clients()
+
+    assert asyncio.run(scenario()) == ["hi"]
+    # Notes: The stream object carries no usage; the last chunk settles the estimate
+    assert settled == [None, 13]
+    assert (results[0].prompt_tokens, results[0].completion_tokens) == (12, 1)
+
+
+def test_throttle_halves_rate_and_honours_retry_after():
+    clock = FakeClock()
+    controller = _controller(clock, increase=0.25)
+
+    controller.on_throttle(retry_after=3)
+
+    assert controller.factor == 0.5
+    assert controller.reserve(1, max_wait=10) == 3.0
+    controller.on_success()
+    controller.on_success()
+    controller.on_success()
+    assert controller.factor == 1.0
+    assert controller.stats()["throttled"] == 1
+
+
+def test_sync_client_retries_429_after_retry_after(monkeypatch):
+    responses = iter(
+        [
+            httpx.Response(429, headers={"retry-after-ms": "50"}, json={"error": {"message": "slow down"}}),
+            httpx.Response(200, json=_completion("after throttle")),
+        ]
+    )
+    llm_client.set_clients(
+        sync_client=OpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            max_retries=0,
+            http_client=httpx.Client(transport=httpx.MockTransport(lambda request: next(responses))),
+        )
+    )
+    try:
+        result = llm_client.chat_completion([{"role": "user", "content": "hi"}], cache=False)
+    finally:
+        llm_client.set_clients()
+
+    assert result == "after throttle"
+    stats = llm_rate_limiter.get_rate_limiter_stats()["gpt-4o"]
+    assert stats["throttled"] == 1 and stats["retried"] == 1
+    assert stats["admitted"] == 2
+    assert stats["wait_ms_max"] >= 40
+
+
+def test_saturated_provider_surfaces_busy_message(monkeypatch):
+    monkeypatch.setenv("LLM_QUEUE_TIMEOUT_SECONDS", "0.2")
+    from config import get_settings
+
+    get_settings.cache_clear()
+
+    async def handler(request):
+        return httpx.Response(429, headers={"retry-after": "5"}, json={"error": {"message": "full"}})
+
+    async def scenario():
+        llm_client.set_clients(
+            async_client=AsyncOpenAI(
+                api_key="test",
+                base_url="http://fake-openai.local/v1",
+                max_retries=0,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+        )
+        try:
+            return await llm_call_service.acall_llm([{"role": "user", "content": "hi"}])
+        finally:
+            await llm_client.aclose()
+            llm_client.set_clients()
+
+    try:
+        assert asyncio.run(scenario()) == llm_call_service.BUSY_MESSAGE
+    finally:
+        get_settings.cache_clear()
+    stats = llm_rate_limiter.get_rate_limiter_stats()["gpt-4o"]
+    assert stats["throttled"] == 1 and stats["rejected"] == 1
+
+# Footnote: Controllers use a fake clock so the queueing arithmetic is checked without sleeping.
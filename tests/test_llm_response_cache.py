@@ -0,0 +1,121 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+from openai import OpenAI
+
+from models import LLMResponseCacheEntry
+from services import llm_client, llm_response_cache
+from services.ai_model_adapter import AIModelAdapter
+from services.llm_response_cache import DatabaseResponseStore, LLMResponseCache, cache_key
+
+
+def _install_counting_client():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"reply {len(calls)}"},
+                        "finish_reason": "stop",
+                    }
+                ],
+            },
+        )
+
+    llm_client.set_clients(
+        sync_client=OpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+    )
+    return calls
+
+
+def test_cache_key_is_canonical():
+    a = cache_key("gpt-4o", [{"role": "user", "content": "hi"}], 0, 10)
+    b = cache_key("gpt-4o", [{"content": "hi", "role": "user"}], 0.0, 10)
+    assert a == b
+    assert a != cache_key("gpt-4o", [{"role": "user", "content": "hi"}], 0.5, 10)
+    assert a != cache_key("gpt-4o-mini", [{"role": "user", "content": "hi"}], 0, 10)
+
+
+def test_adapter_reuses_identical_prompts_and_honours_opt_out():
+    calls = _install_counting_client()
+    adapter = AIModelAdapter("OpenAI")
+    messages = [{"role": "user", "content": "Rate this summary from 1 to 10"}]
+    try:
+        first = adapter.generate(messages, temperature=0)
+        second = adapter.generate(messages, temperature=0)
+        creative = adapter.generate(messages, temperature=0, cache=False)
+    finally:
+        llm_client.set_clients()
+
+    assert first == second == "reply 1"
+    assert creative == "reply 2"
+    assert len(calls) == 2
+    stats = llm_response_cache.get_llm_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["bypassed"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_sampled_calls_are_not_cached_unless_opted_in():
+    calls = _install_counting_client()
+    messages = [{"role": "user", "content": "hi"}]
+    try:
+        first = llm_client.chat_completion(messages, temperature=0.7)
+        second = llm_client.chat_completion(messages, temperature=0.7)
+        opted_in = [llm_client.chat_completion(messages, temperature=0.7, cache=True) for _ in range(2)]
+    finally:
+        llm_client.set_clients()
+
+    # Notes: Two users sending "hi" to the coach each get a fresh reply
+    assert (first, second) == ("reply 1", "reply 2")
+    assert opted_in == ["reply 3", "reply 3"]
+    assert len(calls) == 3
+
+
+def test_lru_evicts_oldest_and_expires():
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "m", "A")
+    cache.set("b", "m", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "m", "C")
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    expired = LLMResponseCache(max_entries=2, ttl_seconds=1e-9)
+    expired.set("a", "m", "A")
+    assert expired.get("a") is None
+
+
+def test_persistent_tier_survives_process_cache(db_session):
+    store = DatabaseResponseStore(bind=db_session.get_bind(), max_rows=2, prune_every=1000)
+    LLMResponseCache(store=store).set("k1", "gpt-4o", "stored")
+
+    fresh = LLMResponseCache(store=store)
+    assert fresh.get("k1") == "stored"
+    assert fresh.stats()["persistent_hits"] == 1
+
+    for key in ("k2", "k3", "k4"):
+        store.set(key, "gpt-4o", key, ttl_seconds=60)
+    store.prune()
+    assert db_session.query(LLMResponseCacheEntry).count() == 2
@@ -0,0 +1,148 @@
+"""Tests for provider usage accounting and per-model cost pricing."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+from openai import OpenAI
+
+from models.orchestration_log import OrchestrationPerformanceLog
+from services import llm_client
+from services import orchestration_processor_service as orchestrator
+from services.agent_cost_service import aggregate_agent_costs, compute_cost
+from services.llm_usage import LLMResult, usage_metrics
+from services.orchestration_log_service import log_agent_run
+
+
+def _install_sync_stub(usage: dict) -> dict:
+    seen = {"calls": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["calls"] += 1
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-2024-08-06",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "measured"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    llm_client.set_clients(
+        sync_client=OpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+    )
+    return seen
+
+
+def test_chat_completion_returns_provider_usage():
+    _install_sync_stub(
+        {
+            "prompt_tokens": 120,
+            "completion_tokens": 30,
+            "total_tokens": 150,
+            "prompt_tokens_details": {"cached_tokens": 64},
+        }
+    )
+    try:
+        result = llm_client.chat_completion([{"role": "user", "content": "usage"}], cache=False)
+    finally:
+        llm_client.set_clients()
+
+    assert result == "measured"
+    assert isinstance(result, LLMResult)
+    assert (result.prompt_tokens, result.completion_tokens, result.cached_tokens) == (120, 30, 64)
+    assert result.model == "gpt-4o-2024-08-06"
+    assert result.latency_ms >= 0
+    assert usage_metrics(result)["input_tokens"] == 120
+
+
+def test_cache_hit_reports_no_provider_tokens():
+    seen = _install_sync_stub({"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12})
+    messages = [{"role": "user", "content": f"cached {uuid.uuid4().hex}"}]
+    try:
+        first = llm_client.chat_completion(messages, temperature=0)
+        second = llm_client.chat_completion(messages, temperature=0)
+    finally:
+        llm_client.set_clients()
+
+    assert seen["calls"] == 1
+    assert first.prompt_tokens == 10 and not first.from_cache
+    assert second == "measured"
+    assert second.from_cache and second.total_tokens == 0
+
+
+def test_plain_strings_have_unknown_usage():
+    assert usage_metrics("fallback text")["input_tokens"] is None
+
+
+def test_compute_cost_uses_model_rates():
+    # Notes: 1000 uncached prompt tokens at input rate, 1000 cached, 1000 output
+    cost = compute_cost("gpt-4o-2024-08-06", input_tokens=2000, output_tokens=1000, cached_tokens=1000)
+    assert cost == round(0.0025 + 0.00125 + 0.01, 6)
+    # Notes: The longest prefix wins, so mini models are not priced as gpt-4o
+    assert compute_cost("gpt-4o-mini-2024-07-18", 1000, 1000) == round(0.00015 + 0.0006, 6)
+    # Notes: Unknown models fall back to the flat default rate
+    assert compute_cost("unknown-model", 500, 500) == 0.002
+
+
+def test_parallel_agents_log_exact_usage(monkeypatch, db_session, test_user):
+    user = test_user
+    monkeypatch.setattr(orchestrator, "build_memory_context", lambda *_: "mem")
+    monkeypatch.setattr(
+        orchestrator, "build_agent_prompt", lambda a, *_: [{"role": "user", "content": a}]
+    )
+    import services.llm_call_service as llm_service
+
+    async def fake_call_llm(payload):
+        return LLMResult(
+            "reply", model="gpt-4o", prompt_tokens=42, completion_tokens=7, cached_tokens=2, latency_ms=5
+        )
+
+    monkeypatch.setattr(llm_service, "acall_llm", fake_call_llm)
+
+    asyncio.run(orchestrator.arun_parallel_agents(user.id, "plan", ["career"], db_session))
+
+    row = db_session.query(OrchestrationPerformanceLog).filter_by(user_id=user.id).one()
+    assert (row.input_tokens, row.output_tokens, row.cached_tokens) == (42, 7, 2)
+    assert row.model == "gpt-4o"
+    assert row.llm_latency_ms == 5
+
+
+def test_aggregate_costs_price_each_model(db_session):
+    for model, tokens in (("gpt-4o", 1000), ("gpt-4o-mini", 2000), (None, 1000)):
+        log_agent_run(
+            db_session,
+            "CareerAgent",
+            None,
+            {"input_tokens": tokens, "output_tokens": 0, "model": model, "status": "success"},
+        )
+
+    totals = aggregate_agent_costs(db_session)
+
+    costs = {row["model"]: row["cost"] for row in totals["by_model"]}
+    assert costs == {"gpt-4o": 0.0025, "gpt-4o-mini": 0.0003, None: 0.002}
+    assert totals["total_tokens"] == 4000
+    assert totals["total_cost"] == 0.0048
+    assert totals["daily"][0]["tokens"] == 4000
+
+# Footnote: Guards the exact token accounting behind the admin cost dashboards.
@@ -0,0 +1,139 @@
+"""Tests for memoized, batched moderation and the compiled keyword matcher."""
+
+# Notes: Ensure project modules are importable and env vars set
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+import pytest
+from openai import OpenAI
+
+from models.summarized_journal import SummarizedJournal
+from services import llm_client, moderation_engine, summary_moderation_service
+from services.moderation_engine import AUTO_FLAG, FALLBACK, KeywordMatcher
+
+
+@pytest.fixture
+def moderation_api():
+    """Install a moderation endpoint flagging inputs that mention 'toxic'."""
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        requests.append(inputs)
+        return httpx.Response(
+            200,
+            json={
+                "id": "modr-test",
+                "model": "omni-moderation-latest",
+                "results": [
+                    {"flagged": "toxic" in text, "categories": {}, "category_scores": {}}
+                    for text in inputs
+                ],
+            },
+        )
+
+    llm_client.set_clients(
+        sync_client=OpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+    )
+    yield requests
+    llm_client.set_clients()
+
+
+def test_matcher_agrees_with_substring_scan():
+    rules = {"he": "a", "she": "b", "his": "c", "hers": "d", "kill": "e"}
+    matcher = KeywordMatcher(rules)
+    assert matcher.scan("uSHErs") == {"a", "b", "d"}
+
+    rng = random.Random(3)
+    for _ in range(200):
+        text = "".join(rng.choice("hesirkl ") for _ in range(30))
+        expected = {category for word, category in rules.items() if word in text}
+        assert matcher.scan(text) == expected
+
+
+def test_default_rules_cover_both_categories():
+    assert moderation_engine.keyword_categories("Banned topics and hate") == {FALLBACK, AUTO_FLAG}
+    assert moderation_engine.keyword_categories("a calm week") == set()
+
+
+def test_verdicts_are_memoized_by_content(moderation_api):
+    assert moderation_engine.is_flagged("toxic words") is True
+    assert moderation_engine.is_flagged("toxic words") is True
+    assert moderation_engine.is_flagged("kind words") is False
+
+    assert moderation_api == [["toxic words"], ["kind words"]]
+    assert moderation_engine.get_moderation_stats()["hits"] == 1
+
+
+def test_batch_sends_unique_uncached_texts_in_chunks(moderation_api, monkeypatch):
+    monkeypatch.setenv("MODERATION_BATCH_SIZE", "2")
+    from config import get_settings
+
+    get_settings.cache_clear()
+    try:
+        moderation_engine.is_flagged("cached")
+        verdicts = moderation_engine.moderate_batch(["a", "toxic b", "a", "cached", "c"])
+    finally:
+        get_settings.cache_clear()
+
+    assert verdicts == [False, True, False, False, False]
+    assert moderation_api == [["cached"], ["a", "toxic b"], ["c"]]
+
+
+def test_provider_failure_uses_uncached_keyword_fallback():
+    def handler(request):
+        return httpx.Response(500, json={"error": {"message": "down"}})
+
+    llm_client.set_clients(
+        sync_client=OpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            max_retries=0,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+    )
+    try:
+        assert moderation_engine.is_flagged("violence ahead") is True
+        assert moderation_engine.is_flagged("quiet day") is False
+    finally:
+        llm_client.set_clients()
+    stats = moderation_engine.get_moderation_stats()
+    assert stats["fallbacks"] == 2 and stats["size"] == 0
+
+
+def test_rerun_flags_summaries_with_one_request_per_page(moderation_api, db_session, test_user):
+    user = test_user
+    texts = ["a toxic rant", "a calm week", "I hate mondays", "steady progress", "toxic again"]
+    for text in texts:
+        db_session.add(SummarizedJournal(user_id=user.id, summary_text=text))
+    db_session.commit()
+
+    result = summary_moderation_service.rerun_summary_moderation(db_session, batch_size=10)
+
+    assert result == {"checked": 5, "flagged": 3}
+    # Notes: The keyword-matched summary never reaches the provider
+    assert len(moderation_api) == 1 and "I hate mondays" not in moderation_api[0]
+    reasons = {
+        s.summary_text: s.flag_reason
+        for s in db_session.query(SummarizedJournal).filter_by(flagged=True)
+    }
+    assert reasons == {
+        "a toxic rant": "Auto-flagged: ai_moderation",
+        "toxic again": "Auto-flagged: ai_moderation",
+        "I hate mondays": "Auto-flagged: keyword",
+    }
+    assert summary_moderation_service.rerun_summary_moderation(db_session) == {"checked": 2, "flagged": 0}
+
+# Footnote: The moderation endpoint is stubbed with httpx.MockTransport.
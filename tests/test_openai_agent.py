@@ -0,0 +1,266 @@
+"""Tests for the async OpenAI Assistants agent."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+from openai import AsyncOpenAI
+
+from agents.openai_agent import OpenAIAgent
+from services import llm_client
+
+
+def _run_body(status: str, tool_calls: list | None = None) -> dict:
+    body = {
+        "id": "run_1",
+        "object": "thread.run",
+        "created_at": 0,
+        "thread_id": "thread_1",
+        "assistant_id": "asst_1",
+        "status": status,
+        "model": "gpt-4o",
+        "instructions": "",
+        "tools": [],
+        "metadata": {},
+        "parallel_tool_calls": True,
+    }
+    if tool_calls:
+        body["required_action"] = {
+            "type": "submit_tool_outputs",
+            "submit_tool_outputs": {"tool_calls": tool_calls},
+        }
+    return body
+
+
+def _message_body(text: str) -> dict:
+    return {
+        "id": "msg_1",
+        "object": "thread.message",
+        "created_at": 0,
+        "thread_id": "thread_1",
+        "role": "assistant",
+        "status": "completed",
+        "content": [{"type": "text", "text": {"value": text, "annotations": []}}],
+        "attachments": [],
+        "metadata": {},
+    }
+
+
+def _delta_body(text: str) -> dict:
+    return {
+        "id": "msg_1",
+        "object": "thread.message.delta",
+        "delta": {"content": [{"index": 0, "type": "text", "text": {"value": text}}]},
+    }
+
+
+def _frame(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+# Notes: Fake Assistants API answering over SSE, optionally asking for tools first
+class FakeAssistantsAPI:
+    def __init__(self, tool_calls: list | None = None, run_delay: float = 0.0):
+        self.tool_calls = tool_calls or []
+        self.run_delay = run_delay
+        self.requests = []
+        self.submitted = None
+        self.cancelled = False
+
+    async def _reply_stream(self):
+        yield _frame("thread.run.created", _run_body("queued"))
+        yield _frame("thread.run.in_progress", _run_body("in_progress"))
+        await asyncio.sleep(self.run_delay)
+        for part in ("Keep ", "going!"):
+            yield _frame("thread.message.delta", _delta_body(part))
+        yield _frame("thread.message.completed", _message_body("Keep going!"))
+        yield _frame("thread.run.completed", _run_body("completed"))
+        yield b"event: done\ndata: [DONE]\n\n"
+
+    async def _tool_stream(self):
+        yield _frame("thread.run.created", _run_body("queued"))
+        yield _frame("thread.run.requires_action", _run_body("requires_action", self.tool_calls))
+        yield b"event: done\ndata: [DONE]\n\n"
+
+    def _stream(self, events) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=events)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(path)
+        if path.endswith("/assistants"):
+            return httpx.Response(
+                200,
+                json={
+                    "id": "asst_1",
+                    "object": "assistant",
+                    "created_at": 0,
+                    "model": "gpt-4o",
+                    "tools": [],
+                    "metadata": {},
+                },
+            )
+        if path.endswith("/threads"):
+            return httpx.Response(
+                200, json={"id": "thread_1", "object": "thread", "created_at": 0, "metadata": {}}
+            )
+        if path.endswith("/messages"):
+            return httpx.Response(200, json={**_message_body("hi"), "role": "user"})
+        if path.endswith("/runs"):
+            return self._stream(self._tool_stream() if self.tool_calls else self._reply_stream())
+        if path.endswith("/submit_tool_outputs"):
+            self.submitted = json.loads(request.content)["tool_outputs"]
+            return self._stream(self._reply_stream())
+        if path.endswith("/cancel"):
+            self.cancelled = True
+            return httpx.Response(200, json=_run_body("cancelling"))
+        return httpx.Response(404, json={"error": {"message": path}})
+
+
+def _install(api: FakeAssistantsAPI) -> None:
+    llm_client.set_clients(
+        async_client=AsyncOpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handle)),
+        )
+    )
+
+
+def _run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await llm_client.aclose()
+            llm_client.set_clients()
+
+    return asyncio.run(wrapper())
+
+
+def test_init_makes_no_network_calls():
+    api = FakeAssistantsAPI()
+    _install(api)
+    try:
+        agent = OpenAIAgent()
+    finally:
+        llm_client.set_clients()
+
+    assert agent.assistant_id is None
+    assert agent.timeout > 0
+    assert api.requests == []
+
+
+def test_run_returns_streamed_reply():
+    api = FakeAssistantsAPI()
+    _install(api)
+
+    result = _run(OpenAIAgent().run("motivate me"))
+
+    assert result["response"] == "Keep going!"
+    assert result["status"] == "completed"
+    assert result["thread_id"] == "thread_1"
+    assert result["run_id"] == "run_1"
+    assert result["assistant_id"] == "asst_1"
+    # Notes: No polling round trips; the run is consumed as one stream
+    assert api.requests.count("/v1/threads/thread_1/runs") == 1
+    assert not any(path.endswith("run_1") for path in api.requests)
+
+
+def test_tool_calls_run_concurrently():
+    tool_calls = [
+        {"id": f"call_{i}", "type": "function", "function": {"name": "slow_tool", "arguments": json.dumps({"n": i})}}
+        for i in range(2)
+    ] + [{"id": "call_x", "type": "function", "function": {"name": "missing", "arguments": "{}"}}]
+    api = FakeAssistantsAPI(tool_calls=tool_calls)
+    _install(api)
+
+    async def slow_tool(arguments):
+        await asyncio.sleep(0.2)
+        return {"n": arguments["n"]}
+
+    agent = OpenAIAgent(tool_handlers={"slow_tool": slow_tool})
+    start = time.perf_counter()
+    result = _run(agent.run("plan my week"))
+    elapsed = time.perf_counter() - start
+
+    assert result["response"] == "Keep going!"
+    assert elapsed < 0.35
+    assert [o["tool_call_id"] for o in api.submitted] == ["call_0", "call_1", "call_x"]
+    assert json.loads(api.submitted[1]["output"]) == {"n": 1}
+    assert "not implemented" in json.loads(api.submitted[2]["output"])["error"]
+
+
+def test_run_timeout_cancels_run():
+    api = FakeAssistantsAPI(run_delay=1.0)
+    _install(api)
+
+    result = _run(OpenAIAgent(timeout=0.2).run("hello"))
+
+    assert result["status"] == "error"
+    assert "timed out" in result["error"]
+    assert api.cancelled
+
+
+def test_stream_yields_deltas_then_done():
+    api = FakeAssistantsAPI()
+    _install(api)
+
+    async def collect():
+        return [event async for event in OpenAIAgent().stream("hello")]
+
+    events = _run(collect())
+
+    assert [e["delta"] for e in events if "delta" in e] == ["Keep ", "going!"]
+    assert events[-1]["done"] is True
+    assert events[-1]["status"] == "completed"
+
+
+def test_stream_timeout_cancels_stalled_run():
+    api = FakeAssistantsAPI(run_delay=5.0)
+    _install(api)
+    events = []
+
+    async def collect():
+        async for event in OpenAIAgent(timeout=0.2).stream("hello"):
+            events.append(event)
+
+    start = time.perf_counter()
+    try:
+        _run(collect())
+    except TimeoutError as exc:
+        assert "timed out" in str(exc)
+    else:
+        raise AssertionError("stalled stream did not time out")
+    elapsed = time.perf_counter() - start
+
+    # Notes: No event arrives during the stall, so only the bounded wait can end it
+    assert events == []
+    assert elapsed < 1.0
+    assert api.cancelled
+
+
+def test_concurrent_runs_do_not_block_loop():
+    api = FakeAssistantsAPI(run_delay=0.2)
+    _install(api)
+    agent = OpenAIAgent()
+
+    async def many():
+        return await asyncio.gather(*[agent.run(f"prompt {i}") for i in range(5)])
+
+    start = time.perf_counter()
+    results = _run(many())
+    elapsed = time.perf_counter() - start
+
+    assert all(r["response"] == "Keep going!" for r in results)
+    assert elapsed < 0.6
+
+# Footnote: The fake API speaks the Assistants SSE wire format so the real SDK parses it.
@@ -149,10 +149,10 @@ def test_run_parallel_agents(monkeypatch):
     # Notes: Stub the LLM call so no external request occurs
     import services.llm_call_service as llm_service
 
-    def fake_call_llm(payload):
+    async def fake_call_llm(payload):
         return payload[-1]["content"] + " reply"
 
-    monkeypatch.setattr(llm_service, "call_llm", fake_call_llm)
+    monkeypatch.setattr(llm_service, "acall_llm", fake_call_llm)
 
     result = orchestrator.run_parallel_agents(
         user.id,
@@ -184,7 +184,11 @@ def test_orchestrator_blocks_disallowed_agent(monkeypatch):
 
     monkeypatch.setattr(orchestrator, "determine_agent_flow", lambda *_: ["career"])
     monkeypatch.setattr(orchestrator, "load_agent_context", lambda *_: ["career"])
-    monkeypatch.setattr(orchestrator, "build_personalized_prompt", lambda *a: "p")
+    monkeypatch.setattr(
+        orchestrator,
+        "build_personalized_prompts",
+        lambda db, uid, names, prompt: {name: "p" for name in names},
+    )
     monkeypatch.setattr(orchestrator, "build_agent_prompt", lambda *a: [])
     monkeypatch.setitem(orchestrator.AGENT_PROCESSORS, "career", lambda _m: "r")
 
@@ -212,7 +216,10 @@ def test_parallel_agents_respects_role(monkeypatch):
     monkeypatch.setattr(orchestrator, "build_memory_context", lambda *_: "mem")
     monkeypatch.setattr(orchestrator, "build_agent_prompt", lambda a, *_: [{"role": "user", "content": a}])
     import services.llm_call_service as llm_service
-    monkeypatch.setattr(llm_service, "call_llm", lambda *_: "reply")
+    async def fake_call_llm(*_):
+        return "reply"
+
+    monkeypatch.setattr(llm_service, "acall_llm", fake_call_llm)
 
     monkeypatch.setattr(orchestrator, "is_agent_allowed", lambda db, role, agent: agent != "career")
 
@@ -225,3 +232,91 @@ def test_parallel_agents_respects_role(monkeypatch):
     assert "career" not in result
     assert result["finance"]["status"] == "success"
     db.close()
+
+
+# Verify agents run concurrently so latency tracks the slowest agent
+
+def test_process_user_prompt_runs_agents_concurrently(monkeypatch):
+    import asyncio
+    import time
+    from models.agent_execution_log import AgentExecutionLog
+
+    db = TestingSessionLocal()
+    user = create_user(
+        db,
+        {
+            "email": f"orch_{uuid.uuid4().hex}@example.com",
+            "phone_number": str(int(uuid.uuid4().int % 10_000_000_000)).zfill(10),
+            "hashed_password": "password123",
+        },
+    )
+    domains = ["career", "finance", "health", "relationships", "mental_health"]
+    for domain in domains:
+        assign_personality(db, user.id, uuid.uuid4(), domain)
+
+    # Notes: Each fake agent takes 0.2s; sequential execution would take 1s
+    def make_agent(name):
+        async def _agent(messages):
+            await asyncio.sleep(0.2)
+            return f"{name} reply"
+
+        return _agent
+
+    for domain in domains:
+        monkeypatch.setitem(orchestrator.AGENT_PROCESSORS, domain, make_agent(domain))
+    monkeypatch.setattr(orchestrator, "determine_agent_flow", lambda *_: domains)
+    monkeypatch.setattr(orchestrator, "load_agent_context", lambda *_: domains)
+
+    start = time.perf_counter()
+    result = orchestrator.process_user_prompt(db, user.id, "help me")
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == 5
+    assert elapsed < 0.6
+    logs = db.query(AgentExecutionLog).filter_by(user_id=user.id).all()
+    assert {log.agent_name for log in logs} == set(domains)
+    db.close()
+
+
+# Verify slow agents are cut off at the request deadline and logged as failures
+
+def test_process_user_prompt_deadline(monkeypatch):
+    import asyncio
+    from models.agent_execution_log import AgentExecutionLog
+
+    db = TestingSessionLocal()
+    user = create_user(
+        db,
+        {
+            "email": f"orch_{uuid.uuid4().hex}@example.com",
+            "phone_number": str(int(uuid.uuid4().int % 10_000_000_000)).zfill(10),
+            "hashed_password": "password123",
+        },
+    )
+    assign_personality(db, user.id, uuid.uuid4(), "career")
+    assign_personality(db, user.id, uuid.uuid4(), "finance")
+
+    async def fast(messages):
+        return "fast reply"
+
+    async def slow(messages):
+        await asyncio.sleep(1)
+        return "slow reply"
+
+    monkeypatch.setitem(orchestrator.AGENT_PROCESSORS, "career", fast)
+    monkeypatch.setitem(orchestrator.AGENT_PROCESSORS, "finance", slow)
+    monkeypatch.setattr(orchestrator, "determine_agent_flow", lambda *_: ["career", "finance"])
+    monkeypatch.setattr(orchestrator, "load_agent_context", lambda *_: ["career", "finance"])
+
+    result = asyncio.run(
+        orchestrator.aprocess_user_prompt(db, user.id, "help me", deadline_seconds=0.1)
+    )
+    assert result == [{"agent": "career", "response": "fast reply"}]
+    failed = (
+        db.query(AgentExecutionLog)
+        .filter_by(user_id=user.id, agent_name="finance")
+        .one()
+    )
+    assert failed.success is False
+    assert failed.error_message == "Deadline exceeded"
+    db.close()
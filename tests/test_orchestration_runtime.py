@@ -0,0 +1,79 @@
+"""Tests for the shared orchestration runtime."""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from orchestration.runtime import OrchestrationRuntime
+from services import orchestration_processor_service as orchestrator
+from models.orchestration_log import OrchestrationPerformanceLog
+
+
+# Verify repeated sync calls reuse one long-lived loop thread
+
+def test_runtime_reuses_background_loop():
+    runtime = OrchestrationRuntime()
+
+    async def thread_name():
+        return threading.current_thread().name, id(asyncio.get_running_loop())
+
+    first = runtime.run(thread_name())
+    second = runtime.run(thread_name())
+    assert first == second
+    assert first[0] == "orchestration-runtime"
+    runtime.shutdown()
+
+
+# Verify the provider semaphore caps in-flight calls
+
+def test_runtime_limits_provider_concurrency():
+    runtime = OrchestrationRuntime(provider_limits={"openai": 2})
+    state = {"in_flight": 0, "peak": 0}
+
+    async def call():
+        async with runtime.limit("openai"):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+
+    async def burst():
+        await asyncio.gather(*[call() for _ in range(8)])
+
+    runtime.run(burst())
+    assert state["peak"] == 2
+    runtime.shutdown()
+
+
+# Verify the coroutine API works under an already running loop and shares context
+
+def test_arun_parallel_agents_loads_memory_once(monkeypatch, db_session, test_user):
+    db, user = db_session, test_user
+    calls = {"memory": 0}
+
+    def fake_memory(*_):
+        calls["memory"] += 1
+        return "mem"
+
+    async def fake_call_llm(payload):
+        return payload[-1]["content"] + " reply"
+
+    import services.llm_call_service as llm_service
+
+    monkeypatch.setattr(orchestrator, "build_memory_context", fake_memory)
+    monkeypatch.setattr(llm_service, "acall_llm", fake_call_llm)
+
+    agents = ["career", "finance", "health"]
+    result = asyncio.run(
+        orchestrator.arun_parallel_agents(user.id, "plan", agents, db)
+    )
+
+    assert set(result) == set(agents)
+    assert calls["memory"] == 1
+    rows = db.query(OrchestrationPerformanceLog).filter_by(user_id=user.id).all()
+    assert sorted(r.agent_name for r in rows) == sorted(agents)
@@ -0,0 +1,102 @@
+"""Tests for the admin policy caches used by agent execution and feature gates."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from sqlalchemy import event
+
+from auth.dependencies import get_current_admin_user
+from main import app
+from models.subscription import Subscription
+from models.agent_access_policy import SubscriptionTier
+from orchestration.executor import execute_agent
+from services import (
+    agent_access_service,
+    agent_toggle_service,
+    feature_flag_service,
+    policy_cache,
+)
+
+
+def _count_selects(db):
+    counter = {"selects": 0}
+
+    def _on_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            counter["selects"] += 1
+
+    event.listen(db.get_bind(), "before_cursor_execute", _on_execute)
+    return counter, lambda: event.remove(db.get_bind(), "before_cursor_execute", _on_execute)
+
+
+def test_warm_agent_checks_skip_policy_queries(db_session, test_user):
+    user = test_user
+
+    async def call():
+        return "ok"
+
+    def run_counted():
+        counter, stop = _count_selects(db_session)
+        try:
+            asyncio.run(execute_agent(db_session, "career", user.id, call))
+        finally:
+            stop()
+        return counter["selects"]
+
+    cold = run_counted()
+    warm = run_counted()
+    # Notes: Toggle, subscription and access policy lookups are all served from cache
+    assert cold - warm == 3
+    stats = policy_cache.get_policy_cache_stats()
+    assert stats["agent_toggles"]["hits"] == 1
+    assert stats["agent_access_policies"]["hits"] == 1
+    assert stats["subscription_tiers"]["hits"] == 1
+
+
+def test_setters_invalidate_cached_values(db_session, test_user):
+    user = test_user
+
+    assert agent_toggle_service.is_agent_enabled(db_session, "career")
+    agent_toggle_service.set_agent_enabled(db_session, "career", False)
+    assert not agent_toggle_service.is_agent_enabled(db_session, "career")
+
+    assert feature_flag_service.get_feature_flag(db_session, "journal", "free")
+    feature_flag_service.set_feature_flag(db_session, "journal", "pro", True)
+    assert not feature_flag_service.get_feature_flag(db_session, "journal", "free")
+
+    assert agent_access_service.is_agent_enabled_for_user(db_session, "finance", user)
+    agent_access_service.set_agent_access_policy(
+        db_session, "finance", SubscriptionTier.free, False
+    )
+    assert not agent_access_service.is_agent_enabled_for_user(db_session, "finance", user)
+
+
+def test_subscription_change_drops_tier_memo(db_session, test_user):
+    user = test_user
+    agent_access_service.set_agent_access_policy(db_session, "career", "free", False)
+
+    assert not agent_access_service.is_agent_enabled_for_user(db_session, "career", user)
+    db_session.add(
+        Subscription(user_id=user.id, stripe_subscription_id="sub_1", status="active")
+    )
+    db_session.commit()
+    assert agent_access_service.is_agent_enabled_for_user(db_session, "career", user)
+
+
+def test_admin_metrics_reports_cache_counters(client, test_user):
+    app.dependency_overrides[get_current_admin_user] = lambda: test_user
+    try:
+        resp = client.get("/admin/metrics/")
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+    assert resp.status_code == 200
+    assert set(resp.json()["policy_cache"]) == {
+        "agent_toggles",
+        "agent_access_policies",
+        "feature_flags",
+        "subscription_tiers",
+    }
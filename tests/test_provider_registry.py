@@ -0,0 +1,48 @@
+"""Tests for the lazy provider registry."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from services.provider_registry import ProviderRegistry
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_factory_runs_once_on_first_use():
+    registry = ProviderRegistry()
+    built = []
+    registry.register("fake", lambda: built.append(1) or FakeClient())
+
+    assert registry.initialized() == []
+    first = registry.get("fake")
+    assert registry.get("fake") is first
+    assert built == [1]
+    assert registry.initialized() == ["fake"]
+
+
+def test_override_and_close():
+    registry = ProviderRegistry()
+    registry.register("fake", FakeClient)
+    stub = FakeClient()
+    registry.override("fake", stub)
+    assert registry.get("fake") is stub
+
+    asyncio.run(registry.aclose())
+    assert stub.closed
+    assert registry.get("fake") is not stub
+
+
+def test_unknown_provider_raises():
+    with pytest.raises(KeyError):
+        ProviderRegistry().get("missing")
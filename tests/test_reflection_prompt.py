@@ -35,7 +35,7 @@ def register_user() -> tuple[int, str]:
 
 def test_generate_reflection_prompt_text():
     """Agent should return a non-empty string question."""
-    def fake_generate(_msgs, temperature=0.6):
+    def fake_generate(_msgs, temperature=0.6, cache=True):
         return "What made you feel this way today?"
 
     # Notes: Patch the adapter to avoid external API calls
@@ -0,0 +1,171 @@
+"""Tests for the day/week/month rollup summary tree and its readers."""
+
+# Notes: Ensure project modules are importable and env vars set
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+
+from config import get_settings
+from models.journal_entry import JournalEntry
+from models.rollup_summary import RollupSummary
+from models.task import Task
+from services import reporting_service, rollup_summary_service, user_service, weekly_review_service
+from services.rollup_summary_service import LEVEL_DAY, LEVEL_MONTH, LEVEL_WEEK, period_start
+
+
+@pytest.fixture
+def condense_calls(monkeypatch):
+    """Stub the node summarizer and record what it was asked to condense."""
+
+    calls = []
+
+    def fake_completion(messages, **kwargs):
+        calls.append({"input": messages[1]["content"], **kwargs})
+        return f"condensed {len(calls)}"
+
+    monkeypatch.setattr(rollup_summary_service.llm_client, "chat_completion", fake_completion)
+    return calls
+
+
+def _nodes(db, user_id, level):
+    return (
+        db.query(RollupSummary)
+        .filter_by(user_id=user_id, level=level)
+        .order_by(RollupSummary.period_start)
+        .all()
+    )
+
+
+def test_flush_marks_days_stale_and_short_input_is_stored_verbatim(condense_calls, db_session, test_user):
+    user = test_user
+    when = datetime(2026, 10, 14, 9, 0)
+    db_session.add(JournalEntry(user_id=user.id, content="ran 5k", created_at=when))
+    db_session.add(Task(user_id=user.id, description="call mom", is_completed=True, created_at=when))
+    db_session.commit()
+
+    (day,) = _nodes(db_session, user.id, LEVEL_DAY)
+    assert day.stale and day.summary_text is None
+
+    assert rollup_summary_service.refresh_rollups(db_session, user.id) == 3
+    day, week, month = (_nodes(db_session, user.id, level)[0] for level in (LEVEL_DAY, LEVEL_WEEK, LEVEL_MONTH))
+    assert day.summary_text == "Journal: ran 5k\nTask: [x] call mom"
+    assert week.period_start == period_start(LEVEL_WEEK, when.date()) and week.item_count == 1
+    assert month.summary_text == f"{week.period_start.isoformat()}: {week.summary_text}"
+    assert condense_calls == []
+    assert rollup_summary_service.refresh_rollups(db_session, user.id) == 0
+
+
+def test_edits_and_deletes_propagate_up_the_tree(condense_calls, db_session, test_user):
+    user = test_user
+    entry = JournalEntry(user_id=user.id, content="first draft", created_at=datetime(2026, 10, 14))
+    db_session.add(entry)
+    db_session.commit()
+    rollup_summary_service.refresh_rollups(db_session, user.id)
+
+    entry.content = "second draft"
+    db_session.commit()
+    rollup_summary_service.refresh_rollups(db_session, user.id)
+    assert "second draft" in _nodes(db_session, user.id, LEVEL_MONTH)[0].summary_text
+
+    db_session.delete(entry)
+    db_session.commit()
+    rollup_summary_service.refresh_rollups(db_session, user.id)
+    assert db_session.query(RollupSummary).filter_by(user_id=user.id).count() == 0
+
+
+def test_long_input_is_condensed_under_the_token_ceiling(condense_calls, db_session, test_user):
+    user = test_user
+    db_session.add(JournalEntry(user_id=user.id, content="x" * 20000, created_at=datetime(2026, 10, 14)))
+    db_session.commit()
+
+    rollup_summary_service.refresh_rollups(db_session, user.id)
+
+    (call,) = condense_calls
+    assert call["model"] == "gpt-4o-mini" and call["max_tokens"] == 300
+    assert len(call["input"]) == 16000
+    assert _nodes(db_session, user.id, LEVEL_DAY)[0].summary_text == "condensed 1"
+
+
+def test_monthly_report_prompt_does_not_grow_with_history(monkeypatch, db_session, unique_user_data):
+    prompts = []
+
+    def fake_completion(messages, **kwargs):
+        if kwargs["model"] == "gpt-4o":
+            prompts.append(messages[1]["content"])
+            return "report"
+        # Notes: Node summaries as long as the token ceiling allows
+        return "condensed".ljust(1000, "z")
+
+    monkeypatch.setattr(rollup_summary_service.llm_client, "chat_completion", fake_completion)
+
+    now = datetime.utcnow()
+    for entries_per_day in (1, 6):
+        user = user_service.create_user(db_session, unique_user_data())
+        for day in range(25):
+            for i in range(entries_per_day):
+                db_session.add(
+                    JournalEntry(user_id=user.id, content=f"{day}-{i} " + "y" * 400, created_at=now - timedelta(days=day))
+                )
+        db_session.commit()
+        # Notes: The refresh job keeps the tree current; reads only top it up
+        rollup_summary_service.refresh_rollups(db_session, user.id)
+        assert reporting_service.generate_monthly_report(db_session, user.id) == "report"
+
+    # Notes: At most six week nodes, each capped, whatever the volume of writing
+    light, heavy = prompts
+    assert "y" * 400 not in heavy
+    assert len(light) < 6 * 1100 and len(heavy) < 6 * 1100
+
+
+def test_weekly_review_reads_day_summaries(condense_calls, monkeypatch, db_session, test_user):
+    user = test_user
+    db_session.add(JournalEntry(user_id=user.id, content="old news", created_at=datetime.utcnow() - timedelta(days=20)))
+    db_session.add(JournalEntry(user_id=user.id, content="fresh win", created_at=datetime.utcnow()))
+    db_session.commit()
+
+    messages = weekly_review_service._build_weekly_review_messages(db_session, user.id)
+
+    assert "Journal: fresh win" in messages[1]["content"]
+    assert "old news" not in messages[1]["content"]
+
+
+def test_reads_rebuild_a_capped_batch_and_leave_the_rest_to_the_job(condense_calls, db_session, test_user):
+    user = test_user
+    now = datetime.utcnow()
+    for day in range(20):
+        db_session.add(JournalEntry(user_id=user.id, content="z" * 2000, created_at=now - timedelta(days=day)))
+    db_session.commit()
+
+    messages = weekly_review_service._build_weekly_review_messages(db_session, user.id)
+    assert len(condense_calls) == get_settings().ROLLUP_READ_REFRESH_LIMIT
+    # Notes: Days past the budget still show the opening of their input
+    assert len(messages[1]["content"].splitlines()) == 1 + 8
+    assert db_session.query(RollupSummary).filter_by(user_id=user.id, stale=True).count() > 0
+
+    rollup_summary_service.refresh_rollups(db_session, user.id)
+    assert db_session.query(RollupSummary).filter_by(user_id=user.id, stale=True).count() == 0
+
+
+def test_reads_refresh_their_own_window_before_older_history(condense_calls, db_session, test_user):
+    user = test_user
+    now = datetime.utcnow()
+    for day in range(55, 60):
+        db_session.add(JournalEntry(user_id=user.id, content="z" * 2000, created_at=now - timedelta(days=day)))
+    db_session.add(JournalEntry(user_id=user.id, content="fresh win", created_at=now))
+    db_session.commit()
+
+    messages = weekly_review_service._build_weekly_review_messages(db_session, user.id)
+    (month,) = rollup_summary_service.get_rollup_nodes(db_session, user.id, LEVEL_MONTH, now.date())
+
+    assert "Journal: fresh win" in messages[1]["content"]
+    assert "fresh win" in month.summary_text
+    # Notes: The stale days two months back are left to the refresh job
+    assert condense_calls == []
+
+# Footnote: Node condensation is stubbed; short inputs never reach the model.
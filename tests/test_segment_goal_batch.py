@@ -0,0 +1,116 @@
+"""Tests for resumable concurrent goal generation over segments."""
+
+# Notes: Ensure project modules are importable and env vars set
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+
+from models import Goal, GoalBatchCheckpoint
+from services.segment_goal_batch_service import COMPLETED, arun_segment_goal_batch
+from services.segmentation_service import create_segment, iter_segment_member_pages
+from services.user_service import create_user
+
+
+class FakeAdapter:
+    """Async adapter stub tracking concurrency and optionally failing."""
+
+    def __init__(self, fail_for=(), crash_after=None):
+        self.fail_for = set(fail_for)
+        self.crash_after = crash_after
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def agenerate(self, messages, temperature=0.7, cache=True):
+        email = messages[-1]["content"].rsplit(" ", 1)[-1]
+        if self.crash_after is not None and len(self.calls) >= self.crash_after:
+            raise KeyboardInterrupt
+        self.calls.append(email)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if email in self.fail_for:
+            raise RuntimeError("provider down")
+        return '{"goals": ["Walk daily", "Read nightly"]}'
+
+
+def test_member_pages_use_keyset_order(db_session, unique_user_data):
+    users = [create_user(db_session, unique_user_data()) for _ in range(5)]
+    segment = create_segment(db_session, {"name": "everyone"})
+
+    pages = list(iter_segment_member_pages(db_session, segment.id, batch_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [uid for page in pages for uid, _ in page] == sorted(u.id for u in users)
+
+    resumed = list(iter_segment_member_pages(db_session, segment.id, 2, after_id=users[2].id))
+    assert [uid for page in resumed for uid, _ in page] == [u.id for u in users[3:]]
+
+
+def test_batch_bulk_inserts_goals_with_bounded_concurrency(db_session, unique_user_data):
+    users = [create_user(db_session, unique_user_data()) for _ in range(12)]
+    segment = create_segment(db_session, {"name": "everyone"})
+    adapter = FakeAdapter(fail_for={users[4].email})
+    progress = []
+
+    report = asyncio.run(
+        arun_segment_goal_batch(
+            db_session,
+            segment.id,
+            page_size=5,
+            concurrency=3,
+            adapter=adapter,
+            on_progress=progress.append,
+        )
+    )
+
+    assert adapter.peak == 3
+    assert report.status == COMPLETED
+    assert (report.users_processed, report.users_failed, report.goals_created) == (12, 1, 22)
+    assert report.pages == 3 and report.users_per_second > 0
+    assert [p.users_processed for p in progress] == [5, 10, 12]
+    assert db_session.query(Goal).count() == 22
+    assert db_session.query(Goal).filter(Goal.user_id == users[4].id).count() == 0
+
+
+def test_interrupted_run_resumes_after_last_committed_page(db_session, unique_user_data):
+    users = [create_user(db_session, unique_user_data()) for _ in range(6)]
+    segment = create_segment(db_session, {"name": "everyone"})
+
+    # Notes: The crash hits during the second page, after the first committed
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(
+            arun_segment_goal_batch(
+                db_session, segment.id, page_size=3, concurrency=1, adapter=FakeAdapter(crash_after=4)
+            )
+        )
+    db_session.rollback()
+    checkpoint = db_session.get(GoalBatchCheckpoint, segment.id)
+    assert checkpoint.last_user_id == users[2].id
+    assert db_session.query(Goal).count() == 6
+
+    adapter = FakeAdapter()
+    report = asyncio.run(
+        arun_segment_goal_batch(db_session, segment.id, page_size=3, adapter=adapter)
+    )
+
+    assert adapter.calls == [u.email for u in users[3:]]
+    assert report.resumed_after == users[2].id
+    assert report.users_processed == 6
+    assert db_session.query(Goal).count() == 12
+
+    # Notes: A completed run starts over on the next invocation
+    again = asyncio.run(
+        arun_segment_goal_batch(db_session, segment.id, page_size=3, adapter=FakeAdapter())
+    )
+    assert again.resumed_after is None and again.users_processed == 6
+
+# Footnote: The fake adapter replaces AIModelAdapter so no provider calls are made.
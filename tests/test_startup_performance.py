@@ -0,0 +1,80 @@
+"""Startup-time benchmark: import cost and time to first request.
+
+The probe runs in a fresh interpreter so module caching from other tests
+does not hide import work. Timings are attached to the junit report via
+``record_property`` so CI can chart them across commits.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Notes: Generous ceilings that still catch a regression back to eager setup
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "20"))
+FIRST_REQUEST_BUDGET_SECONDS = float(os.getenv("STARTUP_FIRST_REQUEST_BUDGET_SECONDS", "5"))
+
+PROBE = """
+import json, time
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+connects = []
+event.listen(Pool, "connect", lambda *a: connects.append(1))
+
+start = time.perf_counter()
+import main
+import_seconds = time.perf_counter() - start
+
+from fastapi.testclient import TestClient
+from services.provider_registry import registry
+
+providers = registry.initialized()
+start = time.perf_counter()
+with TestClient(main.app) as client:
+    status = client.get("/health/ping").status_code
+first_request_seconds = time.perf_counter() - start
+
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "first_request_seconds": first_request_seconds,
+    "db_connects_on_import": len(connects),
+    "providers_on_import": providers,
+    "status": status,
+}))
+"""
+
+
+def _run_probe() -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite:///:memory:",
+        "OPENAI_API_KEY": "test",
+        "TESTING": "true",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_startup_is_lazy_and_within_budget(record_property):
+    metrics = _run_probe()
+    record_property("startup_import_seconds", round(metrics["import_seconds"], 3))
+    record_property("startup_first_request_seconds", round(metrics["first_request_seconds"], 3))
+
+    assert metrics["status"] == 200
+    # Notes: Importing the app must not open DB connections or build LLM clients
+    assert metrics["db_connects_on_import"] == 0
+    assert metrics["providers_on_import"] == []
+    assert metrics["import_seconds"] < IMPORT_BUDGET_SECONDS
+    assert metrics["first_request_seconds"] < FIRST_REQUEST_BUDGET_SECONDS
@@ -0,0 +1,205 @@
+"""Tests for the server-sent event coaching endpoints."""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from sqlalchemy.orm import sessionmaker
+
+from models import AgentAssignment, AgentInteractionLog, OrchestrationPerformanceLog
+from services import (
+    agent_interaction_service,
+    llm_client,
+    openai_agent_service,
+    orchestration_log_service,
+)
+
+TOKENS = ["Keep ", "going, ", "you've ", "got ", "this."]
+
+
+# Notes: Fake streaming endpoint emitting one chat.completion.chunk per token
+def _stream_handler(seen: list):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seen.append(body)
+
+        async def chunks():
+            for token in TOKENS:
+                chunk = {
+                    "id": "chatcmpl-stream",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+            if body.get("stream_options", {}).get("include_usage"):
+                usage = {
+                    "id": "chatcmpl-stream",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [],
+                    "usage": {"prompt_tokens": 40, "completion_tokens": len(TOKENS), "total_tokens": 45},
+                }
+                yield f"data: {json.dumps(usage)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=chunks()
+        )
+
+    return handler
+
+
+def _install_stream_stub():
+    seen: list = []
+    llm_client.set_clients(
+        async_client=AsyncOpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(_stream_handler(seen))),
+        )
+    )
+    return seen
+
+
+@pytest.fixture
+def stream_sessions(monkeypatch, db_session):
+    """Record the sessions streams open to persist replies, bound to the test database."""
+
+    factory = sessionmaker(bind=db_session.get_bind())
+    opened = []
+
+    def open_session():
+        session = factory()
+        opened.append(session)
+        return session
+
+    monkeypatch.setattr(agent_interaction_service, "SessionLocal", open_session)
+    monkeypatch.setattr(openai_agent_service, "SessionLocal", open_session)
+    monkeypatch.setattr(orchestration_log_service, "SessionLocal", open_session)
+    return opened
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_vida_stream_forwards_tokens(client):
+    seen = _install_stream_stub()
+    try:
+        resp = client.post("/vida/coach/stream", json={"prompt": "motivate me"})
+    finally:
+        llm_client.set_clients()
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp.text)
+    assert [data["delta"] for name, data in events if name == "token"] == TOKENS
+    assert events[-1] == ("done", {"response": "".join(TOKENS)})
+    assert seen[0]["stream"] is True
+    assert seen[0]["stream_options"] == {"include_usage": True}
+
+
+def test_coach_stream_persists_final_text(authorized_client, db_session, test_user, stream_sessions):
+    _install_stream_stub()
+    try:
+        resp = authorized_client.post("/ai/coach/stream", json={"prompt": "help"})
+    finally:
+        llm_client.set_clients()
+
+    assert _events(resp.text)[-1][0] == "done"
+    log = db_session.query(AgentInteractionLog).filter_by(user_id=test_user.id).one()
+    assert log.user_prompt == "help"
+    assert log.ai_response == "".join(TOKENS)
+    # Notes: The reply and its usage are logged on sessions of their own, not the closed request one
+    assert len(stream_sessions) == 2 and db_session not in stream_sessions
+    usage = db_session.query(OrchestrationPerformanceLog).filter_by(user_id=test_user.id).one()
+    assert (usage.agent_name, usage.input_tokens, usage.output_tokens) == ("AICoach", 40, 5)
+    assert usage.model == "gpt-4o"
+
+
+def test_orchestrate_stream_reports_agent(authorized_client, db_session, test_user, stream_sessions):
+    db_session.add(AgentAssignment(user_id=test_user.id, agent_type="health"))
+    db_session.commit()
+    _install_stream_stub()
+    try:
+        resp = authorized_client.post("/ai/orchestrate/stream", json={"prompt": "sleep tips"})
+    finally:
+        llm_client.set_clients()
+
+    name, data = _events(resp.text)[-1]
+    assert name == "done"
+    assert data == {"agent": "health", "response": "".join(TOKENS)}
+    assert db_session.query(AgentInteractionLog).filter_by(user_id=test_user.id).count() == 1
+    usage = db_session.query(OrchestrationPerformanceLog).filter_by(user_id=test_user.id).one()
+    assert (usage.agent_name, usage.input_tokens) == ("health", 40)
+
+
+def test_orchestrate_stream_without_assignment(authorized_client):
+    resp = authorized_client.post("/ai/orchestrate/stream", json={"prompt": "hi"})
+    assert resp.status_code == 400
+
+
+def test_stream_failure_emits_error_event():
+    from utils.sse import stream_text_events
+
+    async def broken():
+        yield "partial"
+        raise RuntimeError("upstream closed")
+
+    async def collect():
+        return [frame async for frame in stream_text_events(broken())]
+
+    frames = asyncio.run(collect())
+    assert frames[0].startswith("event: token")
+    assert frames[-1].startswith("event: error")
+
+
+def test_agent_chat_stream_saves_thread(authorized_client, db_session, test_user, monkeypatch, stream_sessions):
+    from models.assistant_thread import AssistantThread
+    from services.openai_agent_service import OpenAIAgentService
+
+    class FakeAgent:
+        model = "gpt-4o"
+
+        async def stream(self, prompt, context=None, thread_id=None):
+            for token in TOKENS:
+                yield {"delta": token}
+            yield {"done": True, "thread_id": "thread_1", "run_id": "run_1",
+                   "assistant_id": "asst_1", "status": "completed"}
+
+    monkeypatch.setattr(
+        OpenAIAgentService, "get_agent", classmethod(lambda cls, domain="general": FakeAgent())
+    )
+    resp = authorized_client.post("/agents/chat/stream", json={"prompt": "plan my week"})
+
+    name, data = _events(resp.text)[-1]
+    assert name == "done"
+    assert data["thread_id"] == "thread_1"
+    assert data["response"] == "".join(TOKENS)
+    thread = db_session.query(AssistantThread).filter_by(user_id=test_user.id).one()
+    assert thread.thread_metadata["initial_prompt"] == "plan my week"
+    assert db_session.query(AgentInteractionLog).filter_by(user_id=test_user.id).count() == 1
+
+    # Notes: A follow-up reloads the stored thread on the persisting session
+    authorized_client.post(
+        "/agents/chat/stream", json={"prompt": "and next week", "thread_id": "thread_1"}
+    )
+    db_session.expire_all()
+    assert db_session.query(AssistantThread).filter_by(user_id=test_user.id).count() == 1
+    assert db_session.query(AgentInteractionLog).filter_by(user_id=test_user.id).count() == 2
+    assert len(stream_sessions) == 2
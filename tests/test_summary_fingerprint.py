@@ -0,0 +1,163 @@
+"""Tests for reusing and incrementally updating journal summaries."""
+
+# Notes: Ensure project modules are importable and env vars set
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+import pytest
+from openai import OpenAI
+
+from models.journal_summary import JournalSummary
+from models.summarized_journal import SummarizedJournal
+from services import agent_rerun_service, journal_service, llm_client, orchestration_summarizer
+from services.ai_processor import generate_journal_summary
+
+
+@pytest.fixture
+def summary_calls(monkeypatch):
+    """Record summary prompts sent to the model; self-score calls are ignored."""
+
+    calls = []
+
+    def generate(self, messages, temperature=0.7, cache=True):
+        if temperature == 0:
+            return "8"
+        calls.append(messages)
+        return f"summary {len(calls)}"
+
+    monkeypatch.setattr(orchestration_summarizer.AIModelAdapter, "generate", generate)
+    monkeypatch.setattr(orchestration_summarizer, "check_summary_text", lambda text: False)
+    monkeypatch.setattr(orchestration_summarizer, "generate_reflection_prompt", lambda *a, **k: "Reflect")
+    monkeypatch.setattr(orchestration_summarizer, "detect_conflict_issues", lambda text: [])
+    return calls
+
+
+def _add_entries(db, user, count):
+    return [
+        journal_service.create_journal_entry(db, {"user_id": user.id, "content": f"entry {i}"})
+        for i in range(count)
+    ]
+
+
+def test_unchanged_entries_reuse_the_summary(summary_calls, db_session, test_user):
+    user = test_user
+    _add_entries(db_session, user, 2)
+
+    first = orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+    second = orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+
+    assert first == second == "summary 1"
+    assert len(summary_calls) == 1
+    assert db_session.query(SummarizedJournal).filter_by(user_id=user.id).count() == 1
+
+
+def test_new_entries_are_folded_into_the_previous_summary(summary_calls, db_session, test_user):
+    user = test_user
+    _add_entries(db_session, user, 2)
+    orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+    journal_service.create_journal_entry(db_session, {"user_id": user.id, "content": "fresh news"})
+
+    assert orchestration_summarizer.summarize_journal_entries(user.id, db_session) == "summary 2"
+
+    system, prompt = summary_calls[-1]
+    assert system["content"] == orchestration_summarizer.INCREMENTAL_SUMMARY_PROMPT
+    assert prompt["content"] == "Previous summary:\nsummary 1\n\nNew entries:\nfresh news"
+    assert db_session.query(SummarizedJournal).filter_by(user_id=user.id).count() == 2
+
+
+def test_edited_entry_or_flagged_summary_forces_a_full_summary(summary_calls, db_session, test_user):
+    user = test_user
+    entries = _add_entries(db_session, user, 2)
+    orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+
+    entries[0].content = "entry 0, revised"
+    db_session.commit()
+    orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+    assert summary_calls[-1][0]["content"] == orchestration_summarizer.SUMMARY_PROMPT
+
+    latest = db_session.query(SummarizedJournal).filter_by(user_id=user.id, summary_text="summary 2").one()
+    latest.flagged = True
+    db_session.commit()
+    assert orchestration_summarizer.summarize_journal_entries(user.id, db_session) == "summary 3"
+    assert summary_calls[-1][0]["content"] == orchestration_summarizer.SUMMARY_PROMPT
+
+
+def test_admin_rerun_always_calls_the_model(summary_calls, db_session, test_user):
+    user = test_user
+    _add_entries(db_session, user, 1)
+    orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+    record = db_session.query(SummarizedJournal).filter_by(user_id=user.id).one()
+
+    updated = agent_rerun_service.rerun_summary(db_session, record.id)
+
+    assert updated.summary_text == "summary 2"
+    assert len(summary_calls) == 2
+
+
+def test_rerun_reaches_the_provider_past_the_response_cache(monkeypatch, db_session, test_user):
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        # Notes: Self-score calls run at temperature 0 and expect a number
+        content = "8" if body["temperature"] == 0 else f"provider summary {len(bodies)}"
+        message = {"role": "assistant", "content": content}
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            },
+        )
+
+    monkeypatch.setattr(orchestration_summarizer, "check_summary_text", lambda text: False)
+    monkeypatch.setattr(orchestration_summarizer, "generate_reflection_prompt", lambda *a, **k: "Reflect")
+    monkeypatch.setattr(orchestration_summarizer, "detect_conflict_issues", lambda text: [])
+    llm_client.set_clients(
+        sync_client=OpenAI(
+            api_key="test",
+            base_url="http://fake-openai.local/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+    )
+    try:
+        user = test_user
+        _add_entries(db_session, user, 1)
+        orchestration_summarizer.summarize_journal_entries(user.id, db_session)
+        record = db_session.query(SummarizedJournal).filter_by(user_id=user.id).one()
+        # Notes: An earlier reply to the identical prompt sits in the response cache
+        messages = [b["messages"] for b in bodies if b["temperature"] == 0.5][0]
+        llm_client.chat_completion(messages, model="gpt-4o", temperature=0.5, cache=True)
+        sent = len(bodies)
+
+        updated = agent_rerun_service.rerun_summary(db_session, record.id)
+    finally:
+        llm_client.set_clients()
+
+    summaries = [b for b in bodies[sent:] if b["temperature"] == 0.5]
+    assert summaries and summaries[0]["messages"] == messages
+    assert updated.summary_text == f"provider summary {sent + 1}"
+
+
+def test_generate_journal_summary_skips_unchanged_entries(db_session, test_user):
+    user = test_user
+    _add_entries(db_session, user, 3)
+
+    assert generate_journal_summary(db_session, user.id) == generate_journal_summary(db_session, user.id)
+    assert db_session.query(JournalSummary).filter_by(user_id=user.id).count() == 1
+
+    journal_service.create_journal_entry(db_session, {"user_id": user.id, "content": "more"})
+    assert generate_journal_summary(db_session, user.id) == "You wrote 4 journal entries recently."
+    assert db_session.query(JournalSummary).filter_by(user_id=user.id).count() == 2
+
+# Footnote: The model is stubbed; a reused summary must not reach it at all.
@@ -0,0 +1,110 @@
+"""Tests for the buffered orchestration/execution log writer."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from models import AgentExecutionLog, OrchestrationPerformanceLog
+from services import activity_rollup_service, orchestration_log_service, telemetry_writer, user_service
+from services.telemetry_writer import TelemetryWriter
+
+
+def _execution(user_id):
+    return AgentExecutionLog(
+        user_id=user_id,
+        agent_name="career",
+        input_prompt="p",
+        response_output="r",
+        success=True,
+        execution_time_ms=5,
+    )
+
+
+def test_buffered_submit_stays_off_request_session(file_db, unique_user_data, monkeypatch):
+    user_id = user_service.create_user(file_db, unique_user_data()).id
+    writer = TelemetryWriter(
+        sessionmaker(bind=file_db.get_bind()), mode="buffered", flush_interval_ms=60_000
+    )
+    monkeypatch.setattr(telemetry_writer, "_writer", writer)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(file_db.get_bind(), "before_cursor_execute", listener)
+    try:
+        for _ in range(3):
+            orchestration_log_service.log_agent_run(file_db, "career", user_id, {"status": "success"})
+    finally:
+        event.remove(file_db.get_bind(), "before_cursor_execute", listener)
+
+    assert statements == []
+    assert file_db.query(OrchestrationPerformanceLog).count() == 0
+
+    writer.submit_many(file_db, [_execution(user_id), _execution(user_id)])
+    assert writer.flush() == 5
+    writer.shutdown()
+    assert file_db.query(OrchestrationPerformanceLog).count() == 3
+    assert file_db.query(AgentExecutionLog).count() == 2
+    # Notes: Rows written on the writer's session still reach the daily rollup
+    totals = activity_rollup_service.get_user_activity_totals(file_db, [user_id], 1)
+    assert totals[user_id]["agent_runs"] == 2
+    assert writer.stats()["written"] == 5
+
+
+def test_background_thread_flushes_on_interval(file_db, unique_user_data):
+    user = user_service.create_user(file_db, unique_user_data())
+    writer = TelemetryWriter(
+        sessionmaker(bind=file_db.get_bind()), mode="buffered", flush_interval_ms=10
+    )
+    writer.submit(file_db, _execution(user.id))
+
+    deadline = time.monotonic() + 5
+    while writer.stats()["written"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.shutdown()
+    assert writer.stats()["written"] == 1
+    assert file_db.query(AgentExecutionLog).count() == 1
+
+
+def test_full_queue_drops_and_counts(file_db, unique_user_data):
+    user = user_service.create_user(file_db, unique_user_data())
+    writer = TelemetryWriter(
+        sessionmaker(bind=file_db.get_bind()),
+        mode="buffered",
+        max_queue=2,
+        enqueue_timeout_ms=0,
+        flush_interval_ms=60_000,
+    )
+    # Notes: Holding the write lock keeps the flusher from draining mid-test
+    with writer._write_lock:
+        for _ in range(5):
+            writer.submit(file_db, _execution(user.id))
+        stats = writer.stats()
+    assert stats["enqueued"] == 2
+    assert stats["dropped"] == 3
+    writer.shutdown()
+    assert file_db.query(AgentExecutionLog).count() == 2
+
+
+def test_buffered_mode_falls_back_to_sync_on_a_shared_connection(db_session, test_user):
+    # Notes: The suite's StaticPool engine has one connection for every session
+    writer = TelemetryWriter(sessionmaker(bind=db_session.get_bind()), mode="buffered")
+    assert writer.mode == "sync"
+
+    writer.submit(db_session, _execution(test_user.id))
+    assert writer._thread is None
+    assert db_session.query(AgentExecutionLog).count() == 1
+
+
+def test_sync_mode_commits_inline(db_session, test_user):
+    writer = TelemetryWriter(mode="sync")
+    entry = writer.submit(db_session, _execution(test_user.id))
+    assert entry.id is not None
+    assert db_session.query(AgentExecutionLog).count() == 1
+    assert writer.stats()["enqueued"] == 0
@@ -1,7 +1,7 @@
+import asyncio
 import os
 import sys
 import uuid
-import time
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -30,11 +30,11 @@ def test_run_parallel_agents_timeout(monkeypatch):
     )
     import services.llm_call_service as llm_service
 
-    def slow_call(_payload):
-        time.sleep(0.05)
+    async def slow_call(_payload):
+        await asyncio.sleep(0.05)
         return "late"
 
-    monkeypatch.setattr(llm_service, "call_llm", slow_call)
+    monkeypatch.setattr(llm_service, "acall_llm", slow_call)
 
     result = orchestrator.run_parallel_agents(
         user.id,
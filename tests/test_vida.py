@@ -17,7 +17,7 @@ import routes.vida as vida_route
 client = TestClient(app)
 
 
-def fake_get_vida_response(prompt: str) -> str:
+async def fake_get_vida_response(prompt: str) -> str:
     return "Mocked response"
 
 
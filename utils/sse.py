@@ -0,0 +1,70 @@
+"""Server-sent event helpers for streaming LLM output to clients.
+
+Streaming endpoints emit one ``token`` event per text delta, then a single
+``done`` event carrying the full response (plus any extra fields such as the
+agent type or thread id). A failure mid-stream is reported as an ``error``
+event because the 200 status line has already been sent.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi.responses import StreamingResponse
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Notes: Stop nginx-style proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: str | None = None) -> str:
+    """Return one SSE frame with ``data`` encoded as JSON."""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data)}\n\n"
+
+
+async def stream_text_events(
+    deltas: AsyncIterator[str],
+    on_complete: Callable[[str], Any | Awaitable[Any]] | None = None,
+    extra: dict | None = None,
+) -> AsyncIterator[str]:
+    """Forward text deltas as ``token`` events and finish with ``done``.
+
+    ``on_complete`` receives the full text once the upstream stream ends
+    (before ``done`` is sent) and is where callers persist the reply.
+    ``extra`` is read only when ``done`` is sent, so it may be filled in
+    while streaming.
+    """
+    parts: list[str] = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield format_sse({"delta": delta}, event="token")
+        text = "".join(parts)
+        if on_complete is not None:
+            result = on_complete(text)
+            if inspect.isawaitable(result):
+                await result
+    except Exception as exc:
+        logger.error("Streaming response failed: %s", exc)
+        yield format_sse(
+            {"detail": "An unexpected error occurred while generating the response."},
+            event="error",
+        )
+        return
+    yield format_sse({**(extra or {}), "response": text}, event="done")
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an iterator of SSE frames in a ``text/event-stream`` response."""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
+# Footnote: Used by the coaching, orchestration and agent chat streaming routes.
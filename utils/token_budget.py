@@ -0,0 +1,101 @@
+"""Token counting and budget truncation for prompt assembly.
+
+Counts use the model's real BPE encoding through ``tiktoken`` when it is
+installed and its encoding files can be loaded. Otherwise a regex
+approximation of the GPT pre-tokenizer is used, which still tracks
+punctuation, digits and long words far better than whitespace splitting.
+Truncation keeps the original text (including line breaks) intact.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+
+from utils.logger import get_logger
+
+try:  # pragma: no cover - optional dependency
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = get_logger()
+
+DEFAULT_MODEL = "gpt-4o"
+
+# Notes: Mirrors the word/number/punctuation split used by GPT tokenizers
+_PIECE_PATTERN = re.compile(
+    r"'(?:s|t|re|ve|m|ll|d)|[^\W\d_]+|\d{1,3}|[^\s\w]+|\n+",
+    re.UNICODE | re.IGNORECASE,
+)
+# Notes: Average characters per BPE token for long alphabetic words
+_CHARS_PER_TOKEN = 4
+
+_encodings: dict[str, object | None] = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(model: str):
+    """Return a cached tiktoken encoding for ``model`` or ``None``."""
+
+    if tiktoken is None:
+        return None
+    with _encodings_lock:
+        if model not in _encodings:
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except Exception:  # pragma: no cover - offline or unknown model
+                logger.warning("tiktoken encoding for %s unavailable; approximating", model)
+                _encodings[model] = None
+        return _encodings[model]
+
+
+def _piece_cost(piece: str) -> int:
+    """Approximate token cost of a single pre-tokenized piece."""
+
+    if piece[0].isalpha() and len(piece) > _CHARS_PER_TOKEN:
+        return math.ceil(len(piece) / _CHARS_PER_TOKEN)
+    return 1
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Return the number of tokens ``text`` occupies for ``model``."""
+
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum(_piece_cost(m.group()) for m in _PIECE_PATTERN.finditer(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """Return the tail of ``text`` that fits within ``max_tokens`` tokens.
+
+    The most recent material is kept, matching how memory blocks are ordered.
+    """
+
+    if max_tokens <= 0 or not text:
+        return ""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[-max_tokens:]).lstrip()
+
+    pieces = list(_PIECE_PATTERN.finditer(text))
+    budget = max_tokens
+    cut = len(text)
+    for match in reversed(pieces):
+        cost = _piece_cost(match.group())
+        if cost > budget:
+            break
+        budget -= cost
+        cut = match.start()
+    else:
+        return text
+    return text[cut:].lstrip()
+
+# Footnote: Shared by memory assembly so prompts respect real model budgets.